@@ -10,6 +10,7 @@ celery_app = Celery(
         "app.tasks.schedule",
         "app.tasks.push",
         "app.tasks.analysis",
+        "app.tasks.reanalysis",
     ],
 )
 
@@ -24,10 +25,13 @@ celery_app.conf.update(
     worker_prefetch_multiplier=1,
     # Beat schedule for periodic tasks
     beat_schedule={
-        "check-call-schedules-every-minute": {
-            "task": "app.tasks.schedule.check_schedules",
-            "schedule": 60.0,  # Every 60 seconds
-        },
+        # CALL_SCHEDULER_MODE=heap이면 상주 스케줄러(app.tasks.scheduler)가 대신 처리
+        **({
+            "check-call-schedules-every-minute": {
+                "task": "app.tasks.schedule.check_schedules",
+                "schedule": 60.0,  # Every 60 seconds
+            },
+        } if settings.CALL_SCHEDULER_MODE == "beat" else {}),
         "sweep-missed-calls-every-5-minutes": {
             "task": "app.tasks.schedule.sweep_missed_calls",
             "schedule": 300.0,  # Every 5 minutes
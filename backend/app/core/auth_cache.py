@@ -0,0 +1,167 @@
+"""
+Short-lived caches for authentication.
+
+Every authenticated request used to decode its JWT and look the principal
+up in the database (``User`` for caregivers, ``ElderlyDevice`` for devices,
+including the ``/pending-call`` poll of every iOS device). Both results are
+cached here for AUTH_CACHE_TTL_SECONDS, keyed by the SHA-256 of the token
+(raw tokens are never kept in memory):
+
+- ``token_cache``: decoded payloads (verify_token)
+- ``user_cache`` / ``device_cache``: resolved principals (a ``User``
+  snapshot / an elderly id), tagged ``user:<id>`` / ``device:<id>`` so they
+  can be dropped when the principal changes. Kept apart so a token cached
+  by one route kind is never served to the other.
+
+Entries never outlive the token's own ``exp``. Invalidation is per process;
+changes made by another process (e.g. a Celery worker deactivating a
+device) are picked up when the entry expires.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import sha256
+from typing import Any, Dict, Optional, Set, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+
+
+@dataclass
+class AuthCacheStats:
+    """Hit/miss counters of one cache."""
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        """Convert to dictionary for logging/metrics."""
+        return {"hits": self.hits, "misses": self.misses, "invalidations": self.invalidations}
+
+
+class TokenCache:
+    """Bounded LRU of token hash -> value with a TTL, invalidated by tag."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = AuthCacheStats()
+        self._entries: "OrderedDict[str, Tuple[Any, float, Optional[str]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()  # sync dependencies run in the threadpool
+
+    @staticmethod
+    def key(token: str) -> str:
+        return sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[Any]:
+        if self.ttl <= 0:
+            return None
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    self._remove(key)
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[0]
+
+    def set(self, token: str, value: Any, expires_at: Optional[float] = None, tag: Optional[str] = None) -> None:
+        """Cache `value` for at most the TTL, and never past `expires_at` (the token's exp)."""
+        if self.ttl <= 0:
+            return
+        deadline = time.time() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        key = self.key(token)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (value, deadline, tag)
+            if tag is not None:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tag: str) -> int:
+        """Drop every entry of a principal. Returns the number of entries removed."""
+        with self._lock:
+            keys = self._tags.pop(tag, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            self.stats.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None and entry[2] is not None:
+            keys = self._tags.get(entry[2])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[entry[2]]
+
+
+token_cache = TokenCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS)
+user_cache = TokenCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS)
+device_cache = TokenCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS)
+
+
+def user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def device_tag(device_id: int) -> str:
+    return f"device:{device_id}"
+
+
+def invalidate_user(user_id: int) -> None:
+    user_cache.invalidate(user_tag(user_id))
+
+
+def invalidate_device(device_id: int) -> None:
+    device_cache.invalidate(device_tag(device_id))
+
+
+def detached_copy(instance):
+    """
+    Column-only snapshot of an ORM object, detached with its identity.
+
+    ``session.merge(copy, load=False)`` attaches it to a request's session
+    without a SELECT, so routes can still modify and commit it.
+    """
+    mapper = inspect(instance).mapper
+    copy = mapper.class_manager.new_instance()
+    for attr in mapper.column_attrs:
+        set_committed_value(copy, attr.key, getattr(instance, attr.key))
+    make_transient_to_detached(copy)
+    return copy
+
+
+def get_auth_cache_stats() -> Dict[str, Any]:
+    return {
+        "tokens": {"size": len(token_cache), **token_cache.stats.to_dict()},
+        "users": {"size": len(user_cache), **user_cache.stats.to_dict()},
+        "devices": {"size": len(device_cache), **device_cache.stats.to_dict()},
+    }
+
+
+def clear_auth_caches() -> None:
+    token_cache.clear()
+    user_cache.clear()
+    device_cache.clear()
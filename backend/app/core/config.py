@@ -14,6 +14,8 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_HOURS: int = 24
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    AUTH_CACHE_TTL_SECONDS: float = 60.0  # 디코딩한 토큰과 사용자/기기 조회 결과 캐시 시간 (0: 비활성)
+    AUTH_CACHE_MAX_ENTRIES: int = 10000  # 캐시별 최대 토큰 수 (LRU)
 
     # Pairing Code
     PAIRING_CODE_PEPPER: str = ""
@@ -25,6 +27,40 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = ""
     OPENAI_MODEL: str = "gpt-4o"  # 또는 gpt-4o-mini for cost efficiency
 
+    # LLM HTTP 연결 풀 (에이전트, 평가기, AIService, Celery 공용)
+    LLM_HTTP2: bool = True  # h2 패키지가 없으면 HTTP/1.1로 동작
+    LLM_MAX_CONNECTIONS: int = 100
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_KEEPALIVE_EXPIRY: float = 120.0  # 유휴 연결 유지 시간 (초)
+    LLM_TIMEOUT: float = 60.0
+    LLM_CONNECT_TIMEOUT: float = 5.0
+
+    # 통화 후 일괄 분석 (batch_analyze_pending)
+    ANALYSIS_BATCH_SIZE: int = 50  # 한 번에 처리할 미분석 통화 수
+    ANALYSIS_CONCURRENCY: int = 8  # 동시 LLM 분석 요청 수
+    ANALYSIS_MAX_ATTEMPTS: int = 3  # 이만큼 분석에 실패한 통화는 일괄 분석에서 제외
+    ANALYSIS_MESSAGE_WAIT_RETRIES: int = 5  # 다른 프로세스 버퍼에 메시지가 남아 있을 때 분석을 미루는 최대 횟수 (MESSAGE_FLUSH_INTERVAL 간격)
+
+    # Batch API 재분석 (프롬프트 변경 후 과거 통화 재채점)
+    BATCH_API_BACKEND: str = "openai"  # "openai" 또는 "local" (로컬 파일 기반, 테스트/개발용)
+    BATCH_API_DIR: str = "/tmp/sori_batches"  # JSONL 입력/출력 파일 위치
+    BATCH_API_POLL_INTERVAL: int = 300  # 완료 확인 주기 (초)
+    BATCH_API_MAX_REQUESTS: int = 50000  # 배치 하나당 최대 요청 수
+
+    # 예약 통화 스케줄러
+    CALL_SCHEDULER_MODE: str = "beat"  # "beat" (매분 check_schedules) 또는 "heap" (next_fire_at 기반 상주 스케줄러)
+    SCHEDULER_LOOKAHEAD_SECONDS: int = 300  # 힙에 미리 올려둘 구간 (초)
+    SCHEDULER_BATCH_SIZE: int = 10000  # 새로고침 1회당 힙에 올릴 최대 항목 수
+    SCHEDULER_REFRESH_INTERVAL: int = 30  # DB에서 힙을 다시 읽는 주기 (초)
+    SCHEDULER_MAX_LATENESS: int = 300  # 이보다 늦은 발신은 통화 생성 없이 다음 시각으로 넘김 (초)
+
+    # 통화 메시지 저장 (WebSocket write-behind 버퍼)
+    MESSAGE_DURABILITY: str = "journal"  # "immediate"(메시지마다 commit), "journal"(버퍼 + 로컬 저널), "buffered"(메모리 버퍼만)
+    MESSAGE_FLUSH_INTERVAL: float = 2.0  # 버퍼를 DB에 내리는 주기 (초)
+    MESSAGE_FLUSH_SIZE: int = 20  # 이만큼 쌓이면 주기를 기다리지 않고 flush
+    MESSAGE_JOURNAL_DIR: str = "/tmp/sori_message_journal"  # 프로세스 크래시 후 재적재할 저널 파일 위치
+    MESSAGE_PENDING_TTL: int = 60  # 미저장 메시지 플래그(Redis) 만료 시간 (초): 버퍼 주인 프로세스가 죽어도 분석이 무한정 기다리지 않도록
+
     # Claude API (legacy fallback, optional)
     CLAUDE_API_KEY: str = ""
 
@@ -34,6 +70,11 @@ class Settings(BaseSettings):
     AGENT_QUALITY_THRESHOLD: float = 0.7
     AGENT_ENABLE_REFLECTION: bool = True
     AGENT_TEMPERATURE: float = 0.7
+    AGENT_REFLECTION_MODE: str = "blocking"  # "blocking" 또는 "background"
+    AGENT_INCREMENTAL_EVALUATION: bool = False  # 스트리밍 중 문장 단위 안전 검사
+    AGENT_HISTORY_TOKEN_BUDGET: int = 3000  # 프롬프트에 포함할 대화 기록 토큰 상한
+    AGENT_SUMMARIZE_AFTER_MESSAGES: int = 20  # 이 개수를 넘으면 이전 대화를 백그라운드 요약 (0: 비활성)
+    AGENT_TOOL_SUBSETTING: bool = False  # 계획된 도구 + 핵심 도구(end_call, notify_caregiver)만 전송 (도구 조합마다 프롬프트 캐시 prefix가 달라짐)
 
     # CORS
     FRONTEND_URL: str = "http://localhost:3000"
@@ -41,6 +82,15 @@ class Settings(BaseSettings):
 
     # Firebase
     FIREBASE_CREDENTIALS_PATH: Optional[str] = None
+    FCM_SEND_MODE: str = "sdk"  # "sdk"(firebase-admin, 순차 발송) 또는 "http"(HTTP v1 직접 호출, 스레드 풀 + 연결 재사용)
+    FCM_PROJECT_ID: Optional[str] = None  # 비어 있으면 서비스 계정 파일의 project_id
+    FCM_BASE_URL: str = "https://fcm.googleapis.com"
+    FCM_HTTP_CONCURRENCY: int = 64  # 워커 프로세스당 동시 요청 수 (스레드/연결 수)
+    FCM_MAX_RETRIES: int = 3  # 429/5xx/네트워크 오류 재시도 횟수
+    FCM_RETRY_BACKOFF: float = 0.5  # 첫 재시도 대기 상한 (초, 시도마다 2배, jitter)
+    FCM_RETRY_BACKOFF_MAX: float = 10.0
+    FCM_TIMEOUT: float = 10.0
+    PUSH_BATCH_SIZE: int = 500  # 예약 통화 푸시 태스크 1개가 맡는 Call 수 (토큰 조회 1번 + send_each 묶음)
 
     # Server
     API_HOST: str = "0.0.0.0"
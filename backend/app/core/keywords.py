@@ -0,0 +1,236 @@
+"""
+Shared keyword index for perception heuristics.
+
+Agents, workers, skills and the evaluator all decide things by checking
+whether a keyword appears in the user's utterance. Instead of each call
+site lowercasing the text and scanning its own list, every list is
+registered here under a category name and compiled into a single
+Aho–Corasick automaton. One pass over the text returns every hit, tagged
+by category.
+
+Usage:
+    index = get_keyword_index()
+    index.register("emotion.sad", ["슬퍼", "우울"])
+
+    matches = index.match("요즘 너무 우울해요")
+    matches.has("emotion.sad")     # True
+    matches.get("emotion.sad")     # {"우울"}
+"""
+
+import logging
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+_EMPTY: FrozenSet[str] = frozenset()
+
+
+@dataclass
+class KeywordMatches:
+    """All keyword hits for one text, grouped by category."""
+    text: str
+    hits: Dict[str, Set[str]] = field(default_factory=dict)
+
+    def has(self, category: str) -> bool:
+        """True if any keyword of the category appears in the text."""
+        return category in self.hits
+
+    def get(self, category: str) -> FrozenSet[str]:
+        """Distinct keywords of the category found in the text."""
+        return frozenset(self.hits.get(category, _EMPTY))
+
+    def count(self, category: str) -> int:
+        """Number of distinct keywords of the category found in the text."""
+        return len(self.hits.get(category, _EMPTY))
+
+    def any_of(self, *categories: str) -> bool:
+        """True if any of the given categories matched."""
+        return any(c in self.hits for c in categories)
+
+
+class KeywordIndex:
+    """
+    Multi-pattern keyword matcher built from registered keyword lists.
+
+    Keywords are matched case-insensitively as substrings, which is exactly
+    the semantics of the ``kw in text.lower()`` checks it replaces. The
+    automaton is rebuilt lazily after registrations change, and recent
+    results are memoized so that every component looking at the same
+    utterance in a turn shares a single scan.
+    """
+
+    def __init__(self, cache_size: int = 256):
+        self._categories: Dict[str, Tuple[str, ...]] = {}
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, KeywordMatches]" = OrderedDict()
+        self._cache_size = cache_size
+
+        # Automaton state (built by _compile)
+        self._goto: List[Dict[str, int]] = []
+        self._fail: List[int] = []
+        self._outputs: List[List[Tuple[str, str]]] = []
+        self._compiled = False
+        self._generation = 0
+
+        # Stats
+        self.scans = 0
+        self.cache_hits = 0
+
+    # =========================================================================
+    # Registration
+    # =========================================================================
+
+    def register(self, category: str, keywords: Iterable[str]) -> None:
+        """
+        Register (or replace) the keyword list for a category.
+
+        Args:
+            category: Category name, e.g. "intent.end_conversation"
+            keywords: Keywords to match as substrings
+        """
+        normalized = tuple(dict.fromkeys(kw.lower() for kw in keywords if kw))
+
+        with self._lock:
+            if self._categories.get(category) == normalized:
+                return
+            self._categories[category] = normalized
+            self._invalidate()
+
+    def unregister(self, category: str) -> None:
+        """Remove a category from the index."""
+        with self._lock:
+            if self._categories.pop(category, None) is not None:
+                self._invalidate()
+
+    @property
+    def categories(self) -> List[str]:
+        """Registered category names."""
+        return list(self._categories)
+
+    def _invalidate(self) -> None:
+        self._compiled = False
+        self._generation += 1
+        self._cache.clear()
+
+    # =========================================================================
+    # Matching
+    # =========================================================================
+
+    def match(self, text: Optional[str]) -> KeywordMatches:
+        """
+        Find every registered keyword in the text in a single pass.
+
+        Args:
+            text: Text to scan (lowercased internally)
+
+        Returns:
+            KeywordMatches with hits grouped by category
+        """
+        text = text or ""
+
+        with self._lock:
+            cached = self._cache.get(text)
+            if cached is not None:
+                self._cache.move_to_end(text)
+                self.cache_hits += 1
+                return cached
+
+            if not self._compiled:
+                self._compile()
+
+            goto, fail, outputs = self._goto, self._fail, self._outputs
+            generation = self._generation
+
+        hits: Dict[str, Set[str]] = {}
+        state = 0
+        for ch in text.lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for category, keyword in outputs[state]:
+                hits.setdefault(category, set()).add(keyword)
+
+        result = KeywordMatches(text=text, hits=hits)
+
+        with self._lock:
+            self.scans += 1
+            # Don't cache a result computed against a since-replaced automaton
+            if generation == self._generation:
+                self._cache[text] = result
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+
+        return result
+
+    def _compile(self) -> None:
+        """Build the Aho–Corasick automaton from all registered keywords."""
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[Tuple[str, str]]] = [[]]
+
+        for category, keywords in self._categories.items():
+            for keyword in keywords:
+                state = 0
+                for ch in keyword:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][ch] = nxt
+                        goto.append({})
+                        outputs.append([])
+                    state = nxt
+                outputs[state].append((category, keyword))
+
+        # Breadth-first fail links; outputs inherit from their fail state
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                if state:
+                    fail[nxt] = goto[f].get(ch, 0)
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+        self._compiled = True
+
+        logger.debug(
+            f"[KeywordIndex] Compiled {sum(len(k) for k in self._categories.values())} "
+            f"keywords in {len(self._categories)} categories ({len(goto)} states)"
+        )
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get index statistics."""
+        return {
+            "categories": len(self._categories),
+            "keywords": sum(len(k) for k in self._categories.values()),
+            "scans": self.scans,
+            "cache_hits": self.cache_hits,
+        }
+
+
+# Global index instance
+_keyword_index: Optional[KeywordIndex] = None
+
+
+def get_keyword_index() -> KeywordIndex:
+    """Get the global keyword index."""
+    global _keyword_index
+    if _keyword_index is None:
+        _keyword_index = KeywordIndex()
+    return _keyword_index
+
+
+def reset_keyword_index() -> None:
+    """Reset the global keyword index (for testing)."""
+    global _keyword_index
+    _keyword_index = None
@@ -0,0 +1,416 @@
+"""
+Process-wide pooled LLM clients.
+
+The agent, evaluator, legacy AIService and Celery analysis tasks all talk to
+the same OpenAI endpoint. Instead of each creating its own client (and its
+own cold connection pool), they get shared clients from here, built on one
+tuned httpx transport per process: bounded connection limits, long-lived
+keep-alive and HTTP/2 when the ``h2`` package is installed.
+
+The transport is instrumented so pool saturation and the connect / TLS
+time of every new connection are visible via ``get_llm_client_stats()``.
+
+Usage:
+    client = get_async_openai_client()   # agent, evaluator (async)
+    client = get_openai_client()         # AIService, Celery tasks (sync)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LLMClientStats:
+    """Connection pool metrics for one kind of client (async or sync)."""
+    max_connections: int = 0
+    requests: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    saturated_requests: int = 0  # Started while every pooled connection was busy
+    new_connections: int = 0
+    connect_ms_total: float = 0.0
+    tls_ms_total: float = 0.0
+    last_connect_ms: float = 0.0
+    last_tls_ms: float = 0.0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def request_started(self, transport_in_flight: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            if transport_in_flight > self.max_connections:
+                self.saturated_requests += 1
+
+    def request_finished(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def connection_opened(self, connect_ms: float, tls_ms: float) -> None:
+        with self._lock:
+            self.new_connections += 1
+            self.connect_ms_total += connect_ms
+            self.tls_ms_total += tls_ms
+            self.last_connect_ms = connect_ms
+            self.last_tls_ms = tls_ms
+
+    @property
+    def reused_connections(self) -> int:
+        """Requests served on an already open connection."""
+        return max(self.requests - self.new_connections, 0)
+
+    @property
+    def saturation(self) -> float:
+        """Current share of the pool in use."""
+        return self.in_flight / self.max_connections if self.max_connections else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for logging/metrics."""
+        return {
+            "max_connections": self.max_connections,
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "saturation": round(self.saturation, 3),
+            "saturated_requests": self.saturated_requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "avg_connect_ms": round(self.connect_ms_total / self.new_connections, 2) if self.new_connections else 0.0,
+            "avg_tls_ms": round(self.tls_ms_total / self.new_connections, 2) if self.new_connections else 0.0,
+            "last_connect_ms": round(self.last_connect_ms, 2),
+            "last_tls_ms": round(self.last_tls_ms, 2),
+        }
+
+
+class _ConnectionTimer:
+    """
+    httpcore trace callback measuring TCP connect and TLS handshake time.
+
+    Only requests that open a new connection emit the connect/TLS events;
+    requests on a kept-alive connection record nothing.
+    """
+
+    def __init__(self, stats: LLMClientStats):
+        self._stats = stats
+        self._started: Dict[str, float] = {}
+        self._durations: Dict[str, float] = {}
+
+    def on_event(self, event_name: str) -> None:
+        for step in ("connect_tcp", "start_tls"):
+            prefix = f"connection.{step}."
+            if event_name == prefix + "started":
+                self._started[step] = time.perf_counter()
+            elif event_name == prefix + "complete" and step in self._started:
+                self._durations[step] = (time.perf_counter() - self._started.pop(step)) * 1000
+
+        # Headers go out once the connection is ready
+        if event_name.endswith("send_request_headers.started") and "connect_tcp" in self._durations:
+            self._stats.connection_opened(
+                connect_ms=self._durations.pop("connect_tcp"),
+                tls_ms=self._durations.pop("start_tls", 0.0),
+            )
+
+    def sync_trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        self.on_event(event_name)
+
+    async def async_trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        self.on_event(event_name)
+
+
+# Last event of an OpenAI SSE stream. The SDK stops reading once it sees it,
+# which leaves the end of the HTTP message unread and the connection unusable
+# for keep-alive, so the (empty) remainder is drained before closing.
+_SSE_DONE = b"data: [DONE]"
+
+
+class _TrackedAsyncStream(httpx.AsyncByteStream):
+    """Response body that reports the request as finished when closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+        self._tail = b""
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self._tail = (self._tail + chunk)[-32:]
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            if _SSE_DONE in self._tail:
+                try:
+                    async for _ in self._stream:
+                        pass
+                except Exception:
+                    pass
+            await self._stream.aclose()
+        finally:
+            self._on_close()
+
+
+class _TrackedSyncStream(httpx.SyncByteStream):
+    """Sync counterpart of _TrackedAsyncStream."""
+
+    def __init__(self, stream: httpx.SyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+        self._tail = b""
+
+    def __iter__(self):
+        for chunk in self._stream:
+            self._tail = (self._tail + chunk)[-32:]
+            yield chunk
+
+    def close(self) -> None:
+        try:
+            if _SSE_DONE in self._tail:
+                try:
+                    for _ in self._stream:
+                        pass
+                except Exception:
+                    pass
+            self._stream.close()
+        finally:
+            self._on_close()
+
+
+class _InstrumentedTransportMixin:
+    """Shared in-flight accounting for the async and sync transports."""
+
+    def _init_tracking(self, stats: LLMClientStats) -> None:
+        self._stats = stats
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+            in_flight = self._in_flight
+        self._stats.request_started(in_flight)
+
+    def _finish(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._stats.request_finished()
+
+    def _once(self):
+        """Callback that runs _finish at most once per request."""
+        done = False
+
+        def finish():
+            nonlocal done
+            if not done:
+                done = True
+                self._finish()
+        return finish
+
+
+class InstrumentedAsyncTransport(_InstrumentedTransportMixin, httpx.AsyncBaseTransport):
+    """AsyncHTTPTransport wrapper recording pool usage and connection timing."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, stats: LLMClientStats):
+        self._transport = transport
+        self._init_tracking(stats)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.extensions["trace"] = _ConnectionTimer(self._stats).async_trace
+        finish = self._once()
+        self._start()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            finish()
+            raise
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_TrackedAsyncStream(response.stream, finish),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class InstrumentedSyncTransport(_InstrumentedTransportMixin, httpx.BaseTransport):
+    """HTTPTransport wrapper recording pool usage and connection timing."""
+
+    def __init__(self, transport: httpx.BaseTransport, stats: LLMClientStats):
+        self._transport = transport
+        self._init_tracking(stats)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.extensions["trace"] = _ConnectionTimer(self._stats).sync_trace
+        finish = self._once()
+        self._start()
+        try:
+            response = self._transport.handle_request(request)
+        except BaseException:
+            finish()
+            raise
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_TrackedSyncStream(response.stream, finish),
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+# =============================================================================
+# Factory
+# =============================================================================
+
+_lock = threading.Lock()
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+_async_client_no_loop: Optional[AsyncOpenAI] = None
+_sync_client: Optional[OpenAI] = None
+_async_stats = LLMClientStats()
+_sync_stats = LLMClientStats()
+_http2_warned = False
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(settings.LLM_TIMEOUT, connect=settings.LLM_CONNECT_TIMEOUT)
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 if configured and the optional ``h2`` package is installed."""
+    global _http2_warned
+    if not settings.LLM_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        if not _http2_warned:
+            logger.warning("[LLMClients] h2 not installed, falling back to HTTP/1.1 (pip install 'httpx[http2]')")
+            _http2_warned = True
+        return False
+    return True
+
+
+def _new_async_client() -> AsyncOpenAI:
+    _async_stats.max_connections = settings.LLM_MAX_CONNECTIONS
+    transport = InstrumentedAsyncTransport(
+        httpx.AsyncHTTPTransport(http2=_http2_enabled(), limits=_limits()),
+        _async_stats,
+    )
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        timeout=_timeout(),
+        http_client=httpx.AsyncClient(transport=transport, timeout=_timeout()),
+    )
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    Get the shared AsyncOpenAI client.
+
+    Async connections belong to the event loop that opened them, so one
+    client is kept per running loop (in practice: one per process).
+    """
+    global _async_client_no_loop
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    with _lock:
+        if loop is None:
+            if _async_client_no_loop is None:
+                _async_client_no_loop = _new_async_client()
+            return _async_client_no_loop
+
+        client = _async_clients.get(loop)
+        if client is None:
+            client = _new_async_client()
+            _async_clients[loop] = client
+            logger.info(f"[LLMClients] AsyncOpenAI client created (http2={_http2_enabled()})")
+        return client
+
+
+async def aclose_async_openai_client() -> None:
+    """
+    Close the running loop's client.
+
+    For short-lived loops (``asyncio.run`` inside a Celery task) so their
+    connections are released before the loop goes away.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.pop(loop, None)
+    if client is not None:
+        await client.close()
+
+
+def get_openai_client() -> OpenAI:
+    """Get the shared synchronous OpenAI client (thread-safe)."""
+    global _sync_client
+    with _lock:
+        if _sync_client is None:
+            _sync_stats.max_connections = settings.LLM_MAX_CONNECTIONS
+            transport = InstrumentedSyncTransport(
+                httpx.HTTPTransport(http2=_http2_enabled(), limits=_limits()),
+                _sync_stats,
+            )
+            _sync_client = OpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                timeout=_timeout(),
+                http_client=httpx.Client(transport=transport, timeout=_timeout()),
+            )
+            logger.info(f"[LLMClients] OpenAI client created (http2={_http2_enabled()})")
+        return _sync_client
+
+
+def get_llm_client_stats() -> Dict[str, Dict[str, Any]]:
+    """Pool and connection metrics of the shared clients."""
+    return {
+        "async": _async_stats.to_dict(),
+        "sync": _sync_stats.to_dict(),
+    }
+
+
+def reset_llm_clients() -> None:
+    """
+    Drop the shared clients and metrics (for testing, and after fork).
+
+    Clients are not closed: after a fork their sockets belong to the parent.
+    """
+    global _async_client_no_loop, _sync_client, _async_stats, _sync_stats, _lock
+    _lock = threading.Lock()
+    _async_clients.clear()
+    _async_client_no_loop = None
+    _sync_client = None
+    _async_stats = LLMClientStats()
+    _sync_stats = LLMClientStats()
+
+
+# Celery prefork workers must not share the parent's pooled connections
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_llm_clients)
@@ -5,6 +5,7 @@ from passlib.context import CryptContext
 from typing import Optional, Literal
 import secrets
 
+from app.core.auth_cache import token_cache
 from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -58,11 +59,15 @@ def create_refresh_token(user_id: int, email: str) -> str:
 
 
 def verify_token(token: str) -> Optional[dict]:
+    cached = token_cache.get(token)
+    if cached is not None:
+        return dict(cached)
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
+    token_cache.set(token, payload, expires_at=payload.get("exp"))
+    return dict(payload)
 
 
 # Pairing code functions
@@ -1,4 +1,6 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
 
@@ -23,9 +25,43 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def async_database_url(url: str) -> str:
+    """DATABASE_URL의 드라이버를 async 드라이버로 교체 (PostgreSQL → asyncpg, SQLite → aiosqlite)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    elif backend == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+
+def create_async_db_engine(url: str):
+    """WebSocket 경로용 async 엔진 (커넥션 풀 설정은 sync 엔진과 동일)."""
+    if url.startswith("sqlite"):
+        return create_async_engine(
+            async_database_url(url),
+            echo=settings.ENVIRONMENT == "development",
+        )
+    return create_async_engine(
+        async_database_url(url),
+        echo=settings.ENVIRONMENT == "development",
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20,
+    )
+
+
+# WebSocket 핸들러는 이벤트 루프에서 돌기 때문에 DB 대기가 다른 통화를 막지 않도록 async 세션 사용.
+# commit 후에도 ORM 객체 속성을 다시 읽을 수 있도록 expire_on_commit=False (lazy load는 await 불가)
+async_engine = create_async_db_engine(settings.DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
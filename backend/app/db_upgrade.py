@@ -0,0 +1,118 @@
+"""
+In-place schema upgrades for databases created before a table, column or
+index was added.
+
+There is no migration tool: tables come from init-db.sql (fresh PostgreSQL
+volume) and ``Base.metadata.create_all`` (API startup). Neither touches a
+table that already exists, so new columns and indexes on existing tables
+are added here, idempotently, followed by the backfills they need.
+
+Usage (replaces a bare create_all):
+    init_schema(engine)
+"""
+
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app import models  # noqa: F401 (register every table on Base.metadata)
+from app.database import Base
+
+logger = logging.getLogger(__name__)
+
+# (table, column, DDL type, backfill) — append when a model gains a column
+ADDED_COLUMNS: List[Tuple[str, str, str, Optional[str]]] = [
+    ("elderly", "next_fire_at", "TIMESTAMP", "schedule"),
+    ("calls", "analysis_failed_at", "TIMESTAMP", None),
+    ("calls", "analysis_attempts", "INTEGER NOT NULL DEFAULT 0", None),
+]
+
+# Model indexes on pre-existing tables, by name; skipped when an index on
+# the same columns already exists (e.g. created by init-db.sql under another name)
+ADDED_INDEXES: List[Tuple[str, str]] = [
+    ("calls", "idx_calls_elderly_scheduled"),
+    ("elderly", "ix_elderly_next_fire_at"),
+]
+
+# New tables that must be filled from existing rows once created
+ADDED_TABLES: Dict[str, str] = {
+    "call_schedule_slots": "schedule",
+}
+
+
+def backfill_schedule(db: Session) -> None:
+    """call_schedule_slots and Elderly.next_fire_at from Elderly.call_schedule."""
+    from app.services.elderly import ElderlyService
+
+    count = ElderlyService.rebuild_schedule_slots(db)
+    logger.info(f"Backfilled {count} call schedule slots")
+
+
+BACKFILLS = {
+    "schedule": backfill_schedule,
+}
+
+
+def upgrade_schema(bind: Engine, existing_tables: Set[str]) -> List[str]:
+    """
+    Add missing columns/indexes to ``existing_tables`` (the tables that
+    existed before create_all) and run the backfills they need.
+
+    Returns:
+        Descriptions of the changes applied
+    """
+    applied: List[str] = []
+    backfills: Set[str] = set()
+    if not existing_tables:
+        return applied  # 새 DB: create_all이 전부 만들었음
+
+    for table, backfill in ADDED_TABLES.items():
+        if table not in existing_tables:
+            applied.append(f"table {table}")
+            backfills.add(backfill)
+
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table, column, ddl, backfill in ADDED_COLUMNS:
+            if table not in existing_tables:
+                continue
+            if column in {c["name"] for c in inspector.get_columns(table)}:
+                continue
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+            applied.append(f"column {table}.{column}")
+            if backfill:
+                backfills.add(backfill)
+
+    for table, name in ADDED_INDEXES:
+        if table not in existing_tables:
+            continue
+        index = next(i for i in Base.metadata.tables[table].indexes if i.name == name)
+        columns = [c.name for c in index.columns]
+        if any(i["column_names"] == columns for i in inspect(bind).get_indexes(table)):
+            continue
+        try:
+            index.create(bind)
+            applied.append(f"index {name}")
+        except Exception as e:
+            # 예: 기존 데이터에 중복이 있어 유니크 인덱스를 만들 수 없음 — 정리 후 재시작
+            logger.error(f"Could not create index {name} on {table}: {e}")
+
+    if backfills and "elderly" in existing_tables:
+        with Session(bind=bind) as db:
+            for backfill in sorted(backfills):
+                BACKFILLS[backfill](db)
+                db.commit()
+
+    for change in applied:
+        logger.warning(f"Schema upgrade: added {change}")
+    return applied
+
+
+def init_schema(bind: Engine) -> List[str]:
+    """Create missing tables, then upgrade the tables that already existed."""
+    existing_tables = set(inspect(bind).get_table_names())
+    Base.metadata.create_all(bind=bind)
+    return upgrade_schema(bind, existing_tables)
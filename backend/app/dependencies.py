@@ -1,8 +1,10 @@
 from fastapi import Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.core.auth_cache import detached_copy, invalidate_user, user_cache, user_tag
 from app.core.security import verify_token
 from app.models.user import User
 from app.core.exceptions import InvalidTokenError
@@ -17,8 +19,14 @@ async def get_current_user(
     """현재 사용자 조회 (토큰 검증)"""
     token = credentials.credentials
 
+    # 캐시된 사용자는 SELECT 없이 이 요청의 세션에 붙여서 반환 (수정/commit 가능)
+    cached = user_cache.get(token)
+    if isinstance(cached, User):
+        return db.merge(cached, load=False)
+
+    # 보호자 access 토큰만 허용 (refresh, 기기 토큰 거부)
     payload = verify_token(token)
-    if not payload or payload.get("type") == "refresh":
+    if not payload or payload.get("type") != "access":
         raise InvalidTokenError()
 
     user_id = int(payload.get("sub"))
@@ -27,4 +35,12 @@ async def get_current_user(
     if not user:
         raise InvalidTokenError()
 
+    user_cache.set(token, detached_copy(user), expires_at=payload.get("exp"), tag=user_tag(user.id))
     return user
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    """사용자 정보가 바뀌면 캐시된 principal 폐기 (이 프로세스 한정, 나머지는 TTL)"""
+    invalidate_user(target.id)
@@ -3,28 +3,49 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 import time
+from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.core.logging import setup_logging, get_logger
 from app.core.exceptions import APIError
-from app.database import engine, Base
+from app.core.auth_cache import get_auth_cache_stats
+from app.core.llm_clients import get_llm_client_stats
+from app.database import engine, AsyncSessionLocal
+from app.db_upgrade import init_schema
 from app.routes import auth, elderly, calls, websocket, pairing, pairing_public, device
 from app.routes import websocket_v2  # Agent SDK version
+from app.services import message_buffer
+from app.services.device_events import device_event_hub
 
 # 로깅 설정
 logger = setup_logging()
 
-# 데이터베이스 테이블 생성
-Base.metadata.create_all(bind=engine)
+# 데이터베이스 테이블 생성 + 기존 테이블에 새 컬럼/인덱스 추가 (마이그레이션 도구 없음)
+init_schema(engine)
 logger.info("Database tables created")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 이전 프로세스가 flush하지 못하고 죽은 통화 메시지를 저널에서 재적재
+    try:
+        recovered = await message_buffer.recover_journals(AsyncSessionLocal)
+        if recovered:
+            logger.warning(f"Recovered {recovered} unflushed call messages from journals")
+    except Exception as e:
+        logger.error(f"Message journal recovery failed: {e}")
+    yield
+    await device_event_hub.close()
+
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="Sori API",
     description="AI-based elderly counseling system",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 
@@ -105,6 +126,30 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/health/llm")
+async def llm_health_check():
+    """LLM 연결 풀 사용량 및 연결/TLS 시간"""
+    return get_llm_client_stats()
+
+
+@app.get("/health/auth")
+async def auth_cache_health_check():
+    """토큰/사용자·기기 인증 캐시 적중률"""
+    return get_auth_cache_stats()
+
+
+@app.get("/health/messages")
+async def message_buffer_health_check():
+    """통화 메시지 write-behind 버퍼: 추가된 메시지 수 대비 DB flush 횟수"""
+    return message_buffer.stats.to_dict()
+
+
+@app.get("/health/agent")
+async def agent_health_check():
+    """에이전트 프롬프트 캐시: 캐시된 토큰 비율과 고정 prefix 비율"""
+    return websocket_v2.get_agent_service().prompt_cache_stats.to_dict()
+
+
 @app.get("/")
 async def root():
     return {
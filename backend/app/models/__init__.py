@@ -5,6 +5,7 @@ from app.models.call import Call
 from app.models.message import Message
 from app.models.call_analysis import CallAnalysis
 from app.models.pairing_code import ElderlyPairingCode
+from app.models.call_schedule_slot import CallScheduleSlot
 
 __all__ = [
     "User",
@@ -14,4 +15,5 @@ __all__ = [
     "Message",
     "CallAnalysis",
     "ElderlyPairingCode",
+    "CallScheduleSlot",
 ]
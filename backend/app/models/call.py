@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 
@@ -10,6 +10,17 @@ class Call(Base):
     # NOTE:
     # scheduled call 중복 방지는 DB의 부분 유니크 인덱스(idx_calls_elderly_scheduled)가 책임집니다.
     # ORM UniqueConstraint로 강제하면 manual call까지 막을 수 있어 불일치가 발생할 수 있습니다.
+    # (trigger_type='auto'에만 걸리는 부분 인덱스로 선언 — check_schedules의 ON CONFLICT 대상)
+    __table_args__ = (
+        Index(
+            "idx_calls_elderly_scheduled",
+            "elderly_id",
+            "scheduled_for",
+            unique=True,
+            postgresql_where=text("trigger_type = 'auto'"),
+            sqlite_where=text("trigger_type = 'auto'"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     elderly_id = Column(Integer, ForeignKey("elderly.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -25,6 +36,8 @@ class Call(Base):
     # 상태
     status = Column(String(50), default="in_progress")  # 'in_progress', 'completed', 'failed', 'cancelled', 'missed'
     is_successful = Column(Boolean, default=True)
+    analysis_failed_at = Column(DateTime, nullable=True)  # 마지막 분석 실패 시각 (분석 결과가 저장되면 무시)
+    analysis_attempts = Column(Integer, nullable=False, default=0, server_default="0")  # 실패한 분석 횟수
 
     # 메타데이터
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
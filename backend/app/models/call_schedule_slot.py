@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, SmallInteger, String, ForeignKey
+
+from app.database import Base
+
+
+class CallScheduleSlot(Base):
+    """
+    Normalized index of Elderly.call_schedule: one row per (weekday, HH:MM)
+    an elderly person should be called at.
+
+    Kept in sync by ElderlyService; check_schedules looks up the current
+    (weekday, time) on the primary key instead of scanning every schedule.
+    Disabled schedules have no rows.
+    """
+    __tablename__ = "call_schedule_slots"
+
+    weekday = Column(SmallInteger, primary_key=True)  # 0 = Monday (KST)
+    slot_time = Column(String(5), primary_key=True)  # "HH:MM" (KST)
+    elderly_id = Column(
+        Integer,
+        ForeignKey("elderly.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True
+    )
@@ -18,6 +18,7 @@ class Elderly(Base):
 
     # 통화 관련
     call_schedule = Column(JSON, default={"enabled": True, "times": ["09:00", "14:00", "19:00"]})
+    next_fire_at = Column(DateTime, nullable=True, index=True)  # 다음 예약 통화 시각 (UTC naive, 비활성이면 NULL)
 
     # 건강 정보
     health_condition = Column(Text, nullable=True)
@@ -36,3 +37,4 @@ class Elderly(Base):
     caregiver = relationship("User", back_populates="elderly")
     calls = relationship("Call", back_populates="elderly", cascade="all, delete-orphan")
     devices = relationship("ElderlyDevice", back_populates="elderly", cascade="all, delete-orphan")
+    schedule_slots = relationship("CallScheduleSlot", cascade="all, delete-orphan")
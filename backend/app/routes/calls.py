@@ -1,4 +1,10 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, status, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -7,12 +13,17 @@ from app.models.user import User
 from app.schemas.call import CallCreateRequest, CallStartResponse, CallDetailResponse, CallListResponse, CallAnalysisResponse
 from app.schemas.response import success_response
 from app.services.calls import CallService
-from app.services.ai_service import AIService
+from app.services.message_buffer import flush_call_messages
 from app.core.config import settings
 from app.core.exceptions import NotFoundError, ForbiddenError
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
-ai_service = AIService()
+
+# 분석 상태 롱폴링 간격 / 최대 대기 시간 (초)
+ANALYSIS_POLL_INTERVAL = 0.5
+ANALYSIS_MAX_WAIT = 30
 
 
 @router.get("")
@@ -63,7 +74,8 @@ async def start_call(
     db: Session = Depends(get_db)
 ):
     """새 통화 시작"""
-    call = CallService.start_call(db, call_data, current_user.id)
+    # 기기 이벤트 발행(Redis 왕복)이 이벤트 루프를 막지 않도록 스레드풀에서 실행
+    call = await run_in_threadpool(CallService.start_call, db, call_data, current_user.id)
 
     # WebSocket URL 생성
     ws_host = settings.API_HOST if settings.API_HOST != "0.0.0.0" else "localhost"
@@ -89,34 +101,80 @@ async def end_call(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """통화 종료 + 분석"""
-    call = CallService.end_call(db, call_id, current_user.id)
-
-    # 메시지가 있으면 Claude API로 분석 실행
-    if call.messages:
-        messages_list = [
-            {"role": m.role, "content": m.content}
-            for m in call.messages
-        ]
+    """통화 종료 + 분석 요청 (분석은 Celery에서 비동기로 수행)"""
+    # 이 프로세스에서 진행 중인 WebSocket 통화면 버퍼에 남은 메시지부터 저장 (분석이 전체 대화를 보도록)
+    # 다른 프로세스의 버퍼는 그 프로세스가 flush할 때까지 analyze_call이 기다림 (pending_messages)
+    if not await flush_call_messages(call_id):
+        logger.error(f"Call {call_id} ending with unsaved messages")
+    call = CallService.get_by_id(db, call_id, current_user.id)
+    # WebSocket 종료로 이미 완료된 통화면 종료 시각/길이를 덮어쓰거나 분석을 다시 요청하지 않음
+    already_completed = call.status == "completed"
+    if not already_completed:
+        call = CallService.end_call(db, call_id, current_user.id)
+
+    analysis_status = CallService.get_analysis_status(call)
+    if analysis_status == "pending" and not already_completed:
         try:
-            analysis_result = ai_service.analyze_call(messages_list)
-            CallService.save_analysis(db, call_id, analysis_result)
-        except Exception:
-            # 분석 실패해도 통화 종료는 성공
-            pass
+            from app.tasks.analysis import analyze_call
+            analyze_call.delay(call_id)
+        except Exception as e:
+            # 분석 요청 실패해도 통화 종료는 성공 (실패를 기록해 상태 조회도 failed를 반환)
+            logger.error(f"Failed to enqueue analysis for call {call_id}: {e}")
+            call.analysis_failed_at = datetime.utcnow()
+            db.commit()
+            analysis_status = "failed"
 
     return success_response(
         data={
             "id": call.id,
             "status": call.status,
             "duration": call.duration,
-            "ended_at": call.ended_at.isoformat() if call.ended_at else None
+            "ended_at": call.ended_at.isoformat() if call.ended_at else None,
+            "analysis_status": analysis_status
         },
         message="통화가 종료되었습니다",
         code=200
     )
 
 
+@router.get("/{call_id}/analysis/status")
+async def get_call_analysis_status(
+    call_id: int,
+    wait: int = Query(0, ge=0, le=ANALYSIS_MAX_WAIT),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """통화 분석 상태 조회 (wait > 0이면 완료될 때까지 최대 wait초 대기)"""
+    caregiver_id = current_user.id
+    call = CallService.get_by_id(db, call_id, caregiver_id)
+    analysis_status = CallService.get_analysis_status(call)
+
+    if analysis_status == "pending" and wait:
+        deadline = time.monotonic() + wait
+        settled = False
+        while not settled and time.monotonic() < deadline:
+            # 대기 중에는 세션을 닫아 커넥션을 풀에 반납 (조회마다 짧은 트랜잭션)
+            db.close()
+            await asyncio.sleep(ANALYSIS_POLL_INTERVAL)
+            settled = CallService.is_analysis_settled(db, call_id)
+        db.close()
+        call = CallService.get_by_id(db, call_id, caregiver_id)
+        analysis_status = CallService.get_analysis_status(call)
+
+    return success_response(
+        data={
+            "call_id": call.id,
+            "analysis_status": analysis_status,
+            "analysis": (
+                CallAnalysisResponse.model_validate(call.analysis).model_dump()
+                if call.analysis else None
+            )
+        },
+        message="OK",
+        code=200
+    )
+
+
 @router.get("/{call_id}/analysis")
 async def get_call_analysis(
     call_id: int,
@@ -2,26 +2,31 @@
 Device-specific routes for elderly iOS app.
 These routes use device_access_token authentication (scope=elderly).
 """
-from datetime import datetime, timedelta
-from typing import Optional
-import sys
+import asyncio
+from datetime import datetime
+from typing import Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
-from sqlalchemy import or_, and_
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_db
+from app.core.auth_cache import device_cache, device_tag
 from app.core.security import verify_token
 from app.core.logging import get_logger
-from app.models.call import Call
 from app.models.elderly_device import ElderlyDevice
+from app.services.calls import CallService
+from app.services.device_events import RESYNC_EVENT, device_event_hub, pending_call_event
 
 router = APIRouter()
 security = HTTPBearer()
 logger = get_logger(__name__)
 
+# 이벤트 채널 유휴 시 ping 주기 (프록시/NAT 유휴 타임아웃 방지)
+DEVICE_EVENTS_PING_INTERVAL = 30
+
 
 # MARK: - Response Models
 
@@ -42,6 +47,12 @@ def get_elderly_from_device_token(
     Raises 401 if token is invalid or not a device token.
     """
     token = credentials.credentials
+
+    # 활성 기기로 확인된 토큰이면 DB 조회 생략 (unpair 시 무효화)
+    cached_elderly_id = device_cache.get(token)
+    if isinstance(cached_elderly_id, int):
+        return cached_elderly_id
+
     payload = verify_token(token)
 
     if not payload:
@@ -77,6 +88,7 @@ def get_elderly_from_device_token(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Device not active",
             )
+        device_cache.set(token, elderly_id, expires_at=payload.get("exp"), tag=device_tag(device_id))
 
     return elderly_id
 
@@ -95,57 +107,10 @@ async def get_pending_call(
     1. Manual call in progress (caregiver-initiated)
     2. Scheduled auto call within the time window
 
-    Used by iOS app to poll for calls without FCM push.
+    Used by iOS app to poll for calls without FCM push. Connected devices
+    get the same data pushed on /api/device/events; this stays as the fallback.
     """
-    now = datetime.utcnow()
-
-    # Look for calls scheduled in the past 5 minutes to next 60 minutes
-    time_window_start = now - timedelta(minutes=5)
-    time_window_end = now + timedelta(minutes=60)
-
-    # Query for pending calls:
-    # - Any in_progress calls (caregiver-initiated or voice)
-    # - OR Auto scheduled calls within time window
-    pending_call = db.query(Call).filter(
-        Call.elderly_id == elderly_id,
-        or_(
-            # Any in-progress calls (caregiver-initiated, voice, manual)
-            Call.status == "in_progress",
-            # Auto scheduled calls within time window
-            and_(
-                Call.trigger_type == "auto",
-                Call.status == "scheduled",
-                Call.scheduled_for >= time_window_start,
-                Call.scheduled_for <= time_window_end
-            )
-        )
-    ).order_by(
-        # Prioritize in_progress calls, then by scheduled time
-        Call.status.desc(),
-        Call.scheduled_for.asc()
-    ).first()
-
-    # DEBUG: Log query result
-    print(f"[DEBUG] ===== [PENDING-CALL] elderly_id={elderly_id} =====", flush=True)
-    sys.stdout.flush()
-    print(f"[DEBUG] Query result: found={pending_call is not None}", flush=True)
-    sys.stdout.flush()
-    if pending_call:
-        print(f"[DEBUG]   ✓ Call ID: {pending_call.id}", flush=True)
-        print(f"[DEBUG]   ✓ Status: {pending_call.status}", flush=True)
-        print(f"[DEBUG]   ✓ Call Type: {pending_call.call_type}", flush=True)
-        print(f"[DEBUG]   ✓ Trigger Type: {pending_call.trigger_type}", flush=True)
-        sys.stdout.flush()
-    else:
-        # Show all calls for debugging
-        all_calls = db.query(Call).filter(Call.elderly_id == elderly_id).all()
-        print(f"[DEBUG]   ✗ No pending call found", flush=True)
-        print(f"[DEBUG]   Total calls for elderly_id={elderly_id}: {len(all_calls)}", flush=True)
-        for c in all_calls[:5]:
-            print(f"[DEBUG]     - Call {c.id}: status={c.status}, type={c.call_type}/{c.trigger_type}", flush=True)
-        sys.stdout.flush()
-    print(f"[DEBUG] {'=' * 60}", flush=True)
-    sys.stdout.flush()
+    pending_call = CallService.get_pending_call(db, elderly_id)
 
     if not pending_call:
         # Return success with null data (no pending call)
@@ -188,3 +153,109 @@ async def device_heartbeat(
             "server_time": datetime.utcnow().isoformat(),
         },
     }
+
+
+# MARK: - Event Channel
+
+async def authenticate_device_token(token: str) -> Optional[Tuple[int, Optional[int]]]:
+    """WebSocket version of get_elderly_from_device_token: (elderly_id, device_id) or None."""
+    payload = verify_token(token)
+    if not payload or payload.get("scope") != "elderly" or payload.get("type") != "device_access":
+        return None
+
+    elderly_id = int(payload.get("sub", 0))
+    device_id = payload.get("device_id")
+    if not elderly_id:
+        return None
+
+    if device_id and device_cache.get(token) != elderly_id:
+        async with AsyncSessionLocal() as db:
+            active = (await db.execute(select(ElderlyDevice.id).where(
+                ElderlyDevice.id == device_id,
+                ElderlyDevice.is_active == True,
+            ))).first()
+        if not active:
+            return None
+        device_cache.set(token, elderly_id, expires_at=payload.get("exp"), tag=device_tag(device_id))
+
+    return elderly_id, device_id
+
+
+async def send_pending_call(websocket: WebSocket, elderly_id: int) -> None:
+    """Send the current pending call (if any) from the DB."""
+    async with AsyncSessionLocal() as db:
+        call = await CallService.get_pending_call_async(db, elderly_id)
+    if call:
+        await websocket.send_json(pending_call_event(call.id, call.status, call.scheduled_for))
+
+
+async def wait_for_disconnect(websocket: WebSocket) -> None:
+    """Read (and ignore) client frames until the device disconnects."""
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.websocket("/events")
+async def device_event_channel(websocket: WebSocket, token: str = Query(...)):
+    """
+    Long-lived event channel for an elderly device (replaces pending-call polling).
+
+    Server → device frames: `pending_call` (same fields as GET /pending-call)
+    and `ping`. Closed with 1008 when the token is invalid or the device is
+    unpaired. On connect (and after the server's Redis subscription recovers)
+    the current pending call is sent from the DB, so nothing created while
+    the device was offline is missed.
+    """
+    principal = await authenticate_device_token(token)
+    if principal is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    elderly_id, device_id = principal
+
+    await websocket.accept()
+    # 구독을 먼저 하고 DB를 읽어야 그 사이에 생성된 통화를 놓치지 않음
+    queue = device_event_hub.subscribe(elderly_id)
+    receiver = asyncio.create_task(wait_for_disconnect(websocket))
+    logger.info(f"Device event channel opened: elderly_id={elderly_id}")
+
+    try:
+        await send_pending_call(websocket, elderly_id)
+
+        while not receiver.done():
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait(
+                {getter, receiver},
+                timeout=DEVICE_EVENTS_PING_INTERVAL,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if getter not in done:
+                getter.cancel()
+                if not receiver.done():
+                    await websocket.send_json({"type": "ping", "timestamp": datetime.utcnow().isoformat()})
+                continue
+
+            event = getter.result()
+            if event is RESYNC_EVENT:
+                await send_pending_call(websocket, elderly_id)
+            elif event.get("type") == "device_unpaired":
+                if event.get("device_id") == device_id:
+                    await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                    break
+            else:
+                await websocket.send_json(event)
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Device event channel error for elderly_id={elderly_id}: {e}")
+    finally:
+        device_event_hub.unsubscribe(elderly_id, queue)
+        receiver.cancel()
+        try:
+            await receiver
+        except (asyncio.CancelledError, Exception):
+            pass
+        logger.info(f"Device event channel closed: elderly_id={elderly_id}")
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -65,7 +66,8 @@ async def disconnect_device(
     """
     Disconnect/unpair a device from an elderly (caregiver only).
     """
-    PairingService.disconnect_device(db, elderly_id, device_id, current_user.id)
+    # device_unpaired 발행(Redis 왕복)이 이벤트 루프를 막지 않도록 스레드풀에서 실행
+    await run_in_threadpool(PairingService.disconnect_device, db, elderly_id, device_id, current_user.id)
     return success_response(
         data=None,
         message="기기 연결이 해제되었습니다",
@@ -10,17 +10,20 @@ from collections import OrderedDict
 from typing import Optional, Set
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, status
+from sqlalchemy import select
 
-from app.database import SessionLocal
+from app.database import AsyncSessionLocal
 from app.core.security import verify_token
 from app.models.call import Call
-from app.models.message import Message
-from app.services.ai_service import AIService
+from app.models.elderly import Elderly
+from app.models.elderly_device import ElderlyDevice
+from app.services.ai_service import get_ai_service
 from app.services.calls import CallService
+from app.services.message_buffer import MessageBuffer, open_message_buffer
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-ai_service = AIService()
+ai_service = get_ai_service()
 
 # Configuration
 HEARTBEAT_INTERVAL = 30  # seconds
@@ -147,13 +150,15 @@ async def websocket_endpoint(websocket: WebSocket, call_id: int, token: str = Qu
     scope = payload.get("scope")
     token_type = payload.get("type")
 
-    db = SessionLocal()
+    db = AsyncSessionLocal()
+    call: Optional[Call] = None
     heartbeat_task: Optional[asyncio.Task] = None
     state: Optional[ConnectionState] = None
+    message_buffer: Optional[MessageBuffer] = None
 
     try:
         # Verify call exists
-        call = db.query(Call).filter(Call.id == call_id).first()
+        call = await CallService.get_call_async(db, call_id)
         if not call:
             await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
             return
@@ -170,21 +175,19 @@ async def websocket_endpoint(websocket: WebSocket, call_id: int, token: str = Qu
             # Update device last_used_at
             device_id = payload.get("device_id")
             if device_id:
-                from app.models.elderly_device import ElderlyDevice
-                device = db.query(ElderlyDevice).filter(ElderlyDevice.id == device_id).first()
+                device = await db.get(ElderlyDevice, device_id)
                 if device:
                     device.last_used_at = datetime.now(timezone.utc)
-                    db.commit()
+                    await db.commit()
 
         elif scope == "caregiver":
             # Caregiver access token: verify call's elderly belongs to this caregiver
             user_id = int(payload.get("sub"))
-            from app.models.elderly import Elderly
-            elderly = db.query(Elderly).filter(
+            owned = (await db.execute(select(Elderly.id).where(
                 Elderly.id == call.elderly_id,
                 Elderly.caregiver_id == user_id
-            ).first()
-            if not elderly:
+            ))).first()
+            if not owned:
                 logger.warning(f"User {user_id} tried to access call {call_id} without permission")
                 await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
                 return
@@ -197,17 +200,17 @@ async def websocket_endpoint(websocket: WebSocket, call_id: int, token: str = Qu
         if call.status in ("pending", "scheduled"):
             call.status = "in_progress"
             call.started_at = datetime.now(timezone.utc)
-            db.commit()
+            await db.commit()
 
         # Connect and start heartbeat
         state = await manager.connect(websocket, call_id)
         heartbeat_task = asyncio.create_task(heartbeat_loop(state))
 
+        # Turns are written behind the conversation in bulk (MESSAGE_DURABILITY)
+        message_buffer = open_message_buffer(call_id, AsyncSessionLocal)
+
         # Send existing messages
-        existing_messages = db.query(Message)\
-            .filter(Message.call_id == call_id)\
-            .order_by(Message.created_at)\
-            .all()
+        existing_messages = await CallService.get_messages_async(db, call_id)
 
         messages_list = [
             {"role": m.role, "content": m.content}
@@ -223,8 +226,7 @@ async def websocket_endpoint(websocket: WebSocket, call_id: int, token: str = Qu
             })
 
         # Get elderly context for personalized responses (used throughout the call)
-        from app.models.elderly import Elderly
-        elderly = db.query(Elderly).filter(Elderly.id == call.elderly_id).first()
+        elderly = await db.get(Elderly, call.elderly_id)
 
         elderly_context = ""
         if elderly:
@@ -262,7 +264,7 @@ async def websocket_endpoint(websocket: WebSocket, call_id: int, token: str = Qu
 
             if not state.closed and greeting_response:
                 # Save greeting message
-                CallService.save_message(db, call_id, "assistant", greeting_response)
+                await message_buffer.add("assistant", greeting_response)
                 messages_list.append({"role": "assistant", "content": greeting_response})
 
                 # Send stream end
@@ -333,7 +335,7 @@ async def websocket_endpoint(websocket: WebSocket, call_id: int, token: str = Qu
                     })
 
                 # Save user message
-                CallService.save_message(db, call_id, "user", user_message)
+                await message_buffer.add("user", user_message)
                 messages_list.append({"role": "user", "content": user_message})
 
                 # Echo user message
@@ -369,7 +371,7 @@ async def websocket_endpoint(websocket: WebSocket, call_id: int, token: str = Qu
                     clean_response = full_response.replace("[CALL_END]", "").strip()
 
                     # Save assistant response (without marker)
-                    CallService.save_message(db, call_id, "assistant", clean_response)
+                    await message_buffer.add("assistant", clean_response)
                     messages_list.append({"role": "assistant", "content": clean_response})
 
                     # Send stream end with cleaned content (for TTS)
@@ -389,18 +391,10 @@ async def websocket_endpoint(websocket: WebSocket, call_id: int, token: str = Qu
                         # Wait briefly for TTS to finish on client
                         await asyncio.sleep(1.0)
 
-                        # Update call status
-                        db.refresh(call)
-                        if call.status == "in_progress":
-                            call.status = "completed"
-                            call.ended_at = datetime.now(timezone.utc)
-                            if call.started_at:
-                                # Handle naive datetime from DB
-                                started = call.started_at if call.started_at.tzinfo else call.started_at.replace(tzinfo=timezone.utc)
-                                call.duration = int((call.ended_at - started).total_seconds())
-                            call.is_successful = True
-                            db.commit()
-
+                        # Update call status (buffered turns first: the analysis reads them)
+                        if not await message_buffer.drain():
+                            logger.error(f"Call {call_id} ending with {message_buffer.pending} unsaved messages")
+                        if await CallService.complete_call_async(db, call_id):
                             # Trigger analysis
                             from app.tasks.analysis import analyze_call
                             analyze_call.delay(call_id)
@@ -418,17 +412,9 @@ async def websocket_endpoint(websocket: WebSocket, call_id: int, token: str = Qu
             # Handle end call (P0: 분석 태스크 트리거 연결)
             elif msg_type == "end_call":
                 # Refresh call to get latest state
-                db.refresh(call)
-                if call.status == "in_progress":
-                    call.status = "completed"
-                    call.ended_at = datetime.now(timezone.utc)
-                    if call.started_at:
-                        # Handle naive datetime from DB
-                        started = call.started_at if call.started_at.tzinfo else call.started_at.replace(tzinfo=timezone.utc)
-                        call.duration = int((call.ended_at - started).total_seconds())
-                    call.is_successful = True
-                    db.commit()
-
+                if not await message_buffer.drain():
+                    logger.error(f"Call {call_id} ending with {message_buffer.pending} unsaved messages")
+                if await CallService.complete_call_async(db, call_id):
                     # 통화 분석 비동기 실행
                     from app.tasks.analysis import analyze_call
                     analyze_call.delay(call_id)
@@ -450,19 +436,14 @@ async def websocket_endpoint(websocket: WebSocket, call_id: int, token: str = Qu
         except Exception:
             pass
     finally:
+        # Persist buffered turns before the call is closed and analyzed
+        if message_buffer is not None:
+            await message_buffer.close()
+
         # Update call status if still in_progress (unexpected disconnect or client disconnect)
         try:
-            db.refresh(call)
-            if call.status == "in_progress":
+            if state is not None and await CallService.complete_call_async(db, call_id):
                 logger.info(f"Call {call_id} ended via disconnect - marking as completed")
-                call.status = "completed"
-                call.ended_at = datetime.now(timezone.utc)
-                if call.started_at:
-                    # Handle naive datetime from DB
-                    started = call.started_at if call.started_at.tzinfo else call.started_at.replace(tzinfo=timezone.utc)
-                    call.duration = int((call.ended_at - started).total_seconds())
-                call.is_successful = True
-                db.commit()
 
                 # Trigger call analysis
                 from app.tasks.analysis import analyze_call
@@ -479,4 +460,4 @@ async def websocket_endpoint(websocket: WebSocket, call_id: int, token: str = Qu
                 pass
 
         manager.disconnect(call_id)
-        db.close()
+        await db.close()
@@ -19,17 +19,24 @@ import logging
 import uuid
 from datetime import datetime, timezone
 from collections import OrderedDict
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, status
+from sqlalchemy import select
 
-from app.database import SessionLocal
+from app.database import AsyncSessionLocal
+from app.core.config import settings
 from app.core.security import verify_token
-from app.models.call import Call
-from app.models.message import Message
 from app.models.elderly import Elderly
-from app.services.agents import OpenAIAgentService, AgentConfig, ConversationContext
+from app.models.elderly_device import ElderlyDevice
+from app.services.agents import (
+    OpenAIAgentService,
+    AgentConfig,
+    ConversationContext,
+    ReflectionMode,
+)
 from app.services.calls import CallService
+from app.services.message_buffer import MessageBuffer, open_message_buffer
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -54,6 +61,11 @@ def get_agent_service() -> OpenAIAgentService:
             quality_threshold=0.6,
             enable_reflection=True,
             temperature=0.7,
+            reflection_mode=ReflectionMode(settings.AGENT_REFLECTION_MODE),
+            enable_incremental_evaluation=settings.AGENT_INCREMENTAL_EVALUATION,
+            history_token_budget=settings.AGENT_HISTORY_TOKEN_BUDGET,
+            summarize_after_messages=settings.AGENT_SUMMARIZE_AFTER_MESSAGES,
+            enable_tool_subsetting=settings.AGENT_TOOL_SUBSETTING,
         )
         _agent_service = OpenAIAgentService(config=config)
         logger.info("OpenAIAgentService initialized with GPT-4o")
@@ -92,6 +104,7 @@ class ConnectionState:
         self.seen_messages: LRUSet = LRUSet()
         self.lock: asyncio.Lock = asyncio.Lock()
         self.closed: bool = False
+        self.message_buffer: Optional[MessageBuffer] = None
 
 
 class ConnectionManager:
@@ -163,6 +176,72 @@ async def heartbeat_loop(state: ConnectionState):
             break
 
 
+async def send_correction(
+    state: ConnectionState,
+    agent_service: OpenAIAgentService,
+    user_input: str,
+    context: ConversationContext,
+    response_id: str,
+    response_row: Dict[str, Any],
+):
+    """
+    Wait for the background evaluation of a delivered response and, only if the
+    evaluator demands a retry, send the regenerated answer as a correction frame.
+
+    Runs concurrently with the receive loop. The correction replaces the
+    rejected answer's stored message (``response_row`` from the buffer), so
+    the transcript keeps one assistant turn.
+    """
+    try:
+        evaluation = await agent_service.await_reflection(context.conversation_id)
+        if evaluation is None or not evaluation.should_retry or state.closed:
+            return
+
+        corrected = ""
+        async for chunk in agent_service.correct_response(user_input, context):
+            if state.closed:
+                return
+            corrected += chunk
+
+        clean_response = corrected.replace("[CALL_END]", "").strip()
+        if state.closed or not clean_response:
+            return
+
+        await state.message_buffer.replace(response_row, clean_response)
+
+        await manager.send_message(state, {
+            "type": "correction",
+            "response_id": str(uuid.uuid4()),
+            "replaces_response_id": response_id,
+            "role": "assistant",
+            "content": clean_response,
+            "is_streaming": False,
+            "reason": evaluation.retry_reason,
+        })
+        logger.info(f"Correction sent for call {state.call_id}: {evaluation.retry_reason}")
+
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"Correction failed for call_id={state.call_id}: {e}")
+
+
+async def complete_call(call_id: int) -> bool:
+    """Mark the call completed in a session of its own (see CallService.complete_call_async)."""
+    async with AsyncSessionLocal() as db:
+        return await CallService.complete_call_async(db, call_id)
+
+
+async def cancel_correction(task: Optional[asyncio.Task]):
+    """Cancel a pending correction task and wait for it to unwind."""
+    if task and not task.done():
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
 @router.websocket("/ws/v2/{call_id}")
 async def websocket_endpoint_v2(websocket: WebSocket, call_id: int, token: str = Query(...)):
     """
@@ -181,60 +260,67 @@ async def websocket_endpoint_v2(websocket: WebSocket, call_id: int, token: str =
     scope = payload.get("scope")
     token_type = payload.get("type")
 
-    db = SessionLocal()
     heartbeat_task: Optional[asyncio.Task] = None
+    correction_task: Optional[asyncio.Task] = None
     state: Optional[ConnectionState] = None
+    message_buffer: Optional[MessageBuffer] = None
     agent_service = get_agent_service()
 
     try:
-        # Verify call exists
-        call = db.query(Call).filter(Call.id == call_id).first()
-        if not call:
-            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
-            return
-
-        # Authorization check based on scope
-        if scope == "elderly" and token_type == "device_access":
-            elderly_id = int(payload.get("sub"))
-            if call.elderly_id != elderly_id:
-                logger.warning(f"Elderly {elderly_id} tried to access call {call_id}")
+        # Short unit of work: the session (and its pooled connection) is released
+        # before the first LLM call, so idle and streaming calls hold no connection
+        async with AsyncSessionLocal() as db:
+            # Verify call exists
+            call = await CallService.get_call_async(db, call_id)
+            if not call:
                 await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
                 return
 
-            # Update device last_used_at
-            device_id = payload.get("device_id")
-            if device_id:
-                from app.models.elderly_device import ElderlyDevice
-                device = db.query(ElderlyDevice).filter(ElderlyDevice.id == device_id).first()
-                if device:
-                    device.last_used_at = datetime.now(timezone.utc)
-                    db.commit()
-
-        elif scope == "caregiver":
-            user_id = int(payload.get("sub"))
-            elderly = db.query(Elderly).filter(
-                Elderly.id == call.elderly_id,
-                Elderly.caregiver_id == user_id
-            ).first()
-            if not elderly:
-                logger.warning(f"User {user_id} tried to access call {call_id}")
-                await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
-                return
-        else:
-            logger.warning(f"Token without scope accessing call {call_id}")
-
-        # Update call status
-        if call.status in ("pending", "scheduled"):
-            call.status = "in_progress"
-            call.started_at = datetime.now(timezone.utc)
-            db.commit()
+            # Authorization check based on scope
+            if scope == "elderly" and token_type == "device_access":
+                elderly_id = int(payload.get("sub"))
+                if call.elderly_id != elderly_id:
+                    logger.warning(f"Elderly {elderly_id} tried to access call {call_id}")
+                    await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                    return
+
+                # Update device last_used_at
+                device_id = payload.get("device_id")
+                if device_id:
+                    device = await db.get(ElderlyDevice, device_id)
+                    if device:
+                        device.last_used_at = datetime.now(timezone.utc)
+                        await db.commit()
+
+            elif scope == "caregiver":
+                user_id = int(payload.get("sub"))
+                owned = (await db.execute(select(Elderly.id).where(
+                    Elderly.id == call.elderly_id,
+                    Elderly.caregiver_id == user_id
+                ))).first()
+                if not owned:
+                    logger.warning(f"User {user_id} tried to access call {call_id}")
+                    await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                    return
+            else:
+                logger.warning(f"Token without scope accessing call {call_id}")
+
+            # Update call status
+            if call.status in ("pending", "scheduled"):
+                call.status = "in_progress"
+                call.started_at = datetime.now(timezone.utc)
+                await db.commit()
+
+            # Get elderly info for context and the conversation so far
+            elderly = await db.get(Elderly, call.elderly_id)
+            existing_messages = await CallService.get_messages_async(db, call_id)
 
         # Connect and start heartbeat
         state = await manager.connect(websocket, call_id)
         heartbeat_task = asyncio.create_task(heartbeat_loop(state))
 
-        # Get elderly info for context
-        elderly = db.query(Elderly).filter(Elderly.id == call.elderly_id).first()
+        # Turns are written behind the conversation in bulk (MESSAGE_DURABILITY)
+        message_buffer = state.message_buffer = open_message_buffer(call_id, AsyncSessionLocal)
 
         # Create conversation context
         context = ConversationContext(
@@ -248,11 +334,6 @@ async def websocket_endpoint_v2(websocket: WebSocket, call_id: int, token: str =
         )
 
         # Send existing messages
-        existing_messages = db.query(Message)\
-            .filter(Message.call_id == call_id)\
-            .order_by(Message.created_at)\
-            .all()
-
         for msg in existing_messages:
             await manager.send_message(state, {
                 "type": "history",
@@ -286,7 +367,7 @@ async def websocket_endpoint_v2(websocket: WebSocket, call_id: int, token: str =
 
             if not state.closed and greeting_response:
                 clean_response = greeting_response.replace("[CALL_END]", "").strip()
-                CallService.save_message(db, call_id, "assistant", clean_response)
+                response_row = await message_buffer.add("assistant", clean_response)
 
                 await manager.send_message(state, {
                     "type": "stream_end",
@@ -298,6 +379,11 @@ async def websocket_endpoint_v2(websocket: WebSocket, call_id: int, token: str =
 
                 logger.info(f"Initial greeting sent: {clean_response[:50]}...")
 
+                if agent_service.config.reflection_mode == ReflectionMode.BACKGROUND:
+                    correction_task = asyncio.create_task(send_correction(
+                        state, agent_service, "", context, response_id, response_row,
+                    ))
+
         # Main message loop
         while not state.closed:
             try:
@@ -346,6 +432,11 @@ async def websocket_endpoint_v2(websocket: WebSocket, call_id: int, token: str =
                 if not user_message:
                     continue
 
+                # The user has moved on; a pending correction would be stale
+                await cancel_correction(correction_task)
+                agent_service.cancel_reflection(context.conversation_id)
+                correction_task = None
+
                 # Send ack
                 if msg_id:
                     await manager.send_message(state, {
@@ -354,7 +445,7 @@ async def websocket_endpoint_v2(websocket: WebSocket, call_id: int, token: str =
                     })
 
                 # Save user message
-                CallService.save_message(db, call_id, "user", user_message)
+                await message_buffer.add("user", user_message)
 
                 # Echo user message
                 await manager.send_message(state, {
@@ -392,7 +483,7 @@ async def websocket_endpoint_v2(websocket: WebSocket, call_id: int, token: str =
                     clean_response = full_response.replace("[CALL_END]", "").strip()
 
                     # Save assistant response
-                    CallService.save_message(db, call_id, "assistant", clean_response)
+                    response_row = await message_buffer.add("assistant", clean_response)
 
                     # Send stream end
                     await manager.send_message(state, {
@@ -411,15 +502,10 @@ async def websocket_endpoint_v2(websocket: WebSocket, call_id: int, token: str =
 
                         await asyncio.sleep(1.0)
 
-                        db.refresh(call)
-                        if call.status == "in_progress":
-                            call.status = "completed"
-                            call.ended_at = datetime.now(timezone.utc)
-                            if call.started_at:
-                                call.duration = int((call.ended_at - call.started_at).total_seconds())
-                            call.is_successful = True
-                            db.commit()
-
+                        # The analysis must see the whole conversation (analyze_call waits while turns are pending)
+                        if not await message_buffer.drain():
+                            logger.error(f"Call {call_id} ending with {message_buffer.pending} unsaved messages")
+                        if await complete_call(call_id):
                             from app.tasks.analysis import analyze_call
                             analyze_call.delay(call_id)
 
@@ -435,17 +521,21 @@ async def websocket_endpoint_v2(websocket: WebSocket, call_id: int, token: str =
 
                         break
 
+                    # Evaluate in the background; correct only if a retry is demanded
+                    if agent_service.config.reflection_mode == ReflectionMode.BACKGROUND:
+                        correction_task = asyncio.create_task(send_correction(
+                            state, agent_service, user_message, context, response_id, response_row,
+                        ))
+
+                    # Compact older turns off the hot path (no-op for short calls)
+                    agent_service.schedule_summarization(context.conversation_id)
+
             # Handle explicit end call
             elif msg_type == "end_call":
-                db.refresh(call)
-                if call.status == "in_progress":
-                    call.status = "completed"
-                    call.ended_at = datetime.now(timezone.utc)
-                    if call.started_at:
-                        call.duration = int((call.ended_at - call.started_at).total_seconds())
-                    call.is_successful = True
-                    db.commit()
-
+                await cancel_correction(correction_task)
+                if not await message_buffer.drain():
+                    logger.error(f"Call {call_id} ending with {message_buffer.pending} unsaved messages")
+                if await complete_call(call_id):
                     from app.tasks.analysis import analyze_call
                     analyze_call.delay(call_id)
 
@@ -469,17 +559,16 @@ async def websocket_endpoint_v2(websocket: WebSocket, call_id: int, token: str =
         except Exception:
             pass
     finally:
+        await cancel_correction(correction_task)
+
+        # Persist buffered turns before the call is closed and analyzed
+        if message_buffer is not None:
+            await message_buffer.close()
+
         # Update call status if still in_progress
         try:
-            db.refresh(call)
-            if call.status == "in_progress":
+            if state is not None and await complete_call(call_id):
                 logger.info(f"Call {call_id} ended via disconnect")
-                call.status = "completed"
-                call.ended_at = datetime.now(timezone.utc)
-                if call.started_at:
-                    call.duration = int((call.ended_at - call.started_at).total_seconds())
-                call.is_successful = True
-                db.commit()
 
                 from app.tasks.analysis import analyze_call
                 analyze_call.delay(call_id)
@@ -499,7 +588,6 @@ async def websocket_endpoint_v2(websocket: WebSocket, call_id: int, token: str =
                 pass
 
         manager.disconnect(call_id)
-        db.close()
 
 
 # For backward compatibility, also expose the v2 endpoint at /ws/{call_id}
@@ -9,7 +9,17 @@ This module provides:
 - Message handling and conversation management
 """
 
-from .openai_agent import OpenAIAgentService, AgentConfig, Message, ConversationContext
+from .openai_agent import (
+    OpenAIAgentService,
+    AgentConfig,
+    Message,
+    ConversationContext,
+    ReflectionMode,
+    TurnAnalysis,
+    TurnAnalysisStats,
+    PromptCacheStats,
+)
+from .history import ConversationHistory
 from .evaluator import (
     EvaluatorAgent,
     EvaluatorConfig,
@@ -17,6 +27,9 @@ from .evaluator import (
     DimensionScore,
     EvaluationDimension,
     RetryStrategy,
+    IncrementalEvaluation,
+    StreamAction,
+    StreamCheck,
 )
 from .orchestrator import (
     OrchestratorAgent,
@@ -39,6 +52,11 @@ __all__ = [
     "AgentConfig",
     "Message",
     "ConversationContext",
+    "ReflectionMode",
+    "TurnAnalysis",
+    "TurnAnalysisStats",
+    "PromptCacheStats",
+    "ConversationHistory",
     # Evaluator
     "EvaluatorAgent",
     "EvaluatorConfig",
@@ -46,6 +64,9 @@ __all__ = [
     "DimensionScore",
     "EvaluationDimension",
     "RetryStrategy",
+    "IncrementalEvaluation",
+    "StreamAction",
+    "StreamCheck",
     # Orchestrator
     "OrchestratorAgent",
     "OrchestratorConfig",
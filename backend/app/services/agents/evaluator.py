@@ -16,16 +16,27 @@ Usage:
     result = await evaluator.evaluate(user_input, response, context)
     if result.should_retry:
         # Generate new response with improvement hints
+
+Incremental usage (while streaming):
+    monitor = evaluator.start_incremental(user_input)
+    for chunk in stream:
+        check = monitor.feed(chunk)
+        emit(check.released)
+        if check.action != StreamAction.CONTINUE:
+            # Stop the stream and retry with check.improvement_hints
 """
 
 import json
 import logging
+import re
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Union
 from enum import Enum
 
 from openai import AsyncOpenAI
 
+from app.core.keywords import get_keyword_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -90,6 +101,28 @@ class EvaluationResult:
         }
 
 
+class StreamAction(str, Enum):
+    """Decision taken by incremental evaluation at a sentence boundary."""
+    CONTINUE = "continue"  # Sentence is fine, release it
+    ABORT = "abort"  # Sentence is unsafe, withhold it and regenerate
+    REDIRECT = "redirect"  # Response is missing required handling, regenerate
+
+
+@dataclass
+class StreamCheck:
+    """Result of feeding streamed text to an IncrementalEvaluation."""
+    action: StreamAction = StreamAction.CONTINUE
+
+    # Sentences that passed the checks and may be sent to the user
+    released: List[str] = field(default_factory=list)
+
+    # Set when action is not CONTINUE
+    reason: Optional[str] = None
+    sentence: Optional[str] = None
+    improvement_hints: List[str] = field(default_factory=list)
+    urgent_flags: List[str] = field(default_factory=list)
+
+
 @dataclass
 class EvaluatorConfig:
     """Configuration for EvaluatorAgent."""
@@ -99,6 +132,9 @@ class EvaluatorConfig:
     enable_llm_evaluation: bool = True  # Fall back to heuristics if False
     temperature: float = 0.3  # Lower temperature for consistent evaluation
 
+    # Incremental evaluation: sentences allowed before an emergency must be addressed
+    stream_safety_grace_sentences: int = 2
+
     # Dimension weights for overall score
     weights: Dict[str, float] = field(default_factory=lambda: {
         "relevance": 0.25,
@@ -117,6 +153,15 @@ class EvaluatorAgent:
     actionable feedback for improvement.
     """
 
+    # Heuristic keyword lists (shared by full and incremental evaluation)
+    MEDICAL_KEYWORDS = ["진단", "처방", "복용량", "약을 먹"]
+    EMERGENCY_INPUT_KEYWORDS = ["쓰러", "의식", "숨", "119", "죽고"]
+    SAFETY_RESPONSE_MARKERS = ["119", "보호자"]
+    EMPATHY_MARKERS = [
+        "이해", "공감", "힘드시", "걱정", "괜찮",
+        "함께", "옆에", "들어", "마음",
+    ]
+
     EVALUATION_PROMPT = """당신은 AI 응답 품질 평가 전문가입니다. 어르신 돌봄 대화에서 AI 응답의 품질을 평가해주세요.
 
 ## 평가 기준
@@ -192,6 +237,13 @@ JSON만 출력하세요. 추가 설명은 불필요합니다."""
         self.client = client
         self.config = config or EvaluatorConfig()
 
+        # Heuristic keyword lists are matched through the shared index
+        self.keyword_index = get_keyword_index()
+        self.keyword_index.register("evaluator.medical", self.MEDICAL_KEYWORDS)
+        self.keyword_index.register("evaluator.emergency_input", self.EMERGENCY_INPUT_KEYWORDS)
+        self.keyword_index.register("evaluator.safety_marker", self.SAFETY_RESPONSE_MARKERS)
+        self.keyword_index.register("evaluator.empathy", self.EMPATHY_MARKERS)
+
     async def evaluate(
         self,
         user_input: str,
@@ -260,6 +312,8 @@ JSON만 출력하세요. 추가 설명은 불필요합니다."""
         """Fallback heuristic-based evaluation."""
         logger.debug("[Evaluator] Using heuristic evaluation")
 
+        response_matches = self.keyword_index.match(response)
+
         # Relevance: Check if response seems related to input
         relevance_score = 0.8
         relevance_issues = []
@@ -273,8 +327,7 @@ JSON만 출력하세요. 추가 설명은 불필요합니다."""
         accuracy_score = 0.9
         accuracy_issues = []
 
-        medical_keywords = ["진단", "처방", "복용량", "약을 먹"]
-        if any(kw in response for kw in medical_keywords):
+        if response_matches.has("evaluator.medical"):
             accuracy_score -= 0.2
             accuracy_issues.append("의료 조언을 삼가야 합니다")
 
@@ -282,11 +335,7 @@ JSON만 출력하세요. 추가 설명은 불필요합니다."""
         empathy_score = 0.7
         empathy_issues = []
 
-        empathy_markers = [
-            "이해", "공감", "힘드시", "걱정", "괜찮",
-            "함께", "옆에", "들어", "마음",
-        ]
-        empathy_count = sum(1 for m in empathy_markers if m in response)
+        empathy_count = response_matches.count("evaluator.empathy")
         empathy_score += min(0.3, empathy_count * 0.1)
 
         if empathy_count == 0:
@@ -306,10 +355,10 @@ JSON만 출력하세요. 추가 설명은 불필요합니다."""
         urgent_flags = []
 
         # Check if user mentioned emergency but response didn't address it
-        emergency_input = any(kw in user_input.lower() for kw in ["쓰러", "의식", "숨", "119", "죽고"])
+        emergency_input = self._is_emergency_input(user_input)
         if emergency_input:
             urgent_flags.append("긴급 상황 언급 감지")
-            if "119" not in response and "보호자" not in response:
+            if not response_matches.has("evaluator.safety_marker"):
                 safety_score -= 0.3
                 safety_issues.append("긴급 상황에 대한 적절한 대응 필요")
 
@@ -384,6 +433,22 @@ JSON만 출력하세요. 추가 설명은 불필요합니다."""
             urgent_flags=urgent_flags,
         )
 
+    def _is_emergency_input(self, user_input: str) -> bool:
+        """Check if the user mentioned an emergency."""
+        return self.keyword_index.match(user_input).has("evaluator.emergency_input")
+
+    def start_incremental(self, user_input: str) -> "IncrementalEvaluation":
+        """
+        Start sentence-level evaluation of a response that is still streaming.
+
+        Args:
+            user_input: Original user message
+
+        Returns:
+            IncrementalEvaluation to feed response chunks into
+        """
+        return IncrementalEvaluation(self, user_input)
+
     def _format_context(self, context: Dict[str, Any]) -> str:
         """Format context dictionary as string."""
         parts = []
@@ -473,6 +538,92 @@ JSON만 출력하세요. 추가 설명은 불필요합니다."""
         )
 
 
+class IncrementalEvaluation:
+    """
+    Runs the cheap heuristic checks on each sentence of a streaming response.
+
+    Text is buffered until a sentence boundary; complete sentences are checked
+    and either released or the stream is stopped early, before the rest of a
+    response that is doomed to be retried gets generated and sent.
+    """
+
+    SENTENCE_BOUNDARY = re.compile(r"[.!?…\n]+")
+
+    def __init__(self, evaluator: EvaluatorAgent, user_input: str):
+        self.evaluator = evaluator
+        self.emergency_input = evaluator._is_emergency_input(user_input)
+        self.safety_addressed = False
+        self.sentence_count = 0
+        self._buffer = ""
+
+    def feed(self, text: str) -> StreamCheck:
+        """
+        Add a streamed chunk and check every sentence it completes.
+
+        Returns:
+            StreamCheck with the sentences that may be released
+        """
+        self._buffer += text
+        released = []
+
+        while True:
+            match = self.SENTENCE_BOUNDARY.search(self._buffer)
+            if not match:
+                break
+
+            sentence = self._buffer[:match.end()]
+            self._buffer = self._buffer[match.end():]
+
+            check = self._check_sentence(sentence, final=False)
+            if check.action != StreamAction.CONTINUE:
+                check.released = released
+                return check
+            released.append(sentence)
+
+        return StreamCheck(released=released)
+
+    def finish(self) -> StreamCheck:
+        """Check the trailing text once the stream has ended."""
+        sentence, self._buffer = self._buffer, ""
+        check = self._check_sentence(sentence, final=True)
+        if check.action == StreamAction.CONTINUE and sentence:
+            check.released = [sentence]
+        return check
+
+    def _check_sentence(self, sentence: str, final: bool) -> StreamCheck:
+        """Run the heuristic checks on one sentence."""
+        if sentence.strip():
+            self.sentence_count += 1
+
+        matches = self.evaluator.keyword_index.match(sentence)
+
+        # Accuracy: medical advice must never reach the user
+        if matches.has("evaluator.medical"):
+            logger.info(f"[Evaluator] Stream aborted on medical advice: {sentence[:50]}")
+            return StreamCheck(
+                action=StreamAction.ABORT,
+                reason="의료 조언을 삼가야 합니다",
+                sentence=sentence,
+                improvement_hints=["의료 조언 대신 보호자나 의료진과 상담하도록 권유해주세요"],
+            )
+
+        # Safety: an emergency must be addressed within the first few sentences
+        if self.emergency_input and not self.safety_addressed:
+            if matches.has("evaluator.safety_marker"):
+                self.safety_addressed = True
+            elif final or self.sentence_count >= self.evaluator.config.stream_safety_grace_sentences:
+                logger.info("[Evaluator] Stream redirected: emergency not addressed")
+                return StreamCheck(
+                    action=StreamAction.REDIRECT,
+                    reason="긴급 상황에 대한 적절한 대응 필요",
+                    sentence=sentence,
+                    improvement_hints=["첫 문장에서 바로 119 신고나 보호자 연락을 안내해주세요"],
+                    urgent_flags=["긴급 상황 언급 감지"],
+                )
+
+        return StreamCheck()
+
+
 class RetryStrategy:
     """
     Determines how to retry based on evaluation results.
@@ -522,3 +673,31 @@ class RetryStrategy:
             return "\n\n## 응답 개선 지침\n" + "\n".join(f"- {e}" for e in enhancements)
 
         return ""
+
+    @staticmethod
+    def get_stream_check_enhancement(check: StreamCheck) -> str:
+        """
+        Generate prompt enhancement for a response stopped by incremental evaluation.
+
+        Args:
+            check: The StreamCheck that stopped the stream
+
+        Returns:
+            Additional prompt instructions for retry
+        """
+        enhancements = []
+
+        if check.action == StreamAction.REDIRECT:
+            enhancements.append(
+                "안전 가이드라인을 더 철저히 준수해주세요. "
+                "긴급 상황에는 보호자 연락이나 119 안내가 필요합니다."
+            )
+
+        if check.reason:
+            enhancements.append(f"이전 응답 문제: {check.reason}")
+        enhancements.extend(check.improvement_hints)
+
+        if enhancements:
+            return "\n\n## 응답 개선 지침\n" + "\n".join(f"- {e}" for e in enhancements)
+
+        return ""
@@ -0,0 +1,186 @@
+"""
+Token-budgeted conversation history.
+
+Each message's token count is computed once, when it is appended, and a
+running total is kept so the prompt size of the history is known without
+re-tokenizing it every turn. When the total exceeds the budget, the oldest
+turns are dropped.
+
+Older turns can also be folded into a running summary (see
+``OpenAIAgentService.schedule_summarization``); the summary is sent as a
+system message ahead of the remaining messages.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    from .openai_agent import Message
+
+logger = logging.getLogger(__name__)
+
+
+# Tokens the chat format adds per message (role and separators)
+MESSAGE_TOKEN_OVERHEAD = 4
+
+
+class ConversationHistory:
+    """
+    Message list for one conversation with incremental token accounting.
+
+    Supports the list operations the agent uses (append, pop, len,
+    iteration, indexing, copy) and keeps ``total_tokens`` in sync.
+    """
+
+    def __init__(
+        self,
+        count_tokens: Callable[[str], int],
+        token_budget: int,
+        max_messages: int = 50,
+    ):
+        """
+        Initialize history.
+
+        Args:
+            count_tokens: Tokenizer used once per appended message
+            token_budget: Maximum tokens the history may occupy in the prompt
+            max_messages: Hard cap on the number of messages
+        """
+        self.count_tokens = count_tokens
+        self.token_budget = token_budget
+        self.max_messages = max_messages
+
+        self.messages: List["Message"] = []
+        self.total_tokens = 0
+
+        # Running summary of turns no longer kept verbatim
+        self.summary: Optional[str] = None
+        self.summary_tokens = 0
+        self.summarized_messages = 0
+
+        # Stats
+        self.trimmed_messages = 0
+        self.trimmed_tokens = 0
+
+    def message_tokens(self, message: "Message") -> int:
+        """Token count of a message, computed on first use and stored on it."""
+        if message.token_count is None:
+            message.token_count = self.count_tokens(message.content or "") + MESSAGE_TOKEN_OVERHEAD
+        return message.token_count
+
+    def append(self, message: "Message") -> List["Message"]:
+        """
+        Append a message and trim the oldest turns if over budget.
+
+        Returns:
+            Messages removed to stay within the budget (oldest first)
+        """
+        self.total_tokens += self.message_tokens(message)
+        self.messages.append(message)
+        return self._trim()
+
+    def pop(self, index: int = -1) -> "Message":
+        """Remove and return a message."""
+        message = self.messages.pop(index)
+        self.total_tokens -= self.message_tokens(message)
+        return message
+
+    def copy(self) -> List["Message"]:
+        """Shallow copy of the messages."""
+        return self.messages.copy()
+
+    def summarizable_messages(self, keep_recent: int) -> List["Message"]:
+        """
+        Oldest messages that can be folded into the summary.
+
+        Keeps at least ``keep_recent`` messages verbatim and cuts at a user
+        message so a turn is never split; the latest turn is always kept,
+        even with ``keep_recent=0``.
+        """
+        cut = min(len(self.messages) - keep_recent, len(self.messages) - 1)
+        while cut > 0 and self.messages[cut].role != "user":
+            cut -= 1
+        return self.messages[:max(cut, 0)]
+
+    def apply_summary(self, summary: str, covered: Sequence["Message"]) -> int:
+        """
+        Replace the summarized messages with the new summary in one step.
+
+        Messages appended (or already trimmed) while the summary was being
+        generated are handled: only the leading messages that are still
+        present and were covered by the summary are removed.
+
+        Args:
+            summary: New running summary (includes the previous one)
+            covered: Messages the summary was generated from
+
+        Returns:
+            Number of messages removed
+        """
+        covered_ids = {id(m) for m in covered}
+        removed = 0
+        while len(self.messages) > 1 and id(self.messages[0]) in covered_ids:
+            self.pop(0)
+            removed += 1
+
+        self.total_tokens -= self.summary_tokens
+        self.summary = summary
+        self.summary_tokens = self.count_tokens(summary) + MESSAGE_TOKEN_OVERHEAD
+        self.total_tokens += self.summary_tokens
+        self.summarized_messages += removed
+
+        logger.debug(
+            f"[History] Summarized {removed} messages, "
+            f"{self.total_tokens}/{self.token_budget} tokens"
+        )
+        return removed
+
+    def summary_message(self) -> Optional[Dict[str, str]]:
+        """Summary in OpenAI message format, if there is one."""
+        if not self.summary:
+            return None
+        return {"role": "system", "content": f"## 이전 대화 요약\n{self.summary}"}
+
+    def _trim(self) -> List["Message"]:
+        """Drop the oldest turns until the budget and message cap are met."""
+        trimmed: List["Message"] = []
+
+        while len(self.messages) > 1 and (
+            self.total_tokens > self.token_budget or len(self.messages) > self.max_messages
+        ):
+            trimmed.append(self.pop(0))
+
+            # Don't leave replies whose user message was dropped
+            while len(self.messages) > 1 and self.messages[0].role != "user":
+                trimmed.append(self.pop(0))
+
+        if trimmed:
+            self.trimmed_messages += len(trimmed)
+            self.trimmed_tokens += sum(m.token_count or 0 for m in trimmed)
+            logger.debug(
+                f"[History] Trimmed {len(trimmed)} messages, "
+                f"{self.total_tokens}/{self.token_budget} tokens"
+            )
+
+        return trimmed
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get history statistics."""
+        return {
+            "messages": len(self.messages),
+            "total_tokens": self.total_tokens,
+            "token_budget": self.token_budget,
+            "trimmed_messages": self.trimmed_messages,
+            "trimmed_tokens": self.trimmed_tokens,
+            "summary_tokens": self.summary_tokens,
+            "summarized_messages": self.summarized_messages,
+        }
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def __iter__(self) -> Iterator["Message"]:
+        return iter(self.messages)
+
+    def __getitem__(self, index):
+        return self.messages[index]
@@ -30,10 +30,12 @@ from typing import (
 )
 from enum import Enum
 
-from openai import AsyncOpenAI, APIError, RateLimitError
+from openai import APIError, RateLimitError
 import tiktoken
 
 from app.core.config import settings
+from app.core.keywords import KeywordMatches, get_keyword_index
+from app.core.llm_clients import get_async_openai_client
 from app.services.tools.registry import ToolRegistry, ToolResult, get_registry
 from app.services.tools.base_tools import register_all_tools
 from app.skills import SkillLoader, get_skill_loader
@@ -42,7 +44,10 @@ from app.services.agents.evaluator import (
     EvaluatorConfig,
     EvaluationResult,
     RetryStrategy,
+    StreamAction,
+    StreamCheck,
 )
+from app.services.agents.history import ConversationHistory, MESSAGE_TOKEN_OVERHEAD
 from app.services.agents.orchestrator import (
     OrchestratorAgent,
     OrchestratorConfig,
@@ -53,6 +58,35 @@ from app.services.agents.orchestrator import (
 logger = logging.getLogger(__name__)
 
 
+# Keyword lists behind the perception helpers, registered in the shared
+# KeywordIndex. Intent and emotion categories are checked in this order.
+PERCEPTION_KEYWORDS: Dict[str, List[str]] = {
+    "intent.end_conversation": ["끊", "그만", "이만", "안녕"],
+    "intent.request_help": ["도와", "도움", "부탁"],
+    "intent.question": ["?", "뭐", "어떻게", "왜", "언제"],
+    "intent.positive_feedback": ["고마워", "감사", "좋아"],
+    "intent.negative_feedback": ["싫", "별로", "아니"],
+    "emotion.sad": ["슬퍼", "우울", "외로", "힘들"],
+    "emotion.angry": ["화나", "짜증", "답답"],
+    "emotion.anxious": ["걱정", "불안", "무서"],
+    "emotion.happy": ["기뻐", "좋아", "행복", "감사"],
+    "perception.health": [
+        "아파", "아프", "아픔", "통증", "병원", "약", "치료",
+        "어지러", "두통", "열", "기침", "설사", "변비",
+        "잠", "못 자", "피곤", "힘들", "우울",
+    ],
+    "perception.end_call": [
+        "끊을게", "끊어야", "끊자", "끊을래",
+        "이만", "그만", "다음에", "나중에",
+        "안녕히", "수고", "고마워요",
+    ],
+    "perception.emergency": [
+        "쓰러", "의식", "못 움직", "숨", "가슴이 아",
+        "119", "응급", "죽", "자해", "자살",
+    ],
+}
+
+
 class AgentPhase(str, Enum):
     """Agent processing phases."""
     PERCEIVE = "perceive"
@@ -63,6 +97,12 @@ class AgentPhase(str, Enum):
     ERROR = "error"
 
 
+class ReflectionMode(str, Enum):
+    """How the Reflect phase is scheduled relative to Act."""
+    BLOCKING = "blocking"  # Reflect before returning, retry inline
+    BACKGROUND = "background"  # Return right after Act, reflect in a background task
+
+
 @dataclass
 class AgentConfig:
     """Configuration for OpenAI Agent."""
@@ -83,6 +123,24 @@ class AgentConfig:
     # Evaluator settings
     evaluator_model: str = "gpt-4o-mini"  # Use faster model for evaluation
     enable_llm_evaluation: bool = True
+    reflection_mode: ReflectionMode = ReflectionMode.BLOCKING
+    enable_incremental_evaluation: bool = False  # Sentence-level checks while streaming
+
+    # Conversation history limits
+    history_token_budget: int = 3000  # Prompt tokens the history may occupy
+    max_history_messages: int = 50
+
+    # Rolling summarization of older turns (0 disables)
+    summarize_after_messages: int = 20
+    summary_keep_recent_messages: int = 8
+    summary_model: str = "gpt-4o-mini"
+    summary_max_tokens: int = 400
+
+    # Tool subsetting: send only the plan's use_tools plus the core set.
+    # Off by default: per-turn subsets change the tool schemas at the head of
+    # the prompt and break the cached prefix (see benchmarks/tool_subsetting.py)
+    enable_tool_subsetting: bool = False
+    core_tools: List[str] = field(default_factory=lambda: ["end_call", "notify_caregiver"])
 
 
 @dataclass
@@ -94,6 +152,7 @@ class Message:
     tool_calls: Optional[List[Dict[str, Any]]] = None
     tool_results: Optional[List[Dict[str, Any]]] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    token_count: Optional[int] = None  # Set once when added to history
 
     def to_openai_format(self) -> Dict[str, Any]:
         """Convert to OpenAI API message format."""
@@ -130,6 +189,84 @@ class ConversationContext:
         return ", ".join(parts) if parts else "정보 없음"
 
 
+@dataclass
+class TurnAnalysis:
+    """
+    Analysis of one user message, computed once and shared by every phase.
+
+    Perceive, Plan, skill selection and retries of the same turn all read
+    from this object instead of re-deriving the same signals.
+    """
+    conversation_id: str
+    user_input: str
+    keyword_matches: KeywordMatches
+    perception: Optional[Dict[str, Any]] = None
+    plan: Optional[Dict[str, Any]] = None
+    skills: Optional[List[Any]] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def is_for(self, conversation_id: str, user_input: str) -> bool:
+        """Check whether this analysis belongs to the given message."""
+        return self.conversation_id == conversation_id and self.user_input == user_input
+
+
+@dataclass
+class PromptCacheStats:
+    """
+    Prompt token accounting for provider-side prompt caching.
+
+    ``cached_share`` is the provider-reported share of prompt tokens served
+    from cache; ``static_prefix_share`` is the share covered by the
+    byte-stable prefix (tool schemas + static system prompt).
+    """
+    requests: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    static_prefix_tokens: int = 0
+
+    @property
+    def cached_share(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    @property
+    def static_prefix_share(self) -> float:
+        return self.static_prefix_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for logging/metrics."""
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "static_prefix_tokens": self.static_prefix_tokens,
+            "cached_share": round(self.cached_share, 4),
+            "static_prefix_share": round(self.static_prefix_share, 4),
+        }
+
+
+@dataclass
+class TurnAnalysisStats:
+    """Counters of work saved by reusing TurnAnalysis."""
+    turns_analyzed: int = 0
+    perceptions_reused: int = 0
+    plans_reused: int = 0
+    skill_matches_reused: int = 0
+
+    @property
+    def recomputations_saved(self) -> int:
+        return self.perceptions_reused + self.plans_reused + self.skill_matches_reused
+
+    def to_dict(self) -> Dict[str, int]:
+        """Convert to dictionary for logging/metrics."""
+        return {
+            "turns_analyzed": self.turns_analyzed,
+            "perceptions_reused": self.perceptions_reused,
+            "plans_reused": self.plans_reused,
+            "skill_matches_reused": self.skill_matches_reused,
+            "recomputations_saved": self.recomputations_saved,
+        }
+
+
 class OpenAIAgentService:
     """
     OpenAI Agent with Perceive-Plan-Act-Reflect loop.
@@ -141,6 +278,16 @@ class OpenAIAgentService:
     - Error recovery and retry logic
     """
 
+    SUMMARY_PROMPT = """어르신과 AI 상담사의 통화 내용을 요약합니다. 기존 요약이 있으면 새 대화 내용과 합쳐 하나의 요약으로 갱신하세요.
+
+다음을 빠짐없이 간결하게 정리하세요:
+- 어르신이 언급한 건강 상태, 증상, 복용 약
+- 감정 상태와 걱정거리
+- 약속, 일정, 후속 조치가 필요한 내용
+- 대화에서 나온 주요 화제
+
+요약만 한국어로 작성하고 다른 말은 덧붙이지 마세요."""
+
     # Default system prompt for elderly care
     DEFAULT_SYSTEM_PROMPT = """당신은 친절하고 공감 능력이 뛰어난 AI 상담사입니다. 독거 어르신들의 이야기를 경청하고, 그들의 감정에 깊이 공감하며, 따뜻한 격려를 제공합니다.
 
@@ -187,7 +334,7 @@ class OpenAIAgentService:
 
         # Initialize OpenAI client
         if settings.OPENAI_API_KEY:
-            self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+            self.client = get_async_openai_client()
             logger.info("OpenAI Agent initialized with GPT-4o")
         else:
             raise ValueError("OPENAI_API_KEY is required for OpenAIAgentService")
@@ -211,12 +358,31 @@ class OpenAIAgentService:
         if len(self.tool_registry) == 0:
             register_all_tools(self.tool_registry)
 
+        # Shared keyword index for the perception helpers
+        self.keyword_index = get_keyword_index()
+        for category, keywords in PERCEPTION_KEYWORDS.items():
+            self.keyword_index.register(category, keywords)
+
         # Conversation state
-        self._conversations: Dict[str, List[Message]] = {}
+        self._conversations: Dict[str, ConversationHistory] = {}
 
         # Retry enhancement storage (for improved prompts on retry)
         self._retry_enhancements: Dict[str, str] = {}
 
+        # In-flight background reflections (ReflectionMode.BACKGROUND)
+        self._pending_reflections: Dict[str, asyncio.Task] = {}
+
+        # In-flight background summarizations
+        self._pending_summaries: Dict[str, asyncio.Task] = {}
+
+        # Latest turn analysis per conversation (reused across phases/retries)
+        self._turns: Dict[str, TurnAnalysis] = {}
+        self.turn_stats = TurnAnalysisStats()
+
+        # Prompt caching metrics
+        self.prompt_cache_stats = PromptCacheStats()
+        self._prefix_token_counts: Dict[Any, int] = {}
+
         # Initialize Orchestrator for worker coordination
         self.orchestrator = get_orchestrator()
         logger.info(f"Orchestrator initialized with {len(self.orchestrator.workers)} workers")
@@ -228,29 +394,37 @@ class OpenAIAgentService:
         """Count tokens in text using tiktoken."""
         return len(self.encoding.encode(text))
 
-    def _get_system_prompt(
-        self,
-        context: ConversationContext,
-        user_input: str = ""
-    ) -> str:
-        """Generate system prompt with context and relevant skills."""
+    def _get_static_system_prompt(self, context: ConversationContext) -> str:
+        """
+        Generate the stable part of the system prompt.
+
+        Contains only the base prompt and the elderly context, so it is
+        byte-identical across turns and calls for the same person and can be
+        served from the provider's prompt cache.
+        """
         prompt = self.config.base_system_prompt or self.DEFAULT_SYSTEM_PROMPT
 
         # Add elderly context
         if context.elderly_name or context.elderly_age:
             prompt += f"\n\n## 현재 통화 중인 어르신\n{context.to_context_string()}"
 
+        return prompt
+
+    def _get_turn_instructions(
+        self,
+        context: ConversationContext,
+        user_input: str = ""
+    ) -> str:
+        """Generate the per-turn instructions (greeting, skills, retry hints)."""
+        prompt = ""
+
         # Add greeting instruction if this is the start
         if context.is_greeting:
             prompt += "\n\n## 현재 상황\n지금은 통화가 시작되는 시점입니다. 어르신에게 먼저 따뜻하게 인사하고 안부를 물어주세요."
 
         # Add relevant skills based on user input (progressive disclosure)
         if user_input:
-            matching_skills = self.skill_loader.get_matching_skills(
-                user_input,
-                max_skills=2,  # Limit to 2 most relevant skills
-                min_score=0.2
-            )
+            matching_skills = self._get_matching_skills(context, user_input)
 
             if matching_skills:
                 prompt += "\n\n## 관련 스킬 지침\n"
@@ -265,46 +439,170 @@ class OpenAIAgentService:
         if retry_enhancement:
             prompt += retry_enhancement
 
+        return prompt.lstrip("\n")
+
+    def _get_system_prompt(
+        self,
+        context: ConversationContext,
+        user_input: str = ""
+    ) -> str:
+        """Generate the full system prompt (static part + per-turn instructions)."""
+        prompt = self._get_static_system_prompt(context)
+        instructions = self._get_turn_instructions(context, user_input)
+        if instructions:
+            prompt += f"\n\n{instructions}"
         return prompt
 
-    def _get_tools_for_openai(self) -> List[Dict[str, Any]]:
-        """Convert tools to OpenAI Function Calling format."""
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "parameters": {
-                        "type": "object",
-                        "properties": tool.input_schema.get("properties", {}),
-                        "required": tool.input_schema.get("required", [])
-                    }
-                }
-            }
-            for tool in self.tool_registry._tools.values()
+    def _build_messages(
+        self,
+        context: ConversationContext,
+        user_input: str,
+        conversation: ConversationHistory,
+    ) -> List[Dict[str, Any]]:
+        """
+        Assemble the chat messages, most stable first.
+
+        Order: static system prompt, running summary, history, then the
+        volatile per-turn instructions, so everything before the newest
+        turn stays a cacheable prefix.
+        """
+        messages = [
+            {"role": "system", "content": self._get_static_system_prompt(context)}
         ]
+        summary_message = conversation.summary_message()
+        if summary_message:
+            messages.append(summary_message)
+        messages.extend([msg.to_openai_format() for msg in conversation])
+
+        instructions = self._get_turn_instructions(context, user_input)
+        if instructions:
+            messages.append({"role": "system", "content": instructions})
+
+        # If this is a greeting and no user messages yet, add prompt
+        if context.is_greeting and len(conversation) == 0:
+            messages.append({"role": "user", "content": "통화가 시작되었습니다."})
+
+        return messages
+
+    def _static_prefix_tokens(self, static_prompt: str, tools: List[Dict[str, Any]]) -> int:
+        """Token count of the stable prefix (tool schemas + static prompt), memoized."""
+        key = (static_prompt, tuple(t["function"]["name"] for t in tools))
+        tokens = self._prefix_token_counts.get(key)
+        if tokens is None:
+            if len(self._prefix_token_counts) >= 256:
+                self._prefix_token_counts.clear()
+            tokens = self.count_tokens(static_prompt) + self.count_tokens(
+                json.dumps(tools, ensure_ascii=False, sort_keys=True)
+            )
+            self._prefix_token_counts[key] = tokens
+        return tokens
+
+    def _record_prompt_usage(self, usage: Any, static_prefix_tokens: int) -> None:
+        """Record provider-reported prompt/cached token counts for one request."""
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        if not isinstance(prompt_tokens, int):
+            return
+
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None)
+        if not isinstance(cached_tokens, int):
+            cached_tokens = 0
 
-    def _get_conversation(self, conversation_id: str) -> List[Message]:
+        stats = self.prompt_cache_stats
+        stats.requests += 1
+        stats.prompt_tokens += prompt_tokens
+        stats.cached_tokens += cached_tokens
+        stats.static_prefix_tokens += min(static_prefix_tokens, prompt_tokens)
+
+        logger.debug(
+            f"[Act] Prompt tokens: {prompt_tokens}, cached: {cached_tokens}, "
+            f"static prefix: {static_prefix_tokens}"
+        )
+
+    def _get_matching_skills(self, context: ConversationContext, user_input: str) -> List[Any]:
+        """Get the skills for the message, reusing the turn's selection."""
+        turn = self.get_turn_analysis(context.conversation_id, user_input)
+        if turn and turn.skills is not None:
+            self.turn_stats.skill_matches_reused += 1
+            return turn.skills
+
+        skills = self.skill_loader.get_matching_skills(
+            user_input,
+            max_skills=2,  # Limit to 2 most relevant skills
+            min_score=0.2
+        )
+        if turn:
+            turn.skills = skills
+        return skills
+
+    # =========================================================================
+    # Turn Analysis
+    # =========================================================================
+
+    def begin_turn(self, context: ConversationContext, user_input: str) -> TurnAnalysis:
+        """Start a new turn: scan the message once and remember the analysis."""
+        turn = TurnAnalysis(
+            conversation_id=context.conversation_id,
+            user_input=user_input,
+            keyword_matches=self.keyword_index.match(user_input),
+        )
+        self._turns[context.conversation_id] = turn
+        self.turn_stats.turns_analyzed += 1
+        return turn
+
+    def get_turn_analysis(self, conversation_id: str, user_input: str) -> Optional[TurnAnalysis]:
+        """Get the current turn's analysis if it belongs to this message."""
+        turn = self._turns.get(conversation_id)
+        if turn and turn.is_for(conversation_id, user_input):
+            return turn
+        return None
+
+    def _get_tools_for_openai(self, tool_names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Get tools in OpenAI Function Calling format.
+
+        Args:
+            tool_names: Optional subset of tools to send (None sends all)
+        """
+        return self.tool_registry.to_openai_format(tool_names)
+
+    def _select_tools(self, plan: Optional[Dict[str, Any]]) -> Optional[List[str]]:
+        """
+        Names of the tools to send for this turn.
+
+        Returns the plan's ``use_tools`` plus the always-available core tools,
+        or None (all tools) when subsetting is disabled or there is no plan.
+        """
+        if not self.config.enable_tool_subsetting or plan is None:
+            return None
+        return list(dict.fromkeys([*self.config.core_tools, *plan.get("use_tools", [])]))
+
+    def _get_conversation(self, conversation_id: str) -> ConversationHistory:
         """Get or create conversation history."""
         if conversation_id not in self._conversations:
-            self._conversations[conversation_id] = []
+            self._conversations[conversation_id] = ConversationHistory(
+                count_tokens=self.count_tokens,
+                token_budget=self.config.history_token_budget,
+                max_messages=self.config.max_history_messages,
+            )
         return self._conversations[conversation_id]
 
     def _add_message(self, conversation_id: str, message: Message) -> None:
-        """Add message to conversation history."""
+        """Add message to conversation history (trimmed to the token budget)."""
         conversation = self._get_conversation(conversation_id)
-        conversation.append(message)
+        trimmed = conversation.append(message)
 
-        # Limit history to prevent token overflow
-        max_messages = 50
-        if len(conversation) > max_messages:
-            self._conversations[conversation_id] = conversation[-max_messages:]
+        if trimmed:
+            logger.info(
+                f"[Agent] Trimmed {len(trimmed)} old messages from {conversation_id} "
+                f"(history: {conversation.total_tokens} tokens)"
+            )
 
     async def perceive(
         self,
         user_input: str,
         context: ConversationContext,
+        turn: Optional[TurnAnalysis] = None,
     ) -> Dict[str, Any]:
         """
         Phase 1: Perceive - Analyze user input.
@@ -314,33 +612,49 @@ class OpenAIAgentService:
         - Emotional tone
         - Key topics
         - Potential concerns
+
+        With a TurnAnalysis that was already perceived (a retry), the cached
+        perception is returned and the user message is not added again.
         """
+        if turn and turn.perception is not None:
+            self.turn_stats.perceptions_reused += 1
+            return turn.perception
+
         logger.info(f"[Perceive] Input: {user_input[:100]}...")
 
-        # Add user message to history
+        # Add user message to history (tokenized once, here)
+        input_tokens = self.count_tokens(user_input)
         self._add_message(
             context.conversation_id,
-            Message(role="user", content=user_input)
+            Message(
+                role="user",
+                content=user_input,
+                token_count=input_tokens + MESSAGE_TOKEN_OVERHEAD,
+            )
         )
 
-        # Quick perception analysis
+        # Quick perception analysis (the helpers share one keyword scan)
         perception = {
             "input": user_input,
             "intent": self._detect_intent(user_input),
             "emotional_tone": self._detect_emotion(user_input),
             "is_health_related": self._is_health_related(user_input),
             "wants_to_end": self._wants_to_end_call(user_input),
-            "token_count": self.count_tokens(user_input),
+            "is_emergency": self._is_emergency(user_input),
+            "token_count": input_tokens,
             "timestamp": datetime.utcnow().isoformat(),
         }
 
         logger.debug(f"[Perceive] Result: {perception}")
+        if turn:
+            turn.perception = perception
         return perception
 
     async def plan(
         self,
         perception: Dict[str, Any],
         context: ConversationContext,
+        turn: Optional[TurnAnalysis] = None,
     ) -> Dict[str, Any]:
         """
         Phase 2: Plan - Determine response strategy using Orchestrator.
@@ -351,7 +665,12 @@ class OpenAIAgentService:
         - Scheduling needs (ScheduleWorker)
 
         Returns a unified plan with tool recommendations and response guidance.
+        The plan is cached on the TurnAnalysis, so retries skip the workers.
         """
+        if turn and turn.plan is not None:
+            self.turn_stats.plans_reused += 1
+            return turn.plan
+
         logger.info(f"[Plan] Planning response for intent: {perception.get('intent')}")
 
         user_input = perception.get("input", "")
@@ -363,6 +682,9 @@ class OpenAIAgentService:
             "health_condition": context.health_condition,
             "is_greeting": context.is_greeting,
         }
+        if turn:
+            # Workers read the turn's keyword hits instead of rescanning
+            orchestrator_context["keyword_matches"] = turn.keyword_matches
 
         # Run orchestrator with all workers in parallel
         orchestrator_result = await self.orchestrator.orchestrate(
@@ -391,7 +713,8 @@ class OpenAIAgentService:
             plan["use_tools"].append("check_health_status")
 
         # Emergency check fallback
-        if self._is_emergency(user_input):
+        is_emergency = perception["is_emergency"] if "is_emergency" in perception else self._is_emergency(user_input)
+        if is_emergency:
             if "notify_caregiver" not in plan["use_tools"]:
                 plan["use_tools"].insert(0, "notify_caregiver")
             plan["priority"] = "urgent"
@@ -402,6 +725,8 @@ class OpenAIAgentService:
             f"tools={plan['use_tools']}, "
             f"workers_used={orchestrator_result.workers_activated}"
         )
+        if turn:
+            turn.plan = plan
         return plan
 
     async def act(
@@ -413,96 +738,128 @@ class OpenAIAgentService:
         """
         Phase 3: Act - Generate response with OpenAI streaming and function calling.
 
+        Runs a tool loop: when the model requests tools, all calls of that
+        round are executed concurrently, their results are appended as
+        ``tool`` messages and the model is resumed, until it answers without
+        tool calls or ``max_tool_calls_per_turn`` is used up.
+
         Yields:
             Streaming response text chunks
         """
         logger.info("[Act] Generating response with OpenAI...")
 
-        # Prepare messages for OpenAI
+        # Prepare messages for OpenAI (stable prefix first, see _build_messages)
         conversation = self._get_conversation(context.conversation_id)
-        messages = [
-            {"role": "system", "content": self._get_system_prompt(context, user_input)}
-        ]
-        messages.extend([msg.to_openai_format() for msg in conversation])
-
-        # If this is a greeting and no user messages yet, add prompt
-        if context.is_greeting and len(conversation) == 0:
-            messages.append({"role": "user", "content": "통화가 시작되었습니다."})
+        messages = self._build_messages(context, user_input, conversation)
 
-        # Get available tools in OpenAI format
-        tools = self._get_tools_for_openai()
+        # Send only the tools relevant to this turn (plus the core set)
+        tools = self._get_tools_for_openai(self._select_tools(plan))
+        static_prefix_tokens = self._static_prefix_tokens(messages[0]["content"], tools)
 
         accumulated_response = ""
         tool_calls_accumulated = []
         tool_results = []
+        tool_budget = self.config.max_tool_calls_per_turn
+        stream = None
 
         try:
-            # Create streaming response with OpenAI
-            stream = await self.client.chat.completions.create(
-                model=self.config.model,
-                max_tokens=self.config.max_tokens,
-                temperature=self.config.temperature,
-                messages=messages,
-                tools=tools if tools else None,
-                stream=True,
-            )
-
-            current_tool_calls = {}
-
-            async for chunk in stream:
-                delta = chunk.choices[0].delta if chunk.choices else None
-
-                if delta:
-                    # Handle text content
-                    if delta.content:
-                        text = delta.content
-                        accumulated_response += text
-                        yield text
-
-                    # Handle function calls (streamed in chunks)
-                    if delta.tool_calls:
-                        for tool_call_delta in delta.tool_calls:
-                            idx = tool_call_delta.index
-                            if idx not in current_tool_calls:
-                                current_tool_calls[idx] = {
-                                    "id": "",
-                                    "function": {"name": "", "arguments": ""}
-                                }
-
-                            if tool_call_delta.id:
-                                current_tool_calls[idx]["id"] = tool_call_delta.id
-                            if tool_call_delta.function:
-                                if tool_call_delta.function.name:
-                                    current_tool_calls[idx]["function"]["name"] = tool_call_delta.function.name
-                                if tool_call_delta.function.arguments:
-                                    current_tool_calls[idx]["function"]["arguments"] += tool_call_delta.function.arguments
-
-            # Process completed tool calls
-            for idx, tool_call in current_tool_calls.items():
-                tool_name = tool_call["function"]["name"]
-                try:
-                    tool_input = json.loads(tool_call["function"]["arguments"])
-                except json.JSONDecodeError:
-                    tool_input = {}
+            while True:
+                # Once the tool budget is used up the model must answer in text
+                round_tools = tools if tools and tool_budget > 0 else None
+
+                # Create streaming response with OpenAI
+                stream = await self.client.chat.completions.create(
+                    model=self.config.model,
+                    max_tokens=self.config.max_tokens,
+                    temperature=self.config.temperature,
+                    messages=messages,
+                    tools=round_tools,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                )
 
-                logger.info(f"[Act] Executing tool: {tool_name}")
+                round_text = ""
+                current_tool_calls = {}
+
+                async for chunk in stream:
+                    # The final chunk carries token usage (incl. cached prompt tokens)
+                    usage = getattr(chunk, "usage", None)
+                    if usage is not None:
+                        self._record_prompt_usage(usage, static_prefix_tokens)
+
+                    delta = chunk.choices[0].delta if chunk.choices else None
+
+                    if delta:
+                        # Handle text content
+                        if delta.content:
+                            text = delta.content
+                            round_text += text
+                            accumulated_response += text
+                            yield text
+
+                        # Handle function calls (streamed in chunks)
+                        if delta.tool_calls:
+                            for tool_call_delta in delta.tool_calls:
+                                idx = tool_call_delta.index
+                                if idx not in current_tool_calls:
+                                    current_tool_calls[idx] = {
+                                        "id": "",
+                                        "function": {"name": "", "arguments": ""}
+                                    }
+
+                                if tool_call_delta.id:
+                                    current_tool_calls[idx]["id"] = tool_call_delta.id
+                                if tool_call_delta.function:
+                                    if tool_call_delta.function.name:
+                                        current_tool_calls[idx]["function"]["name"] = tool_call_delta.function.name
+                                    if tool_call_delta.function.arguments:
+                                        current_tool_calls[idx]["function"]["arguments"] += tool_call_delta.function.arguments
+
+                stream = None
+                if not current_tool_calls:
+                    break
 
-                # Execute the tool
-                result = await self.tool_registry.execute(tool_name, **tool_input)
-                tool_results.append({
-                    "tool_call_id": tool_call["id"],
-                    "result": result.to_dict(),
+                # Execute this round's tool calls concurrently
+                round_calls = [current_tool_calls[idx] for idx in sorted(current_tool_calls)]
+                results = await self._execute_tool_calls(round_calls, tool_budget)
+                tool_budget = max(tool_budget - len(round_calls), 0)
+
+                messages.append({
+                    "role": "assistant",
+                    "content": round_text or None,
+                    "tool_calls": [
+                        {"id": call["id"], "type": "function", "function": call["function"]}
+                        for call in round_calls
+                    ],
                 })
 
-                # Handle special tool results
-                if tool_name == "end_call" and result.success:
+                call_ended = False
+                for call, (tool_input, result) in zip(round_calls, results):
+                    tool_name = call["function"]["name"]
+                    tool_results.append({
+                        "tool_call_id": call["id"],
+                        "result": result.to_dict(),
+                    })
+                    tool_calls_accumulated.append({
+                        "id": call["id"],
+                        "name": tool_name,
+                        "input": tool_input,
+                    })
+                    messages.append({
+                        "role": "tool",
+                        "tool_call_id": call["id"],
+                        "content": json.dumps(result.to_dict(), ensure_ascii=False, default=str),
+                    })
+
+                    # Handle special tool results
+                    if tool_name == "end_call" and result.success:
+                        call_ended = True
+
+                if call_ended:
                     yield "\n[CALL_END]"
+                    break
 
-                tool_calls_accumulated.append({
-                    "id": tool_call["id"],
-                    "name": tool_name,
-                    "input": tool_input,
-                })
+                logger.info(f"[Act] Resuming after {len(round_calls)} tool call(s), budget left: {tool_budget}")
 
         except RateLimitError as e:
             logger.warning(f"[Act] Rate limited: {e}")
@@ -517,6 +874,11 @@ class OpenAIAgentService:
             logger.error(f"[Act] Error: {e}")
             yield f"\n죄송합니다. 일시적인 오류가 발생했습니다."
             return
+        finally:
+            # Release the HTTP stream if the consumer stopped reading early
+            close = getattr(stream, "close", None)
+            if close is not None and asyncio.iscoroutinefunction(close):
+                await close()
 
         # Add assistant message to history
         self._add_message(
@@ -529,6 +891,45 @@ class OpenAIAgentService:
             )
         )
 
+    async def _execute_tool_calls(
+        self,
+        tool_calls: List[Dict[str, Any]],
+        budget: int,
+    ) -> List[Tuple[Dict[str, Any], ToolResult]]:
+        """
+        Execute one round of tool calls concurrently.
+
+        Each call is bounded by its tool's ``timeout_seconds`` (enforced in
+        ``Tool.execute``). Calls beyond the remaining budget are not run and
+        get an error result, so the model still receives a reply for every
+        tool_call_id.
+
+        Returns:
+            (parsed input, result) per call, in call order
+        """
+        async def run(call: Dict[str, Any], allowed: bool) -> Tuple[Dict[str, Any], ToolResult]:
+            tool_name = call["function"]["name"]
+            try:
+                tool_input = json.loads(call["function"]["arguments"] or "{}")
+            except json.JSONDecodeError:
+                tool_input = {}
+            if not isinstance(tool_input, dict):
+                tool_input = {}
+
+            if not allowed:
+                return tool_input, ToolResult(
+                    tool_name=tool_name,
+                    success=False,
+                    error="Tool call limit reached for this turn",
+                )
+
+            logger.info(f"[Act] Executing tool: {tool_name}")
+            return tool_input, await self.tool_registry.execute(tool_name, **tool_input)
+
+        return await asyncio.gather(*(
+            run(call, allowed=i < budget) for i, call in enumerate(tool_calls)
+        ))
+
     async def reflect(
         self,
         user_input: str,
@@ -618,19 +1019,77 @@ class OpenAIAgentService:
         retries = 0
         accumulated_response = ""
 
+        # Perceive and Plan run once per message; retries reuse the analysis
+        turn = self.begin_turn(context, user_input)
+
         while retries <= self.config.max_retries:
             try:
                 # Phase 1: Perceive
-                perception = await self.perceive(user_input, context)
+                perception = await self.perceive(user_input, context, turn)
 
                 # Phase 2: Plan
-                plan = await self.plan(perception, context)
+                plan = await self.plan(perception, context, turn)
+
+                # Phase 3: Act (streaming). With incremental evaluation, text is
+                # released sentence by sentence; the last attempt is not gated.
+                monitor = None
+                if self.config.enable_incremental_evaluation and retries < self.config.max_retries:
+                    monitor = self.evaluator.start_incremental(user_input)
 
-                # Phase 3: Act (streaming)
                 accumulated_response = ""
-                async for chunk in self.act(user_input, context, plan):
-                    accumulated_response += chunk
-                    yield chunk
+                stream_check: Optional[StreamCheck] = None
+                act_stream = self.act(user_input, context, plan)
+                try:
+                    async for chunk in act_stream:
+                        if monitor is None:
+                            accumulated_response += chunk
+                            yield chunk
+                            continue
+
+                        stream_check = monitor.feed(chunk)
+                        for sentence in stream_check.released:
+                            accumulated_response += sentence
+                            yield sentence
+                        if stream_check.action != StreamAction.CONTINUE:
+                            break
+                    else:
+                        if monitor is not None:
+                            stream_check = monitor.finish()
+                            for sentence in stream_check.released:
+                                accumulated_response += sentence
+                                yield sentence
+                finally:
+                    await act_stream.aclose()
+
+                # Stopped early by incremental evaluation: regenerate right away
+                if stream_check and stream_check.action != StreamAction.CONTINUE:
+                    retries += 1
+                    logger.info(
+                        f"[Agent] Stream {stream_check.action.value} "
+                        f"(attempt {retries}/{self.config.max_retries}), "
+                        f"reason: {stream_check.reason}"
+                    )
+                    for flag in stream_check.urgent_flags:
+                        logger.warning(f"[Agent] URGENT: {flag} in conversation {context.conversation_id}")
+
+                    self._retry_enhancements[context.conversation_id] = (
+                        RetryStrategy.get_stream_check_enhancement(stream_check)
+                    )
+
+                    # act() only records the response if it ran to completion
+                    conversation = self._get_conversation(context.conversation_id)
+                    if conversation and conversation[-1].role == "assistant":
+                        conversation.pop()
+
+                    if accumulated_response:
+                        yield "\n\n"
+                    continue
+
+                # Phase 4: Reflect in the background; the caller picks up the
+                # verdict via await_reflection() once the text is delivered
+                if self.config.reflection_mode == ReflectionMode.BACKGROUND:
+                    self._schedule_reflection(user_input, accumulated_response, context)
+                    break
 
                 # Phase 4: Reflect (using EvaluatorAgent)
                 evaluation = await self.reflect(user_input, accumulated_response, context)
@@ -679,6 +1138,170 @@ class OpenAIAgentService:
 
                 await asyncio.sleep(self.config.retry_delay_base * retries)
 
+    # =========================================================================
+    # Background Reflection
+    # =========================================================================
+
+    def _schedule_reflection(
+        self,
+        user_input: str,
+        response: str,
+        context: ConversationContext,
+    ) -> asyncio.Task:
+        """Start reflect() for a finished response without waiting for it."""
+        self.cancel_reflection(context.conversation_id)
+
+        task = asyncio.create_task(self.reflect(user_input, response, context))
+        self._pending_reflections[context.conversation_id] = task
+        logger.debug(f"[Reflect] Scheduled background evaluation for {context.conversation_id}")
+        return task
+
+    async def await_reflection(self, conversation_id: str) -> Optional[EvaluationResult]:
+        """
+        Wait for the background evaluation of the last response.
+
+        Returns:
+            EvaluationResult, or None if nothing is pending or evaluation failed
+        """
+        task = self._pending_reflections.get(conversation_id)
+        if task is None:
+            return None
+
+        # asyncio.wait() neither cancels the task nor raises its exception
+        await asyncio.wait({task})
+        if self._pending_reflections.get(conversation_id) is task:
+            del self._pending_reflections[conversation_id]
+
+        if task.cancelled():
+            return None
+        if task.exception():
+            logger.error(f"[Reflect] Background evaluation failed: {task.exception()}")
+            return None
+        return task.result()
+
+    def cancel_reflection(self, conversation_id: str) -> None:
+        """Drop a pending background evaluation (e.g. the user already moved on)."""
+        task = self._pending_reflections.pop(conversation_id, None)
+        if task and not task.done():
+            task.cancel()
+        # A finished evaluation may already have queued its enhancement
+        self._retry_enhancements.pop(conversation_id, None)
+
+    # =========================================================================
+    # Background Summarization
+    # =========================================================================
+
+    def schedule_summarization(self, conversation_id: str) -> Optional[asyncio.Task]:
+        """
+        Fold older turns into the running summary in a background task.
+
+        Meant to be called once a response has been delivered; does nothing
+        until the history crosses ``summarize_after_messages``.
+
+        Returns:
+            The running summarization task, or None if not needed
+        """
+        threshold = self.config.summarize_after_messages
+        conversation = self._conversations.get(conversation_id)
+        if threshold <= 0 or conversation is None or len(conversation) < threshold:
+            return None
+
+        task = self._pending_summaries.get(conversation_id)
+        if task and not task.done():
+            return task
+
+        task = asyncio.create_task(self._summarize(conversation_id))
+        self._pending_summaries[conversation_id] = task
+        return task
+
+    async def _summarize(self, conversation_id: str) -> int:
+        """
+        Generate the new running summary and swap it into the history.
+
+        Returns:
+            Number of messages replaced by the summary
+        """
+        conversation = self._conversations.get(conversation_id)
+        if conversation is None:
+            return 0
+
+        covered = conversation.summarizable_messages(self.config.summary_keep_recent_messages)
+        if not covered:
+            return 0
+
+        transcript = "\n".join(
+            f"{'어르신' if m.role == 'user' else 'AI'}: {m.content}"
+            for m in covered
+            if m.content
+        )
+        content = f"## 새 대화 내용\n{transcript}"
+        if conversation.summary:
+            content = f"## 기존 요약\n{conversation.summary}\n\n{content}"
+
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.config.summary_model,
+                max_tokens=self.config.summary_max_tokens,
+                temperature=0.3,
+                messages=[
+                    {"role": "system", "content": self.SUMMARY_PROMPT},
+                    {"role": "user", "content": content},
+                ],
+            )
+            summary = (response.choices[0].message.content or "").strip()
+        except Exception as e:
+            logger.warning(f"[Summary] Failed for {conversation_id}: {e}")
+            return 0
+
+        if not summary or self._conversations.get(conversation_id) is not conversation:
+            return 0
+
+        # No await between here and the swap: the agent never sees a half-applied summary
+        removed = conversation.apply_summary(summary, covered)
+        logger.info(
+            f"[Summary] Folded {removed} messages into summary for {conversation_id} "
+            f"(history: {conversation.total_tokens} tokens)"
+        )
+        return removed
+
+    def cancel_summarization(self, conversation_id: str) -> None:
+        """Drop a pending background summarization."""
+        task = self._pending_summaries.pop(conversation_id, None)
+        if task and not task.done():
+            task.cancel()
+
+    async def correct_response(
+        self,
+        user_input: str,
+        context: ConversationContext,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Regenerate the last response after a background evaluation demanded a retry.
+
+        Replaces the last assistant message in history and uses the retry
+        enhancement stored by reflect(). The correction itself is not re-evaluated.
+
+        Yields:
+            Streaming response text chunks
+        """
+        conversation = self._get_conversation(context.conversation_id)
+        if conversation and conversation[-1].role == "assistant":
+            conversation.pop()
+
+        # Reuse the plan of the turn being corrected
+        plan = None
+        turn = self.get_turn_analysis(context.conversation_id, user_input)
+        if turn and turn.plan is not None:
+            self.turn_stats.plans_reused += 1
+            plan = turn.plan
+
+        logger.info(f"[Agent] Generating correction for conversation {context.conversation_id}")
+        try:
+            async for chunk in self.act(user_input, context, plan):
+                yield chunk
+        finally:
+            self._retry_enhancements.pop(context.conversation_id, None)
+
     async def generate_greeting(
         self,
         context: ConversationContext,
@@ -691,6 +1314,10 @@ class OpenAIAgentService:
 
     def clear_conversation(self, conversation_id: str) -> None:
         """Clear conversation history."""
+        self.cancel_reflection(conversation_id)
+        self.cancel_summarization(conversation_id)
+        self._retry_enhancements.pop(conversation_id, None)
+        self._turns.pop(conversation_id, None)
         if conversation_id in self._conversations:
             del self._conversations[conversation_id]
             logger.info(f"Cleared conversation: {conversation_id}")
@@ -703,60 +1330,44 @@ class OpenAIAgentService:
     # Helper Methods for Perception
     # =========================================================================
 
+    def _match_keywords(self, text: str) -> KeywordMatches:
+        """Get the (shared, memoized) keyword hits for the text."""
+        return self.keyword_index.match(text)
+
     def _detect_intent(self, text: str) -> str:
         """Detect user intent from text."""
-        text_lower = text.lower()
-
-        if any(kw in text_lower for kw in ["끊", "그만", "이만", "안녕"]):
-            return "end_conversation"
-        if any(kw in text_lower for kw in ["도와", "도움", "부탁"]):
-            return "request_help"
-        if any(kw in text_lower for kw in ["?", "뭐", "어떻게", "왜", "언제"]):
-            return "question"
-        if any(kw in text_lower for kw in ["고마워", "감사", "좋아"]):
-            return "positive_feedback"
-        if any(kw in text_lower for kw in ["싫", "별로", "아니"]):
-            return "negative_feedback"
+        matches = self._match_keywords(text)
+
+        for intent in (
+            "end_conversation",
+            "request_help",
+            "question",
+            "positive_feedback",
+            "negative_feedback",
+        ):
+            if matches.has(f"intent.{intent}"):
+                return intent
 
         return "general_conversation"
 
     def _detect_emotion(self, text: str) -> str:
         """Detect emotional tone from text."""
-        text_lower = text.lower()
+        matches = self._match_keywords(text)
 
-        if any(kw in text_lower for kw in ["슬퍼", "우울", "외로", "힘들"]):
-            return "sad"
-        if any(kw in text_lower for kw in ["화나", "짜증", "답답"]):
-            return "angry"
-        if any(kw in text_lower for kw in ["걱정", "불안", "무서"]):
-            return "anxious"
-        if any(kw in text_lower for kw in ["기뻐", "좋아", "행복", "감사"]):
-            return "happy"
+        for emotion in ("sad", "angry", "anxious", "happy"):
+            if matches.has(f"emotion.{emotion}"):
+                return emotion
 
         return "neutral"
 
     def _is_health_related(self, text: str) -> bool:
         """Check if text mentions health-related topics."""
-        health_keywords = [
-            "아파", "아프", "아픔", "통증", "병원", "약", "치료",
-            "어지러", "두통", "열", "기침", "설사", "변비",
-            "잠", "못 자", "피곤", "힘들", "우울",
-        ]
-        return any(kw in text.lower() for kw in health_keywords)
+        return self._match_keywords(text).has("perception.health")
 
     def _wants_to_end_call(self, text: str) -> bool:
         """Check if user wants to end the call."""
-        end_keywords = [
-            "끊을게", "끊어야", "끊자", "끊을래",
-            "이만", "그만", "다음에", "나중에",
-            "안녕히", "수고", "고마워요",
-        ]
-        return any(kw in text.lower() for kw in end_keywords)
+        return self._match_keywords(text).has("perception.end_call")
 
     def _is_emergency(self, text: str) -> bool:
         """Check for emergency situations."""
-        emergency_keywords = [
-            "쓰러", "의식", "못 움직", "숨", "가슴이 아",
-            "119", "응급", "죽", "자해", "자살",
-        ]
-        return any(kw in text.lower() for kw in emergency_keywords)
+        return self._match_keywords(text).has("perception.emergency")
@@ -11,6 +11,8 @@ from datetime import datetime, timezone
 from enum import IntEnum
 from typing import Any, Dict, List, Optional
 
+from app.core.keywords import KeywordMatches, get_keyword_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -87,6 +89,39 @@ class BaseWorker(ABC):
         """Initialize the worker."""
         self.logger = logging.getLogger(f"{__name__}.{self.name}")
 
+        # Register keyword lists with the shared index (one scan per utterance)
+        self.keyword_index = get_keyword_index()
+        for key, keywords in self.get_keyword_sets().items():
+            self.keyword_index.register(self.keyword_category(key), keywords)
+
+    def get_keyword_sets(self) -> Dict[str, List[str]]:
+        """
+        Keyword lists this worker matches on, keyed by a short name.
+
+        Override in subclasses to add lists besides the trigger keywords.
+        """
+        return {"trigger": self.trigger_keywords}
+
+    def keyword_category(self, key: str) -> str:
+        """Category name of one of this worker's keyword lists in the index."""
+        return f"worker.{self.name}.{key}"
+
+    def match_keywords(self, user_input: str, context: Optional[Dict] = None) -> KeywordMatches:
+        """
+        Get the keyword hits for the input.
+
+        Uses the turn's precomputed hits from ``context["keyword_matches"]``
+        when the agent supplies them, otherwise the shared (memoized) index.
+        """
+        matches = context.get("keyword_matches") if context else None
+        if isinstance(matches, KeywordMatches) and matches.text == user_input:
+            return matches
+        return self.keyword_index.match(user_input)
+
+    def has_keywords(self, matches: KeywordMatches, key: str) -> bool:
+        """Check whether any keyword of one of this worker's lists matched."""
+        return matches.has(self.keyword_category(key))
+
     def should_activate(self, user_input: str, context: Optional[Dict] = None) -> bool:
         """
         Determine if this worker should be activated for the given input.
@@ -98,8 +133,7 @@ class BaseWorker(ABC):
         Returns:
             True if this worker should process the input
         """
-        input_lower = user_input.lower()
-        return any(kw in input_lower for kw in self.trigger_keywords)
+        return self.has_keywords(self.match_keywords(user_input, context), "trigger")
 
     @abstractmethod
     async def analyze(
@@ -8,6 +8,8 @@ empathetic support recommendations.
 import logging
 from typing import Dict, List, Optional, Tuple
 
+from app.core.keywords import KeywordMatches
+
 from .base import BaseWorker, WorkerResult, WorkerPriority
 
 logger = logging.getLogger(__name__)
@@ -106,6 +108,16 @@ class EmotionSupportWorker(BaseWorker):
         },
     }
 
+    def get_keyword_sets(self) -> Dict[str, List[str]]:
+        """Trigger, crisis and per-emotion keyword lists."""
+        keyword_sets = {
+            "trigger": self.trigger_keywords,
+            "crisis": self.crisis_keywords,
+        }
+        for emotion, pattern in self.emotion_patterns.items():
+            keyword_sets[emotion] = pattern["keywords"]
+        return keyword_sets
+
     async def analyze(
         self,
         user_input: str,
@@ -123,13 +135,13 @@ class EmotionSupportWorker(BaseWorker):
         """
         logger.debug(f"[EmotionWorker] Analyzing: {user_input[:50]}...")
 
-        input_lower = user_input.lower()
+        matches = self.match_keywords(user_input, context)
 
         # Check for crisis first
-        is_crisis = any(kw in input_lower for kw in self.crisis_keywords)
+        is_crisis = self.has_keywords(matches, "crisis")
 
         # Detect emotions
-        detected_emotions = self._detect_emotions(input_lower)
+        detected_emotions = self._detect_emotions(matches)
 
         # Get primary emotion and confidence
         primary_emotion, confidence = self._get_primary_emotion(detected_emotions)
@@ -202,15 +214,15 @@ class EmotionSupportWorker(BaseWorker):
             }
         )
 
-    def _detect_emotions(self, text: str) -> List[Tuple[str, float]]:
-        """Detect emotions and their strength from text."""
+    def _detect_emotions(self, matches: KeywordMatches) -> List[Tuple[str, float]]:
+        """Detect emotions and their strength from keyword hits."""
         detected = []
 
-        for emotion, pattern in self.emotion_patterns.items():
-            matches = sum(1 for kw in pattern["keywords"] if kw in text)
-            if matches > 0:
+        for emotion in self.emotion_patterns:
+            count = matches.count(self.keyword_category(emotion))
+            if count > 0:
                 # Higher confidence with more keyword matches
-                confidence = min(1.0, 0.5 + matches * 0.15)
+                confidence = min(1.0, 0.5 + count * 0.15)
                 detected.append((emotion, confidence))
 
         return sorted(detected, key=lambda x: x[1], reverse=True)
@@ -227,12 +239,12 @@ class EmotionSupportWorker(BaseWorker):
 
     def get_priority(self, user_input: str) -> WorkerPriority:
         """Get dynamic priority based on emotional intensity."""
-        input_lower = user_input.lower()
+        matches = self.match_keywords(user_input)
 
-        if any(kw in input_lower for kw in self.crisis_keywords):
+        if self.has_keywords(matches, "crisis"):
             return WorkerPriority.CRITICAL
 
-        detected = self._detect_emotions(input_lower)
+        detected = self._detect_emotions(matches)
         if not detected:
             return WorkerPriority.LOW
 
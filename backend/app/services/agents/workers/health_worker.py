@@ -8,6 +8,8 @@ in elderly conversations.
 import logging
 from typing import Dict, List, Optional, Tuple
 
+from app.core.keywords import KeywordMatches
+
 from .base import BaseWorker, WorkerResult, WorkerPriority
 
 logger = logging.getLogger(__name__)
@@ -60,6 +62,14 @@ class HealthMonitorWorker(BaseWorker):
         "잠을 못": ("moderate", "수면 장애"),
     }
 
+    def get_keyword_sets(self) -> Dict[str, List[str]]:
+        """Trigger, emergency and symptom keyword lists."""
+        return {
+            "trigger": self.trigger_keywords,
+            "emergency": self.emergency_keywords,
+            "symptom": list(self.symptom_severity),
+        }
+
     async def analyze(
         self,
         user_input: str,
@@ -77,13 +87,13 @@ class HealthMonitorWorker(BaseWorker):
         """
         logger.debug(f"[HealthWorker] Analyzing: {user_input[:50]}...")
 
-        input_lower = user_input.lower()
+        matches = self.match_keywords(user_input, context)
 
         # Check for emergency first
-        is_emergency = any(kw in input_lower for kw in self.emergency_keywords)
+        is_emergency = self.has_keywords(matches, "emergency")
 
         # Detect symptoms and severity
-        detected_symptoms = self._detect_symptoms(input_lower)
+        detected_symptoms = self._detect_symptoms(matches)
         overall_severity = self._calculate_severity(detected_symptoms, is_emergency)
 
         # Determine priority based on severity
@@ -134,12 +144,13 @@ class HealthMonitorWorker(BaseWorker):
             }
         )
 
-    def _detect_symptoms(self, text: str) -> List[Tuple[str, str]]:
-        """Detect symptoms and their severity from text."""
+    def _detect_symptoms(self, matches: KeywordMatches) -> List[Tuple[str, str]]:
+        """Detect symptoms and their severity from keyword hits."""
         detected = []
+        found = matches.get(self.keyword_category("symptom"))
 
         for pattern, (severity, description) in self.symptom_severity.items():
-            if pattern in text:
+            if pattern in found:
                 detected.append((description, severity))
 
         return detected
@@ -178,12 +189,12 @@ class HealthMonitorWorker(BaseWorker):
 
     def get_priority(self, user_input: str) -> WorkerPriority:
         """Get dynamic priority based on input severity."""
-        input_lower = user_input.lower()
+        matches = self.match_keywords(user_input)
 
-        if any(kw in input_lower for kw in self.emergency_keywords):
+        if self.has_keywords(matches, "emergency"):
             return WorkerPriority.CRITICAL
 
-        symptoms = self._detect_symptoms(input_lower)
+        symptoms = self._detect_symptoms(matches)
         severity = self._calculate_severity(symptoms, is_emergency=False)
 
         return self._severity_to_priority(severity)
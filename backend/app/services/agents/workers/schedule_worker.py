@@ -8,6 +8,8 @@ follow-up actions.
 import logging
 from typing import Dict, List, Optional
 
+from app.core.keywords import KeywordMatches
+
 from .base import BaseWorker, WorkerResult, WorkerPriority
 
 logger = logging.getLogger(__name__)
@@ -55,6 +57,22 @@ class ScheduleWorker(BaseWorker):
         "확인해", "알아볼", "연락드릴",
     ]
 
+    # Scheduling topics
+    schedule_keywords = [
+        "병원", "진료", "약속", "일정",
+        "내일", "모레", "다음 주",
+        "예약", "알려", "잊어버",
+    ]
+
+    def get_keyword_sets(self) -> Dict[str, List[str]]:
+        """Trigger, farewell, follow-up and schedule keyword lists."""
+        return {
+            "trigger": self.trigger_keywords,
+            "farewell": self.farewell_keywords,
+            "followup": self.followup_keywords,
+            "schedule": self.schedule_keywords,
+        }
+
     async def analyze(
         self,
         user_input: str,
@@ -72,12 +90,12 @@ class ScheduleWorker(BaseWorker):
         """
         logger.debug(f"[ScheduleWorker] Analyzing: {user_input[:50]}...")
 
-        input_lower = user_input.lower()
+        matches = self.match_keywords(user_input, context)
 
         # Detect intent
-        wants_to_end = any(kw in input_lower for kw in self.farewell_keywords)
-        needs_followup = self._needs_followup(input_lower, context)
-        mentions_schedule = self._mentions_schedule(input_lower)
+        wants_to_end = self.has_keywords(matches, "farewell")
+        needs_followup = self._needs_followup(matches, context)
+        mentions_schedule = self._mentions_schedule(matches)
 
         # Determine priority
         priority = WorkerPriority.HIGH if wants_to_end else WorkerPriority.NORMAL
@@ -101,7 +119,7 @@ class ScheduleWorker(BaseWorker):
 
         if mentions_schedule:
             response_hints.append("일정 관련 내용 경청")
-            if "병원" in input_lower or "진료" in input_lower:
+            if matches.get(self.keyword_category("schedule")) & {"병원", "진료"}:
                 suggested_actions.append("병원 일정 확인")
                 response_hints.append("병원 방문 응원")
 
@@ -139,10 +157,10 @@ class ScheduleWorker(BaseWorker):
             }
         )
 
-    def _needs_followup(self, text: str, context: Optional[Dict]) -> bool:
+    def _needs_followup(self, matches: KeywordMatches, context: Optional[Dict]) -> bool:
         """Determine if follow-up is needed."""
         # Explicit follow-up mentions
-        if any(kw in text for kw in self.followup_keywords):
+        if self.has_keywords(matches, "followup"):
             return True
 
         # Context-based determination
@@ -156,21 +174,14 @@ class ScheduleWorker(BaseWorker):
 
         return False
 
-    def _mentions_schedule(self, text: str) -> bool:
+    def _mentions_schedule(self, matches: KeywordMatches) -> bool:
         """Check if text mentions scheduling topics."""
-        schedule_patterns = [
-            "병원", "진료", "약속", "일정",
-            "내일", "모레", "다음 주",
-            "예약", "알려", "잊어버",
-        ]
-        return any(p in text for p in schedule_patterns)
+        return self.has_keywords(matches, "schedule")
 
     def get_priority(self, user_input: str) -> WorkerPriority:
         """Get dynamic priority based on input."""
-        input_lower = user_input.lower()
-
         # Farewell is high priority to ensure proper call ending
-        if any(kw in input_lower for kw in self.farewell_keywords):
+        if self.has_keywords(self.match_keywords(user_input), "farewell"):
             return WorkerPriority.HIGH
 
         return WorkerPriority.NORMAL
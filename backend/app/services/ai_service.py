@@ -1,26 +1,40 @@
 import json
 import re
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 from app.core.config import settings
 
 
 class AIService:
     """AI Service - supports OpenAI (primary) or Claude (fallback)"""
 
+    ANALYSIS_MODEL = "gpt-4o-mini"
+    ANALYSIS_MAX_TOKENS = 1024
+
     def __init__(self):
         self.use_openai = bool(settings.OPENAI_API_KEY)
 
         if self.use_openai:
-            from openai import OpenAI
-            self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
             print("[AI Service] Using OpenAI")
         elif settings.CLAUDE_API_KEY:
             import anthropic
             self.claude_client = anthropic.Anthropic(api_key=settings.CLAUDE_API_KEY)
+            self.async_claude_client = anthropic.AsyncAnthropic(api_key=settings.CLAUDE_API_KEY)
             print("[AI Service] Using Claude")
         else:
             print("[AI Service] WARNING: No API key configured!")
 
+    @property
+    def openai_client(self):
+        """Shared pooled OpenAI client (looked up per use so it survives forks)."""
+        from app.core.llm_clients import get_openai_client
+        return get_openai_client()
+
+    @property
+    def async_openai_client(self):
+        """Shared pooled AsyncOpenAI client for the running event loop."""
+        from app.core.llm_clients import get_async_openai_client
+        return get_async_openai_client()
+
     async def stream_chat_response(
         self,
         messages: list,
@@ -61,32 +75,74 @@ class AIService:
             # OpenAI streaming
             openai_messages = [{"role": "system", "content": system_prompt}] + formatted_messages
 
-            stream = self.openai_client.chat.completions.create(
+            stream = await self.async_openai_client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=openai_messages,
                 max_tokens=1024,
                 stream=True
             )
 
-            for chunk in stream:
-                if chunk.choices[0].delta.content:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
                     yield chunk.choices[0].delta.content
         else:
             # Claude streaming
-            with self.claude_client.messages.stream(
+            async with self.async_claude_client.messages.stream(
                 model="claude-3-5-sonnet-20241022",
                 max_tokens=1024,
                 system=system_prompt,
                 messages=formatted_messages
             ) as stream:
-                for text in stream.text_stream:
+                async for text in stream.text_stream:
                     yield text
 
     def analyze_conversation(self, conversation: str, elderly_context: str = "") -> dict:
-        """Analyze conversation and return risk assessment"""
+        """Analyze conversation and return risk assessment (blocking; for Celery tasks)"""
+        analysis_prompt = self.build_analysis_prompt(conversation, elderly_context)
+
+        if self.use_openai:
+            response = self.openai_client.chat.completions.create(
+                model=self.ANALYSIS_MODEL,
+                messages=[{"role": "user", "content": analysis_prompt}],
+                max_tokens=self.ANALYSIS_MAX_TOKENS
+            )
+            response_text = response.choices[0].message.content
+        else:
+            response = self.claude_client.messages.create(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=1024,
+                messages=[{"role": "user", "content": analysis_prompt}]
+            )
+            response_text = response.content[0].text
+
+        return self.parse_analysis(response_text)
+
+    async def analyze_conversation_async(self, conversation: str, elderly_context: str = "") -> dict:
+        """Analyze conversation without blocking the event loop"""
+        analysis_prompt = self.build_analysis_prompt(conversation, elderly_context)
+
+        if self.use_openai:
+            response = await self.async_openai_client.chat.completions.create(
+                model=self.ANALYSIS_MODEL,
+                messages=[{"role": "user", "content": analysis_prompt}],
+                max_tokens=self.ANALYSIS_MAX_TOKENS
+            )
+            response_text = response.choices[0].message.content
+        else:
+            response = await self.async_claude_client.messages.create(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=1024,
+                messages=[{"role": "user", "content": analysis_prompt}]
+            )
+            response_text = response.content[0].text
+
+        return self.parse_analysis(response_text)
+
+    def build_analysis_prompt(self, conversation: str, elderly_context: str = "") -> str:
+        """Prompt for call analysis (shared by real-time and Batch API analysis)"""
         context_section = f"\n어르신 정보: {elderly_context}" if elderly_context else ""
 
-        analysis_prompt = f"""다음 상담 대화를 분석해주세요.{context_section}
+        return f"""다음 상담 대화를 분석해주세요.{context_section}
 
 대화 내용:
 {conversation}
@@ -108,30 +164,23 @@ class AIService:
 
 반드시 유효한 JSON 형식으로만 응답해주세요."""
 
-        if self.use_openai:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": analysis_prompt}],
-                max_tokens=1024
-            )
-            response_text = response.choices[0].message.content
-        else:
-            response = self.claude_client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=1024,
-                messages=[{"role": "user", "content": analysis_prompt}]
-            )
-            response_text = response.content[0].text
-
-        # Parse JSON response
-        json_match = re.search(r'\{[\s\S]*\}', response_text)
+    def try_parse_analysis(self, response_text: str) -> Optional[dict]:
+        """Parse the JSON analysis from a model response; None if it is unparseable"""
+        json_match = re.search(r'\{[\s\S]*\}', response_text or "")
         if json_match:
             try:
                 result = json.loads(json_match.group())
                 result["risk_score"] = int(result.get("risk_score", 0))
                 return result
-            except (json.JSONDecodeError, ValueError):
+            except (json.JSONDecodeError, ValueError, TypeError, AttributeError):
                 pass
+        return None
+
+    def parse_analysis(self, response_text: str) -> dict:
+        """Parse the JSON analysis from a model response (placeholder if unparseable)"""
+        result = self.try_parse_analysis(response_text)
+        if result is not None:
+            return result
 
         return {
             "summary": "분석을 수행할 수 없습니다.",
@@ -145,8 +194,25 @@ class AIService:
         conversation = self._format_messages(messages)
         return self.analyze_conversation(conversation)
 
+    async def analyze_call_async(self, messages: list) -> dict:
+        """Legacy call analysis for async handlers"""
+        conversation = self._format_messages(messages)
+        return await self.analyze_conversation_async(conversation)
+
     def _format_messages(self, messages: list) -> str:
         return "\n".join([
             f"{'사용자' if m['role'] == 'user' else 'AI'}: {m['content']}"
             for m in messages
         ])
+
+
+# Shared instance (routes and Celery tasks)
+_ai_service: Optional[AIService] = None
+
+
+def get_ai_service() -> AIService:
+    """Get or create the shared AIService."""
+    global _ai_service
+    if _ai_service is None:
+        _ai_service = AIService()
+    return _ai_service
@@ -0,0 +1,297 @@
+"""
+Batch API backends for non-urgent bulk LLM work.
+
+Requests are written as JSONL in the OpenAI Batch API input format (one
+``{"custom_id", "method", "url", "body"}`` object per line) and submitted to
+a backend. Batch requests are billed at half price and run against a
+separate quota, so large jobs don't compete with real-time calls.
+
+Backends:
+- ``OpenAIBatchBackend``: the OpenAI Batch API (files + batches endpoints)
+- ``LocalBatchBackend``: file-based stand-in that answers every request
+  with a local responder function (tests and local development)
+
+Both produce output lines in the OpenAI Batch API output format.
+"""
+
+import json
+import logging
+import os
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+CHAT_COMPLETIONS_ENDPOINT = "/v1/chat/completions"
+
+
+class BatchStatus(str, Enum):
+    """Lifecycle of a submitted batch (subset of the OpenAI batch statuses)."""
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    EXPIRED = "expired"
+    CANCELLED = "cancelled"
+
+    @property
+    def is_final(self) -> bool:
+        return self != BatchStatus.IN_PROGRESS
+
+
+@dataclass
+class BatchInfo:
+    """State of a submitted batch."""
+    batch_id: str
+    status: BatchStatus
+    request_counts: Dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchResult:
+    """One output line: the response body for a custom_id, or an error."""
+    custom_id: str
+    body: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def content(self) -> Optional[str]:
+        """Assistant message content of a chat completion response."""
+        try:
+            return self.body["choices"][0]["message"]["content"]
+        except (TypeError, KeyError, IndexError):
+            return None
+
+
+def chat_request(custom_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    """Batch input line for a chat completion request."""
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": CHAT_COMPLETIONS_ENDPOINT,
+        "body": body,
+    }
+
+
+def write_jsonl(path: str, lines: Iterable[Dict[str, Any]]) -> int:
+    """Write objects as JSONL; returns the number of lines written."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def parse_output_line(line: Dict[str, Any]) -> BatchResult:
+    """Convert a Batch API output line into a BatchResult."""
+    custom_id = line.get("custom_id", "")
+    if line.get("error"):
+        error = line["error"]
+        return BatchResult(custom_id=custom_id, error=error.get("message") if isinstance(error, dict) else str(error))
+
+    response = line.get("response") or {}
+    if response.get("status_code") != 200:
+        return BatchResult(custom_id=custom_id, error=f"HTTP {response.get('status_code')}")
+    return BatchResult(custom_id=custom_id, body=response.get("body"))
+
+
+class BatchBackend(ABC):
+    """Submits JSONL request files and returns their results."""
+
+    @abstractmethod
+    def submit(self, input_path: str, metadata: Optional[Dict[str, str]] = None) -> str:
+        """Submit a JSONL input file; returns the batch id."""
+
+    @abstractmethod
+    def get_status(self, batch_id: str) -> BatchInfo:
+        """Current state of a batch."""
+
+    @abstractmethod
+    def iter_results(self, batch_id: str) -> Iterator[BatchResult]:
+        """Results of a completed batch (successes and per-request errors)."""
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API backend (24h completion window)."""
+
+    # OpenAI batch statuses mapped onto BatchStatus
+    STATUS_MAP = {
+        "validating": BatchStatus.IN_PROGRESS,
+        "in_progress": BatchStatus.IN_PROGRESS,
+        "finalizing": BatchStatus.IN_PROGRESS,
+        "cancelling": BatchStatus.IN_PROGRESS,
+        "completed": BatchStatus.COMPLETED,
+        "failed": BatchStatus.FAILED,
+        "expired": BatchStatus.EXPIRED,
+        "cancelled": BatchStatus.CANCELLED,
+    }
+
+    def __init__(self, client: Any = None, completion_window: str = "24h"):
+        if client is None:
+            from app.core.llm_clients import get_openai_client
+            client = get_openai_client()
+        self.client = client
+        self.completion_window = completion_window
+
+    def submit(self, input_path: str, metadata: Optional[Dict[str, str]] = None) -> str:
+        with open(input_path, "rb") as f:
+            input_file = self.client.files.create(file=f, purpose="batch")
+
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=CHAT_COMPLETIONS_ENDPOINT,
+            completion_window=self.completion_window,
+            metadata=metadata,
+        )
+        logger.info(f"[BatchAPI] Submitted batch {batch.id} ({input_path})")
+        return batch.id
+
+    def get_status(self, batch_id: str) -> BatchInfo:
+        batch = self.client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        errors = getattr(batch, "errors", None)
+        return BatchInfo(
+            batch_id=batch_id,
+            status=self.STATUS_MAP.get(batch.status, BatchStatus.IN_PROGRESS),
+            request_counts={
+                "total": counts.total,
+                "completed": counts.completed,
+                "failed": counts.failed,
+            } if counts else {},
+            error=str(errors.data[0].message) if errors and errors.data else None,
+        )
+
+    def iter_results(self, batch_id: str) -> Iterator[BatchResult]:
+        batch = self.client.batches.retrieve(batch_id)
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            text = self.client.files.content(file_id).text
+            for raw in text.splitlines():
+                if raw.strip():
+                    yield parse_output_line(json.loads(raw))
+
+
+def default_local_responder(body: Dict[str, Any]) -> str:
+    """Local responder: a neutral analysis so the pipeline can run offline."""
+    return json.dumps({
+        "summary": "로컬 배치 분석 결과",
+        "risk_score": 0,
+        "concerns": "",
+        "recommendations": "",
+    }, ensure_ascii=False)
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    File-based stand-in for the Batch API.
+
+    ``submit`` answers every request line with ``responder(body)`` right
+    away and writes an output file in the Batch API output format next to a
+    small state file, so status and results can be read from another
+    process (e.g. a later Celery task).
+
+    Args:
+        directory: Where batch state and output files are kept
+        responder: Returns the assistant content for a request body;
+            raising marks that request as failed
+        polls_until_complete: Number of ``get_status`` calls that report
+            ``in_progress`` before the batch completes
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        responder: Callable[[Dict[str, Any]], str] = default_local_responder,
+        polls_until_complete: int = 0,
+    ):
+        self.directory = directory
+        self.responder = responder
+        self.polls_until_complete = polls_until_complete
+        os.makedirs(directory, exist_ok=True)
+
+    def _state_path(self, batch_id: str) -> str:
+        return os.path.join(self.directory, f"{batch_id}.state.json")
+
+    def _output_path(self, batch_id: str) -> str:
+        return os.path.join(self.directory, f"{batch_id}.output.jsonl")
+
+    def _load_state(self, batch_id: str) -> Dict[str, Any]:
+        with open(self._state_path(batch_id), encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_state(self, batch_id: str, state: Dict[str, Any]) -> None:
+        with open(self._state_path(batch_id), "w", encoding="utf-8") as f:
+            json.dump(state, f)
+
+    def submit(self, input_path: str, metadata: Optional[Dict[str, str]] = None) -> str:
+        batch_id = f"batch_local_{uuid.uuid4().hex[:12]}"
+        outputs: List[Dict[str, Any]] = []
+        completed = failed = 0
+
+        with open(input_path, encoding="utf-8") as f:
+            for raw in f:
+                if not raw.strip():
+                    continue
+                request = json.loads(raw)
+                try:
+                    content = self.responder(request["body"])
+                    outputs.append({
+                        "id": f"{batch_id}_{request['custom_id']}",
+                        "custom_id": request["custom_id"],
+                        "response": {
+                            "status_code": 200,
+                            "body": {"choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]},
+                        },
+                        "error": None,
+                    })
+                    completed += 1
+                except Exception as e:
+                    outputs.append({
+                        "id": f"{batch_id}_{request['custom_id']}",
+                        "custom_id": request["custom_id"],
+                        "response": None,
+                        "error": {"code": "local_error", "message": str(e)},
+                    })
+                    failed += 1
+
+        write_jsonl(self._output_path(batch_id), outputs)
+        self._save_state(batch_id, {
+            "polls_left": self.polls_until_complete,
+            "metadata": metadata or {},
+            "request_counts": {"total": completed + failed, "completed": completed, "failed": failed},
+        })
+        logger.info(f"[BatchAPI] Local batch {batch_id}: {completed} completed, {failed} failed")
+        return batch_id
+
+    def get_status(self, batch_id: str) -> BatchInfo:
+        state = self._load_state(batch_id)
+        if state["polls_left"] > 0:
+            state["polls_left"] -= 1
+            self._save_state(batch_id, state)
+            return BatchInfo(batch_id=batch_id, status=BatchStatus.IN_PROGRESS)
+        return BatchInfo(
+            batch_id=batch_id,
+            status=BatchStatus.COMPLETED,
+            request_counts=state["request_counts"],
+        )
+
+    def iter_results(self, batch_id: str) -> Iterator[BatchResult]:
+        with open(self._output_path(batch_id), encoding="utf-8") as f:
+            for raw in f:
+                if raw.strip():
+                    yield parse_output_line(json.loads(raw))
+
+
+def get_batch_backend() -> BatchBackend:
+    """Batch backend selected by BATCH_API_BACKEND ("openai" or "local")."""
+    if settings.BATCH_API_BACKEND == "local":
+        return LocalBatchBackend(settings.BATCH_API_DIR)
+    return OpenAIBatchBackend()
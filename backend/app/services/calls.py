@@ -1,11 +1,36 @@
+from typing import List, Optional
+
+from sqlalchemy import and_, exists, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from app.models.call import Call
 from app.models.message import Message
 from app.models.call_analysis import CallAnalysis
 from app.models.elderly import Elderly
 from app.schemas.call import CallCreateRequest
 from app.core.exceptions import NotFoundError, ForbiddenError
+from app.services.device_events import device_events
+
+
+def pending_call_query(elderly_id: int, now: datetime):
+    """
+    기기가 받아야 할 통화: 진행 중인 통화(보호자 발신 등) 또는 -5분 ~ +60분 사이의 예약 자동 통화.
+
+    진행 중 통화를 먼저, 그다음 예약 시각 순.
+    """
+    return select(Call).where(
+        Call.elderly_id == elderly_id,
+        or_(
+            Call.status == "in_progress",
+            and_(
+                Call.trigger_type == "auto",
+                Call.status == "scheduled",
+                Call.scheduled_for >= now - timedelta(minutes=5),
+                Call.scheduled_for <= now + timedelta(minutes=60),
+            ),
+        ),
+    ).order_by(Call.status.desc(), Call.scheduled_for.asc()).limit(1)
 
 
 class CallService:
@@ -27,6 +52,9 @@ class CallService:
         db.commit()
         db.refresh(new_call)
 
+        # 어르신 기기로 즉시 전달 (기기 이벤트 채널)
+        device_events.publish_pending_call(new_call.elderly_id, new_call.id, new_call.status)
+
         return new_call
 
     @staticmethod
@@ -67,6 +95,30 @@ class CallService:
 
         return call
 
+    @staticmethod
+    def get_pending_call(db: Session, elderly_id: int) -> Optional[Call]:
+        return db.execute(pending_call_query(elderly_id, datetime.utcnow())).scalars().first()
+
+    @staticmethod
+    def get_analysis_status(call: Call) -> str:
+        """분석 상태: completed(완료), pending(대기/진행 중), failed(분석 실패), none(분석할 메시지 없음)"""
+        if call.analysis:
+            return "completed"
+        if call.status == "completed" and call.messages:
+            return "failed" if call.analysis_failed_at else "pending"
+        return "none"
+
+    @staticmethod
+    def is_analysis_settled(db: Session, call_id: int) -> bool:
+        """분석 결과가 저장됐거나 실패가 기록됐는지 (long-poll용, 메시지를 읽지 않는 가벼운 조회)"""
+        return db.query(Call.id).filter(
+            Call.id == call_id,
+            or_(
+                Call.analysis_failed_at.isnot(None),
+                exists().where(CallAnalysis.call_id == Call.id),
+            ),
+        ).first() is not None
+
     @staticmethod
     def save_message(db: Session, call_id: int, role: str, content: str):
         message = Message(
@@ -79,6 +131,47 @@ class CallService:
         db.refresh(message)
         return message
 
+    # --- async (WebSocket 경로용: DB 대기 중에도 이벤트 루프의 다른 통화가 진행됨) ---
+
+    @staticmethod
+    async def get_call_async(db: AsyncSession, call_id: int) -> Optional[Call]:
+        return await db.get(Call, call_id)
+
+    @staticmethod
+    async def get_pending_call_async(db: AsyncSession, elderly_id: int) -> Optional[Call]:
+        return (await db.execute(pending_call_query(elderly_id, datetime.utcnow()))).scalars().first()
+
+    @staticmethod
+    async def get_messages_async(db: AsyncSession, call_id: int) -> List[Message]:
+        result = await db.execute(
+            select(Message).where(Message.call_id == call_id).order_by(Message.created_at)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def complete_call_async(db: AsyncSession, call_id: int) -> bool:
+        """
+        진행 중인 통화를 completed로 마감 (WS end_call / 자동 종료 / 연결 끊김).
+
+        새 세션에서 불러도 되도록 call_id로 받고, 세션에 이미 있는 객체라도 DB 최신 상태로 다시 읽는다.
+
+        Returns:
+            이번에 마감했으면 True (분석 태스크 큐잉은 호출자 몫), 이미 마감된 통화면 False
+        """
+        call = await db.get(Call, call_id, populate_existing=True)
+        if call is None or call.status != "in_progress":
+            return False
+
+        call.status = "completed"
+        call.ended_at = datetime.now(timezone.utc)
+        if call.started_at:
+            # Handle naive datetime from DB
+            started = call.started_at if call.started_at.tzinfo else call.started_at.replace(tzinfo=timezone.utc)
+            call.duration = int((call.ended_at - started).total_seconds())
+        call.is_successful = True
+        await db.commit()
+        return True
+
     @staticmethod
     def save_analysis(db: Session, call_id: int, analysis_data: dict):
         analysis = CallAnalysis(
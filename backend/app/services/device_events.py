@@ -0,0 +1,180 @@
+"""
+Device event channel: push pending calls to paired elderly devices.
+
+Devices used to poll ``GET /api/device/pending-call`` every few seconds.
+Instead they keep one WebSocket open (``/api/device/events``) and the call
+creation paths publish to it through Redis pub/sub:
+
+- ``check_schedules`` / the heap scheduler → ``dispatch_call_follow_ups``
+- ``CallService.start_call`` (caregiver-initiated call)
+- ``PairingService.disconnect_device`` (closes the unpaired device's channel)
+
+Publishing is synchronous (Celery tasks, sync REST services) and never
+raises: the polling endpoint stays as a fallback. Async routes call the
+publishing services in the threadpool, so the Redis round trip never
+blocks the event loop. Each API process holds a single pattern
+subscription (``DeviceEventHub``) and fans events out to the devices
+connected to it.
+
+Usage:
+    device_events.publish_pending_call(elderly_id, call_id, "scheduled")
+
+    queue = device_event_hub.subscribe(elderly_id)
+    event = await queue.get()
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "device_events:"
+
+# Put into every local queue after the subscription was (re)established:
+# events published while it was down are lost, so handlers re-read the DB
+RESYNC_EVENT = {"type": "resync"}
+
+
+def channel_for(elderly_id: int) -> str:
+    return f"{CHANNEL_PREFIX}{elderly_id}"
+
+
+def pending_call_event(call_id: int, status: str, scheduled_at: Optional[datetime] = None) -> Dict[str, Any]:
+    """Same fields as GET /api/device/pending-call's data."""
+    return {
+        "type": "pending_call",
+        "call_id": call_id,
+        "status": status,
+        "scheduled_at": scheduled_at.isoformat() if scheduled_at else None,
+    }
+
+
+class DeviceEventPublisher:
+    """Publishes device events to Redis (sync, for Celery tasks and REST services)."""
+
+    def __init__(self):
+        self._redis = None
+
+    @property
+    def redis(self):
+        """Lazy initialization of Redis connection."""
+        if self._redis is None:
+            self._redis = redis.from_url(settings.REDIS_URL, socket_connect_timeout=1, socket_timeout=1)
+        return self._redis
+
+    def publish(self, events: Iterable[Tuple[int, Dict[str, Any]]]) -> int:
+        """
+        Publish (elderly_id, event) pairs in one round trip.
+
+        Returns:
+            Number of events published (0 if Redis is unavailable)
+        """
+        events = list(events)
+        if not events:
+            return 0
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for elderly_id, event in events:
+                pipe.publish(channel_for(elderly_id), json.dumps(event))
+            pipe.execute()
+        except redis.RedisError as e:
+            # 폴링 엔드포인트가 남아 있으므로 통화 생성은 계속 진행
+            logger.warning(f"Failed to publish {len(events)} device events: {e}")
+            return 0
+        return len(events)
+
+    def publish_pending_call(
+        self, elderly_id: int, call_id: int, status: str, scheduled_at: Optional[datetime] = None
+    ) -> int:
+        return self.publish([(elderly_id, pending_call_event(call_id, status, scheduled_at))])
+
+    def publish_device_unpaired(self, elderly_id: int, device_id: int) -> int:
+        return self.publish([(elderly_id, {"type": "device_unpaired", "device_id": device_id})])
+
+
+class DeviceEventHub:
+    """One Redis pattern subscription per API process, fanned out to local device connections."""
+
+    QUEUE_SIZE = 100
+    RECONNECT_DELAY = 1.0
+
+    def __init__(self):
+        self._listeners: Dict[int, Set[asyncio.Queue]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def connections(self) -> int:
+        return sum(len(queues) for queues in self._listeners.values())
+
+    def subscribe(self, elderly_id: int) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self._listeners.setdefault(elderly_id, set()).add(queue)
+        if self._task is None or self._task.done() or self._task.get_loop() is not asyncio.get_running_loop():
+            self._task = asyncio.create_task(self._listen())
+        return queue
+
+    def unsubscribe(self, elderly_id: int, queue: asyncio.Queue) -> None:
+        queues = self._listeners.get(elderly_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._listeners[elderly_id]
+
+    def dispatch(self, elderly_id: int, event: Dict[str, Any]) -> None:
+        for queue in self._listeners.get(elderly_id, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning(f"Device event queue full for elderly {elderly_id}, dropping {event.get('type')}")
+
+    def _resync_all(self) -> None:
+        for elderly_id in list(self._listeners):
+            self.dispatch(elderly_id, RESYNC_EVENT)
+
+    async def _listen(self) -> None:
+        resubscribed = False
+        while True:
+            client = aioredis.from_url(settings.REDIS_URL)
+            pubsub = client.pubsub()
+            try:
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                if resubscribed:
+                    self._resync_all()
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    channel = message["channel"].decode()
+                    self.dispatch(int(channel[len(CHANNEL_PREFIX):]), json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Device event subscription failed, retrying: {e}")
+            finally:
+                try:
+                    await pubsub.close()
+                    await client.close()
+                except Exception:
+                    pass
+            resubscribed = True
+            await asyncio.sleep(self.RECONNECT_DELAY)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+device_events = DeviceEventPublisher()
+device_event_hub = DeviceEventHub()
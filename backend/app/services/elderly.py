@@ -1,8 +1,66 @@
+from collections import defaultdict
+from functools import lru_cache
+from datetime import datetime, time, timedelta, timezone
+from typing import Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
 from sqlalchemy.orm import Session, joinedload
 from app.models.elderly import Elderly
+from app.models.call_schedule_slot import CallScheduleSlot
 from app.schemas.elderly import ElderlyCreateRequest, ElderlyUpdateRequest
 from app.core.exceptions import NotFoundError, ForbiddenError
 
+KST = ZoneInfo("Asia/Seoul")
+UTC = timezone.utc
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+
+@lru_cache(maxsize=4096)
+def _normalize_time(value: str) -> Optional[str]:
+    """ "9:00" → "09:00". 잘못된 값은 None."""
+    try:
+        return datetime.strptime(value, "%H:%M").strftime("%H:%M")
+    except (TypeError, ValueError):
+        return None
+
+
+def schedule_slots(call_schedule: Optional[dict]) -> Set[Tuple[int, str]]:
+    """call_schedule JSON → (weekday, "HH:MM") 슬롯 집합 (비활성/잘못된 시간은 제외)."""
+    schedule = call_schedule or {}
+    if not schedule.get("enabled", False):
+        return set()
+
+    days = schedule.get("days")
+    weekdays = [WEEKDAYS.index(d.lower()) for d in days if d.lower() in WEEKDAYS] if days else range(7)
+
+    # 잘못된 값은 기존 문자열 비교에서도 매칭되지 않던 값이므로 제외
+    times = {t for t in map(_normalize_time, schedule.get("times", [])) if t}
+
+    return {(weekday, t) for weekday in weekdays for t in times}
+
+
+def next_fire_time(call_schedule: Optional[dict], after: datetime) -> Optional[datetime]:
+    """
+    after(UTC naive) 이후 첫 예약 시각 (UTC naive, 분 단위). 스케줄이 없으면 None.
+
+    요일/시각 매칭은 check_schedules와 같이 KST 기준.
+    """
+    times_by_weekday = defaultdict(list)
+    for weekday, slot_time in schedule_slots(call_schedule):
+        times_by_weekday[weekday].append(slot_time)
+    if not times_by_weekday:
+        return None
+
+    after_kst = after.replace(tzinfo=UTC).astimezone(KST)
+    for offset in range(8):
+        day = after_kst.date() + timedelta(days=offset)
+        for slot_time in sorted(times_by_weekday.get(day.weekday(), [])):
+            hour, minute = map(int, slot_time.split(":"))
+            candidate = datetime.combine(day, time(hour, minute), KST)
+            if candidate > after_kst:
+                return candidate.astimezone(UTC).replace(tzinfo=None)
+    return None
+
 
 class ElderlyService:
     @staticmethod
@@ -18,6 +76,7 @@ class ElderlyService:
             emergency_contact=elderly_data.emergency_contact,
             notes=elderly_data.notes
         )
+        ElderlyService.sync_schedule(new_elderly)
         db.add(new_elderly)
         db.commit()
         db.refresh(new_elderly)
@@ -55,6 +114,9 @@ class ElderlyService:
             elif value is not None:
                 setattr(elderly, key, value)
 
+        if update_data.get("call_schedule"):
+            ElderlyService.sync_schedule(elderly)
+
         db.add(elderly)
         db.commit()
         db.refresh(elderly)
@@ -66,3 +128,47 @@ class ElderlyService:
         db.delete(elderly)
         db.commit()
         return True
+
+    @staticmethod
+    def sync_schedule(elderly: Elderly):
+        """
+        call_schedule_slots와 next_fire_at을 elderly.call_schedule과 일치시킴.
+        슬롯은 변경분만 반영. 커밋은 호출자.
+        """
+        elderly.next_fire_at = next_fire_time(elderly.call_schedule, datetime.utcnow())
+
+        desired = schedule_slots(elderly.call_schedule)
+        for slot in list(elderly.schedule_slots):
+            key = (slot.weekday, slot.slot_time)
+            if key in desired:
+                desired.discard(key)
+            else:
+                elderly.schedule_slots.remove(slot)
+        for weekday, slot_time in sorted(desired):
+            elderly.schedule_slots.append(CallScheduleSlot(weekday=weekday, slot_time=slot_time))
+
+    @staticmethod
+    def rebuild_schedule_slots(db: Session, chunk_size: int = 1000) -> int:
+        """
+        전체 슬롯과 next_fire_at 재생성 (배포 후 1회 백필 / 정합성 복구용).
+        생성된 슬롯 수 반환.
+        """
+        now = datetime.utcnow()
+        schedules = db.query(Elderly.id, Elderly.call_schedule).all()
+
+        db.query(CallScheduleSlot).delete(synchronize_session=False)
+        rows = [
+            {"weekday": weekday, "slot_time": slot_time, "elderly_id": elderly_id}
+            for elderly_id, call_schedule in schedules
+            for weekday, slot_time in schedule_slots(call_schedule)
+        ]
+        fire_times = [
+            {"id": elderly_id, "next_fire_at": next_fire_time(call_schedule, now)}
+            for elderly_id, call_schedule in schedules
+        ]
+        for start in range(0, len(rows), chunk_size):
+            db.bulk_insert_mappings(CallScheduleSlot, rows[start:start + chunk_size])
+        for start in range(0, len(fire_times), chunk_size):
+            db.bulk_update_mappings(Elderly, fire_times[start:start + chunk_size])
+        db.commit()
+        return len(rows)
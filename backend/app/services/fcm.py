@@ -2,12 +2,18 @@
 Firebase Cloud Messaging service for push notifications.
 """
 import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Optional, List, Dict, Any
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# FCM batch send limit (messages per send_each call)
+FCM_MAX_BATCH = 500
+
 # Firebase Admin SDK initialization
 _firebase_app = None
 
@@ -38,16 +44,100 @@ def _init_firebase():
         return None
 
 
+def _is_invalid_token_error(error: Exception) -> bool:
+    """Whether an FCM send error means the token is no longer registered."""
+    # firebase-admin 버전/환경에 따라 예외 타입이 다를 수 있음
+    code = getattr(error, "code", None)
+    if code in ("UNREGISTERED", "SENDER_ID_MISMATCH", "registration-token-not-registered"):
+        return True
+    error_str = str(error).lower()
+    return "not found" in error_str or "not-registered" in error_str
+
+
+def _build_message(token: str, title: str, body: str, data: Optional[Dict[str, str]] = None):
+    """Build a single-token FCM message with the default APNs sound/badge."""
+    from firebase_admin import messaging
+
+    return messaging.Message(
+        notification=messaging.Notification(
+            title=title,
+            body=body,
+        ),
+        data=data or {},
+        token=token,
+        apns=messaging.APNSConfig(
+            payload=messaging.APNSPayload(
+                aps=messaging.Aps(
+                    sound="default",
+                    badge=1,
+                )
+            )
+        ),
+    )
+
+
+@dataclass
+class FCMTokenStats:
+    """Invalid-token pruning metrics (per process)."""
+    invalid_tokens: int = 0  # Unregistered tokens reported by FCM
+    device_tokens_pruned: int = 0  # ElderlyDevice rows deactivated
+    user_tokens_pruned: int = 0  # Caregiver User.fcm_token values cleared
+    prune_updates: int = 0  # Bulk deactivations run (one per send)
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def pruned(self, invalid: int, devices: int, users: int) -> None:
+        with self._lock:
+            self.invalid_tokens += invalid
+            self.device_tokens_pruned += devices
+            self.user_tokens_pruned += users
+            self.prune_updates += 1
+
+    def to_dict(self) -> Dict[str, int]:
+        """Convert to dictionary for logging/metrics."""
+        return {
+            "invalid_tokens": self.invalid_tokens,
+            "device_tokens_pruned": self.device_tokens_pruned,
+            "user_tokens_pruned": self.user_tokens_pruned,
+            "prune_updates": self.prune_updates,
+        }
+
+
 class FCMService:
     """Service for sending push notifications via Firebase Cloud Messaging."""
 
     def __init__(self):
         self._app = _init_firebase()
+        self.stats = FCMTokenStats()
 
     @property
     def is_available(self) -> bool:
         """Check if FCM is properly configured and available."""
-        return self._app is not None
+        return self._app is not None or self._http_sender() is not None
+
+    def _http_sender(self):
+        """Pooled HTTP v1 sender when FCM_SEND_MODE=http (None otherwise or without credentials)."""
+        if settings.FCM_SEND_MODE != "http":
+            return None
+        from app.services.fcm_sender import get_fcm_sender
+
+        return get_fcm_sender()
+
+    def _send_http(self, sender, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Send through the HTTP v1 sender; same result shape as send_batch."""
+        results = sender.send_many(messages)
+        failed = [r for r in results if not r.success]
+        for r in failed:
+            if not r.invalid_token:
+                logger.error(f"Failed to send FCM message: {r.error_code} (status={r.status_code})")
+        return {
+            "success_count": len(results) - len(failed),
+            "failure_count": len(failed),
+            "failed_tokens": [r.token for r in failed],
+            "invalid_tokens": [r.token for r in failed if r.invalid_token],
+            "batches": sum(r.attempts for r in results),
+        }
 
     def send_to_token(
         self,
@@ -72,45 +162,27 @@ class FCMService:
             logger.warning("FCM not available. Skipping notification.")
             return None
 
+        sender = self._http_sender()
+        if sender is not None:
+            result = sender.send({"token": token, "title": title, "body": body, "data": data})
+            if result.invalid_token:
+                logger.warning(f"Invalid FCM token (code={result.error_code}): {token[:20]}...")
+                self.deactivate_tokens([token])
+            elif not result.success:
+                logger.error(f"Failed to send FCM message: {result.error_code} (status={result.status_code})")
+            return result.message_id
+
         try:
             from firebase_admin import messaging
 
-            message = messaging.Message(
-                notification=messaging.Notification(
-                    title=title,
-                    body=body,
-                ),
-                data=data or {},
-                token=token,
-                apns=messaging.APNSConfig(
-                    payload=messaging.APNSPayload(
-                        aps=messaging.Aps(
-                            sound="default",
-                            badge=1,
-                        )
-                    )
-                ),
-            )
-
-            response = messaging.send(message)
+            response = messaging.send(_build_message(token, title, body, data))
             logger.info(f"Successfully sent message: {response}")
             return response
 
         except Exception as e:
-            # firebase-admin 버전/환경에 따라 예외 타입이 다를 수 있음
-            error_str = str(e)
-
-            # 먼저 FirebaseError code 기반 처리 시도
-            code = getattr(e, "code", None)
-            if code in ("UNREGISTERED", "SENDER_ID_MISMATCH", "registration-token-not-registered"):
-                logger.warning(f"Invalid FCM token (code={code}): {token[:20]}...")
-                self._handle_invalid_token(token)
-                return None
-
-            # 문자열 기반 fallback 처리
-            if "Requested entity was not found" in error_str or "registration-token-not-registered" in error_str:
-                logger.warning(f"Invalid FCM token: {token[:20]}...")
-                self._handle_invalid_token(token)
+            if _is_invalid_token_error(e):
+                logger.warning(f"Invalid FCM token (code={getattr(e, 'code', None)}): {token[:20]}...")
+                self.deactivate_tokens([token])
             else:
                 logger.error(f"Failed to send FCM message: {e}")
             return None
@@ -126,7 +198,8 @@ class FCMService:
         Send a push notification to multiple device tokens.
 
         Returns:
-            Dict with success_count, failure_count, and failed_tokens
+            Dict with success_count, failure_count, failed_tokens and pruned
+            (invalid tokens deactivated)
         """
         if not self.is_available:
             logger.warning("FCM not available. Skipping multicast notification.")
@@ -135,6 +208,19 @@ class FCMService:
         if not tokens:
             return {"success_count": 0, "failure_count": 0, "failed_tokens": []}
 
+        sender = self._http_sender()
+        if sender is not None:
+            result = self._send_http(sender, [
+                {"token": token, "title": title, "body": body, "data": data} for token in tokens
+            ])
+            logger.info(f"Multicast result: {result['success_count']} success, {result['failure_count']} failed")
+            return {
+                "success_count": result["success_count"],
+                "failure_count": result["failure_count"],
+                "failed_tokens": result["failed_tokens"],
+                "pruned": self.deactivate_tokens(result["invalid_tokens"]),
+            }
+
         try:
             from firebase_admin import messaging
 
@@ -158,43 +244,150 @@ class FCMService:
             response = messaging.send_each_for_multicast(message)
 
             failed_tokens = []
+            invalid_tokens = []
             for idx, send_response in enumerate(response.responses):
                 if not send_response.success:
                     failed_tokens.append(tokens[idx])
                     error = send_response.exception
-                    if error and ("not found" in str(error).lower() or "not-registered" in str(error).lower()):
-                        self._handle_invalid_token(tokens[idx])
+                    if error and _is_invalid_token_error(error):
+                        invalid_tokens.append(tokens[idx])
 
             logger.info(f"Multicast result: {response.success_count} success, {response.failure_count} failed")
             return {
                 "success_count": response.success_count,
                 "failure_count": response.failure_count,
                 "failed_tokens": failed_tokens,
+                "pruned": self.deactivate_tokens(invalid_tokens),
             }
 
         except Exception as e:
             logger.error(f"Failed to send multicast FCM message: {e}")
             return {"success_count": 0, "failure_count": len(tokens), "failed_tokens": tokens}
 
-    def _handle_invalid_token(self, token: str):
-        """Mark an invalid token as inactive in the database."""
+    def send_batch(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Send individually addressed notifications in as few FCM calls as possible.
+
+        Messages are sent with ``send_each`` in chunks of FCM_MAX_BATCH, so
+        every message can carry its own body and data (unlike multicast,
+        which shares one payload across tokens). With FCM_SEND_MODE=http
+        they go through the pooled HTTP v1 sender concurrently instead.
+
+        Args:
+            messages: Dicts with token, title, body and optional data
+
+        Returns:
+            Dict with success_count, failure_count, failed_tokens,
+            invalid_tokens (unregistered; pass them to deactivate_tokens)
+            and batches (FCM requests made)
+        """
+        result = {
+            "success_count": 0,
+            "failure_count": 0,
+            "failed_tokens": [],
+            "invalid_tokens": [],
+            "batches": 0,
+        }
+        if not messages:
+            return result
+
+        if not self.is_available:
+            logger.warning("FCM not available. Skipping batch notification.")
+            result["failure_count"] = len(messages)
+            result["failed_tokens"] = [m["token"] for m in messages]
+            return result
+
+        sender = self._http_sender()
+        if sender is not None:
+            result = self._send_http(sender, messages)
+            logger.info(
+                f"Batch result: {result['success_count']} success, {result['failure_count']} failed "
+                f"in {result['batches']} FCM requests"
+            )
+            return result
+
+        from firebase_admin import messaging
+
+        for start in range(0, len(messages), FCM_MAX_BATCH):
+            chunk = messages[start:start + FCM_MAX_BATCH]
+            tokens = [m["token"] for m in chunk]
+            try:
+                response = messaging.send_each([
+                    _build_message(m["token"], m["title"], m["body"], m.get("data"))
+                    for m in chunk
+                ])
+            except Exception as e:
+                logger.error(f"Failed to send FCM batch of {len(chunk)}: {e}")
+                result["failure_count"] += len(chunk)
+                result["failed_tokens"].extend(tokens)
+                continue
+
+            result["batches"] += 1
+            result["success_count"] += response.success_count
+            result["failure_count"] += response.failure_count
+            for token, send_response in zip(tokens, response.responses):
+                if send_response.success:
+                    continue
+                result["failed_tokens"].append(token)
+                if send_response.exception and _is_invalid_token_error(send_response.exception):
+                    result["invalid_tokens"].append(token)
+
+        logger.info(
+            f"Batch result: {result['success_count']} success, {result['failure_count']} failed "
+            f"in {result['batches']} FCM calls"
+        )
+        return result
+
+    def deactivate_tokens(self, tokens: List[str], db=None) -> int:
+        """
+        Deactivate unregistered tokens with one bulk UPDATE per table.
+
+        Elderly devices are marked inactive; caregiver ``User.fcm_token``
+        values are cleared so alerts stop going to a dead token.
+
+        Args:
+            tokens: Tokens FCM reported as unregistered
+            db: Session to run in (the caller commits). Defaults to a
+                short-lived session committed here.
+
+        Returns:
+            Number of devices and users updated
+        """
+        tokens = list(set(tokens))
+        if not tokens:
+            return 0
+
+        from app.models.elderly_device import ElderlyDevice
+        from app.models.user import User
+
+        def prune(session) -> int:
+            devices = session.query(ElderlyDevice).filter(
+                ElderlyDevice.fcm_token.in_(tokens),
+                ElderlyDevice.is_active == True,
+            ).update({"is_active": False}, synchronize_session=False)
+            users = session.query(User).filter(
+                User.fcm_token.in_(tokens),
+            ).update({"fcm_token": None, "fcm_token_updated_at": datetime.utcnow()}, synchronize_session=False)
+            self.stats.pruned(len(tokens), devices, users)
+            logger.info(f"Pruned {len(tokens)} invalid FCM tokens: {devices} devices, {users} caregivers")
+            return devices + users
+
         try:
+            if db is not None:
+                return prune(db)
+
             from app.database import SessionLocal
-            from app.models.elderly_device import ElderlyDevice
 
-            db = SessionLocal()
+            session = SessionLocal()
             try:
-                device = db.query(ElderlyDevice).filter(
-                    ElderlyDevice.fcm_token == token
-                ).first()
-                if device:
-                    device.is_active = False
-                    db.commit()
-                    logger.info(f"Deactivated invalid FCM token for device {device.id}")
+                pruned = prune(session)
+                session.commit()
+                return pruned
             finally:
-                db.close()
+                session.close()
         except Exception as e:
-            logger.error(f"Failed to deactivate invalid token: {e}")
+            logger.error(f"Failed to deactivate {len(tokens)} invalid tokens: {e}")
+            return 0
 
 
 # Singleton instance
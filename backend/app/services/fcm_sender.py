@@ -0,0 +1,324 @@
+"""
+Pooled FCM HTTP v1 sender.
+
+The firebase-admin SDK sends one blocking request at a time from each
+Celery worker. This sender talks to the FCM HTTP v1 API directly:
+
+- one persistent httpx client per process (keep-alive, HTTP/2 when the
+  ``h2`` package is installed) authorized with a cached OAuth2 token
+- a thread pool bounded by FCM_HTTP_CONCURRENCY, so a batch of messages
+  is sent concurrently over the same connections
+- retry with exponential backoff (and Retry-After) on 429, 5xx and
+  transport errors
+
+Enabled with ``FCM_SEND_MODE=http``; FCMService then routes its sends here.
+
+Usage:
+    sender = get_fcm_sender()
+    results = sender.send_many([{"token": ..., "title": ..., "body": ..., "data": {...}}])
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+FCM_SCOPE = "https://www.googleapis.com/auth/firebase.messaging"
+
+# FCM error codes meaning the token will never work again
+INVALID_TOKEN_CODES = ("UNREGISTERED", "SENDER_ID_MISMATCH", "NOT_FOUND")
+
+
+class FCMAuthError(Exception):
+    """The OAuth2 access token could not be obtained (token_provider failure)."""
+
+
+@dataclass
+class FCMSendResult:
+    """Outcome of one message."""
+    token: str
+    success: bool
+    message_id: Optional[str] = None
+    error_code: Optional[str] = None
+    status_code: Optional[int] = None
+    attempts: int = 1
+
+    @property
+    def invalid_token(self) -> bool:
+        return self.error_code in INVALID_TOKEN_CODES
+
+
+@dataclass
+class FCMSenderStats:
+    """Request metrics of the sender (per process)."""
+    requests: int = 0
+    sent: int = 0
+    failed: int = 0
+    retries: int = 0
+    throttled: int = 0  # 429 responses
+    server_errors: int = 0  # 5xx responses and transport errors
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def to_dict(self) -> Dict[str, int]:
+        """Convert to dictionary for logging/metrics."""
+        return {
+            "requests": self.requests,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "server_errors": self.server_errors,
+        }
+
+
+class ServiceAccountToken:
+    """
+    OAuth2 access token for the FCM scope, refreshed shortly before expiry.
+
+    Thread-safe; the refresh is a blocking call made by whichever sending
+    thread first finds the token stale.
+    """
+
+    def __init__(self, credentials_path: str):
+        from google.oauth2 import service_account
+
+        self._credentials = service_account.Credentials.from_service_account_file(
+            credentials_path, scopes=[FCM_SCOPE]
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def project_id(self) -> Optional[str]:
+        return self._credentials.project_id
+
+    def __call__(self, force_refresh: bool = False) -> str:
+        with self._lock:
+            if force_refresh or not self._credentials.valid:
+                from google.auth.exceptions import GoogleAuthError
+                from google.auth.transport.requests import Request
+
+                try:
+                    self._credentials.refresh(Request())
+                except GoogleAuthError as e:  # RefreshError, TransportError
+                    raise FCMAuthError(str(e)) from e
+            return self._credentials.token
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def build_payload(message: Dict[str, Any]) -> Dict[str, Any]:
+    """FCM v1 request body for a message dict (token, title, body, data)."""
+    return {
+        "message": {
+            "token": message["token"],
+            "notification": {"title": message["title"], "body": message["body"]},
+            "data": message.get("data") or {},
+            "apns": {"payload": {"aps": {"sound": "default", "badge": 1}}},
+        }
+    }
+
+
+def _error_code(response: httpx.Response) -> str:
+    """FCM error code (details[].errorCode) or the generic status."""
+    try:
+        error = response.json().get("error", {})
+    except ValueError:
+        return f"HTTP_{response.status_code}"
+    for detail in error.get("details", []):
+        if detail.get("errorCode"):
+            return detail["errorCode"]
+    return error.get("status") or f"HTTP_{response.status_code}"
+
+
+class FCMHttpSender:
+    """
+    Concurrent FCM HTTP v1 sender with connection reuse and retries.
+
+    Args:
+        project_id: Firebase project id
+        token_provider: Callable returning a bearer token; called with
+            force_refresh=True after a 401. Raises FCMAuthError when no
+            token can be obtained (the message fails with error_code "AUTH")
+        base_url: FCM endpoint (a local stand-in in tests/benchmarks)
+        concurrency: Max requests in flight (threads and connections)
+        max_retries: Retries after the first attempt on 429/5xx/transport errors
+        backoff: First retry delay in seconds, doubled per attempt
+        backoff_max: Upper bound of one retry delay
+        transport: Optional httpx transport (tests)
+    """
+
+    def __init__(
+        self,
+        project_id: str,
+        token_provider: Callable[..., str],
+        base_url: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff: Optional[float] = None,
+        backoff_max: Optional[float] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+    ):
+        self.project_id = project_id
+        self._token_provider = token_provider
+        self.concurrency = concurrency or settings.FCM_HTTP_CONCURRENCY
+        self.max_retries = settings.FCM_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff = settings.FCM_RETRY_BACKOFF if backoff is None else backoff
+        self.backoff_max = backoff_max or settings.FCM_RETRY_BACKOFF_MAX
+        self.stats = FCMSenderStats()
+
+        http2 = transport is None and _http2_available()
+        self._client = httpx.Client(
+            base_url=base_url or settings.FCM_BASE_URL,
+            http2=http2,
+            transport=transport,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+            timeout=httpx.Timeout(settings.FCM_TIMEOUT),
+        )
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="fcm-send")
+        logger.info(f"[FCMSender] Created (concurrency={self.concurrency}, http2={http2})")
+
+    @property
+    def _path(self) -> str:
+        return f"/v1/projects/{self.project_id}/messages:send"
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        # Full jitter so throttled workers do not retry in lockstep
+        return random.uniform(0, min(self.backoff * (2 ** attempt), self.backoff_max))
+
+    def send(self, message: Dict[str, Any]) -> FCMSendResult:
+        """Send one message, retrying transient failures."""
+        payload = build_payload(message)
+        token = message["token"]
+        force_refresh = False
+        attempt = 0
+
+        while True:
+            try:
+                access_token = self._token_provider(force_refresh=force_refresh)
+            except FCMAuthError as e:
+                # 토큰 갱신 실패는 이 메시지만 실패 처리 (send_many의 배치 전체를 깨지 않도록)
+                self.stats.add(failed=1)
+                logger.error(f"[FCMSender] Access token refresh failed: {e}")
+                return FCMSendResult(token, False, error_code="AUTH", attempts=attempt + 1)
+
+            self.stats.add(requests=1)
+            response = None
+            try:
+                response = self._client.post(
+                    self._path,
+                    json=payload,
+                    headers={"Authorization": f"Bearer {access_token}"},
+                )
+            except httpx.TransportError as e:
+                self.stats.add(server_errors=1)
+                error_code, status_code = type(e).__name__, None
+            else:
+                if response.status_code == 200:
+                    self.stats.add(sent=1)
+                    return FCMSendResult(token, True, message_id=response.json().get("name"), attempts=attempt + 1)
+
+                error_code, status_code = _error_code(response), response.status_code
+                if status_code == 401 and not force_refresh:
+                    # Token revoked/expired early: refresh once, not counted as a retry
+                    force_refresh = True
+                    continue
+                if status_code == 429:
+                    self.stats.add(throttled=1)
+                elif status_code >= 500:
+                    self.stats.add(server_errors=1)
+                else:
+                    self.stats.add(failed=1)
+                    return FCMSendResult(token, False, error_code=error_code, status_code=status_code,
+                                         attempts=attempt + 1)
+
+            force_refresh = False
+            if attempt >= self.max_retries:
+                self.stats.add(failed=1)
+                logger.warning(f"[FCMSender] Giving up after {attempt + 1} attempts: {error_code}")
+                return FCMSendResult(token, False, error_code=error_code, status_code=status_code,
+                                     attempts=attempt + 1)
+
+            time.sleep(self._retry_delay(attempt, response))
+            attempt += 1
+            self.stats.add(retries=1)
+
+    def send_many(self, messages: List[Dict[str, Any]]) -> List[FCMSendResult]:
+        """Send messages concurrently (at most `concurrency` in flight); results keep input order."""
+        if not messages:
+            return []
+        return list(self._executor.map(self.send, messages))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self._client.close()
+
+
+# =============================================================================
+# Factory
+# =============================================================================
+
+_lock = threading.Lock()
+_sender: Optional[FCMHttpSender] = None
+
+
+def get_fcm_sender() -> Optional[FCMHttpSender]:
+    """
+    Get the process-wide sender, or None if FCM credentials are not configured.
+
+    Created lazily so that Celery prefork children build their own client
+    and thread pool after the fork.
+    """
+    global _sender
+    with _lock:
+        if _sender is None:
+            if not settings.FIREBASE_CREDENTIALS_PATH:
+                return None
+            try:
+                token = ServiceAccountToken(settings.FIREBASE_CREDENTIALS_PATH)
+            except Exception as e:
+                logger.error(f"[FCMSender] Failed to load credentials: {e}")
+                return None
+            _sender = FCMHttpSender(settings.FCM_PROJECT_ID or token.project_id, token)
+        return _sender
+
+
+def reset_fcm_sender() -> None:
+    """Drop the process-wide sender (for testing, and after fork)."""
+    global _sender, _lock
+    # After a fork the parent's pool threads do not exist in the child; do not wait on them
+    _lock = threading.Lock()
+    _sender = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_fcm_sender)
@@ -0,0 +1,472 @@
+"""
+Per-call write-behind buffer for conversation messages.
+
+Saving every user/assistant turn with its own INSERT + COMMIT puts a DB
+round trip on the hot path of each turn. The WebSocket handlers instead
+``add()`` messages to a MessageBuffer, which returns immediately and
+writes them with one bulk INSERT when
+
+- MESSAGE_FLUSH_INTERVAL seconds have passed,
+- MESSAGE_FLUSH_SIZE messages are pending, or
+- the caller flushes explicitly (end_call, disconnect, and always before
+  analyze_call is enqueued, so the analysis sees the whole conversation).
+
+A buffer only lives in the process that owns the WebSocket, so the REST end
+route of another worker cannot flush it. While a buffer holds messages that
+are not in the DB it sets a Redis flag (``pending_messages``); analyze_call
+checks the flag and waits for the owner's next timed flush.
+
+Durability is chosen with MESSAGE_DURABILITY:
+
+- ``immediate``: flush on every add (one commit per message, the old behaviour)
+- ``journal``: buffered, and each message is also appended to a local
+  journal file. A process that dies before flushing leaves the journal
+  behind; ``recover_journals()`` (run at API startup) inserts what is
+  missing. Protects against process crashes, not against losing the host.
+- ``buffered``: memory only; a crash loses at most one flush interval.
+
+Usage:
+    buffer = open_message_buffer(call_id, AsyncSessionLocal)
+    await buffer.add("user", text)
+    ...
+    await buffer.close()  # final flush
+"""
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import re
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import redis
+from sqlalchemy import insert, select, update
+
+from app.core.config import settings
+from app.models.message import Message
+
+logger = logging.getLogger(__name__)
+
+DURABILITY_MODES = ("immediate", "journal", "buffered")
+
+_JOURNAL_NAME = re.compile(r"call-(\d+)-[0-9a-f]{32}\.jsonl")
+
+# drain(): flush attempts before giving up, and the pause between them (seconds)
+DRAIN_ATTEMPTS = 3
+DRAIN_RETRY_DELAY = 0.5
+
+
+@dataclass
+class MessageBufferStats:
+    """Write metrics of all buffers in this process (event loop only, no lock needed)."""
+    added: int = 0
+    flushes: int = 0  # bulk INSERT + COMMIT round trips
+    flushed: int = 0  # messages written by those flushes
+    failed_flushes: int = 0
+    recovered: int = 0  # messages re-inserted from orphaned journals
+
+    def to_dict(self) -> Dict[str, int]:
+        """Convert to dictionary for logging/metrics."""
+        return {
+            "added": self.added,
+            "flushes": self.flushes,
+            "flushed": self.flushed,
+            "failed_flushes": self.failed_flushes,
+            "recovered": self.recovered,
+        }
+
+
+stats = MessageBufferStats()
+
+
+class PendingMessageMarker:
+    """
+    Redis flag per call: "some process holds messages of this call that are not in the DB".
+
+    Set when a buffer goes from empty to pending, cleared after the flush that
+    empties it. The TTL (MESSAGE_PENDING_TTL) bounds the wait when the owning
+    process dies; its journal is then recovered at restart.
+    """
+
+    KEY_PREFIX = "message_buffer:pending:"
+
+    def __init__(self):
+        self._redis = None
+
+    @property
+    def redis(self):
+        """Lazy initialization of Redis connection."""
+        if self._redis is None:
+            self._redis = redis.from_url(settings.REDIS_URL, socket_connect_timeout=1, socket_timeout=1)
+        return self._redis
+
+    def set(self, call_id: int, pending: bool) -> bool:
+        """Set or clear the flag (blocking; buffers call it in a thread). False if Redis failed."""
+        key = f"{self.KEY_PREFIX}{call_id}"
+        try:
+            if pending:
+                self.redis.set(key, 1, ex=settings.MESSAGE_PENDING_TTL)
+            else:
+                self.redis.delete(key)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to update pending message flag for call {call_id}: {e}")
+            return False
+        return True
+
+    def is_pending(self, call_id: int) -> bool:
+        """Whether messages of the call may still be missing from the DB (False if Redis is down)."""
+        try:
+            return bool(self.redis.exists(f"{self.KEY_PREFIX}{call_id}"))
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read pending message flag for call {call_id}: {e}")
+            return False
+
+
+pending_messages = PendingMessageMarker()
+
+# call_id -> open buffer (lets the REST end route flush a live call in this process)
+_buffers: Dict[int, "MessageBuffer"] = {}
+
+
+def _row_to_json(row: Dict[str, Any]) -> str:
+    return json.dumps({**row, "created_at": row["created_at"].isoformat()}, ensure_ascii=False)
+
+
+def _row_from_json(line: str) -> Dict[str, Any]:
+    row = json.loads(line)
+    row["created_at"] = datetime.fromisoformat(row["created_at"])
+    return row
+
+
+class MessageBuffer:
+    """Pending messages of one call, flushed to the DB in bulk."""
+
+    def __init__(
+        self,
+        call_id: int,
+        session_factory: Callable,
+        mode: Optional[str] = None,
+        flush_interval: Optional[float] = None,
+        flush_size: Optional[int] = None,
+        journal_dir: Optional[str] = None,
+    ):
+        self.call_id = call_id
+        self.mode = mode or settings.MESSAGE_DURABILITY
+        if self.mode not in DURABILITY_MODES:
+            raise ValueError(f"Unknown message durability mode: {self.mode}")
+        self.flush_interval = flush_interval or settings.MESSAGE_FLUSH_INTERVAL
+        self.flush_size = flush_size or settings.MESSAGE_FLUSH_SIZE
+        self.journal_dir = journal_dir or settings.MESSAGE_JOURNAL_DIR
+        self._session_factory = session_factory
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._journal = None
+        self.journal_path: Optional[str] = None
+        self.closed = False
+        self._marked = False  # pending_messages flag as last written
+        self._marker_task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def add(self, role: str, content: str) -> Dict[str, Any]:
+        """
+        Queue a message; only waits for the DB in immediate mode (or after close).
+
+        Returns:
+            The queued row, to pass to replace()
+        """
+        row = {
+            "call_id": self.call_id,
+            "role": role,
+            "content": content,
+            "created_at": datetime.utcnow(),  # 도착 순서 유지 (flush 시각이 아니라)
+        }
+        self._pending.append(row)
+        stats.added += 1
+
+        if self.mode == "immediate" or self.closed:
+            await self.flush()
+            return row
+
+        if self.mode == "journal":
+            self._append_journal(row)
+
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run())
+        if len(self._pending) >= self.flush_size:
+            self._wake.set()
+        self._update_marker()
+        return row
+
+    async def replace(self, row: Dict[str, Any], content: str) -> bool:
+        """
+        Overwrite the content of a message returned by add() (a corrected answer).
+
+        Still pending: swapped in the buffer (and journal) before it is
+        written. Already flushed: the stored row is updated, matched by
+        call, role and created_at.
+
+        Returns:
+            False if the stored row could not be updated
+        """
+        async with self._lock:  # 진행 중인 flush와 겹치지 않도록: 행은 pending이거나 이미 commit됨
+            row["content"] = content
+            if any(pending is row for pending in self._pending):
+                if self._journal is not None:
+                    self._rewrite_journal()
+                return True
+
+            try:
+                async with self._session_factory() as db:
+                    await db.execute(
+                        update(Message)
+                        .where(
+                            Message.call_id == self.call_id,
+                            Message.role == row["role"],
+                            Message.created_at == row["created_at"],
+                        )
+                        .values(content=content)
+                    )
+                    await db.commit()
+            except Exception as e:
+                logger.error(f"Failed to replace a message of call {self.call_id}: {e}")
+                return False
+            return True
+
+    async def flush(self) -> int:
+        """
+        Write all pending messages with one bulk INSERT.
+
+        A failed flush keeps the messages (and their journal lines) for the
+        next attempt instead of raising into the conversation.
+
+        Returns:
+            Number of messages written
+        """
+        async with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, []
+            try:
+                async with self._session_factory() as db:
+                    await db.execute(insert(Message), batch)
+                    await db.commit()
+            except Exception as e:
+                self._pending[:0] = batch
+                stats.failed_flushes += 1
+                logger.error(f"Failed to flush {len(batch)} messages for call {self.call_id}: {e}")
+                self._marked = False  # 다시 써서 TTL 연장 (실패가 이어지는 동안 분석이 기다리도록)
+                self._update_marker()
+                return 0
+
+            stats.flushes += 1
+            stats.flushed += len(batch)
+            if self._journal is not None:
+                self._rewrite_journal()
+            self._update_marker()
+            return len(batch)
+
+    async def drain(self) -> bool:
+        """
+        Flush before the call is analyzed, retrying a failed flush.
+
+        Returns:
+            True if every message is in the DB (and the pending flag is cleared)
+        """
+        for attempt in range(DRAIN_ATTEMPTS):
+            await self.flush()
+            if not self._pending:
+                break
+            if attempt + 1 < DRAIN_ATTEMPTS:
+                await asyncio.sleep(DRAIN_RETRY_DELAY)
+        await self._settle_marker()
+        return not self._pending
+
+    async def close(self) -> int:
+        """Stop the timer and flush what is left. Safe to call twice."""
+        self.closed = True
+        if self._flusher is not None:
+            self._wake.set()
+            try:
+                await self._flusher
+            except Exception as e:
+                logger.error(f"Message flusher for call {self.call_id} failed: {e}")
+            self._flusher = None
+
+        flushed = await self.flush()
+        await self._settle_marker()
+
+        if self._pending:
+            where = f"kept in {self.journal_path}" if self._journal is not None else "lost"
+            logger.error(f"{len(self._pending)} messages for call {self.call_id} not persisted ({where})")
+        if self._journal is not None:
+            if not self._pending:
+                try:
+                    os.remove(self.journal_path)
+                except OSError as e:
+                    logger.error(f"Failed to remove message journal {self.journal_path}: {e}")
+            # 남은 메시지가 있으면 파일은 두고 잠금만 해제 → 재시작 시 recover_journals 대상
+            self._journal.close()
+            self._journal = None
+
+        if _buffers.get(self.call_id) is self:
+            del _buffers[self.call_id]
+        return flushed
+
+    async def _run(self) -> None:
+        while not self.closed:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    # --- pending flag ---
+
+    def _update_marker(self) -> None:
+        """Bring the Redis flag in line with the buffer, off the hot path."""
+        if bool(self._pending) == self._marked:
+            return
+        if self._marker_task is None or self._marker_task.done():
+            self._marker_task = asyncio.create_task(self._sync_marker())
+
+    async def _sync_marker(self) -> None:
+        while bool(self._pending) != self._marked:
+            pending = bool(self._pending)
+            if not await asyncio.to_thread(pending_messages.set, self.call_id, pending):
+                return
+            self._marked = pending
+
+    async def _settle_marker(self) -> None:
+        """Wait until the flag matches the buffer (before analyze_call is enqueued)."""
+        if self._marker_task is not None:
+            await self._marker_task
+            self._marker_task = None
+        await self._sync_marker()
+
+    # --- journal ---
+
+    def _append_journal(self, row: Dict[str, Any]) -> None:
+        try:
+            if self._journal is None:
+                self._open_journal()
+            self._journal.write(_row_to_json(row) + "\n")
+            self._journal.flush()  # OS 버퍼까지 (프로세스가 죽어도 남음)
+        except OSError as e:
+            logger.error(f"Message journal write failed for call {self.call_id}: {e}")
+
+    def _open_journal(self) -> None:
+        # 잠근 뒤에 이름을 바꿔 공개: recover_journals는 잠기지 않은 파일만 주인 없는 저널로 본다
+        os.makedirs(self.journal_dir, exist_ok=True)
+        name = f"call-{self.call_id}-{uuid.uuid4().hex}.jsonl"
+        temp_path = os.path.join(self.journal_dir, f".{name}.tmp")
+        journal = open(temp_path, "a", encoding="utf-8")
+        fcntl.flock(journal.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self.journal_path = os.path.join(self.journal_dir, name)
+        os.rename(temp_path, self.journal_path)
+        self._journal = journal
+
+    def _rewrite_journal(self) -> None:
+        """Drop flushed lines: the journal only ever holds what is still pending."""
+        try:
+            self._journal.seek(0)
+            self._journal.truncate()
+            for row in self._pending:
+                self._journal.write(_row_to_json(row) + "\n")
+            self._journal.flush()
+        except OSError as e:
+            logger.error(f"Message journal rewrite failed for call {self.call_id}: {e}")
+
+
+def open_message_buffer(call_id: int, session_factory: Callable, **kwargs) -> MessageBuffer:
+    """Create the buffer for a call and register it for flush_call_messages()."""
+    buffer = MessageBuffer(call_id, session_factory, **kwargs)
+    _buffers[call_id] = buffer
+    return buffer
+
+
+def get_message_buffer(call_id: int) -> Optional[MessageBuffer]:
+    return _buffers.get(call_id)
+
+
+async def flush_call_messages(call_id: int) -> bool:
+    """
+    Drain a call's buffer if it is open in this process.
+
+    Returns:
+        False if messages are still pending here; a buffer in another
+        process is covered by the pending flag that analyze_call waits on
+    """
+    buffer = _buffers.get(call_id)
+    if buffer is None:
+        return True
+    return await buffer.drain()
+
+
+async def recover_journals(session_factory: Callable, journal_dir: Optional[str] = None) -> int:
+    """
+    Insert messages from journals whose process died before flushing.
+
+    Journals still locked belong to a live process and are skipped. Rows
+    already in the DB (crash between COMMIT and journal rewrite) are not
+    inserted twice.
+
+    Returns:
+        Number of messages recovered
+    """
+    directory = journal_dir or settings.MESSAGE_JOURNAL_DIR
+    if not os.path.isdir(directory):
+        return 0
+
+    recovered = 0
+    for name in sorted(os.listdir(directory)):
+        match = _JOURNAL_NAME.fullmatch(name)
+        if not match:
+            continue
+        path = os.path.join(directory, name)
+        call_id = int(match.group(1))
+
+        with open(path, "r", encoding="utf-8") as journal:
+            try:
+                fcntl.flock(journal.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue  # 살아 있는 프로세스의 저널
+
+            rows = []
+            for line in journal:
+                try:
+                    rows.append(_row_from_json(line))
+                except (ValueError, KeyError, TypeError):
+                    logger.warning(f"Skipping torn journal line in {name}")
+
+            if rows:
+                async with session_factory() as db:
+                    existing = set((await db.execute(
+                        select(Message.role, Message.content, Message.created_at).where(
+                            Message.call_id == call_id,
+                            Message.created_at >= min(row["created_at"] for row in rows),
+                        )
+                    )).all())
+                    missing = [
+                        row for row in rows
+                        if (row["role"], row["content"], row["created_at"]) not in existing
+                    ]
+                    if missing:
+                        await db.execute(insert(Message), missing)
+                        await db.commit()
+                recovered += len(missing)
+                logger.info(f"Recovered {len(missing)} messages for call {call_id} from {name}")
+
+            os.remove(path)
+
+    stats.recovered += recovered
+    return recovered
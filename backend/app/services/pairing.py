@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from typing import Optional, Tuple
 
+from app.core.auth_cache import invalidate_device
 from app.core.config import settings
 from app.core.security import (
     generate_pairing_code,
@@ -18,6 +19,7 @@ from app.core.exceptions import (
 from app.models.pairing_code import ElderlyPairingCode
 from app.models.elderly import Elderly
 from app.models.elderly_device import ElderlyDevice
+from app.services.device_events import device_events
 from app.services.rate_limiter import rate_limiter
 
 
@@ -291,3 +293,7 @@ class PairingService:
 
         device.is_active = False
         db.commit()
+
+        # 이 기기 토큰으로 캐시된 인증 결과 폐기 (다음 요청부터 401), 열린 이벤트 채널도 종료
+        invalidate_device(device.id)
+        device_events.publish_device_unpaired(elderly_id, device.id)
@@ -7,7 +7,7 @@ Provides tool registration, lookup, and execution management.
 import asyncio
 import logging
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
@@ -198,14 +198,35 @@ class ToolRegistry:
     - Tool registration and lookup
     - Category-based organization
     - Tag-based filtering
-    - Claude API format export
+    - Cached OpenAI / Claude API format export
     """
 
+    # Export formats and the Tool method that serializes each
+    EXPORT_FORMATS = {
+        "openai": Tool.to_openai_format,
+        "claude": Tool.to_claude_format,
+    }
+
+    # Max number of distinct tool subsets kept per format
+    SUBSET_CACHE_SIZE = 64
+
     def __init__(self):
         self._tools: Dict[str, Tool] = {}
         self._categories: Dict[str, List[str]] = {}
         self._tags: Dict[str, List[str]] = {}
 
+        # Export cache, rebuilt lazily after register/unregister
+        self._version = 0
+        self._export_version = -1
+        self._exports: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._subsets: Dict[Tuple[str, Optional[Tuple[str, ...]]], List[Dict[str, Any]]] = {}
+        self.export_builds = 0
+
+    @property
+    def version(self) -> int:
+        """Incremented whenever the set of registered tools changes."""
+        return self._version
+
     def register(self, tool: Tool) -> None:
         """Register a new tool."""
         if tool.name in self._tools:
@@ -226,6 +247,7 @@ class ToolRegistry:
             if tool.name not in self._tags[tag]:
                 self._tags[tag].append(tool.name)
 
+        self._version += 1
         logger.info(f"Tool registered: {tool.name} (category: {tool.category})")
 
     def unregister(self, name: str) -> bool:
@@ -245,6 +267,7 @@ class ToolRegistry:
             if tag in self._tags:
                 self._tags[tag] = [t for t in self._tags[tag] if t != name]
 
+        self._version += 1
         logger.info(f"Tool unregistered: {name}")
         return True
 
@@ -277,7 +300,25 @@ class ToolRegistry:
 
         return [self._tools[name] for name in matching_names if name in self._tools]
 
-    def to_claude_format(self, tool_names: List[str] = None) -> List[Dict[str, Any]]:
+    # =========================================================================
+    # API Format Export
+    # =========================================================================
+
+    def to_openai_format(self, tool_names: Iterable[str] = None) -> List[Dict[str, Any]]:
+        """
+        Export tools in OpenAI Function Calling format.
+
+        Args:
+            tool_names: Optional tools to export (unknown names are ignored).
+                       If None, exports all tools.
+
+        Returns:
+            Tool schemas in registration order. The dicts are shared across
+            calls and must not be mutated.
+        """
+        return self._export("openai", tool_names)
+
+    def to_claude_format(self, tool_names: Iterable[str] = None) -> List[Dict[str, Any]]:
         """
         Export tools in Claude API format.
 
@@ -285,12 +326,48 @@ class ToolRegistry:
             tool_names: Optional list of specific tools to export.
                        If None, exports all tools.
         """
+        return self._export("claude", tool_names)
+
+    def _export(self, fmt: str, tool_names: Optional[Iterable[str]]) -> List[Dict[str, Any]]:
+        """
+        Return the cached export for a format, optionally subset by name.
+
+        Each tool is serialized once per registry version; subsets are
+        memoized so the same per-turn selection returns the same list.
+        """
+        if self._export_version != self._version:
+            self._rebuild_exports()
+
+        schemas = self._exports[fmt]
         if tool_names is None:
-            tools = self._tools.values()
+            # Distinct from an empty subset, which is also a valid selection
+            key = (fmt, None)
+            names = None
         else:
-            tools = [self._tools[name] for name in tool_names if name in self._tools]
+            wanted = set(tool_names)
+            names = tuple(name for name in schemas if name in wanted)
+            key = (fmt, names)
+
+        subset = self._subsets.get(key)
+        if subset is None:
+            if len(self._subsets) >= self.SUBSET_CACHE_SIZE:
+                self._subsets.clear()
+            subset = [schemas[name] for name in (names if names is not None else schemas)]
+            self._subsets[key] = subset
+
+        return list(subset)
+
+    def _rebuild_exports(self) -> None:
+        """Serialize every registered tool in every export format."""
+        self._exports = {
+            fmt: {name: serialize(tool) for name, tool in self._tools.items()}
+            for fmt, serialize in self.EXPORT_FORMATS.items()
+        }
+        self._subsets.clear()
+        self._export_version = self._version
+        self.export_builds += 1
 
-        return [tool.to_claude_format() for tool in tools]
+        logger.debug(f"[ToolRegistry] Export cache built for {len(self._tools)} tools (v{self._version})")
 
     async def execute(self, name: str, **kwargs) -> ToolResult:
         """Execute a tool by name."""
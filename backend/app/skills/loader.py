@@ -16,6 +16,8 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Set
 import json
 
+from app.core.keywords import get_keyword_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,6 +44,22 @@ class Skill:
     priority: int = 0
     enabled: bool = True
 
+    def __post_init__(self):
+        # Triggers and tags are matched through the shared keyword index
+        index = get_keyword_index()
+        index.register(self.trigger_category, self.triggers)
+        index.register(self.tag_category, self.tags)
+
+    @property
+    def trigger_category(self) -> str:
+        """Keyword index category holding this skill's triggers."""
+        return f"skill.{self.name}.trigger"
+
+    @property
+    def tag_category(self) -> str:
+        """Keyword index category holding this skill's tags."""
+        return f"skill.{self.name}.tag"
+
     def get_metadata(self) -> Dict[str, any]:
         """
         Get skill metadata for progressive disclosure.
@@ -84,34 +102,18 @@ class Skill:
 
     def matches_intent(self, user_input: str) -> bool:
         """Check if skill matches user intent based on triggers and tags."""
-        input_lower = user_input.lower()
-
-        # Check triggers
-        for trigger in self.triggers:
-            if trigger.lower() in input_lower:
-                return True
-
-        # Check tags
-        for tag in self.tags:
-            if tag.lower() in input_lower:
-                return True
-
-        return False
+        matches = get_keyword_index().match(user_input)
+        return matches.any_of(self.trigger_category, self.tag_category)
 
     def get_match_score(self, user_input: str) -> float:
         """Calculate match score for ranking skills."""
-        input_lower = user_input.lower()
-        score = 0.0
+        matches = get_keyword_index().match(user_input)
 
         # Trigger matches (weighted heavily)
-        for trigger in self.triggers:
-            if trigger.lower() in input_lower:
-                score += 0.5
+        score = matches.count(self.trigger_category) * 0.5
 
         # Tag matches
-        for tag in self.tags:
-            if tag.lower() in input_lower:
-                score += 0.2
+        score += matches.count(self.tag_category) * 0.2
 
         # Category bonus for specific categories
         category_weights = {
@@ -419,6 +421,11 @@ class SkillLoader:
 
     def reload(self) -> None:
         """Reload all skills from disk."""
+        index = get_keyword_index()
+        for skill in self.skills.values():
+            index.unregister(skill.trigger_category)
+            index.unregister(skill.tag_category)
+
         self.skills.clear()
         self.skills_by_category.clear()
         self.skills_by_tag.clear()
@@ -1,26 +1,102 @@
 """
 Analysis Celery tasks for post-call processing.
 """
+import asyncio
 import logging
-from typing import Optional
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import bindparam, exists, select, update
 
 from app.celery_app import celery_app
-from app.tasks.base import get_task_db
+from app.core.config import settings
+from app.tasks.base import dialect_insert, get_task_db
 from app.models.call import Call
 from app.models.message import Message
 from app.models.call_analysis import CallAnalysis
 from app.models.elderly import Elderly
-from app.services.ai_service import AIService
+from app.services.ai_service import get_ai_service
+from app.services.message_buffer import pending_messages
 
 logger = logging.getLogger(__name__)
 
 
+def format_conversation(messages: List[Message]) -> str:
+    """Format call messages as conversation text for analysis."""
+    return "\n".join([
+        f"{'어르신' if m.role == 'user' else 'AI'}: {m.content}"
+        for m in messages
+    ])
+
+
+def build_elderly_context(elderly: Optional[Elderly]) -> str:
+    """Short description of the elderly person for the analysis prompt."""
+    if not elderly:
+        return ""
+    elderly_context = f"어르신 정보: {elderly.name}"
+    if elderly.age:
+        elderly_context += f", {elderly.age}세"
+    if elderly.health_condition:
+        elderly_context += f", 건강상태: {elderly.health_condition}"
+    return elderly_context
+
+
+def risk_level_for_score(risk_score: int) -> str:
+    """Map an analysis risk score to Elderly.risk_level."""
+    if risk_score >= 80:
+        return "critical"
+    elif risk_score >= 60:
+        return "high"
+    elif risk_score >= 40:
+        return "medium"
+    return "low"
+
+
+def call_analysis_values(call_id: int, analysis_result: dict) -> dict:
+    """CallAnalysis column values from an AIService analysis result."""
+    return {
+        "call_id": call_id,
+        "summary": analysis_result.get("summary", ""),
+        "risk_score": analysis_result.get("risk_score", 0),
+        "concerns": analysis_result.get("concerns", ""),
+        "recommendations": analysis_result.get("recommendations", ""),
+    }
+
+
+def build_call_analysis(call_id: int, analysis_result: dict) -> CallAnalysis:
+    """CallAnalysis row from an AIService analysis result."""
+    return CallAnalysis(**call_analysis_values(call_id, analysis_result))
+
+
+def send_alert_if_high_risk(elderly_id: int, call_id: int, risk_score: int, concerns: str) -> None:
+    """Queue a caregiver alert for high-risk analyses."""
+    if risk_score >= 60:
+        from app.tasks.push import send_high_risk_alert
+        send_high_risk_alert.delay(
+            elderly_id=elderly_id,
+            call_id=call_id,
+            risk_score=risk_score,
+            concerns=concerns,
+        )
+
+
 @celery_app.task(name="app.tasks.analysis.analyze_call")
-def analyze_call(call_id: int):
+def analyze_call(call_id: int, wait_attempt: int = 0):
     """
     Analyze a completed call using Claude AI.
     Creates a CallAnalysis record with summary, risk score, and concerns.
+
+    Re-enqueues itself (up to ANALYSIS_MESSAGE_WAIT_RETRIES times) while an
+    API process still buffers messages of the call, so the analysis sees
+    the whole conversation.
     """
+    if wait_attempt < settings.ANALYSIS_MESSAGE_WAIT_RETRIES and pending_messages.is_pending(call_id):
+        logger.info(f"Messages of call {call_id} not flushed yet, delaying analysis")
+        analyze_call.apply_async(args=[call_id, wait_attempt + 1], countdown=settings.MESSAGE_FLUSH_INTERVAL)
+        return {"status": "waiting_for_messages"}
+
     with get_task_db() as db:
         call = db.query(Call).filter(Call.id == call_id).first()
         if not call:
@@ -43,66 +119,40 @@ def analyze_call(call_id: int):
             return {"status": "no_messages"}
 
         # Format conversation for analysis
-        conversation_text = "\n".join([
-            f"{'어르신' if m.role == 'user' else 'AI'}: {m.content}"
-            for m in messages
-        ])
+        conversation_text = format_conversation(messages)
 
         # Get elderly info for context
         elderly = db.query(Elderly).filter(Elderly.id == call.elderly_id).first()
-        elderly_context = ""
-        if elderly:
-            elderly_context = f"어르신 정보: {elderly.name}"
-            if elderly.age:
-                elderly_context += f", {elderly.age}세"
-            if elderly.health_condition:
-                elderly_context += f", 건강상태: {elderly.health_condition}"
+        elderly_context = build_elderly_context(elderly)
 
         # Run analysis
         try:
-            ai_service = AIService()
+            ai_service = get_ai_service()
             analysis_result = ai_service.analyze_conversation(
                 conversation=conversation_text,
                 elderly_context=elderly_context,
             )
         except Exception as e:
             logger.error(f"AI analysis failed for call {call_id}: {e}")
+            # 상태 조회(long-poll)가 pending으로 계속 기다리지 않도록 실패 기록
+            call.analysis_failed_at = datetime.utcnow()
+            call.analysis_attempts = (call.analysis_attempts or 0) + 1
+            db.commit()
             return {"status": "error", "message": str(e)}
 
         # Create analysis record
-        analysis = CallAnalysis(
-            call_id=call_id,
-            summary=analysis_result.get("summary", ""),
-            risk_score=analysis_result.get("risk_score", 0),
-            concerns=analysis_result.get("concerns", ""),
-            recommendations=analysis_result.get("recommendations", ""),
-        )
+        analysis = build_call_analysis(call_id, analysis_result)
         db.add(analysis)
 
         # Update elderly risk level based on score
         if elderly:
-            risk_score = analysis_result.get("risk_score", 0)
-            if risk_score >= 80:
-                elderly.risk_level = "critical"
-            elif risk_score >= 60:
-                elderly.risk_level = "high"
-            elif risk_score >= 40:
-                elderly.risk_level = "medium"
-            else:
-                elderly.risk_level = "low"
+            elderly.risk_level = risk_level_for_score(analysis_result.get("risk_score", 0))
 
         db.commit()
         logger.info(f"Analysis completed for call {call_id}: risk_score={analysis.risk_score}")
 
         # Send high-risk alert if needed
-        if analysis.risk_score >= 60:
-            from app.tasks.push import send_high_risk_alert
-            send_high_risk_alert.delay(
-                elderly_id=call.elderly_id,
-                call_id=call_id,
-                risk_score=analysis.risk_score,
-                concerns=analysis.concerns,
-            )
+        send_alert_if_high_risk(call.elderly_id, call.id, analysis.risk_score, analysis.concerns)
 
         return {
             "status": "completed",
@@ -111,25 +161,225 @@ def analyze_call(call_id: int):
         }
 
 
+# =============================================================================
+# Batch analysis
+# =============================================================================
+
+@dataclass
+class PendingAnalysis:
+    """A completed call awaiting analysis, with everything the prompt needs."""
+    call: Call
+    messages: List[Message]
+    elderly: Optional[Elderly]
+
+    def to_job(self) -> "AnalysisJob":
+        return AnalysisJob(
+            call_id=self.call.id,
+            elderly_id=self.call.elderly_id,
+            ended_at=self.call.ended_at,
+            conversation=format_conversation(self.messages),
+            elderly_context=build_elderly_context(self.elderly),
+        )
+
+
+@dataclass
+class AnalysisJob:
+    """Plain-value snapshot of a PendingAnalysis, usable after the session is released."""
+    call_id: int
+    elderly_id: int
+    ended_at: Optional[datetime]
+    conversation: str
+    elderly_context: str
+
+
+def load_pending_calls(db, limit: int) -> List[PendingAnalysis]:
+    """
+    Load completed calls without analysis, with their messages and elderly.
+
+    Three queries regardless of batch size: calls (anti-join on
+    call_analysis), all their messages, and all their elderly rows. Calls
+    without messages are never returned, so they can't fill every batch.
+
+    Calls that failed before come after the ones never tried, and are
+    dropped after ANALYSIS_MAX_ATTEMPTS failures, so a set of calls the
+    model keeps failing on cannot hold the head of every batch.
+    """
+    calls = (
+        db.query(Call)
+        .outerjoin(CallAnalysis, CallAnalysis.call_id == Call.id)
+        .filter(
+            Call.status == "completed",
+            CallAnalysis.id.is_(None),
+            Call.analysis_attempts < settings.ANALYSIS_MAX_ATTEMPTS,
+            exists().where(Message.call_id == Call.id),
+        )
+        .order_by(Call.analysis_attempts, Call.ended_at, Call.id)
+        .limit(limit)
+        .all()
+    )
+    if not calls:
+        return []
+
+    messages_by_call: Dict[int, List[Message]] = defaultdict(list)
+    for message in (
+        db.query(Message)
+        .filter(Message.call_id.in_([c.id for c in calls]))
+        .order_by(Message.call_id, Message.created_at, Message.id)
+    ):
+        messages_by_call[message.call_id].append(message)
+
+    elderly_by_id = {
+        e.id: e
+        for e in db.query(Elderly).filter(Elderly.id.in_(list({c.elderly_id for c in calls})))
+    }
+
+    return [
+        PendingAnalysis(call=c, messages=messages_by_call.get(c.id, []), elderly=elderly_by_id.get(c.elderly_id))
+        for c in calls
+    ]
+
+
+async def run_analyses(jobs: List[AnalysisJob], concurrency: int) -> Dict[int, dict]:
+    """
+    Analyze calls concurrently, at most ``concurrency`` LLM requests at a time.
+
+    Returns:
+        Analysis result per call id; failed analyses are left out
+    """
+    from app.core.llm_clients import aclose_async_openai_client
+
+    ai_service = get_ai_service()
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def analyze(job: AnalysisJob) -> Optional[dict]:
+        async with semaphore:
+            try:
+                return await ai_service.analyze_conversation_async(
+                    conversation=job.conversation,
+                    elderly_context=job.elderly_context,
+                )
+            except Exception as e:
+                logger.error(f"AI analysis failed for call {job.call_id}: {e}")
+                return None
+
+    try:
+        results = await asyncio.gather(*(analyze(job) for job in jobs))
+    finally:
+        await aclose_async_openai_client()
+
+    return {job.call_id: result for job, result in zip(jobs, results) if result is not None}
+
+
+def write_analyses(db, jobs: List[AnalysisJob], results: Dict[int, dict]) -> List[AnalysisJob]:
+    """
+    Insert the analyses with ON CONFLICT (call_id) DO NOTHING, so a call
+    analyzed meanwhile by analyze_call is skipped instead of failing the
+    whole batch. Sets each person's risk level from their latest call,
+    unless a later call of theirs is already analyzed. Commit is the
+    caller's.
+
+    Returns:
+        The jobs whose analysis was inserted
+    """
+    now = datetime.utcnow()
+    rows = [
+        {**call_analysis_values(job.call_id, results[job.call_id]), "created_at": now}
+        for job in jobs if job.call_id in results
+    ]
+    if not rows:
+        return []
+    stmt = (
+        dialect_insert(db)(CallAnalysis)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["call_id"])
+        .returning(CallAnalysis.call_id)
+    )
+    inserted = {row.call_id for row in db.execute(stmt)}
+    written = [job for job in jobs if job.call_id in inserted]
+
+    latest: Dict[int, AnalysisJob] = {}
+    for job in written:
+        current = latest.get(job.elderly_id)
+        if current is None or (job.ended_at or datetime.min) >= (current.ended_at or datetime.min):
+            latest[job.elderly_id] = job
+
+    later_analyzed = (
+        select(CallAnalysis.id)
+        .join(Call, Call.id == CallAnalysis.call_id)
+        .where(Call.elderly_id == Elderly.id, Call.ended_at > bindparam("ended_at"))
+    )
+    for elderly_id, job in latest.items():
+        risk_level = risk_level_for_score(results[job.call_id].get("risk_score", 0))
+        db.execute(
+            update(Elderly)
+            .where(Elderly.id == elderly_id, ~later_analyzed.exists())
+            .values(risk_level=risk_level),
+            {"ended_at": job.ended_at or datetime.min},
+        )
+    return written
+
+
+def analyze_pending_batch(db, limit: int, concurrency: int) -> dict:
+    """
+    Analyze up to ``limit`` pending calls and write the results in one transaction.
+
+    The read transaction is closed before the LLM requests so no connection
+    or snapshot is held during the fan-out. Failed calls get their attempt
+    counter raised.
+    """
+    items = load_pending_calls(db, limit)
+    jobs = [item.to_job() for item in items if item.messages]
+    db.commit()  # 읽기 트랜잭션 종료 (LLM 호출 동안 커넥션을 잡지 않음)
+    if not jobs:
+        return {"loaded": len(items), "analyzed": 0, "failed": 0}
+
+    results = asyncio.run(run_analyses(jobs, concurrency))
+
+    written = write_analyses(db, jobs, results)
+    failed_ids = [job.call_id for job in jobs if job.call_id not in results]
+    if failed_ids:
+        db.query(Call).filter(Call.id.in_(failed_ids)).update(
+            {
+                "analysis_attempts": Call.analysis_attempts + 1,
+                "analysis_failed_at": datetime.utcnow(),
+            },
+            synchronize_session=False,
+        )
+    db.commit()
+
+    for job in written:
+        result = results[job.call_id]
+        send_alert_if_high_risk(job.elderly_id, job.call_id, result.get("risk_score", 0), result.get("concerns", ""))
+
+    return {
+        "loaded": len(items),
+        "analyzed": len(written),
+        "failed": len(failed_ids),
+    }
+
+
 @celery_app.task(name="app.tasks.analysis.batch_analyze_pending")
-def batch_analyze_pending():
+def batch_analyze_pending(limit: Optional[int] = None, concurrency: Optional[int] = None):
     """
     Find and analyze all completed calls that don't have analysis yet.
     Useful for catch-up processing.
+
+    Loads a batch with bulk queries, analyzes it with bounded concurrency,
+    writes all results in one transaction (ON CONFLICT DO NOTHING), and re-queues itself while a full
+    batch was found so a backlog drains without waiting for the next run.
     """
+    limit = limit or settings.ANALYSIS_BATCH_SIZE
+    concurrency = concurrency or settings.ANALYSIS_CONCURRENCY
+
     with get_task_db() as db:
-        # Find completed calls without analysis
-        calls_without_analysis = db.query(Call).filter(
-            Call.status == "completed",
-            ~Call.id.in_(
-                db.query(CallAnalysis.call_id)
-            )
-        ).limit(10).all()  # Process 10 at a time
+        stats = analyze_pending_batch(db, limit, concurrency)
+
+    logger.info(
+        f"Batch analysis: loaded={stats['loaded']}, analyzed={stats['analyzed']}, "
+        f"failed={stats['failed']}"
+    )
 
-        queued = 0
-        for call in calls_without_analysis:
-            analyze_call.delay(call.id)
-            queued += 1
+    if stats["loaded"] >= limit and stats["analyzed"] > 0:
+        batch_analyze_pending.delay(limit=limit, concurrency=concurrency)
 
-        logger.info(f"Queued {queued} calls for analysis")
-        return {"queued": queued}
+    return stats
@@ -27,3 +27,12 @@ def get_task_db():
         raise
     finally:
         db.close()
+
+
+def dialect_insert(db):
+    """ON CONFLICT / RETURNING을 지원하는 dialect별 insert 구성자."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
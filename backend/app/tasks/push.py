@@ -2,7 +2,7 @@
 Push notification Celery tasks.
 """
 import logging
-from typing import Optional
+from typing import List, Optional
 
 from app.celery_app import celery_app
 from app.tasks.base import get_task_db
@@ -54,6 +54,76 @@ def send_scheduled_push(elderly_id: int, call_id: int):
         return result
 
 
+def _scheduled_call_message(token: str, name: str, elderly_id: int, call_id: int) -> dict:
+    return {
+        "token": token,
+        "title": "소리가 전화드려요",
+        "body": f"{name}님, 오늘 기분은 어떠세요?",
+        "data": {
+            "type": "scheduled_call",
+            "call_id": str(call_id),
+            "elderly_id": str(elderly_id),
+            "deep_link": f"sori://call/{call_id}",
+        },
+    }
+
+
+@celery_app.task(name="app.tasks.push.send_scheduled_pushes")
+def send_scheduled_pushes(calls: List[List[int]]):
+    """
+    Send scheduled call pushes for a batch of calls (one task per PUSH_BATCH_SIZE calls per tick).
+
+    Resolves the active device tokens of every elderly in one query, sends
+    through fcm_service.send_batch (500 messages per FCM call) and
+    deactivates unregistered tokens in one bulk update.
+
+    Args:
+        calls: [call_id, elderly_id] pairs
+    """
+    call_ids_by_elderly = {}
+    for call_id, elderly_id in calls:
+        call_ids_by_elderly.setdefault(elderly_id, []).append(call_id)
+    if not call_ids_by_elderly:
+        return {"calls": 0, "messages": 0}
+
+    with get_task_db() as db:
+        rows = (
+            db.query(ElderlyDevice.fcm_token, Elderly.id, Elderly.name)
+            .join(Elderly, Elderly.id == ElderlyDevice.elderly_id)
+            .filter(
+                ElderlyDevice.elderly_id.in_(list(call_ids_by_elderly)),
+                ElderlyDevice.is_active == True,
+            )
+            .all()
+        )
+
+        messages = [
+            _scheduled_call_message(row.fcm_token, row.name, row.id, call_id)
+            for row in rows
+            for call_id in call_ids_by_elderly[row.id]
+        ]
+        without_devices = len(call_ids_by_elderly) - len({row.id for row in rows})
+        if without_devices:
+            logger.warning(f"No active devices for {without_devices} elderly in push batch")
+
+        result = fcm_service.send_batch(messages)
+
+        deactivated = fcm_service.deactivate_tokens(result["invalid_tokens"], db)
+
+    logger.info(
+        f"Scheduled pushes: {len(calls)} calls, {len(messages)} messages, "
+        f"{result['success_count']} sent in {result['batches']} FCM calls"
+    )
+    return {
+        "calls": len(calls),
+        "messages": len(messages),
+        "success_count": result["success_count"],
+        "failure_count": result["failure_count"],
+        "batches": result["batches"],
+        "deactivated": deactivated,
+    }
+
+
 @celery_app.task(name="app.tasks.push.send_missed_notification")
 def send_missed_notification(elderly_id: int, call_id: int):
     """
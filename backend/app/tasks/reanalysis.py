@@ -0,0 +1,296 @@
+"""
+Bulk re-analysis of past calls through the Batch API.
+
+Used after a change to the analysis prompt (``AIService.build_analysis_prompt``)
+to re-score historical calls without touching the real-time quota:
+
+1. ``build_reanalysis_files`` writes one chat completion request per call
+   as JSONL (split at BATCH_API_MAX_REQUESTS lines per file)
+2. each file is submitted to the batch backend (``get_batch_backend``)
+3. ``poll_reanalysis`` checks the batch every BATCH_API_POLL_INTERVAL seconds
+4. on completion ``apply_reanalysis_results`` bulk-upserts CallAnalysis
+
+Elderly.risk_level is not changed: re-scoring history should not override
+the level set by the most recent real-time analysis.
+"""
+import logging
+import os
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import exists
+
+from app.celery_app import celery_app
+from app.core.config import settings
+from app.tasks.base import dialect_insert, get_task_db
+from app.tasks.analysis import build_elderly_context, call_analysis_values, format_conversation
+from app.models.call import Call
+from app.models.message import Message
+from app.models.call_analysis import CallAnalysis
+from app.models.elderly import Elderly
+from app.services.ai_service import AIService, get_ai_service
+from app.services.batch_api import (
+    BatchBackend,
+    BatchResult,
+    BatchStatus,
+    chat_request,
+    get_batch_backend,
+    write_jsonl,
+)
+
+logger = logging.getLogger(__name__)
+
+
+CUSTOM_ID_PREFIX = "call-"
+
+# Calls loaded per bulk query while building the input file
+LOAD_CHUNK_SIZE = 500
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def select_call_ids(
+    db,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    elderly_id: Optional[int] = None,
+) -> List[int]:
+    """Ids of completed calls with messages, optionally filtered by end time and elderly."""
+    query = db.query(Call.id).filter(
+        Call.status == "completed",
+        exists().where(Message.call_id == Call.id),
+    )
+    if since:
+        query = query.filter(Call.ended_at >= since)
+    if until:
+        query = query.filter(Call.ended_at < until)
+    if elderly_id:
+        query = query.filter(Call.elderly_id == elderly_id)
+    return [row.id for row in query.order_by(Call.id)]
+
+
+def iter_reanalysis_requests(db, call_ids: List[int], ai_service: AIService) -> Iterator[Dict]:
+    """Batch input lines for the calls, loaded in bulk chunks."""
+    for start in range(0, len(call_ids), LOAD_CHUNK_SIZE):
+        chunk = call_ids[start:start + LOAD_CHUNK_SIZE]
+
+        calls = db.query(Call).filter(Call.id.in_(chunk)).order_by(Call.id).all()
+        messages_by_call: Dict[int, List[Message]] = defaultdict(list)
+        for message in (
+            db.query(Message)
+            .filter(Message.call_id.in_(chunk))
+            .order_by(Message.call_id, Message.created_at, Message.id)
+        ):
+            messages_by_call[message.call_id].append(message)
+        elderly_by_id = {
+            e.id: e
+            for e in db.query(Elderly).filter(Elderly.id.in_(list({c.elderly_id for c in calls})))
+        }
+
+        for call in calls:
+            prompt = ai_service.build_analysis_prompt(
+                format_conversation(messages_by_call[call.id]),
+                build_elderly_context(elderly_by_id.get(call.elderly_id)),
+            )
+            yield chat_request(f"{CUSTOM_ID_PREFIX}{call.id}", {
+                "model": AIService.ANALYSIS_MODEL,
+                "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": AIService.ANALYSIS_MAX_TOKENS,
+            })
+
+        # Keep the session small while streaming a large job
+        db.expunge_all()
+
+
+def build_reanalysis_files(
+    db,
+    directory: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    elderly_id: Optional[int] = None,
+    max_requests: Optional[int] = None,
+) -> List[str]:
+    """
+    Write JSONL input files for re-analyzing the selected calls.
+
+    Returns:
+        Paths of the written files (empty if there is nothing to analyze)
+    """
+    max_requests = max_requests or settings.BATCH_API_MAX_REQUESTS
+    call_ids = select_call_ids(db, since, until, elderly_id)
+    os.makedirs(directory, exist_ok=True)
+
+    ai_service = get_ai_service()
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    paths = []
+    for part, start in enumerate(range(0, len(call_ids), max_requests)):
+        path = os.path.join(directory, f"reanalysis_{stamp}_{part}.jsonl")
+        count = write_jsonl(path, iter_reanalysis_requests(db, call_ids[start:start + max_requests], ai_service))
+        logger.info(f"[Reanalysis] Wrote {count} requests to {path}")
+        paths.append(path)
+    return paths
+
+
+def apply_reanalysis_results(db, results: Iterable[BatchResult]) -> Dict[str, int]:
+    """
+    Bulk-upsert CallAnalysis rows from batch results in one transaction.
+
+    One INSERT ... ON CONFLICT (call_id) DO UPDATE per chunk: existing
+    analyses are updated and missing ones inserted, including rows written
+    meanwhile by analyze_call / batch_analyze_pending (no IntegrityError
+    rolling the chunk back). Results for calls that no longer exist are
+    skipped; failed requests and unparseable responses are counted as
+    failed and change nothing.
+    """
+    ai_service = get_ai_service()
+    parsed: Dict[int, dict] = {}
+    failed = 0
+
+    for result in results:
+        if not result.custom_id.startswith(CUSTOM_ID_PREFIX) or result.error or result.content is None:
+            failed += 1
+            if result.error:
+                logger.warning(f"[Reanalysis] {result.custom_id} failed: {result.error}")
+            continue
+        call_id = int(result.custom_id[len(CUSTOM_ID_PREFIX):])
+        analysis = ai_service.try_parse_analysis(result.content)
+        if analysis is None:
+            # 파싱 불가 응답으로 기존 분석을 덮어쓰지 않음
+            failed += 1
+            logger.warning(f"[Reanalysis] {result.custom_id} returned unparseable content")
+            continue
+        parsed[call_id] = analysis
+
+    updated = inserted = 0
+    call_ids = list(parsed)
+    for start in range(0, len(call_ids), LOAD_CHUNK_SIZE):
+        chunk = call_ids[start:start + LOAD_CHUNK_SIZE]
+        existing_calls = {row.id for row in db.query(Call.id).filter(Call.id.in_(chunk))}
+        now = datetime.utcnow()
+        rows = [
+            {**call_analysis_values(call_id, parsed[call_id]), "created_at": now}
+            for call_id in chunk if call_id in existing_calls
+        ]
+        if not rows:
+            continue
+
+        # 한 문장 upsert: 그 사이 analyze_call/batch_analyze_pending이 넣은 행도 충돌 없이 갱신
+        stmt = dialect_insert(db)(CallAnalysis).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["call_id"],
+            set_={
+                column: stmt.excluded[column]
+                for column in ("summary", "risk_score", "concerns", "recommendations")
+            },
+        ).returning(CallAnalysis.created_at)
+        # created_at은 갱신하지 않으므로, 이번 값이 돌아온 행이 새로 삽입된 행
+        for row in db.execute(stmt):
+            if row.created_at == now:
+                inserted += 1
+            else:
+                updated += 1
+
+    db.commit()
+    return {"updated": updated, "inserted": inserted, "failed": failed}
+
+
+def run_reanalysis(
+    db,
+    backend: BatchBackend,
+    directory: str,
+    poll_interval: float,
+    timeout: float,
+    **filters,
+) -> Dict[str, int]:
+    """
+    Run the whole pipeline inline: build, submit, poll, apply.
+
+    For scripts and tests; in production ``submit_reanalysis`` polls from
+    Celery instead of blocking a worker.
+    """
+    totals = {"batches": 0, "updated": 0, "inserted": 0, "failed": 0}
+    deadline = time.monotonic() + timeout
+
+    for path in build_reanalysis_files(db, directory, **filters):
+        batch_id = backend.submit(path, metadata={"job": "reanalysis"})
+        totals["batches"] += 1
+
+        info = backend.get_status(batch_id)
+        while not info.status.is_final:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Batch {batch_id} did not finish within {timeout}s")
+            time.sleep(poll_interval)
+            info = backend.get_status(batch_id)
+
+        if info.status != BatchStatus.COMPLETED:
+            logger.error(f"[Reanalysis] Batch {batch_id} ended as {info.status.value}: {info.error}")
+            continue
+
+        stats = apply_reanalysis_results(db, backend.iter_results(batch_id))
+        for key in ("updated", "inserted", "failed"):
+            totals[key] += stats[key]
+
+    return totals
+
+
+@celery_app.task(name="app.tasks.reanalysis.submit_reanalysis")
+def submit_reanalysis(
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    elderly_id: Optional[int] = None,
+):
+    """
+    Submit a Batch API re-analysis of completed calls.
+
+    Args:
+        since: Only calls ended at or after this ISO datetime
+        until: Only calls ended before this ISO datetime
+        elderly_id: Only calls of this elderly person
+    """
+    backend = get_batch_backend()
+
+    with get_task_db() as db:
+        paths = build_reanalysis_files(
+            db,
+            settings.BATCH_API_DIR,
+            since=_parse_datetime(since),
+            until=_parse_datetime(until),
+            elderly_id=elderly_id,
+        )
+
+    batch_ids = []
+    for path in paths:
+        batch_id = backend.submit(path, metadata={"job": "reanalysis"})
+        batch_ids.append(batch_id)
+        poll_reanalysis.apply_async(args=[batch_id], countdown=settings.BATCH_API_POLL_INTERVAL)
+
+    logger.info(f"[Reanalysis] Submitted {len(batch_ids)} batches")
+    return {"batch_ids": batch_ids}
+
+
+@celery_app.task(name="app.tasks.reanalysis.poll_reanalysis")
+def poll_reanalysis(batch_id: str):
+    """Check a re-analysis batch; apply its results once it has completed."""
+    backend = get_batch_backend()
+    info = backend.get_status(batch_id)
+
+    if not info.status.is_final:
+        poll_reanalysis.apply_async(args=[batch_id], countdown=settings.BATCH_API_POLL_INTERVAL)
+        return {"batch_id": batch_id, "status": info.status.value}
+
+    if info.status != BatchStatus.COMPLETED:
+        logger.error(f"[Reanalysis] Batch {batch_id} ended as {info.status.value}: {info.error}")
+        return {"batch_id": batch_id, "status": info.status.value, "error": info.error}
+
+    with get_task_db() as db:
+        stats = apply_reanalysis_results(db, backend.iter_results(batch_id))
+
+    logger.info(
+        f"[Reanalysis] Batch {batch_id} applied: updated={stats['updated']}, "
+        f"inserted={stats['inserted']}, failed={stats['failed']}"
+    )
+    return {"batch_id": batch_id, "status": info.status.value, **stats}
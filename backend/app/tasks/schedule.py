@@ -6,18 +6,122 @@ DB 시간 저장 규칙(중요):
 """
 import logging
 from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
 from zoneinfo import ZoneInfo
 
+from sqlalchemy import DateTime, literal, select, text
+
 from app.celery_app import celery_app
-from app.tasks.base import get_task_db
-from app.models.elderly import Elderly
+from app.core.config import settings
+from app.tasks.base import dialect_insert, get_task_db
 from app.models.call import Call
+from app.models.call_schedule_slot import CallScheduleSlot
+from app.services.device_events import device_events, pending_call_event
 
 logger = logging.getLogger(__name__)
 KST = ZoneInfo("Asia/Seoul")
 UTC = timezone.utc
 
 
+def insert_scheduled_calls(
+    db, elderly_id_column, criteria, scheduled_for: datetime
+) -> List[Tuple[int, int, datetime]]:
+    """
+    criteria로 고른 어르신들의 auto Call을 한 문장으로 생성 (커밋은 호출자).
+
+    INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING. 이미 생성된 Call은
+    부분 유니크 인덱스(idx_calls_elderly_scheduled)에 걸려 건너뜀.
+
+    Args:
+        elderly_id_column: SELECT할 elderly_id 컬럼
+        criteria: 대상 행을 고르는 WHERE 조건들
+        scheduled_for: 예약 시각 (UTC naive, 분 단위)
+
+    Returns:
+        새로 생성된 (call_id, elderly_id, scheduled_for) 목록
+    """
+    rows = select(
+        elderly_id_column,
+        literal("voice"),
+        literal("scheduled"),
+        literal("auto"),
+        literal(scheduled_for, DateTime),
+        literal(scheduled_for, DateTime),  # WS 연결 시 갱신됨
+        literal(True),
+        literal(datetime.utcnow(), DateTime),
+    ).where(*criteria)
+
+    stmt = (
+        dialect_insert(db)(Call)
+        .from_select(
+            ["elderly_id", "call_type", "status", "trigger_type", "scheduled_for",
+             "started_at", "is_successful", "created_at"],
+            rows,
+        )
+        .on_conflict_do_nothing(
+            index_elements=["elderly_id", "scheduled_for"],
+            index_where=text("trigger_type = 'auto'"),
+        )
+        .returning(Call.id, Call.elderly_id, Call.scheduled_for)
+    )
+    return [(row.id, row.elderly_id, row.scheduled_for) for row in db.execute(stmt)]
+
+
+def create_scheduled_calls(db, now_kst: datetime) -> List[Tuple[int, int, datetime]]:
+    """
+    now_kst(분 단위)에 스케줄된 어르신들의 Call을 한 번에 생성.
+
+    call_schedule_slots의 PK 조회를 SELECT로 쓰는 insert_scheduled_calls 한 문장.
+
+    Returns:
+        새로 생성된 (call_id, elderly_id, scheduled_for) 목록
+    """
+    # scheduled_for는 DB에 UTC naive로 저장(분 단위 정규화)
+    scheduled_time_utc = (
+        now_kst.replace(second=0, microsecond=0)
+        .astimezone(UTC)
+        .replace(tzinfo=None)
+    )
+
+    created = insert_scheduled_calls(
+        db,
+        CallScheduleSlot.elderly_id,
+        [
+            CallScheduleSlot.weekday == now_kst.weekday(),
+            CallScheduleSlot.slot_time == now_kst.strftime("%H:%M"),
+        ],
+        scheduled_time_utc,
+    )
+    db.commit()
+    return created
+
+
+def dispatch_call_follow_ups(created: List[Tuple[int, int, datetime]]) -> None:
+    """새 예약 Call을 기기 이벤트 채널에 발행하고, 푸시를 PUSH_BATCH_SIZE개씩 묶어 큐에 넣고, Call마다 5분 후 missed 체크 예약."""
+    from app.tasks.push import send_scheduled_pushes
+
+    # 연결된 기기에 즉시 전달 (Redis pipeline 1번, 실패해도 폴링/푸시로 전달됨)
+    device_events.publish(
+        (elderly_id, pending_call_event(call_id, "scheduled", scheduled_for))
+        for call_id, elderly_id, scheduled_for in created
+    )
+
+    # 정각에 몰리는 Call을 Call당 태스크/FCM 호출 대신 묶음 단위로 발송
+    batch_size = settings.PUSH_BATCH_SIZE
+    for start in range(0, len(created), batch_size):
+        batch = created[start:start + batch_size]
+        send_scheduled_pushes.delay([[call_id, elderly_id] for call_id, elderly_id, _ in batch])
+
+    for call_id, elderly_id, _ in created:
+        logger.info(f"Created scheduled call {call_id} for elderly {elderly_id}")
+
+        # 5분 후 missed 체크 예약
+        check_missed_single.apply_async(
+            args=[call_id],
+            countdown=300  # 5분
+        )
+
+
 @celery_app.task(name="app.tasks.schedule.check_schedules")
 def check_schedules():
     """매분 실행: 현재 시각(HH:MM)에 해당하는 스케줄 확인 및 Call 생성."""
@@ -27,75 +131,24 @@ def check_schedules():
 
     logger.info(f"Checking schedules for {current_time} ({current_weekday})")
 
-    created_count = 0
+    with get_task_db() as db:
+        created = create_scheduled_calls(db, now_kst)
+
+    dispatch_call_follow_ups(created)
+
+    return {"created": len(created), "time": current_time}
+
+
+@celery_app.task(name="app.tasks.schedule.rebuild_schedule_slots")
+def rebuild_schedule_slots():
+    """call_schedule_slots 전체 재생성 (배포 후 1회 백필 / 정합성 복구)."""
+    from app.services.elderly import ElderlyService
 
     with get_task_db() as db:
-        # Get all elderly with enabled schedules
-        elderly_list = db.query(Elderly).filter(
-            Elderly.call_schedule.isnot(None)
-        ).all()
+        count = ElderlyService.rebuild_schedule_slots(db)
 
-        for elderly in elderly_list:
-            schedule = elderly.call_schedule or {}
-
-            # Check if schedule is enabled
-            if not schedule.get("enabled", False):
-                continue
-
-            # Check if current time matches any scheduled time
-            times = schedule.get("times", [])
-            if current_time not in times:
-                continue
-
-            # Check day restrictions if present
-            days = schedule.get("days")
-            if days and current_weekday not in [d.lower() for d in days]:
-                continue
-
-            # scheduled_for는 DB에 UTC naive로 저장(분 단위 정규화)
-            scheduled_time_utc = (
-                now_kst.replace(second=0, microsecond=0)
-                .astimezone(UTC)
-                .replace(tzinfo=None)
-            )
-
-            try:
-                # 새 Call 생성 (UNIQUE 제약으로 중복 시 예외)
-                new_call = Call(
-                    elderly_id=elderly.id,
-                    call_type="voice",
-                    status="scheduled",
-                    trigger_type="auto",
-                    scheduled_for=scheduled_time_utc,
-                    started_at=scheduled_time_utc,  # WS 연결 시 갱신됨
-                )
-                db.add(new_call)
-                db.commit()
-                db.refresh(new_call)
-
-                logger.info(f"Created scheduled call {new_call.id} for elderly {elderly.id}")
-                created_count += 1
-
-                # Queue push notification task
-                from app.tasks.push import send_scheduled_push
-                send_scheduled_push.delay(elderly.id, new_call.id)
-
-                # 5분 후 missed 체크 예약
-                check_missed_single.apply_async(
-                    args=[new_call.id],
-                    countdown=300  # 5분
-                )
-
-            except Exception as e:
-                db.rollback()
-                emsg = str(e).lower()
-                # DB 부분 유니크 인덱스/제약 위반 케이스(중복 생성)면 조용히 스킵
-                if ("idx_calls_elderly_scheduled" in emsg) or ("unique" in emsg) or ("duplicate key" in emsg):
-                    logger.debug(f"Call already exists for elderly {elderly.id} at {current_time}")
-                else:
-                    logger.error(f"Error creating call for elderly {elderly.id}: {e}")
-
-    return {"created": created_count, "time": current_time}
+    logger.info(f"Rebuilt {count} call schedule slots")
+    return {"slots": count}
 
 
 @celery_app.task(name="app.tasks.schedule.check_missed_single")
@@ -0,0 +1,212 @@
+"""next_fire_at 기반 상주 예약 통화 스케줄러 (CALL_SCHEDULER_MODE=heap).
+
+매분 check_schedules로 DB를 훑는 대신:
+- elderly.next_fire_at(ElderlyService.sync_schedule이 유지)이 다가오는 항목을
+  SCHEDULER_REFRESH_INTERVAL마다 최대 SCHEDULER_BATCH_SIZE개씩 힙에 올리고
+- 힙의 맨 앞 시각까지 잠들었다가 정각에 발신(Call 생성 + 후속 태스크)한 뒤
+- 각 항목의 next_fire_at을 다음 예약 시각으로 전진시켜 다시 힙에 넣음
+
+스케줄 변경과의 경합은 조건부 갱신으로 처리: 발신 시 next_fire_at이 힙의
+값과 같은 행만 Call을 만들고 전진시킴. Call 중복은 check_schedules와 같은
+부분 유니크 인덱스가 막으므로 beat 모드와 동시에 돌아도 안전함.
+
+실행:
+    python -m app.tasks.scheduler
+"""
+import heapq
+import json
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.tasks.base import get_task_db
+from app.tasks.schedule import dispatch_call_follow_ups, insert_scheduled_calls
+from app.models.elderly import Elderly
+from app.services.elderly import next_fire_time
+
+logger = logging.getLogger(__name__)
+
+# IN (...) 목록 하나에 넣을 최대 id 수
+CHUNK_SIZE = 1000
+
+
+class CallScheduler:
+    """
+    힙 기반 look-ahead 스케줄러.
+
+    Args:
+        lookahead: 힙에 올릴 구간 (now + lookahead 이전에 발신할 항목)
+        batch_size: 새로고침 1회당 힙에 올릴 최대 항목 수
+        max_lateness: 이보다 늦게 발견된 항목은 Call 없이 다음 시각으로 넘김
+        clock: 현재 시각 (UTC naive) — 테스트/벤치마크용
+    """
+
+    def __init__(
+        self,
+        lookahead: Optional[timedelta] = None,
+        batch_size: Optional[int] = None,
+        max_lateness: Optional[timedelta] = None,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ):
+        self.lookahead = lookahead or timedelta(seconds=settings.SCHEDULER_LOOKAHEAD_SECONDS)
+        self.batch_size = batch_size or settings.SCHEDULER_BATCH_SIZE
+        self.max_lateness = max_lateness or timedelta(seconds=settings.SCHEDULER_MAX_LATENESS)
+        self.clock = clock
+        self._heap: List[Tuple[datetime, int]] = []
+        # batch_size에 잘려 힙에 못 올린 항목이 있으면, 마지막으로 올린 항목의 시각
+        self._loaded_until: Optional[datetime] = None
+        self.stats: Dict[str, int] = {"refreshes": 0, "fired": 0, "created": 0, "skipped_late": 0, "stale": 0}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def next_due(self) -> Optional[datetime]:
+        """힙에서 가장 이른 발신 시각."""
+        return self._heap[0][0] if self._heap else None
+
+    def refresh(self, db) -> int:
+        """DB에서 now + lookahead 이전에 발신할 항목으로 힙을 다시 채움. 올린 항목 수 반환."""
+        horizon = self.clock() + self.lookahead
+        rows = (
+            db.query(Elderly.next_fire_at, Elderly.id)
+            .filter(Elderly.next_fire_at.isnot(None), Elderly.next_fire_at <= horizon)
+            .order_by(Elderly.next_fire_at)
+            .limit(self.batch_size)
+            .all()
+        )
+        self._heap = [(row.next_fire_at, row.id) for row in rows]
+        heapq.heapify(self._heap)
+        self._loaded_until = rows[-1].next_fire_at if len(rows) >= self.batch_size else None
+        self.stats["refreshes"] += 1
+        return len(self._heap)
+
+    def refresh_deadline(self, next_refresh: datetime) -> datetime:
+        """다음 새로고침 시각: 주기적 새로고침 또는 잘린 구간의 끝 중 이른 쪽."""
+        if self._loaded_until is not None:
+            return min(next_refresh, self._loaded_until)
+        return next_refresh
+
+    def fire_due(self, db) -> List[Tuple[int, int, datetime]]:
+        """
+        발신 시각이 지난 항목을 모두 처리.
+
+        같은 시각의 항목은 CHUNK_SIZE 단위로 묶어서: 유효성 확인 조회 1번,
+        Call INSERT 1번, 전진할 시각별 next_fire_at 조건부 UPDATE 1번.
+
+        Returns:
+            새로 생성된 (call_id, elderly_id, scheduled_for) 목록
+        """
+        now = self.clock()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap))
+
+        created: List[Tuple[int, int, datetime]] = []
+        horizon = now + self.lookahead
+        for fire_at, group in groupby(due, key=lambda entry: entry[0]):
+            ids = [elderly_id for _, elderly_id in group]
+            for start in range(0, len(ids), CHUNK_SIZE):
+                created.extend(self._fire_chunk(db, fire_at, ids[start:start + CHUNK_SIZE], now, horizon))
+
+        self.stats["created"] += len(created)
+        return created
+
+    def _fire_chunk(
+        self, db, fire_at: datetime, ids: List[int], now: datetime, horizon: datetime
+    ) -> List[Tuple[int, int, datetime]]:
+        # 힙에 올린 뒤 스케줄이 바뀐 항목은 제외
+        current = {
+            row.id: row.call_schedule
+            for row in db.query(Elderly.id, Elderly.call_schedule).filter(
+                Elderly.id.in_(ids),
+                Elderly.next_fire_at == fire_at,
+            )
+        }
+        self.stats["stale"] += len(ids) - len(current)
+        if not current:
+            return []
+
+        late = now - fire_at > self.max_lateness
+        created = []
+        if late:
+            self.stats["skipped_late"] += len(current)
+            logger.warning(f"[Scheduler] Skipping {len(current)} calls due at {fire_at} (late by {now - fire_at})")
+        else:
+            created = insert_scheduled_calls(
+                db,
+                Elderly.id,
+                [Elderly.id.in_(list(current)), Elderly.next_fire_at == fire_at],
+                fire_at,
+            )
+            self.stats["fired"] += len(current)
+
+        # 놓친 시각은 다시 발신하지 않도록 늦었으면 now 기준으로 전진
+        advance_from = now if late else fire_at
+        by_next_fire: Dict[Optional[datetime], List[int]] = defaultdict(list)
+        computed: Dict[str, Optional[datetime]] = {}  # 같은 스케줄(기본값 등)은 한 번만 계산
+        for elderly_id, call_schedule in current.items():
+            key = json.dumps(call_schedule, sort_keys=True)
+            if key not in computed:
+                computed[key] = next_fire_time(call_schedule, advance_from)
+            by_next_fire[computed[key]].append(elderly_id)
+
+        # 같은 시각으로 전진하는 항목끼리 UPDATE 1번 (대부분 몇 개의 시각으로 모임)
+        for next_fire_at, elderly_ids in by_next_fire.items():
+            db.query(Elderly).filter(
+                Elderly.id.in_(elderly_ids),
+                Elderly.next_fire_at == fire_at,
+            ).update({"next_fire_at": next_fire_at}, synchronize_session=False)
+        db.commit()
+
+        for next_fire_at, elderly_ids in by_next_fire.items():
+            if next_fire_at is not None and next_fire_at <= horizon:
+                for elderly_id in elderly_ids:
+                    heapq.heappush(self._heap, (next_fire_at, elderly_id))
+
+        return created
+
+    def seconds_until(self, deadline: datetime) -> float:
+        """다음 발신 또는 deadline 중 이른 쪽까지 남은 초."""
+        target = min(self.next_due, deadline) if self.next_due else deadline
+        return max((target - self.clock()).total_seconds(), 0.0)
+
+    def run_forever(
+        self,
+        refresh_interval: Optional[float] = None,
+        stop_event: Optional[threading.Event] = None,
+    ) -> None:
+        """stop_event가 설정될 때까지 새로고침/발신을 반복."""
+        refresh_interval = refresh_interval or settings.SCHEDULER_REFRESH_INTERVAL
+        stop_event = stop_event or threading.Event()
+        next_refresh = self.clock()
+
+        logger.info(f"[Scheduler] Started (lookahead={self.lookahead}, batch={self.batch_size})")
+        while not stop_event.is_set():
+            try:
+                with get_task_db() as db:
+                    if self.clock() >= self.refresh_deadline(next_refresh):
+                        self.refresh(db)
+                        next_refresh = self.clock() + timedelta(seconds=refresh_interval)
+                    created = self.fire_due(db)
+                dispatch_call_follow_ups(created)
+            except Exception as e:
+                logger.error(f"[Scheduler] Tick failed: {e}")
+                next_refresh = self.clock()  # 힙을 DB 기준으로 다시 맞춤
+                stop_event.wait(1.0)
+                continue
+
+            stop_event.wait(self.seconds_until(self.refresh_deadline(next_refresh)))
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    CallScheduler().run_forever()
+
+
+if __name__ == "__main__":
+    main()
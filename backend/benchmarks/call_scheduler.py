@@ -0,0 +1,255 @@
+"""
+Benchmark: scheduled call creation with 100k schedules.
+
+Compares, on the same data set:
+- scan: the old minute tick (load every elderly with a call_schedule and
+  match times/days in Python; call creation not included)
+- slots: check_schedules on the call_schedule_slots index (one
+  INSERT ... SELECT ... ON CONFLICT per minute)
+- heap: the next_fire_at scheduler (CallScheduler.refresh + fire_due)
+
+for a quiet minute (few schedules) and a popular one (09:00, shared by the
+default schedule). Push / missed-check dispatch is not included.
+``--jitter`` additionally runs the heap scheduler loop on the real clock
+against schedules due in a few seconds and reports how late calls were
+created relative to their fire time (beat polling: up to 60 s).
+
+Defaults to a temporary SQLite file; pass ``--database-url`` to run
+against PostgreSQL (tables are created, rows are not cleaned up).
+
+Usage (from backend/):
+    python -m benchmarks.call_scheduler
+    python -m benchmarks.call_scheduler --elderly 100000 --jitter
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+_tmp_dir = tempfile.mkdtemp(prefix="sori_scheduler_bench_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp_dir}/bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from sqlalchemy import create_engine, delete  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.models import Call, Elderly, User  # noqa: E402
+from app.services.elderly import ElderlyService  # noqa: E402
+from app.tasks import scheduler as scheduler_module  # noqa: E402
+from app.tasks.schedule import create_scheduled_calls  # noqa: E402
+from app.tasks.scheduler import CallScheduler  # noqa: E402
+
+KST = ZoneInfo("Asia/Seoul")
+UTC = timezone.utc
+
+# Monday 2026-01-05
+QUIET_MINUTE = datetime(2026, 1, 5, 7, 17, tzinfo=KST)
+POPULAR_MINUTE = datetime(2026, 1, 5, 9, 0, tzinfo=KST)
+DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+
+def _random_schedule(rng: random.Random) -> dict:
+    """Mix of default schedules, custom times and weekday-restricted ones."""
+    roll = rng.random()
+    if roll < 0.4:
+        return {"enabled": True, "times": ["09:00", "14:00", "19:00"]}
+    if roll < 0.5:
+        return {"enabled": False, "times": ["09:00"]}
+    times = sorted({f"{rng.randrange(6, 22):02d}:{rng.randrange(60):02d}" for _ in range(rng.randint(1, 3))})
+    schedule = {"enabled": True, "times": times}
+    if roll < 0.7:
+        schedule["days"] = rng.sample(DAYS, rng.randint(1, 5))
+    return schedule
+
+
+def _seed(db, count: int, now_utc: datetime) -> Dict[str, float]:
+    rng = random.Random(42)
+    user = User(email="bench@example.com", password_hash="x", full_name="bench")
+    db.add(user)
+    db.commit()
+
+    started = time.perf_counter()
+    for start in range(0, count, 5000):
+        db.bulk_insert_mappings(Elderly, [
+            {"caregiver_id": user.id, "name": f"어르신{i}", "call_schedule": _random_schedule(rng)}
+            for i in range(start, min(start + 5000, count))
+        ])
+    db.commit()
+    inserted = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with patch("app.services.elderly.datetime") as fake_datetime:
+        fake_datetime.utcnow.return_value = now_utc
+        fake_datetime.strptime = datetime.strptime
+        fake_datetime.combine = datetime.combine
+        slots = ElderlyService.rebuild_schedule_slots(db)
+    rebuilt = time.perf_counter() - started
+
+    return {"insert_s": inserted, "rebuild_s": rebuilt, "slots": slots}
+
+
+def _legacy_scan(db, now_kst: datetime) -> int:
+    """Matching part of the old check_schedules (without the per-row INSERT+COMMIT)."""
+    current_time = now_kst.strftime("%H:%M")
+    current_weekday = now_kst.strftime("%A").lower()
+    matched = 0
+    for elderly in db.query(Elderly).filter(Elderly.call_schedule.isnot(None)).all():
+        schedule = elderly.call_schedule or {}
+        if not schedule.get("enabled", False) or current_time not in schedule.get("times", []):
+            continue
+        days = schedule.get("days")
+        if days and current_weekday not in [d.lower() for d in days]:
+            continue
+        matched += 1
+    db.expunge_all()
+    return matched
+
+
+def _timed(fn: Callable[[], int], repeat: int) -> Dict[str, float]:
+    times, result = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return {"ms": statistics.median(times), "rows": result}
+
+
+def _reset_calls(db) -> None:
+    db.execute(delete(Call))
+    db.commit()
+
+
+def _utc(moment: datetime) -> datetime:
+    return moment.astimezone(UTC).replace(tzinfo=None)
+
+
+def _bench_minute(db, minute: datetime, repeat: int) -> Dict[str, Dict[str, float]]:
+    results = {"scan": _timed(lambda: _legacy_scan(db, minute), repeat)}
+
+    def slots() -> int:
+        _reset_calls(db)
+        return len(create_scheduled_calls(db, minute))
+
+    results["slots"] = _timed(slots, repeat)
+
+    # next_fire_at is set relative to 1 minute before this minute for every run
+    fire_at = _utc(minute)
+    heap_times, refresh_times, created = [], [], 0
+    for _ in range(repeat):
+        _reset_calls(db)
+        with patch("app.services.elderly.datetime") as fake_datetime:
+            fake_datetime.utcnow.return_value = fire_at - timedelta(minutes=1)
+            fake_datetime.strptime = datetime.strptime
+            fake_datetime.combine = datetime.combine
+            ElderlyService.rebuild_schedule_slots(db)
+
+        clock = [fire_at - timedelta(seconds=30)]
+        scheduler = CallScheduler(lookahead=timedelta(minutes=1), batch_size=200000, clock=lambda: clock[0])
+        started = time.perf_counter()
+        scheduler.refresh(db)
+        refresh_times.append((time.perf_counter() - started) * 1000)
+
+        clock[0] = fire_at
+        started = time.perf_counter()
+        created = len(scheduler.fire_due(db))
+        heap_times.append((time.perf_counter() - started) * 1000)
+
+    results["heap refresh"] = {"ms": statistics.median(refresh_times), "rows": created}
+    results["heap fire"] = {"ms": statistics.median(heap_times), "rows": created}
+    return results
+
+
+def _bench_jitter(session_factory, schedules: int) -> List[float]:
+    """Run the scheduler loop on the real clock; lateness of each created call in ms."""
+    db = session_factory()
+    _reset_calls(db)
+    ids = [row.id for row in db.query(Elderly.id).limit(schedules)]
+    fire_at = (datetime.utcnow() + timedelta(seconds=3)).replace(microsecond=0)
+    db.query(Elderly).filter(Elderly.id.in_(ids)).update(
+        {"next_fire_at": fire_at}, synchronize_session=False
+    )
+    db.query(Elderly).filter(~Elderly.id.in_(ids)).update(
+        {"next_fire_at": None}, synchronize_session=False
+    )
+    db.commit()
+    db.close()
+
+    created_at: List[datetime] = []
+
+    def record(created):
+        if created:
+            created_at.append(datetime.utcnow())
+
+    stop = threading.Event()
+    scheduler = CallScheduler(lookahead=timedelta(minutes=1), batch_size=schedules + 10)
+    with patch.object(scheduler_module, "get_task_db", _session_scope(session_factory)), \
+            patch.object(scheduler_module, "dispatch_call_follow_ups", record):
+        thread = threading.Thread(target=scheduler.run_forever, kwargs={"refresh_interval": 1, "stop_event": stop})
+        thread.start()
+        time.sleep(5)
+        stop.set()
+        thread.join()
+
+    return [(moment - fire_at).total_seconds() * 1000 for moment in created_at]
+
+
+def _session_scope(session_factory):
+    from contextlib import contextmanager
+
+    @contextmanager
+    def scope():
+        db = session_factory()
+        try:
+            yield db
+            db.commit()
+        finally:
+            db.close()
+
+    return scope
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--elderly", type=int, default=100_000, help="Number of elderly schedules")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (median is reported)")
+    parser.add_argument("--database-url", default=os.environ["DATABASE_URL"])
+    parser.add_argument("--jitter", action="store_true", help="Measure firing lateness on the real clock")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    db = session_factory()
+
+    seed = _seed(db, args.elderly, _utc(QUIET_MINUTE) - timedelta(minutes=1))
+    print(f"Seeded {args.elderly} elderly in {seed['insert_s']:.1f}s; "
+          f"rebuilt {seed['slots']} slots + next_fire_at in {seed['rebuild_s']:.1f}s\n")
+
+    print(f"{'minute':<10} {'method':<13} {'median ms':>10} {'calls':>7}")
+    for label, minute in [("quiet", QUIET_MINUTE), ("09:00", POPULAR_MINUTE)]:
+        for method, r in _bench_minute(db, minute, args.repeat).items():
+            print(f"{label:<10} {method:<13} {r['ms']:>10.1f} {r['rows']:>7}")
+    db.close()
+
+    if args.jitter:
+        lateness = _bench_jitter(session_factory, 1000)
+        if lateness:
+            print(f"\nHeap scheduler lateness (1000 calls due together): "
+                  f"{statistics.median(lateness):.0f} ms median, {max(lateness):.0f} ms max "
+                  f"(beat polling: up to 60000 ms)")
+        else:
+            print("\nHeap scheduler created no calls during the jitter run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: FCM sending throughput of one worker process.
+
+Sends N messages to a local stand-in FCM v1 endpoint that answers after a
+fixed latency (simulating the round trip to fcm.googleapis.com) and
+compares:
+- sequential: one request at a time, as the firebase-admin SDK path does
+  from a Celery prefork worker
+- pooled: FCMHttpSender (persistent client, FCM_HTTP_CONCURRENCY threads)
+
+Usage (from backend/):
+    python -m benchmarks.fcm_sender
+    python -m benchmarks.fcm_sender --messages 20000 --latency 0.05 --concurrency 128
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from app.services.fcm_sender import FCMHttpSender  # noqa: E402
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1  # one write per response (avoids Nagle / delayed-ACK stalls on keep-alive)
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        token = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["message"]["token"]
+        time.sleep(self.server.latency)
+        body = json.dumps({"name": f"projects/bench/messages/{token}"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _serve(latency: float, port) -> None:
+    ThreadingHTTPServer.request_queue_size = 1024  # accept the whole pool connecting at once
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.latency = latency
+    port.value = server.server_address[1]
+    server.serve_forever()
+
+
+def _run(url: str, messages: list, concurrency: int) -> float:
+    sender = FCMHttpSender("bench", lambda force_refresh=False: "token", base_url=url,
+                           concurrency=concurrency, backoff=0)
+    try:
+        sender.send(messages[0])  # warm up the first connection
+        started = time.perf_counter()
+        if concurrency == 1:
+            results = [sender.send(m) for m in messages]
+        else:
+            results = sender.send_many(messages)
+        elapsed = time.perf_counter() - started
+    finally:
+        sender.close()
+    assert all(r.success for r in results)
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.03, help="Stand-in response latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--sequential-messages", type=int, default=200,
+                        help="Messages for the (slow) sequential run")
+    args = parser.parse_args()
+
+    # Separate process so the stand-in does not compete with the sender for the GIL
+    port = multiprocessing.Value("i", 0)
+    server = multiprocessing.Process(target=_serve, args=(args.latency, port), daemon=True)
+    server.start()
+    while not port.value:
+        time.sleep(0.01)
+    url = f"http://127.0.0.1:{port.value}"
+
+    messages = [
+        {"token": f"token-{i}", "title": "소리가 전화드려요", "body": "오늘 기분은 어떠세요?",
+         "data": {"call_id": str(i)}}
+        for i in range(args.messages)
+    ]
+
+    print(f"Stand-in FCM latency {args.latency * 1000:.0f} ms\n")
+    print(f"{'mode':<22} {'messages':>9} {'seconds':>8} {'msg/s':>8}")
+    sequential = _run(url, messages[:args.sequential_messages], 1)
+    print(f"{'sequential':<22} {args.sequential_messages:>9} {sequential:>8.2f} "
+          f"{args.sequential_messages / sequential:>8.0f}")
+    pooled = _run(url, messages, args.concurrency)
+    print(f"{f'pooled ({args.concurrency} threads)':<22} {args.messages:>9} {pooled:>8.2f} "
+          f"{args.messages / pooled:>8.0f}")
+
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
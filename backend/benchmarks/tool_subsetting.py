@@ -0,0 +1,212 @@
+"""
+Benchmark: plan-driven tool subsetting vs. sending every tool.
+
+Runs representative utterances through the agent (perceive → plan → act)
+with ``AgentConfig.enable_tool_subsetting`` on and off and compares the
+prompt tokens and time-to-first-token (TTFT) of each request.
+
+Subsetting trades fewer tool tokens for a less stable prompt prefix: the
+tool schemas come first, so every distinct selection is a separate entry
+in the provider's prompt cache. The ``prefixes`` column counts the distinct
+tool lists sent; with ``--live`` the ``cached`` column is the
+provider-reported cached share (``prompt_cache_stats``). Subsetting is off
+by default (``AGENT_TOOL_SUBSETTING``) until a live run shows a net win.
+
+By default no API calls are made: act() runs against a stub client and the
+prompt tokens are counted locally with tiktoken from the exact payload it
+would send (messages + tool schemas). With ``--live`` the requests go to
+OpenAI; prompt tokens are the provider-reported ones and TTFT is measured
+from the request until the first streamed chunk. Tool executions are
+replaced with no-ops in both modes so nothing leaves the process besides
+the chat requests.
+
+Usage (from backend/):
+    python -m benchmarks.tool_subsetting
+    OPENAI_API_KEY=sk-... python -m benchmarks.tool_subsetting --live --repeat 3
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import os
+import statistics
+import time
+import uuid
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from app.services.agents.openai_agent import (  # noqa: E402
+    AgentConfig,
+    ConversationContext,
+    OpenAIAgentService,
+)
+from app.services.tools.registry import ToolRegistry  # noqa: E402
+
+
+UTTERANCES = [
+    "안녕하세요, 오늘 날씨가 좋네요",
+    "요즘 무릎이 자꾸 아파요",
+    "혼자 있으니까 너무 외로워요",
+    "내일 병원 예약이 있어요",
+    "약 먹는 걸 또 깜빡했어요",
+    "가슴이 아프고 숨이 차요",
+    "이제 그만 끊을게요",
+]
+
+
+class _TimedStream:
+    """Wraps a chat completion stream and records when the first chunk arrives."""
+
+    def __init__(self, stream: Any, record: Dict[str, Any]):
+        self._stream = stream
+        self._record = record
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        async for chunk in self._stream:
+            if self._record["ttft_ms"] is None:
+                self._record["ttft_ms"] = (time.perf_counter() - self._record["started"]) * 1000
+            yield chunk
+
+    async def close(self) -> None:
+        close = getattr(self._stream, "close", None)
+        if close is not None and asyncio.iscoroutinefunction(close):
+            await close()
+
+
+class _RecordingCompletions:
+    """Stands in for ``client.chat.completions`` and records every request."""
+
+    def __init__(self, live_client: Optional[Any]):
+        self._live_client = live_client
+        self.requests: List[Dict[str, Any]] = []
+
+    async def create(self, **kwargs):
+        record = {"kwargs": kwargs, "started": time.perf_counter(), "ttft_ms": None}
+        self.requests.append(record)
+
+        if self._live_client is None:
+            async def empty():
+                return
+                yield
+            return _TimedStream(empty(), record)
+
+        stream = await self._live_client.chat.completions.create(**kwargs)
+        return _TimedStream(stream, record)
+
+
+def _build_service(subsetting: bool, live: bool) -> OpenAIAgentService:
+    config = AgentConfig(
+        max_tokens=256,
+        enable_reflection=False,
+        summarize_after_messages=0,
+        enable_tool_subsetting=subsetting,
+    )
+    service = OpenAIAgentService(config=config)
+
+    # Same schemas, no side effects
+    registry = ToolRegistry()
+    for tool in service.tool_registry.get_all():
+        registry.register(dataclasses.replace(tool, execute_func=lambda **kwargs: {"benchmark": True}))
+    service.tool_registry = registry
+
+    completions = _RecordingCompletions(service.client if live else None)
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return service
+
+
+def _local_prompt_tokens(service: OpenAIAgentService, kwargs: Dict[str, Any]) -> int:
+    """Approximate prompt tokens of a request payload with tiktoken."""
+    tokens = sum(service.count_tokens(m.get("content") or "") + 4 for m in kwargs["messages"])
+    if kwargs.get("tools"):
+        tokens += service.count_tokens(json.dumps(kwargs["tools"], ensure_ascii=False))
+    return tokens
+
+
+async def _run(subsetting: bool, live: bool, repeat: int) -> Dict[str, Any]:
+    service = _build_service(subsetting, live)
+    completions = service.client.chat.completions
+
+    prompt_tokens: List[int] = []
+    tool_counts: List[int] = []
+    tool_prefixes = set()
+    ttfts: List[float] = []
+
+    for _ in range(repeat):
+        for utterance in UTTERANCES:
+            context = ConversationContext(
+                conversation_id=f"bench-{uuid.uuid4().hex}",
+                elderly_name="김영희",
+                elderly_age=78,
+                health_condition="고혈압, 무릎 관절염",
+            )
+            before = service.prompt_cache_stats.prompt_tokens
+            async for _ in service.process_message(utterance, context):
+                pass
+
+            record = completions.requests[-1]
+            tools = record["kwargs"].get("tools") or []
+            tool_counts.append(len(tools))
+            tool_prefixes.add(json.dumps(tools, ensure_ascii=False, sort_keys=True))
+            if live:
+                prompt_tokens.append(service.prompt_cache_stats.prompt_tokens - before)
+                if record["ttft_ms"] is not None:
+                    ttfts.append(record["ttft_ms"])
+            else:
+                prompt_tokens.append(_local_prompt_tokens(service, record["kwargs"]))
+
+    return {
+        "requests": len(prompt_tokens),
+        "avg_tools": statistics.mean(tool_counts),
+        "avg_prompt_tokens": statistics.mean(prompt_tokens),
+        "tool_prefixes": len(tool_prefixes),
+        "cached_share": service.prompt_cache_stats.cached_share if live else None,
+        "p50_ttft_ms": statistics.median(ttfts) if ttfts else None,
+        "p95_ttft_ms": (
+            statistics.quantiles(ttfts, n=20)[-1] if len(ttfts) >= 2 else (ttfts[0] if ttfts else None)
+        ),
+    }
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--live", action="store_true", help="Send requests to OpenAI and measure TTFT")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the utterance set")
+    args = parser.parse_args()
+
+    results = {
+        "all tools": await _run(subsetting=False, live=args.live, repeat=args.repeat),
+        "subset": await _run(subsetting=True, live=args.live, repeat=args.repeat),
+    }
+
+    print(f"{'mode':<10} {'requests':>8} {'tools':>6} {'prefixes':>9} {'prompt tok':>11} {'cached':>7} "
+          f"{'p50 TTFT':>9} {'p95 TTFT':>9}")
+    for mode, r in results.items():
+        cached = "-" if r["cached_share"] is None else f"{r['cached_share']:.1%}"
+        print(
+            f"{mode:<10} {r['requests']:>8} {r['avg_tools']:>6.1f} {r['tool_prefixes']:>9} "
+            f"{r['avg_prompt_tokens']:>11.1f} {cached:>7} "
+            f"{_fmt(r['p50_ttft_ms']):>9} {_fmt(r['p95_ttft_ms']):>9}"
+        )
+
+    full, subset = results["all tools"], results["subset"]
+    saved = full["avg_prompt_tokens"] - subset["avg_prompt_tokens"]
+    print(f"\nPrompt tokens saved per request: {saved:.1f} ({saved / full['avg_prompt_tokens']:.1%})")
+    print(f"Distinct tool prefixes: {full['tool_prefixes']} (all tools) vs {subset['tool_prefixes']} (subset)")
+    if not args.live:
+        print("TTFT and cache hits not measured offline; rerun with --live.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,176 @@
+"""
+Benchmark: concurrent WebSocket V2 calls per process vs. DB pool size.
+
+Runs N calls through websocket_endpoint_v2 at once, in-process (fake
+WebSocket, fake agent streaming a reply over a fixed duration), against an
+async engine with the production pool settings (pool_size=10,
+max_overflow=20). Each call connects, sends one message, receives the
+streamed reply and ends the call.
+
+Reports how many calls were streaming at the same time and the peak number
+of checked-out DB connections. A handler holding a session per call can
+stream at most pool_size + max_overflow calls; the rest wait for
+pool_timeout and fail.
+
+Defaults to a temporary SQLite file; pass ``--database-url`` to run
+against PostgreSQL (tables are created, rows are not cleaned up).
+
+Usage (from backend/):
+    python -m benchmarks.ws_call_capacity
+    python -m benchmarks.ws_call_capacity --calls 2000 --stream-seconds 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+_tmp_dir = tempfile.mkdtemp(prefix="sori_ws_bench_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp_dir}/bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import AsyncAdaptedQueuePool  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.security import create_device_access_token  # noqa: E402
+from app.database import Base, async_database_url  # noqa: E402
+from app.models.call import Call  # noqa: E402
+from app.models.elderly import Elderly  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.routes.websocket_v2 import websocket_endpoint_v2  # noqa: E402
+
+
+class _WebSocket:
+    def __init__(self):
+        self.inbound = asyncio.Queue()
+        self.inbound.put_nowait(json.dumps({"type": "message", "content": "잘 지냈어요"}))
+        self.inbound.put_nowait(json.dumps({"type": "end_call"}))
+        self.ended = False
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        self.ended = self.ended or message["type"] == "ended"
+
+    async def receive_text(self):
+        return await self.inbound.get()
+
+    async def close(self, code=None):
+        pass
+
+
+class _Agent:
+    """Streams greeting and reply in 10 chunks spread over `stream_seconds`."""
+
+    def __init__(self, stream_seconds: float):
+        self.config = MagicMock(reflection_mode=None)
+        self.stream_seconds = stream_seconds
+        self.streaming = 0
+        self.peak_streaming = 0
+
+    async def _stream(self, text):
+        self.streaming += 1
+        self.peak_streaming = max(self.peak_streaming, self.streaming)
+        try:
+            for _ in range(10):
+                await asyncio.sleep(self.stream_seconds / 10)
+                yield text
+        finally:
+            self.streaming -= 1
+
+    def generate_greeting(self, context):
+        return self._stream("안녕하세요 ")
+
+    def process_message(self, user_message, context):
+        return self._stream("네, ")
+
+    def cancel_reflection(self, conversation_id):
+        pass
+
+    def clear_conversation(self, conversation_id):
+        pass
+
+    def schedule_summarization(self, conversation_id):
+        pass
+
+
+def _seed(url: str, calls: int):
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        caregiver = User(email=f"bench-{time.time_ns()}@example.com", password_hash="x", full_name="보호자")
+        elderly = [Elderly(caregiver=caregiver, name=f"어르신{i}") for i in range(calls)]
+        rows = [Call(elderly=e, status="scheduled", trigger_type="auto", started_at=datetime.utcnow())
+                for e in elderly]
+        db.add_all([caregiver, *elderly, *rows])
+        db.commit()
+        result = [(c.id, create_device_access_token(c.elderly_id, 0)) for c in rows]
+    engine.dispose()
+    return result
+
+
+async def _run(url: str, calls, stream_seconds: float, pool_size: int, max_overflow: int):
+    # SQLite serializes writers: wait for the file lock instead of failing the end-of-call burst
+    connect_args = {"timeout": 60} if url.startswith("sqlite") else {}
+    async_engine = create_async_engine(async_database_url(url), poolclass=AsyncAdaptedQueuePool,
+                                       pool_size=pool_size, max_overflow=max_overflow, pool_timeout=30,
+                                       connect_args=connect_args)
+    sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    agent = _Agent(stream_seconds)
+    peak = {"checked_out": 0}
+
+    async def sample_pool():
+        while True:
+            peak["checked_out"] = max(peak["checked_out"], async_engine.pool.checkedout())
+            await asyncio.sleep(0.005)
+
+    sockets = [_WebSocket() for _ in calls]
+    sampler = asyncio.create_task(sample_pool())
+    started = time.perf_counter()
+    with patch("app.routes.websocket_v2.AsyncSessionLocal", sessions), \
+            patch("app.routes.websocket_v2.get_agent_service", return_value=agent), \
+            patch.object(settings, "MESSAGE_JOURNAL_DIR", os.path.join(_tmp_dir, "journal")), \
+            patch("app.tasks.analysis.analyze_call"):
+        await asyncio.gather(*(
+            websocket_endpoint_v2(ws, call_id, token) for ws, (call_id, token) in zip(sockets, calls)
+        ))
+    elapsed = time.perf_counter() - started
+    sampler.cancel()
+    await async_engine.dispose()
+    return elapsed, agent.peak_streaming, peak["checked_out"], sum(ws.ended for ws in sockets)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--stream-seconds", type=float, default=2.0, help="Duration of each streamed reply")
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--max-overflow", type=int, default=20)
+    parser.add_argument("--database-url", default=f"sqlite:///{_tmp_dir}/bench.db")
+    args = parser.parse_args()
+
+    url = args.database_url
+    calls = _seed(url, args.calls)
+    elapsed, streaming, checked_out, ended = asyncio.run(
+        _run(url, calls, args.stream_seconds, args.pool_size, args.max_overflow))
+
+    print(f"DB pool: pool_size={args.pool_size} max_overflow={args.max_overflow} "
+          f"(a session per call caps at {args.pool_size + args.max_overflow} calls)")
+    print(f"calls                      {args.calls:>8}")
+    print(f"completed                  {ended:>8}")
+    print(f"peak concurrent streaming  {streaming:>8}")
+    print(f"peak checked-out conns     {checked_out:>8}")
+    print(f"wall time (s)              {elapsed:>8.2f}  (two streamed replies = {2 * args.stream_seconds:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 import pytest
 import os
 import sys
+from contextlib import ExitStack, contextmanager
+from typing import NamedTuple
+from unittest.mock import patch
 
 # 프로젝트 루트를 path에 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -13,10 +16,11 @@ os.environ["ENVIRONMENT"] = "testing"
 
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
-from app.database import Base, get_db
+from app.database import Base, async_database_url, get_db
 
 # 테스트용 인메모리 SQLite 데이터베이스
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -37,6 +41,15 @@ def override_get_db():
         db.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_auth_caches():
+    # 테스트마다 DB를 새로 만들어 id가 재사용되므로 인증 캐시도 비움
+    from app.core.auth_cache import clear_auth_caches
+    clear_auth_caches()
+    yield
+    clear_auth_caches()
+
+
 @pytest.fixture(scope="function")
 def db_session():
     Base.metadata.create_all(bind=engine)
@@ -59,6 +72,50 @@ def client(db_session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def task_db(db_session):
+    """
+    Factory running a task module's ``get_task_db()`` against the test session.
+
+    ``task_db("app.tasks.push")`` patches the module and returns db_session;
+    the session is committed when the task's block ends, like the real one.
+    """
+    @contextmanager
+    def get_test_db():
+        yield db_session
+        db_session.commit()
+
+    with ExitStack() as stack:
+        def use(module: str):
+            stack.enter_context(patch(f"{module}.get_task_db", get_test_db))
+            return db_session
+        yield use
+
+
+class AsyncDatabase(NamedTuple):
+    url: str
+    Session: sessionmaker
+    sessions: async_sessionmaker
+
+
+@pytest.fixture
+def async_database(tmp_path):
+    """
+    File SQLite database shared by a sync sessionmaker and an async one.
+
+    For code on the async session (WebSocket handlers, the message buffer)
+    whose results the test checks with sync sessions; NullPool so every
+    event loop gets its own aiosqlite connection.
+    """
+    url = f"sqlite:///{tmp_path}/test.db"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    async_engine = create_async_engine(async_database_url(url), poolclass=NullPool)
+    sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    yield AsyncDatabase(url, sessionmaker(bind=engine), sessions)
+    engine.dispose()
+
+
 @pytest.fixture
 def test_user_data():
     return {
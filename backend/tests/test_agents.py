@@ -22,8 +22,10 @@ from app.services.agents.evaluator import (
     EvaluationResult,
     DimensionScore,
     EvaluationDimension,
+    StreamAction,
 )
 from app.services.agents.openai_agent import AgentPhase
+from app.services.tools.registry import ToolRegistry
 
 
 class TestAgentConfig:
@@ -92,16 +94,14 @@ class TestOpenAIAgentService:
     @pytest.fixture
     def mock_agent_service(self, agent_config, mock_openai_client):
         """Create agent service with mocked dependencies."""
-        with patch("app.services.agents.openai_agent.AsyncOpenAI") as mock_openai:
+        with patch("app.services.agents.openai_agent.get_async_openai_client") as mock_openai:
             mock_openai.return_value = mock_openai_client
 
             with patch("app.services.agents.openai_agent.settings") as mock_settings:
                 mock_settings.OPENAI_API_KEY = "test-key"
 
                 with patch("app.services.agents.openai_agent.get_registry") as mock_registry:
-                    mock_registry.return_value = MagicMock()
-                    mock_registry.return_value._tools = {}
-                    mock_registry.return_value.__len__ = MagicMock(return_value=0)
+                    mock_registry.return_value = ToolRegistry()
 
                     with patch("app.services.agents.openai_agent.get_skill_loader") as mock_skill:
                         mock_skill.return_value = MagicMock()
@@ -148,23 +148,31 @@ class TestOpenAIAgentService:
 
     def test_get_tools_for_openai(self, mock_agent_service):
         """Test OpenAI tool format generation."""
-        # Add mock tool
-        mock_tool = MagicMock()
-        mock_tool.name = "test_tool"
-        mock_tool.description = "Test tool description"
-        mock_tool.input_schema = {
-            "properties": {"param": {"type": "string"}},
-            "required": ["param"]
-        }
-        mock_agent_service.tool_registry._tools = {"test_tool": mock_tool}
+        from app.services.tools.registry import Tool
+
+        registry = ToolRegistry()
+        for name in ("test_tool", "other_tool"):
+            registry.register(Tool(
+                name=name,
+                description="Test tool description",
+                input_schema={
+                    "properties": {"param": {"type": "string"}},
+                    "required": ["param"]
+                },
+                execute_func=lambda **kwargs: None,
+            ))
+        mock_agent_service.tool_registry = registry
 
         tools = mock_agent_service._get_tools_for_openai()
 
-        assert len(tools) == 1
+        assert len(tools) == 2
         assert tools[0]["type"] == "function"
         assert tools[0]["function"]["name"] == "test_tool"
         assert "parameters" in tools[0]["function"]
 
+        subset = mock_agent_service._get_tools_for_openai(["other_tool"])
+        assert [t["function"]["name"] for t in subset] == ["other_tool"]
+
     def test_conversation_management(self, mock_agent_service, conversation_context):
         """Test conversation history management."""
         conv_id = conversation_context.conversation_id
@@ -187,20 +195,199 @@ class TestOpenAIAgentService:
         assert len(history) == 0
 
 
+class TestConversationHistory:
+    """Test token-budgeted conversation history."""
+
+    @staticmethod
+    def _history(budget=100, max_messages=50):
+        from app.services.agents import ConversationHistory
+        # One token per character keeps the arithmetic readable
+        return ConversationHistory(count_tokens=len, token_budget=budget, max_messages=max_messages)
+
+    def test_tokens_counted_once_on_append(self):
+        counted = []
+        history = self._history()
+        history.count_tokens = lambda text: counted.append(text) or len(text)
+
+        msg = Message(role="user", content="안녕하세요")
+        history.append(msg)
+        history.copy()
+        list(history)
+
+        assert counted == ["안녕하세요"]
+        assert msg.token_count == 5 + 4
+        assert history.total_tokens == 9
+
+    def test_pop_updates_total(self):
+        history = self._history()
+        history.append(Message(role="user", content="a" * 10))
+        history.append(Message(role="assistant", content="b" * 20))
+
+        history.pop()
+
+        assert history.total_tokens == 14
+        assert history[-1].role == "user"
+
+    def test_trims_oldest_turns_to_budget(self):
+        history = self._history(budget=60)
+        for i in range(3):
+            history.append(Message(role="user", content=f"u{i}" * 5))  # 14 tokens
+            history.append(Message(role="assistant", content=f"a{i}" * 5))
+
+        assert history.total_tokens <= 60
+        assert [m.content[:2] for m in history] == ["u1", "a1", "u2", "a2"]
+        assert history.trimmed_messages == 2
+        assert history.get_stats()["trimmed_tokens"] == 28
+
+    def test_does_not_leave_orphan_replies(self):
+        history = self._history(budget=50)
+        history.append(Message(role="user", content="u" * 6))
+        history.append(Message(role="assistant", content="a" * 6))
+        history.append(Message(role="assistant", content="b" * 6))
+        history.append(Message(role="user", content="v" * 30))
+
+        assert [m.role for m in history] == ["user"]
+
+    def test_message_cap(self):
+        history = self._history(budget=10_000, max_messages=4)
+        for i in range(6):
+            history.append(Message(role="user" if i % 2 == 0 else "assistant", content=str(i)))
+
+        assert [m.content for m in history] == ["2", "3", "4", "5"]
+
+    def test_keeps_latest_message_over_budget(self):
+        history = self._history(budget=5)
+        history.append(Message(role="user", content="아주 긴 메시지입니다"))
+
+        assert len(history) == 1
+
+    @pytest.mark.parametrize("keep_recent", [0, 1, 2])
+    def test_summarizable_keeps_latest_turn(self, keep_recent):
+        history = self._history()
+        for i in range(2):
+            history.append(Message(role="user", content=f"u{i}"))
+            history.append(Message(role="assistant", content=f"a{i}"))
+
+        assert [m.content for m in history.summarizable_messages(keep_recent)] == ["u0", "a0"]
+        assert self._history().summarizable_messages(keep_recent) == []
+
+    def test_agent_uses_configured_budget(self, conversation_context):
+        conv_id = conversation_context.conversation_id
+        service = build_streaming_agent_service(AgentConfig(history_token_budget=40), MagicMock())
+
+        for i in range(10):
+            service._add_message(conv_id, Message(role="user", content=f"메시지 {i}"))
+
+        conversation = service._get_conversation(conv_id)
+        assert conversation.total_tokens <= 40
+        assert conversation.total_tokens == sum(m.token_count for m in conversation)
+        assert conversation[-1].content == "메시지 9"
+
+
+class TestRollingSummary:
+    """Test background summarization of older turns."""
+
+    @pytest.fixture
+    def summary_service(self):
+        release = asyncio.Event()
+
+        async def create(**kwargs):
+            await release.wait()
+            response = MagicMock()
+            response.choices[0].message.content = "어르신이 무릎 통증을 말씀하심"
+            return response
+
+        config = AgentConfig(summarize_after_messages=6, summary_keep_recent_messages=2)
+        service = build_streaming_agent_service(config, MagicMock())
+        service.client.chat.completions.create = AsyncMock(side_effect=create)
+        service.release = release
+        return service
+
+    @staticmethod
+    def _fill(service, conv_id, turns):
+        for i in range(turns):
+            service._add_message(conv_id, Message(role="user", content=f"질문 {i}"))
+            service._add_message(conv_id, Message(role="assistant", content=f"답변 {i}"))
+
+    def test_below_threshold_does_nothing(self, summary_service, conversation_context):
+        conv_id = conversation_context.conversation_id
+        self._fill(summary_service, conv_id, 2)
+
+        assert summary_service.schedule_summarization(conv_id) is None
+
+    @pytest.mark.asyncio
+    async def test_summary_swapped_in_after_background_run(self, summary_service, conversation_context):
+        conv_id = conversation_context.conversation_id
+        self._fill(summary_service, conv_id, 4)
+
+        task = summary_service.schedule_summarization(conv_id)
+        assert summary_service.schedule_summarization(conv_id) is task
+
+        # A turn that arrives while summarizing is kept
+        summary_service._add_message(conv_id, Message(role="user", content="새 질문"))
+        summary_service.release.set()
+        removed = await task
+
+        conversation = summary_service._get_conversation(conv_id)
+        assert removed == 6
+        assert [m.content for m in conversation] == ["질문 3", "답변 3", "새 질문"]
+        assert conversation.summary == "어르신이 무릎 통증을 말씀하심"
+        assert conversation.total_tokens == (
+            sum(m.token_count for m in conversation) + conversation.summary_tokens
+        )
+
+        prompt = summary_service.client.chat.completions.create.await_args.kwargs["messages"]
+        assert "질문 0" in prompt[1]["content"]
+        assert "질문 3" not in prompt[1]["content"]
+
+    @pytest.mark.asyncio
+    async def test_previous_summary_is_extended(self, summary_service, conversation_context):
+        conv_id = conversation_context.conversation_id
+        self._fill(summary_service, conv_id, 4)
+        conversation = summary_service._get_conversation(conv_id)
+        conversation.apply_summary("이전 요약", [])
+
+        summary_service.release.set()
+        await summary_service.schedule_summarization(conv_id)
+
+        prompt = summary_service.client.chat.completions.create.await_args.kwargs["messages"]
+        assert prompt[1]["content"].startswith("## 기존 요약\n이전 요약")
+
+    @pytest.mark.asyncio
+    async def test_clear_conversation_cancels(self, summary_service, conversation_context):
+        conv_id = conversation_context.conversation_id
+        self._fill(summary_service, conv_id, 4)
+
+        task = summary_service.schedule_summarization(conv_id)
+        await asyncio.sleep(0)
+        summary_service.clear_conversation(conv_id)
+        await asyncio.wait({task})
+
+        assert task.cancelled()
+
+    def test_summary_message_in_prompt_order(self):
+        from app.services.agents import ConversationHistory
+
+        history = ConversationHistory(count_tokens=len, token_budget=1000)
+        history.append(Message(role="user", content="안녕"))
+        history.apply_summary("요약", [])
+
+        assert history.summary_message() == {"role": "system", "content": "## 이전 대화 요약\n요약"}
+        assert history.total_tokens == (2 + 4) + (2 + 4)
+
+
 class TestPerception:
     """Test perception phase (intent and emotion detection)."""
 
     @pytest.fixture
     def mock_agent_service(self, agent_config):
         """Create minimal agent service for perception tests."""
-        with patch("app.services.agents.openai_agent.AsyncOpenAI"):
+        with patch("app.services.agents.openai_agent.get_async_openai_client"):
             with patch("app.services.agents.openai_agent.settings") as mock_settings:
                 mock_settings.OPENAI_API_KEY = "test-key"
 
                 with patch("app.services.agents.openai_agent.get_registry") as mock_registry:
-                    mock_registry.return_value = MagicMock()
-                    mock_registry.return_value._tools = {}
-                    mock_registry.return_value.__len__ = MagicMock(return_value=0)
+                    mock_registry.return_value = ToolRegistry()
 
                     with patch("app.services.agents.openai_agent.get_skill_loader") as mock_skill:
                         mock_skill.return_value = MagicMock()
@@ -280,6 +467,472 @@ class TestPerception:
         assert "token_count" in perception
 
 
+def build_streaming_agent_service(config, make_stream):
+    """Create an agent service whose LLM calls return ``make_stream()``."""
+    from app.services.agents.orchestrator import OrchestratorResult
+
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=make_stream)
+
+    with patch("app.services.agents.openai_agent.get_async_openai_client", return_value=client):
+        with patch("app.services.agents.openai_agent.settings") as mock_settings:
+            mock_settings.OPENAI_API_KEY = "test-key"
+
+            with patch("app.services.agents.openai_agent.get_registry") as mock_registry:
+                mock_registry.return_value = ToolRegistry()
+
+                with patch("app.services.agents.openai_agent.get_skill_loader") as mock_skill:
+                    mock_skill.return_value = MagicMock()
+                    mock_skill.return_value.skills = []
+                    mock_skill.return_value.get_matching_skills = MagicMock(return_value=[])
+
+                    with patch("app.services.agents.openai_agent.get_orchestrator") as mock_orch:
+                        mock_orch.return_value = MagicMock()
+                        mock_orch.return_value.workers = []
+                        mock_orch.return_value.orchestrate = AsyncMock(
+                            return_value=OrchestratorResult(worker_results=[])
+                        )
+
+                        with patch("app.services.agents.openai_agent.register_all_tools"):
+                            return OpenAIAgentService(config=config)
+
+
+class TestBackgroundReflection:
+    """Test ReflectionMode.BACKGROUND (stream first, evaluate afterwards)."""
+
+    @pytest.fixture
+    def mock_agent_service(self, mock_openai_response):
+        """Create agent service in background reflection mode."""
+        from app.services.agents import ReflectionMode
+
+        def make_stream(*args, **kwargs):
+            async def stream():
+                yield mock_openai_response("괜찮으세요? ")
+                yield mock_openai_response("말씀해 주세요.")
+            return stream()
+
+        config = AgentConfig(max_retries=2, reflection_mode=ReflectionMode.BACKGROUND)
+        return build_streaming_agent_service(config, make_stream)
+
+    @staticmethod
+    def _evaluation(should_retry: bool) -> EvaluationResult:
+        dim = lambda d: DimensionScore(d, 0.5 if should_retry else 0.9, "")
+        return EvaluationResult(
+            relevance=dim(EvaluationDimension.RELEVANCE),
+            accuracy=dim(EvaluationDimension.ACCURACY),
+            empathy=dim(EvaluationDimension.EMPATHY),
+            completeness=dim(EvaluationDimension.COMPLETENESS),
+            safety=dim(EvaluationDimension.SAFETY),
+            overall_score=0.5 if should_retry else 0.9,
+            should_retry=should_retry,
+            retry_reason="empathy 점수가 낮습니다" if should_retry else None,
+        )
+
+    @pytest.mark.asyncio
+    async def test_process_message_does_not_block_on_reflect(
+        self, mock_agent_service, conversation_context
+    ):
+        """Streaming finishes before the evaluator returns."""
+        release = asyncio.Event()
+
+        async def slow_evaluate(**kwargs):
+            await release.wait()
+            return self._evaluation(should_retry=False)
+
+        mock_agent_service.evaluator.evaluate = slow_evaluate
+
+        chunks = [c async for c in mock_agent_service.process_message("안녕하세요", conversation_context)]
+
+        assert "".join(chunks) == "괜찮으세요? 말씀해 주세요."
+        assert conversation_context.conversation_id in mock_agent_service._pending_reflections
+
+        release.set()
+        evaluation = await mock_agent_service.await_reflection(conversation_context.conversation_id)
+
+        assert evaluation.should_retry is False
+        assert conversation_context.conversation_id not in mock_agent_service._pending_reflections
+
+    @pytest.mark.asyncio
+    async def test_correct_response_replaces_last_answer(
+        self, mock_agent_service, conversation_context
+    ):
+        """A demanded retry regenerates the answer in place of the old one."""
+        conv_id = conversation_context.conversation_id
+        mock_agent_service.evaluator.evaluate = AsyncMock(return_value=self._evaluation(should_retry=True))
+
+        async for _ in mock_agent_service.process_message("외로워요", conversation_context):
+            pass
+        evaluation = await mock_agent_service.await_reflection(conv_id)
+        assert evaluation.should_retry is True
+        assert conv_id in mock_agent_service._retry_enhancements
+
+        corrected = [c async for c in mock_agent_service.correct_response("외로워요", conversation_context)]
+
+        history = mock_agent_service.get_conversation_history(conv_id)
+        assert "".join(corrected) == "괜찮으세요? 말씀해 주세요."
+        assert [m.role for m in history] == ["user", "assistant"]
+        assert conv_id not in mock_agent_service._retry_enhancements
+
+    @pytest.mark.asyncio
+    async def test_cancel_reflection(self, mock_agent_service, conversation_context):
+        """A pending evaluation can be dropped when the user moves on."""
+        conv_id = conversation_context.conversation_id
+        mock_agent_service.evaluator.evaluate = AsyncMock(side_effect=lambda **kw: asyncio.sleep(10))
+
+        async for _ in mock_agent_service.process_message("안녕하세요", conversation_context):
+            pass
+        mock_agent_service.cancel_reflection(conv_id)
+
+        assert await mock_agent_service.await_reflection(conv_id) is None
+
+    @pytest.mark.asyncio
+    async def test_cancel_reflection_drops_finished_enhancement(
+        self, mock_agent_service, conversation_context
+    ):
+        """A retry already queued by a finished evaluation is not applied later."""
+        conv_id = conversation_context.conversation_id
+        mock_agent_service.evaluator.evaluate = AsyncMock(return_value=self._evaluation(should_retry=True))
+
+        async for _ in mock_agent_service.process_message("외로워요", conversation_context):
+            pass
+        await asyncio.wait({mock_agent_service._pending_reflections[conv_id]})
+        assert conv_id in mock_agent_service._retry_enhancements
+
+        mock_agent_service.cancel_reflection(conv_id)
+
+        assert conv_id not in mock_agent_service._retry_enhancements
+
+
+class TestTurnAnalysis:
+    """Test per-turn analysis reuse across phases and retries."""
+
+    @pytest.fixture
+    def mock_agent_service(self, mock_openai_response):
+        def make_stream(*args, **kwargs):
+            async def stream():
+                yield mock_openai_response("많이 힘드셨겠어요.")
+            return stream()
+
+        config = AgentConfig(max_retries=2, retry_delay_base=0)
+        return build_streaming_agent_service(config, make_stream)
+
+    @pytest.mark.asyncio
+    async def test_retry_reuses_perception_and_plan(self, mock_agent_service, conversation_context):
+        """A retry neither re-appends the user message nor re-runs the workers."""
+        evaluations = iter([
+            TestBackgroundReflection._evaluation(should_retry=True),
+            TestBackgroundReflection._evaluation(should_retry=False),
+        ])
+        mock_agent_service.evaluator.evaluate = AsyncMock(side_effect=lambda **kw: next(evaluations))
+
+        async for _ in mock_agent_service.process_message("머리가 아파요", conversation_context):
+            pass
+
+        history = mock_agent_service.get_conversation_history(conversation_context.conversation_id)
+        assert [m.role for m in history] == ["user", "assistant"]
+        assert mock_agent_service.orchestrator.orchestrate.await_count == 1
+
+        stats = mock_agent_service.turn_stats.to_dict()
+        assert stats["turns_analyzed"] == 1
+        assert stats["perceptions_reused"] == 1
+        assert stats["plans_reused"] == 1
+        assert stats["skill_matches_reused"] == 1
+        assert stats["recomputations_saved"] == 3
+
+    @pytest.mark.asyncio
+    async def test_new_message_starts_new_turn(self, mock_agent_service, conversation_context):
+        conv_id = conversation_context.conversation_id
+        mock_agent_service.evaluator.evaluate = AsyncMock(
+            return_value=TestBackgroundReflection._evaluation(should_retry=False)
+        )
+
+        for text in ["안녕하세요", "안녕하세요"]:
+            async for _ in mock_agent_service.process_message(text, conversation_context):
+                pass
+
+        history = mock_agent_service.get_conversation_history(conv_id)
+        assert [m.role for m in history] == ["user", "assistant", "user", "assistant"]
+        assert mock_agent_service.turn_stats.turns_analyzed == 2
+        assert mock_agent_service.turn_stats.perceptions_reused == 0
+
+    @pytest.mark.asyncio
+    async def test_plan_passes_keyword_matches_to_workers(
+        self, mock_agent_service, conversation_context
+    ):
+        turn = mock_agent_service.begin_turn(conversation_context, "가슴이 아파요")
+        perception = await mock_agent_service.perceive("가슴이 아파요", conversation_context, turn)
+        plan = await mock_agent_service.plan(perception, conversation_context, turn)
+
+        _, orchestrator_context = mock_agent_service.orchestrator.orchestrate.await_args.args
+        assert orchestrator_context["keyword_matches"] is turn.keyword_matches
+        assert perception["is_emergency"] is True
+        assert plan["priority"] == "urgent"
+        assert turn.plan is plan
+
+    @pytest.mark.asyncio
+    async def test_plan_uses_perceived_emergency_flag(self, mock_agent_service, conversation_context):
+        """The keyword scan runs once, in perceive()."""
+        turn = mock_agent_service.begin_turn(conversation_context, "가슴이 아파요")
+        perception = await mock_agent_service.perceive("가슴이 아파요", conversation_context, turn)
+
+        with patch.object(mock_agent_service, "_is_emergency") as is_emergency:
+            plan = await mock_agent_service.plan(perception, conversation_context, turn)
+
+        is_emergency.assert_not_called()
+        assert plan["priority"] == "urgent"
+
+
+class TestPromptPrefix:
+    """Test prompt assembly for provider-side prompt caching."""
+
+    @pytest.fixture
+    def service(self, mock_openai_response):
+        def make_stream(*args, **kwargs):
+            async def stream():
+                yield mock_openai_response("네, 알겠어요.")
+                usage_chunk = mock_openai_response()
+                usage_chunk.choices = []
+                usage_chunk.usage = MagicMock(prompt_tokens=2000)
+                usage_chunk.usage.prompt_tokens_details.cached_tokens = 1536
+                yield usage_chunk
+            return stream()
+
+        return build_streaming_agent_service(AgentConfig(enable_reflection=False), make_stream)
+
+    def test_static_prefix_identical_across_turns(self, service, conversation_context):
+        conv_id = conversation_context.conversation_id
+        conversation = service._get_conversation(conv_id)
+
+        conversation_context.is_greeting = True
+        first = service._build_messages(conversation_context, "", conversation)
+
+        conversation_context.is_greeting = False
+        service._add_message(conv_id, Message(role="user", content="무릎이 아파요"))
+        service._retry_enhancements[conv_id] = "\n\n## 응답 개선 지침\n- 더 공감해주세요"
+        second = service._build_messages(conversation_context, "무릎이 아파요", conversation)
+
+        assert first[0] == second[0]
+        assert "인사" not in second[0]["content"]
+        assert "응답 개선 지침" not in second[0]["content"]
+
+    def test_volatile_instructions_come_last(self, service, conversation_context):
+        conv_id = conversation_context.conversation_id
+        conversation = service._get_conversation(conv_id)
+        service._add_message(conv_id, Message(role="user", content="외로워요"))
+        service._retry_enhancements[conv_id] = "\n\n## 응답 개선 지침\n- 더 공감해주세요"
+
+        messages = service._build_messages(conversation_context, "외로워요", conversation)
+
+        assert [m["role"] for m in messages] == ["system", "user", "system"]
+        assert "응답 개선 지침" in messages[-1]["content"]
+
+    @pytest.mark.asyncio
+    async def test_records_cached_prefix_share(self, service, conversation_context):
+        async for _ in service.process_message("안녕하세요", conversation_context):
+            pass
+
+        kwargs = service.client.chat.completions.create.await_args.kwargs
+        assert kwargs["stream_options"] == {"include_usage": True}
+
+        stats = service.prompt_cache_stats.to_dict()
+        assert stats["requests"] == 1
+        assert stats["prompt_tokens"] == 2000
+        assert stats["cached_tokens"] == 1536
+        assert stats["cached_share"] == 0.768
+        assert 0 < stats["static_prefix_tokens"] <= 2000
+
+    @pytest.mark.asyncio
+    async def test_health_endpoint_reports_shares(self, service, conversation_context, client):
+        async for _ in service.process_message("안녕하세요", conversation_context):
+            pass
+
+        with patch("app.routes.websocket_v2._agent_service", service):
+            response = client.get("/health/agent")
+
+        assert response.status_code == 200
+        assert response.json() == service.prompt_cache_stats.to_dict()
+        assert response.json()["cached_share"] == 0.768
+
+
+class TestToolSubsetting:
+    """Test sending only the planned tools plus the core set."""
+
+    @staticmethod
+    def _service(mock_openai_response, **config):
+        from app.services.tools.base_tools import register_all_tools
+
+        def make_stream(*args, **kwargs):
+            async def stream():
+                yield mock_openai_response("괜찮으세요?")
+            return stream()
+
+        service = build_streaming_agent_service(
+            AgentConfig(enable_reflection=False, **config), make_stream
+        )
+        register_all_tools(service.tool_registry)
+        return service
+
+    @staticmethod
+    def _sent_tools(service):
+        tools = service.client.chat.completions.create.await_args.kwargs["tools"]
+        return [t["function"]["name"] for t in tools]
+
+    def test_select_tools_adds_core_set(self, mock_openai_response):
+        service = self._service(mock_openai_response, enable_tool_subsetting=True)
+
+        selected = service._select_tools({"use_tools": ["check_health_status", "end_call"]})
+
+        assert selected == ["end_call", "notify_caregiver", "check_health_status"]
+        assert service._select_tools(None) is None
+
+    @pytest.mark.asyncio
+    async def test_act_sends_planned_tools_only(self, mock_openai_response, conversation_context):
+        service = self._service(mock_openai_response, enable_tool_subsetting=True)
+
+        async for _ in service.process_message("무릎이 아파요", conversation_context):
+            pass
+
+        assert self._sent_tools(service) == ["end_call", "check_health_status", "notify_caregiver"]
+
+    @pytest.mark.asyncio
+    async def test_subsetting_off_by_default(self, mock_openai_response, conversation_context):
+        """Every turn sends the full tool list, keeping the cached prompt prefix stable."""
+        service = self._service(mock_openai_response)
+
+        async for _ in service.process_message("무릎이 아파요", conversation_context):
+            pass
+
+        assert len(self._sent_tools(service)) == len(service.tool_registry)
+
+
+class TestToolLoop:
+    """Test multi-round tool execution in act()."""
+
+    @staticmethod
+    def _tool_call_chunk(index, call_id, name, arguments="{}"):
+        from types import SimpleNamespace
+
+        function = SimpleNamespace(name=name, arguments=arguments)
+        tool_call = SimpleNamespace(index=index, id=call_id, function=function)
+        delta = SimpleNamespace(content=None, tool_calls=[tool_call])
+        return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    @staticmethod
+    def _register(service, name, func, timeout_seconds=30.0):
+        from app.services.tools.registry import Tool
+
+        service.tool_registry.register(Tool(
+            name=name,
+            description=name,
+            input_schema={"properties": {}},
+            execute_func=func,
+            timeout_seconds=timeout_seconds,
+        ))
+
+    def _service(self, mock_openai_response, tool_calls, **config):
+        """Service whose model calls ``tool_calls`` while tools are offered, then answers."""
+        def make_stream(*args, **kwargs):
+            resumed = any(m["role"] == "tool" for m in kwargs["messages"])
+
+            async def stream():
+                if kwargs.get("tools") and not resumed:
+                    for i, (call_id, name) in enumerate(tool_calls):
+                        yield self._tool_call_chunk(i, call_id, name)
+                else:
+                    yield mock_openai_response("확인했어요.")
+            return stream()
+
+        config.setdefault("enable_tool_subsetting", False)
+        return build_streaming_agent_service(
+            AgentConfig(enable_reflection=False, **config), make_stream
+        )
+
+    @pytest.mark.asyncio
+    async def test_parallel_calls_fed_back_to_model(self, mock_openai_response, conversation_context):
+        service = self._service(
+            mock_openai_response, [("call_1", "slow_a"), ("call_2", "slow_b")]
+        )
+
+        async def slow_a():
+            await asyncio.sleep(0.2)
+            return "a"
+
+        async def slow_b():
+            await asyncio.sleep(0.2)
+            return "b"
+
+        self._register(service, "slow_a", slow_a)
+        self._register(service, "slow_b", slow_b)
+
+        loop = asyncio.get_event_loop()
+        started = loop.time()
+        chunks = [c async for c in service.act("혈압 확인해줘", conversation_context)]
+        elapsed = loop.time() - started
+
+        assert "".join(chunks) == "확인했어요."
+        assert elapsed < 0.35  # both tools ran concurrently
+
+        create = service.client.chat.completions.create
+        assert create.await_count == 2
+        resumed = create.await_args_list[1].kwargs["messages"]
+        assert [t["id"] for t in resumed[-3]["tool_calls"]] == ["call_1", "call_2"]
+        assert [(m["role"], m["tool_call_id"]) for m in resumed[-2:]] == [
+            ("tool", "call_1"), ("tool", "call_2")
+        ]
+        assert '"result": "a"' in resumed[-2]["content"]
+
+        history = service.get_conversation_history(conversation_context.conversation_id)
+        assert [c["name"] for c in history[-1].tool_calls] == ["slow_a", "slow_b"]
+
+    @pytest.mark.asyncio
+    async def test_tool_timeout_is_reported(self, mock_openai_response, conversation_context):
+        service = self._service(mock_openai_response, [("call_1", "stuck")])
+
+        async def stuck():
+            await asyncio.sleep(5)
+
+        self._register(service, "stuck", stuck, timeout_seconds=0.05)
+
+        chunks = [c async for c in service.act("안녕", conversation_context)]
+
+        assert "".join(chunks) == "확인했어요."
+        history = service.get_conversation_history(conversation_context.conversation_id)
+        assert "timed out" in history[-1].tool_results[0]["result"]["error"]
+
+    @pytest.mark.asyncio
+    async def test_tool_call_cap(self, mock_openai_response, conversation_context):
+        service = self._service(
+            mock_openai_response,
+            [("call_1", "tool_a"), ("call_2", "tool_b")],
+            max_tool_calls_per_turn=1,
+        )
+        calls = []
+        self._register(service, "tool_a", lambda: calls.append("a"))
+        self._register(service, "tool_b", lambda: calls.append("b"))
+
+        chunks = [c async for c in service.act("안녕", conversation_context)]
+
+        assert "".join(chunks) == "확인했어요."
+        assert calls == ["a"]
+
+        # Budget used up: the model is resumed without tools
+        create = service.client.chat.completions.create
+        assert create.await_args_list[1].kwargs["tools"] is None
+
+        history = service.get_conversation_history(conversation_context.conversation_id)
+        assert "limit" in history[-1].tool_results[1]["result"]["error"]
+
+    @pytest.mark.asyncio
+    async def test_end_call_stops_loop(self, mock_openai_response, conversation_context):
+        service = self._service(mock_openai_response, [("call_1", "end_call")])
+        self._register(service, "end_call", lambda: {"action": "end_call"})
+
+        chunks = [c async for c in service.act("이만 끊을게요", conversation_context)]
+
+        assert chunks == ["\n[CALL_END]"]
+        assert service.client.chat.completions.create.await_count == 1
+
+
 class TestEvaluatorAgent:
     """Test EvaluatorAgent for response quality evaluation."""
 
@@ -334,6 +987,88 @@ class TestEvaluatorAgent:
         assert len(result.urgent_flags) > 0 or result.safety.score < 1.0
 
 
+class TestIncrementalEvaluation:
+    """Test sentence-level checks on streaming responses."""
+
+    @pytest.fixture
+    def evaluator(self):
+        config = EvaluatorConfig(enable_llm_evaluation=False, stream_safety_grace_sentences=2)
+        return EvaluatorAgent(MagicMock(), config)
+
+    def test_releases_complete_sentences_only(self, evaluator):
+        monitor = evaluator.start_incremental("오늘 날씨가 좋네요")
+
+        first = monitor.feed("네, 정말 좋")
+        second = monitor.feed("네요. 산책 다녀오")
+        last = monitor.finish()
+
+        assert first.action == StreamAction.CONTINUE
+        assert first.released == []
+        assert second.released == ["네, 정말 좋네요."]
+        assert last.released == [" 산책 다녀오"]
+
+    def test_aborts_on_medical_advice(self, evaluator):
+        monitor = evaluator.start_incremental("머리가 아파요")
+
+        check = monitor.feed("많이 불편하시겠어요. 진통제 복용량을 두 배로")
+        check = monitor.feed(" 늘리세요. 그리고")
+
+        assert check.action == StreamAction.ABORT
+        assert check.released == []
+        assert "복용량" in check.sentence
+        assert check.improvement_hints
+
+    def test_redirects_unaddressed_emergency(self, evaluator):
+        monitor = evaluator.start_incremental("숨이 안 쉬어져요")
+
+        first = monitor.feed("많이 힘드시겠어요. ")
+        second = monitor.feed("천천히 쉬어보세요. ")
+
+        assert first.action == StreamAction.CONTINUE
+        assert first.released == ["많이 힘드시겠어요."]
+        assert second.action == StreamAction.REDIRECT
+        assert second.urgent_flags
+
+    def test_addressed_emergency_continues(self, evaluator):
+        monitor = evaluator.start_incremental("숨이 안 쉬어져요")
+
+        check = monitor.feed("지금 바로 119에 전화하세요. 보호자분께도 알릴게요. 괜찮아요.")
+
+        assert check.action == StreamAction.CONTINUE
+        assert len(check.released) == 3
+        assert monitor.finish().action == StreamAction.CONTINUE
+
+    @pytest.mark.asyncio
+    async def test_process_message_regenerates_aborted_stream(
+        self, mock_openai_response, conversation_context
+    ):
+        """Nothing after the unsafe sentence is sent; the retry replaces it."""
+        attempts = iter([
+            ["걱정되시죠. ", "약을 먹", "으면 돼요. ", "하루 세 번이요."],
+            ["걱정되시죠. ", "보호자분께 여쭤볼게요."],
+        ])
+
+        def make_stream(*args, **kwargs):
+            chunks = next(attempts)
+
+            async def stream():
+                for text in chunks:
+                    yield mock_openai_response(text)
+            return stream()
+
+        config = AgentConfig(max_retries=2, enable_reflection=False, enable_incremental_evaluation=True)
+        service = build_streaming_agent_service(config, make_stream)
+
+        chunks = [c async for c in service.process_message("약 어떻게 먹어요?", conversation_context)]
+        output = "".join(chunks)
+
+        assert output == "걱정되시죠.\n\n걱정되시죠. 보호자분께 여쭤볼게요."
+        assert "하루 세 번" not in output
+        history = service.get_conversation_history(conversation_context.conversation_id)
+        assert [m.role for m in history] == ["user", "assistant"]
+        assert history[-1].content == "걱정되시죠. 보호자분께 여쭤볼게요."
+
+
 class TestAgentPhases:
     """Test agent processing phases."""
 
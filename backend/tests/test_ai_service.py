@@ -0,0 +1,90 @@
+"""
+Tests for the legacy AIService.
+
+Tests that streaming and analysis go through the async client so they
+don't block the event loop.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.ai_service import AIService
+
+
+def _chunk(content):
+    delta = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+@pytest.fixture
+def async_client():
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock()
+    with patch("app.core.llm_clients.get_async_openai_client", return_value=client):
+        yield client
+
+
+@pytest.fixture
+def sync_client():
+    client = MagicMock()
+    with patch("app.core.llm_clients.get_openai_client", return_value=client):
+        yield client
+
+
+class TestAIServiceAsync:
+    """Test the async OpenAI path."""
+
+    @pytest.mark.asyncio
+    async def test_stream_chat_response_does_not_block_loop(self, async_client, sync_client):
+        async def stream():
+            for text in ("안녕하세요, ", "어르신!"):
+                await asyncio.sleep(0.05)
+                yield _chunk(text)
+
+        async_client.chat.completions.create.return_value = stream()
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        chunks = [c async for c in AIService().stream_chat_response([], is_greeting=True)]
+        task.cancel()
+
+        assert "".join(chunks) == "안녕하세요, 어르신!"
+        assert ticks >= 5  # other coroutines kept running during generation
+        assert async_client.chat.completions.create.await_args.kwargs["stream"] is True
+        sync_client.chat.completions.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_analyze_call_async(self, async_client, sync_client):
+        message = SimpleNamespace(content='분석 결과: {"summary": "안정적", "risk_score": "20"}')
+        async_client.chat.completions.create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=message)]
+        )
+
+        result = await AIService().analyze_call_async([
+            {"role": "user", "content": "오늘 산책했어요"},
+        ])
+
+        assert result["summary"] == "안정적"
+        assert result["risk_score"] == 20
+        sync_client.chat.completions.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_analyze_invalid_response(self, async_client, sync_client):
+        message = SimpleNamespace(content=None)
+        async_client.chat.completions.create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=message)]
+        )
+
+        result = await AIService().analyze_conversation_async("대화")
+
+        assert result["risk_score"] == 0
@@ -0,0 +1,291 @@
+"""
+Tests for post-call analysis tasks.
+
+Tests the batch mode: bulk loading, bounded concurrency and the
+single-transaction write of analyses and risk levels, and the wait of
+analyze_call for messages still buffered by an API process.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import event
+
+from app.models.call import Call
+from app.models.call_analysis import CallAnalysis
+from app.models.elderly import Elderly
+from app.models.message import Message
+from app.models.user import User
+from app.tasks import analysis
+
+
+@pytest.fixture
+def task_db(task_db):
+    """Run tasks against the test session."""
+    return task_db("app.tasks.analysis")
+
+
+@pytest.fixture
+def caregiver(db_session):
+    user = User(email="care@example.com", password_hash="x", full_name="보호자")
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+def _add_call(db, elderly, ended_at, messages=("안녕하세요",), status="completed"):
+    call = Call(elderly_id=elderly.id, started_at=ended_at - timedelta(minutes=5),
+                ended_at=ended_at, status=status)
+    db.add(call)
+    db.flush()
+    for i, content in enumerate(messages):
+        db.add(Message(call_id=call.id, role="user" if i % 2 == 0 else "assistant", content=content))
+    db.commit()
+    return call
+
+
+class FakeAIService:
+    """Records concurrency; risk score is taken from the conversation text."""
+
+    def __init__(self, delay=0.02, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def analyze_conversation_async(self, conversation, elderly_context=""):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail_on and self.fail_on in conversation:
+                raise RuntimeError("LLM error")
+            score = 90 if "위험" in conversation else 10
+            return {"summary": elderly_context, "risk_score": score, "concerns": "", "recommendations": ""}
+        finally:
+            self.in_flight -= 1
+
+
+class TestBatchAnalysis:
+    """Test batch_analyze_pending."""
+
+    @pytest.fixture
+    def ai(self):
+        fake = FakeAIService()
+        with patch("app.tasks.analysis.get_ai_service", return_value=fake):
+            yield fake
+
+    def test_loads_batch_with_bulk_queries(self, task_db, caregiver):
+        now = datetime(2026, 1, 1, 12, 0)
+        elderly = [Elderly(caregiver_id=caregiver.id, name=f"어르신{i}") for i in range(4)]
+        task_db.add_all(elderly)
+        task_db.commit()
+        for i in range(20):
+            _add_call(task_db, elderly[i % 4], now + timedelta(minutes=i), messages=("안녕", "네"))
+        _add_call(task_db, elderly[0], now, messages=())  # nothing to analyze
+        task_db.expire_all()
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(task_db.get_bind(), "before_cursor_execute", listener)
+        try:
+            items = analysis.load_pending_calls(task_db, limit=50)
+            for item in items:
+                item.call.elderly_id, item.elderly and item.elderly.name, len(item.messages)
+        finally:
+            event.remove(task_db.get_bind(), "before_cursor_execute", listener)
+
+        assert len(items) == 20
+        assert all(len(item.messages) == 2 for item in items)
+        assert len(statements) == 3
+
+    def test_analyzes_concurrently_and_writes_once(self, task_db, caregiver, ai):
+        now = datetime(2026, 1, 1, 12, 0)
+        kim = Elderly(caregiver_id=caregiver.id, name="김영희")
+        lee = Elderly(caregiver_id=caregiver.id, name="이철수")
+        task_db.add_all([kim, lee])
+        task_db.commit()
+
+        _add_call(task_db, kim, now, messages=("위험해요",))
+        _add_call(task_db, kim, now + timedelta(hours=1), messages=("괜찮아요",))
+        for i in range(10):
+            _add_call(task_db, lee, now + timedelta(minutes=i), messages=("위험해요",))
+
+        commits = []
+        event.listen(task_db, "after_commit", lambda session: commits.append(1))
+        with patch("app.tasks.push.send_high_risk_alert") as alert:
+            stats = analysis.batch_analyze_pending(limit=50, concurrency=4)
+
+        assert stats == {"loaded": 12, "analyzed": 12, "failed": 0}
+        assert ai.peak == 4
+        assert len(commits) <= 3  # end of the read, batch write (+ the task session's final commit)
+        assert task_db.query(CallAnalysis).count() == 12
+
+        # Latest call decides the risk level
+        task_db.refresh(kim)
+        task_db.refresh(lee)
+        assert kim.risk_level == "low"
+        assert lee.risk_level == "critical"
+        assert alert.delay.call_count == 11
+
+    def test_failed_analyses_stay_pending(self, task_db, caregiver):
+        now = datetime(2026, 1, 1, 12, 0)
+        elderly = Elderly(caregiver_id=caregiver.id, name="김영희")
+        task_db.add(elderly)
+        task_db.commit()
+        _add_call(task_db, elderly, now, messages=("실패",))
+        _add_call(task_db, elderly, now + timedelta(minutes=1), messages=("안녕",))
+
+        fake = FakeAIService(fail_on="실패")
+        with patch("app.tasks.analysis.get_ai_service", return_value=fake):
+            stats = analysis.batch_analyze_pending(limit=10, concurrency=2)
+
+        assert stats == {"loaded": 2, "analyzed": 1, "failed": 1}
+        assert len(analysis.load_pending_calls(task_db, limit=10)) == 1
+
+    def test_repeated_failures_do_not_starve_new_calls(self, task_db, caregiver):
+        now = datetime(2026, 1, 1, 12, 0)
+        elderly = Elderly(caregiver_id=caregiver.id, name="김영희")
+        task_db.add(elderly)
+        task_db.commit()
+        for i in range(2):
+            _add_call(task_db, elderly, now + timedelta(minutes=i), messages=("실패",))
+
+        fake = FakeAIService(fail_on="실패")
+        with patch("app.tasks.analysis.get_ai_service", return_value=fake), \
+                patch.object(analysis.settings, "ANALYSIS_MAX_ATTEMPTS", 2), \
+                patch.object(analysis.batch_analyze_pending, "delay"):
+            assert analysis.batch_analyze_pending(limit=2, concurrency=2)["failed"] == 2
+
+            # Calls never tried go ahead of the failed ones
+            fresh = _add_call(task_db, elderly, now + timedelta(hours=1), messages=("안녕",))
+            assert [i.call.id for i in analysis.load_pending_calls(task_db, limit=1)] == [fresh.id]
+
+            assert analysis.batch_analyze_pending(limit=3, concurrency=2) == {"loaded": 3, "analyzed": 1, "failed": 2}
+            # Given up after ANALYSIS_MAX_ATTEMPTS
+            assert analysis.load_pending_calls(task_db, limit=10) == []
+
+        failed = task_db.query(Call).filter(Call.id != fresh.id).all()
+        assert all(c.analysis_attempts == 2 and c.analysis_failed_at for c in failed)
+
+    def test_no_transaction_open_during_llm_requests(self, task_db, caregiver):
+        elderly = Elderly(caregiver_id=caregiver.id, name="김영희")
+        task_db.add(elderly)
+        task_db.commit()
+        _add_call(task_db, elderly, datetime(2026, 1, 1, 12, 0))
+
+        in_transaction = []
+
+        class Recording(FakeAIService):
+            async def analyze_conversation_async(self, conversation, elderly_context=""):
+                in_transaction.append(task_db.in_transaction())
+                return await super().analyze_conversation_async(conversation, elderly_context)
+
+        with patch("app.tasks.analysis.get_ai_service", return_value=Recording()):
+            assert analysis.batch_analyze_pending(limit=10, concurrency=2)["analyzed"] == 1
+
+        assert in_transaction == [False]
+
+    def test_concurrent_analysis_does_not_roll_back_batch(self, task_db, caregiver):
+        """A call analyzed meanwhile by analyze_call is skipped, the rest is written."""
+        from tests.conftest import TestingSessionLocal
+
+        now = datetime(2026, 1, 1, 12, 0)
+        elderly = Elderly(caregiver_id=caregiver.id, name="김영희")
+        task_db.add(elderly)
+        task_db.commit()
+        raced = _add_call(task_db, elderly, now, messages=("먼저",))
+        for i in range(3):
+            _add_call(task_db, elderly, now + timedelta(minutes=i + 1))
+        raced_id = raced.id
+
+        class Racing(FakeAIService):
+            async def analyze_conversation_async(self, conversation, elderly_context=""):
+                if "먼저" in conversation:
+                    with TestingSessionLocal() as other:
+                        other.add(CallAnalysis(call_id=raced_id, summary="per-call task", risk_score=5))
+                        other.commit()
+                return await super().analyze_conversation_async(conversation, elderly_context)
+
+        with patch("app.tasks.analysis.get_ai_service", return_value=Racing()):
+            stats = analysis.batch_analyze_pending(limit=10, concurrency=1)
+
+        assert stats == {"loaded": 4, "analyzed": 3, "failed": 0}
+        assert task_db.query(CallAnalysis).count() == 4
+        assert task_db.query(CallAnalysis).filter_by(call_id=raced_id).one().summary == "per-call task"
+
+    def test_retried_old_call_keeps_newer_risk_level(self, task_db, caregiver, ai):
+        now = datetime(2026, 1, 1, 12, 0)
+        elderly = Elderly(caregiver_id=caregiver.id, name="김영희", risk_level="low")
+        task_db.add(elderly)
+        task_db.commit()
+        old = _add_call(task_db, elderly, now, messages=("위험해요",))
+        old.analysis_attempts = 1
+        newer = _add_call(task_db, elderly, now + timedelta(hours=1), messages=("괜찮아요",))
+        task_db.add(CallAnalysis(call_id=newer.id, summary="", risk_score=10))
+        task_db.commit()
+
+        with patch("app.tasks.push.send_high_risk_alert"):
+            assert analysis.batch_analyze_pending(limit=10, concurrency=1)["analyzed"] == 1
+
+        task_db.refresh(elderly)
+        assert elderly.risk_level == "low"
+
+    def test_requeues_while_backlog_remains(self, task_db, caregiver, ai):
+        now = datetime(2026, 1, 1, 12, 0)
+        elderly = Elderly(caregiver_id=caregiver.id, name="김영희")
+        task_db.add(elderly)
+        task_db.commit()
+        for i in range(3):
+            _add_call(task_db, elderly, now + timedelta(minutes=i))
+
+        with patch.object(analysis.batch_analyze_pending, "delay") as requeue:
+            analysis.batch_analyze_pending(limit=2, concurrency=2)
+            requeue.assert_called_once_with(limit=2, concurrency=2)
+
+            requeue.reset_mock()
+            analysis.batch_analyze_pending(limit=2, concurrency=2)
+            requeue.assert_not_called()
+
+        assert task_db.query(CallAnalysis).count() == 3
+
+
+class TestAnalyzeCall:
+    """Test analyze_call waiting for buffered messages."""
+
+    @pytest.fixture
+    def call(self, task_db, caregiver):
+        elderly = Elderly(caregiver_id=caregiver.id, name="김영희")
+        task_db.add(elderly)
+        task_db.commit()
+        return _add_call(task_db, elderly, datetime(2026, 1, 1, 12, 0))
+
+    @pytest.fixture
+    def ai(self):
+        service = MagicMock()
+        service.analyze_conversation.return_value = {"summary": "안부", "risk_score": 10}
+        with patch("app.tasks.analysis.get_ai_service", return_value=service):
+            yield service
+
+    def test_waits_while_messages_are_buffered_elsewhere(self, task_db, call, ai):
+        with patch.object(analysis.pending_messages, "is_pending", return_value=True), \
+                patch.object(analysis.analyze_call, "apply_async") as requeue:
+            result = analysis.analyze_call(call.id)
+
+        assert result == {"status": "waiting_for_messages"}
+        requeue.assert_called_once_with(args=[call.id, 1], countdown=analysis.settings.MESSAGE_FLUSH_INTERVAL)
+        ai.analyze_conversation.assert_not_called()
+        assert task_db.query(CallAnalysis).count() == 0
+
+    def test_analyzes_once_flushed_or_after_max_waits(self, task_db, call, ai):
+        with patch.object(analysis.pending_messages, "is_pending", return_value=True), \
+                patch.object(analysis.analyze_call, "apply_async") as requeue:
+            result = analysis.analyze_call(call.id, analysis.settings.ANALYSIS_MESSAGE_WAIT_RETRIES)
+
+        requeue.assert_not_called()
+        assert result["status"] == "completed"
+        assert task_db.query(CallAnalysis).filter_by(call_id=call.id).count() == 1
@@ -0,0 +1,153 @@
+"""
+Tests for the token / principal caches used by authentication.
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+from jose import jwt
+from sqlalchemy import event
+
+from app.core import auth_cache
+from app.core.auth_cache import TokenCache, device_cache, user_cache
+from app.core.security import create_access_token, create_device_access_token, verify_token
+from app.models.elderly import Elderly
+from app.models.elderly_device import ElderlyDevice
+from app.models.user import User
+from tests.conftest import TestingSessionLocal, engine
+
+
+@pytest.fixture
+def user_selects():
+    """Count SELECTs against the users table."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def device(client):
+    with TestingSessionLocal() as db:
+        caregiver = User(email="care@example.com", password_hash="x", full_name="보호자")
+        elderly = Elderly(caregiver=caregiver, name="김영희")
+        device = ElderlyDevice(elderly=elderly, fcm_token="fcm-token")
+        db.add_all([caregiver, elderly, device])
+        db.commit()
+        caregiver_headers = {"Authorization": f"Bearer {create_access_token(caregiver.id, caregiver.email)}"}
+        device_headers = {"Authorization": f"Bearer {create_device_access_token(elderly.id, device.id)}"}
+        return elderly.id, device.id, caregiver_headers, device_headers
+
+
+class TestTokenCache:
+
+    def test_lru_eviction(self):
+        cache = TokenCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_entries_expire_with_ttl_and_token_exp(self):
+        cache = TokenCache(maxsize=10, ttl=60)
+        cache.set("expired", 1, expires_at=time.time() - 1)
+        assert cache.get("expired") is None
+
+        cache.set("fresh", 2)
+        assert cache.get("fresh") == 2
+        with patch("app.core.auth_cache.time.time", return_value=time.time() + 61):
+            assert cache.get("fresh") is None
+
+    def test_invalidate_by_tag(self):
+        cache = TokenCache(maxsize=10, ttl=60)
+        cache.set("t1", "user", tag="user:1")
+        cache.set("t2", "user", tag="user:1")
+        cache.set("t3", "other", tag="user:2")
+
+        assert cache.invalidate("user:1") == 2
+        assert cache.get("t1") is None and cache.get("t2") is None
+        assert cache.get("t3") == "other"
+
+    def test_keys_are_token_hashes(self):
+        cache = TokenCache(maxsize=10, ttl=60)
+        cache.set("secret-token", 1)
+        assert "secret-token" not in cache._entries
+        assert TokenCache.key("secret-token") in cache._entries
+
+    def test_zero_ttl_disables_cache(self):
+        cache = TokenCache(maxsize=10, ttl=0)
+        cache.set("t", 1)
+        assert cache.get("t") is None
+
+
+def test_verify_token_decodes_once():
+    token = create_access_token(1, "care@example.com")
+    with patch("app.core.security.jwt.decode", wraps=jwt.decode) as decode:
+        first = verify_token(token)
+        first["sub"] = "tampered"  # callers get their own copy
+        assert verify_token(token)["sub"] == "1"
+    assert decode.call_count == 1
+    assert verify_token("not-a-jwt") is None
+
+
+def test_current_user_is_resolved_without_a_query(client, auth_headers, user_selects):
+    assert client.get("/api/auth/me", headers=auth_headers).status_code == 200
+    user_selects.clear()
+
+    for _ in range(3):
+        response = client.get("/api/auth/me", headers=auth_headers)
+        assert response.json()["data"]["email"] == "test@example.com"
+    assert user_selects == []
+
+
+def test_user_update_invalidates_cached_principal(client, auth_headers):
+    client.get("/api/auth/me", headers=auth_headers)
+    response = client.post("/api/auth/update-fcm-token", headers=auth_headers,
+                           json={"fcm_token": "new-token", "device_type": "ios"})
+    assert response.status_code == 200
+
+    # The cached snapshot was merged into the request session, so the update was committed
+    with TestingSessionLocal() as db:
+        assert db.query(User).one().fcm_token == "new-token"
+    assert len(user_cache) == 0
+
+
+def test_disconnect_device_invalidates_device_token(client, device):
+    elderly_id, device_id, caregiver_headers, device_headers = device
+    assert client.get("/api/device/pending-call", headers=device_headers).status_code == 200
+    assert device_cache.get(device_headers["Authorization"][7:]) == elderly_id
+
+    response = client.delete(f"/api/elderly/{elderly_id}/devices/{device_id}", headers=caregiver_headers)
+    assert response.status_code in (200, 204)
+
+    response = client.get("/api/device/pending-call", headers=device_headers)
+    assert response.status_code == 401
+    assert auth_cache.get_auth_cache_stats()["devices"]["invalidations"] >= 1
+
+
+def test_cached_caregiver_token_is_rejected_on_device_routes(client, device):
+    _, _, caregiver_headers, _ = device
+    assert client.get("/api/auth/me", headers=caregiver_headers).status_code == 200
+
+    response = client.get("/api/device/pending-call", headers=caregiver_headers)
+
+    assert response.status_code == 403
+
+
+def test_cached_device_token_is_rejected_on_caregiver_routes(client, device):
+    _, _, _, device_headers = device
+    assert client.get("/api/device/pending-call", headers=device_headers).status_code == 200
+
+    response = client.get("/api/auth/me", headers=device_headers)
+
+    assert response.status_code == 401
@@ -1,4 +1,5 @@
 import pytest
+from unittest.mock import patch
 
 
 class TestCallsStart:
@@ -172,3 +173,162 @@ class TestCallsAnalysis:
         # 분석 결과 조회 (아직 없음)
         response = client.get(f"/api/calls/{call_id}/analysis", headers=auth_headers)
         assert response.status_code == 404
+
+
+class TestCallsAnalysisPipeline:
+    """통화 종료 시 분석을 Celery로 넘기고 상태를 조회"""
+
+    @staticmethod
+    def _start_call(client, auth_headers):
+        elderly_resp = client.post("/api/elderly", headers=auth_headers, json={"name": "홍길동"})
+        call_resp = client.post("/api/calls", headers=auth_headers, json={
+            "elderly_id": elderly_resp.json()["data"]["id"],
+            "call_type": "voice"
+        })
+        return call_resp.json()["data"]["id"]
+
+    def test_end_call_enqueues_analysis(self, client, auth_headers, db_session):
+        """메시지가 있으면 분석 작업을 큐에 넣고 바로 응답"""
+        from app.services.calls import CallService
+
+        call_id = self._start_call(client, auth_headers)
+        CallService.save_message(db_session, call_id, "user", "오늘 무릎이 아파요")
+
+        with patch("app.tasks.analysis.analyze_call.delay") as mock_delay:
+            response = client.put(f"/api/calls/{call_id}/end", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()["data"]["analysis_status"] == "pending"
+        mock_delay.assert_called_once_with(call_id)
+
+    def test_end_call_enqueue_failure_is_recorded(self, client, auth_headers, db_session):
+        """분석 요청이 실패하면 failed로 기록되어 상태 조회도 failed"""
+        from app.services.calls import CallService
+
+        call_id = self._start_call(client, auth_headers)
+        CallService.save_message(db_session, call_id, "user", "오늘 무릎이 아파요")
+
+        with patch("app.tasks.analysis.analyze_call.delay", side_effect=ConnectionError("broker down")):
+            response = client.put(f"/api/calls/{call_id}/end", headers=auth_headers)
+
+        assert response.json()["data"]["analysis_status"] == "failed"
+        response = client.get(f"/api/calls/{call_id}/analysis/status", headers=auth_headers)
+        assert response.json()["data"]["analysis_status"] == "failed"
+
+    def test_end_call_already_completed(self, client, auth_headers, db_session):
+        """WebSocket에서 이미 종료된 통화는 종료 시각을 유지하고 분석을 다시 요청하지 않음"""
+        from app.services.calls import CallService
+
+        call_id = self._start_call(client, auth_headers)
+        CallService.save_message(db_session, call_id, "user", "오늘 무릎이 아파요")
+        with patch("app.tasks.analysis.analyze_call.delay"):
+            first = client.put(f"/api/calls/{call_id}/end", headers=auth_headers).json()["data"]
+
+        with patch("app.tasks.analysis.analyze_call.delay") as mock_delay:
+            response = client.put(f"/api/calls/{call_id}/end", headers=auth_headers)
+
+        data = response.json()["data"]
+        assert data["status"] == "completed"
+        assert data["ended_at"] == first["ended_at"]
+        assert data["duration"] == first["duration"]
+        assert data["analysis_status"] == "pending"
+        mock_delay.assert_not_called()
+
+    def test_end_call_without_messages(self, client, auth_headers):
+        """메시지가 없으면 분석하지 않음"""
+        call_id = self._start_call(client, auth_headers)
+
+        with patch("app.tasks.analysis.analyze_call.delay") as mock_delay:
+            response = client.put(f"/api/calls/{call_id}/end", headers=auth_headers)
+
+        assert response.json()["data"]["analysis_status"] == "none"
+        mock_delay.assert_not_called()
+
+    def test_analysis_status(self, client, auth_headers, db_session):
+        """분석 전에는 pending, 저장 후에는 completed + 결과"""
+        from app.services.calls import CallService
+
+        call_id = self._start_call(client, auth_headers)
+        CallService.save_message(db_session, call_id, "user", "외로워요")
+        with patch("app.tasks.analysis.analyze_call.delay"):
+            client.put(f"/api/calls/{call_id}/end", headers=auth_headers)
+
+        response = client.get(f"/api/calls/{call_id}/analysis/status", headers=auth_headers)
+        assert response.json()["data"]["analysis_status"] == "pending"
+        assert response.json()["data"]["analysis"] is None
+
+        CallService.save_analysis(db_session, call_id, {"summary": "외로움 호소", "risk_score": 40})
+
+        response = client.get(f"/api/calls/{call_id}/analysis/status?wait=1", headers=auth_headers)
+        data = response.json()["data"]
+        assert data["analysis_status"] == "completed"
+        assert data["analysis"]["risk_score"] == 40
+
+    def test_analysis_status_long_poll_times_out(self, client, auth_headers, db_session):
+        """wait 동안 완료되지 않으면 pending 반환"""
+        from app.services.calls import CallService
+
+        call_id = self._start_call(client, auth_headers)
+        CallService.save_message(db_session, call_id, "user", "안녕하세요")
+        with patch("app.tasks.analysis.analyze_call.delay"):
+            client.put(f"/api/calls/{call_id}/end", headers=auth_headers)
+
+        with patch("app.routes.calls.ANALYSIS_POLL_INTERVAL", 0.01):
+            response = client.get(f"/api/calls/{call_id}/analysis/status?wait=1", headers=auth_headers)
+
+        assert response.json()["data"]["analysis_status"] == "pending"
+
+    def test_failed_analysis_ends_long_poll(self, client, auth_headers, db_session, task_db):
+        """analyze_call 실패가 기록되면 wait 없이 failed 반환"""
+        from app.services.calls import CallService
+        from app.tasks import analysis
+
+        call_id = self._start_call(client, auth_headers)
+        CallService.save_message(db_session, call_id, "user", "안녕하세요")
+        with patch("app.tasks.analysis.analyze_call.delay"):
+            client.put(f"/api/calls/{call_id}/end", headers=auth_headers)
+
+        task_db("app.tasks.analysis")
+        with patch("app.tasks.analysis.get_ai_service") as ai:
+            ai.return_value.analyze_conversation.side_effect = RuntimeError("LLM error")
+            assert analysis.analyze_call(call_id)["status"] == "error"
+
+        with patch("app.routes.calls.ANALYSIS_POLL_INTERVAL", 5):
+            response = client.get(f"/api/calls/{call_id}/analysis/status?wait=30", headers=auth_headers)
+
+        assert response.json()["data"]["analysis_status"] == "failed"
+
+    def test_long_poll_releases_connection_while_waiting(self, client, auth_headers, db_session):
+        """대기(sleep) 중에는 DB 커넥션을 잡고 있지 않음"""
+        import asyncio
+        from sqlalchemy import event
+        from app.services.calls import CallService
+        from tests.conftest import engine
+
+        call_id = self._start_call(client, auth_headers)
+        CallService.save_message(db_session, call_id, "user", "안녕하세요")
+        with patch("app.tasks.analysis.analyze_call.delay"):
+            client.put(f"/api/calls/{call_id}/end", headers=auth_headers)
+        db_session.close()
+
+        checked_out = []
+        held_while_sleeping = []
+        on_checkout = lambda *args: checked_out.append(1)
+        on_checkin = lambda *args: checked_out.pop()
+        real_sleep = asyncio.sleep
+
+        async def sleep(seconds):
+            held_while_sleeping.append(len(checked_out))
+            await real_sleep(0)
+
+        event.listen(engine, "checkout", on_checkout)
+        event.listen(engine, "checkin", on_checkin)
+        try:
+            with patch("app.routes.calls.asyncio.sleep", sleep):
+                response = client.get(f"/api/calls/{call_id}/analysis/status?wait=1", headers=auth_headers)
+        finally:
+            event.remove(engine, "checkout", on_checkout)
+            event.remove(engine, "checkin", on_checkin)
+
+        assert response.json()["data"]["analysis_status"] == "pending"
+        assert held_while_sleeping and set(held_while_sleeping) == {0}
@@ -0,0 +1,76 @@
+"""
+Tests for in-place schema upgrades of databases created by older releases.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from app.db_upgrade import init_schema
+from app.models.call_schedule_slot import CallScheduleSlot
+from app.models.elderly import Elderly
+
+# Tables as they were before call_schedule_slots / next_fire_at existed
+LEGACY_SCHEMA = [
+    """CREATE TABLE users (
+        id INTEGER PRIMARY KEY, email VARCHAR(255) UNIQUE NOT NULL, password_hash VARCHAR(255) NOT NULL,
+        full_name VARCHAR(255) NOT NULL, role VARCHAR(50), fcm_token VARCHAR(512), device_type VARCHAR(20),
+        push_enabled BOOLEAN, fcm_token_updated_at DATETIME, created_at DATETIME, updated_at DATETIME)""",
+    """CREATE TABLE elderly (
+        id INTEGER PRIMARY KEY, caregiver_id INTEGER NOT NULL REFERENCES users(id), name VARCHAR(255) NOT NULL,
+        age INTEGER, phone VARCHAR(20), call_schedule JSON, health_condition TEXT, medications JSON,
+        emergency_contact VARCHAR(255), risk_level VARCHAR(20), notes TEXT,
+        created_at DATETIME, updated_at DATETIME)""",
+    """CREATE TABLE calls (
+        id INTEGER PRIMARY KEY, elderly_id INTEGER NOT NULL REFERENCES elderly(id), call_type VARCHAR(50),
+        trigger_type VARCHAR(50), started_at DATETIME NOT NULL, ended_at DATETIME, duration INTEGER,
+        scheduled_for DATETIME, status VARCHAR(50), is_successful BOOLEAN, created_at DATETIME)""",
+    "INSERT INTO users (id, email, password_hash, full_name) VALUES (1, 'care@example.com', 'x', '보호자')",
+    """INSERT INTO elderly (id, caregiver_id, name, call_schedule)
+       VALUES (1, 1, '김영희', '{"enabled": true, "times": ["09:00", "19:00"]}'),
+              (2, 1, '박철수', '{"enabled": false, "times": ["09:00"]}')""",
+]
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/legacy.db")
+    with engine.begin() as conn:
+        for statement in LEGACY_SCHEMA:
+            conn.execute(text(statement))
+    yield engine
+    engine.dispose()
+
+
+def test_upgrades_legacy_database(legacy_engine):
+    applied = init_schema(legacy_engine)
+
+    assert "column elderly.next_fire_at" in applied
+    assert "table call_schedule_slots" in applied
+    inspector = inspect(legacy_engine)
+    assert "next_fire_at" in {c["name"] for c in inspector.get_columns("elderly")}
+    assert {i["name"] for i in inspector.get_indexes("calls")} >= {"idx_calls_elderly_scheduled"}
+    assert any(i["column_names"] == ["next_fire_at"] for i in inspector.get_indexes("elderly"))
+
+    # Backfilled from call_schedule: 7 days x 2 times for the enabled schedule only
+    with Session(legacy_engine) as db:
+        assert db.query(CallScheduleSlot).filter_by(elderly_id=1).count() == 14
+        assert db.query(CallScheduleSlot).filter_by(elderly_id=2).count() == 0
+        assert db.get(Elderly, 1).next_fire_at > datetime.utcnow()
+        assert db.get(Elderly, 2).next_fire_at is None
+
+
+def test_upgrade_is_idempotent(legacy_engine):
+    init_schema(legacy_engine)
+
+    assert init_schema(legacy_engine) == []
+
+
+def test_fresh_database_needs_no_upgrade(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/fresh.db")
+
+    assert init_schema(engine) == []
+    assert "call_schedule_slots" in inspect(engine).get_table_names()
+    engine.dispose()
@@ -0,0 +1,344 @@
+"""
+Tests for the device event channel (pending calls pushed over /api/device/events).
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+from fastapi import WebSocketDisconnect, status
+
+from app.core.security import create_device_access_token
+from app.models.call import Call
+from app.models.elderly import Elderly
+from app.models.elderly_device import ElderlyDevice
+from app.models.user import User
+from app.routes import device as device_routes
+from app.services.elderly import ElderlyService
+from app.services.device_events import (
+    RESYNC_EVENT,
+    DeviceEventHub,
+    DeviceEventPublisher,
+    device_event_hub,
+    device_events,
+    pending_call_event,
+)
+from app.tasks import schedule
+
+
+class FakeWebSocket:
+    """Records frames sent by the channel; receive_text blocks until disconnect()."""
+
+    def __init__(self):
+        self.sent = []
+        self.accepted = False
+        self.close_code = None
+        self._disconnected = asyncio.Event()
+
+    async def accept(self):
+        self.accepted = True
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+    async def receive_text(self):
+        await self._disconnected.wait()
+        raise WebSocketDisconnect()
+
+    async def close(self, code=None):
+        self.close_code = code
+
+    def disconnect(self):
+        self._disconnected.set()
+
+
+@pytest.fixture
+def publisher():
+    publisher = DeviceEventPublisher()
+    publisher._redis = MagicMock()
+    return publisher
+
+
+@pytest.fixture
+def loop_recorder():
+    """publish() stand-in recording, per call, whether it ran on the event loop."""
+    calls = []
+
+    def publish(events):
+        try:
+            asyncio.get_running_loop()
+            calls.append("event loop")
+        except RuntimeError:
+            calls.append("threadpool")
+        return len(events)
+
+    publish.calls = calls
+    return publish
+
+
+@pytest.fixture
+def hub():
+    """The process hub with its Redis subscription replaced by an idle task."""
+    async def idle(self):
+        await asyncio.Event().wait()
+
+    with patch.object(DeviceEventHub, "_listen", idle):
+        yield device_event_hub
+
+
+@pytest.fixture
+def database(async_database):
+    with patch("app.routes.device.AsyncSessionLocal", async_database.sessions):
+        yield async_database.Session
+
+
+@pytest.fixture
+def paired_device(database):
+    """(elderly_id, device_id, call_id, token) with an auto call due in 10 minutes."""
+    with database() as db:
+        caregiver = User(email="care@example.com", password_hash="x", full_name="보호자")
+        elderly = Elderly(caregiver=caregiver, name="김영희")
+        device = ElderlyDevice(elderly=elderly, fcm_token="fcm-token")
+        due = datetime.utcnow() + timedelta(minutes=10)
+        call = Call(elderly=elderly, status="scheduled", trigger_type="auto", started_at=due, scheduled_for=due)
+        db.add_all([caregiver, elderly, device, call])
+        db.commit()
+        return elderly.id, device.id, call.id, create_device_access_token(elderly.id, device.id)
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestPublisher:
+
+    def test_publishes_batch_in_one_pipeline(self, publisher):
+        events = [(1, pending_call_event(10, "scheduled")), (2, pending_call_event(11, "scheduled"))]
+
+        assert publisher.publish(events) == 2
+
+        pipe = publisher._redis.pipeline.return_value
+        publisher._redis.pipeline.assert_called_once_with(transaction=False)
+        assert [c.args[0] for c in pipe.publish.call_args_list] == ["device_events:1", "device_events:2"]
+        assert json.loads(pipe.publish.call_args_list[0].args[1]) == {
+            "type": "pending_call", "call_id": 10, "status": "scheduled", "scheduled_at": None,
+        }
+        pipe.execute.assert_called_once()
+
+    def test_nothing_to_publish_skips_redis(self, publisher):
+        assert publisher.publish([]) == 0
+        publisher._redis.pipeline.assert_not_called()
+
+    def test_redis_errors_are_swallowed(self, publisher):
+        publisher._redis.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+
+        assert publisher.publish_pending_call(1, 10, "in_progress") == 0
+
+
+class TestHub:
+
+    def test_dispatch_fans_out_per_elderly(self, hub):
+        async def run():
+            first, second = hub.subscribe(1), hub.subscribe(1)
+            other = hub.subscribe(2)
+            hub.dispatch(1, {"type": "pending_call", "call_id": 10})
+
+            assert first.get_nowait()["call_id"] == 10
+            assert second.get_nowait()["call_id"] == 10
+            assert other.empty()
+
+            for elderly_id, queue in [(1, first), (1, second), (2, other)]:
+                hub.unsubscribe(elderly_id, queue)
+            assert hub.connections == 0
+            await hub.close()
+
+        asyncio.run(run())
+
+    def test_full_queue_drops_events(self, hub):
+        async def run():
+            queue = hub.subscribe(1)
+            for i in range(hub.QUEUE_SIZE + 5):
+                hub.dispatch(1, {"type": "pending_call", "call_id": i})
+
+            assert queue.qsize() == hub.QUEUE_SIZE
+            hub.unsubscribe(1, queue)
+            await hub.close()
+
+        asyncio.run(run())
+
+
+class TestEventChannel:
+
+    def test_sends_pending_call_then_forwards_events(self, hub, paired_device):
+        elderly_id, device_id, call_id, token = paired_device
+
+        async def run():
+            ws = FakeWebSocket()
+            channel = asyncio.create_task(device_routes.device_event_channel(ws, token))
+            await asyncio.sleep(0.2)
+
+            assert ws.accepted
+            assert ws.sent[0]["type"] == "pending_call"
+            assert ws.sent[0]["call_id"] == call_id
+            assert ws.sent[0]["scheduled_at"] is not None
+
+            hub.dispatch(elderly_id, pending_call_event(99, "in_progress"))
+            await settle()
+            assert ws.sent[-1] == pending_call_event(99, "in_progress")
+
+            # After a resubscription the pending call is re-read from the DB
+            hub.dispatch(elderly_id, RESYNC_EVENT)
+            await asyncio.sleep(0.2)
+            assert ws.sent[-1]["call_id"] == call_id
+
+            ws.disconnect()
+            await asyncio.wait_for(channel, 1)
+            assert hub.connections == 0
+            await hub.close()
+
+        asyncio.run(run())
+
+    def test_unpairing_closes_only_that_device(self, hub, paired_device):
+        elderly_id, device_id, call_id, token = paired_device
+
+        async def run():
+            ws = FakeWebSocket()
+            channel = asyncio.create_task(device_routes.device_event_channel(ws, token))
+            await asyncio.sleep(0.2)
+
+            hub.dispatch(elderly_id, {"type": "device_unpaired", "device_id": device_id + 1})
+            await settle()
+            assert not channel.done()
+
+            hub.dispatch(elderly_id, {"type": "device_unpaired", "device_id": device_id})
+            await asyncio.wait_for(channel, 1)
+            assert ws.close_code == status.WS_1008_POLICY_VIOLATION
+            await hub.close()
+
+        asyncio.run(run())
+
+    def test_sends_ping_when_idle(self, hub, paired_device):
+        token = paired_device[3]
+
+        async def run():
+            ws = FakeWebSocket()
+            with patch.object(device_routes, "DEVICE_EVENTS_PING_INTERVAL", 0.05):
+                channel = asyncio.create_task(device_routes.device_event_channel(ws, token))
+                await asyncio.sleep(0.3)
+                ws.disconnect()
+                await asyncio.wait_for(channel, 1)
+            assert "ping" in [m["type"] for m in ws.sent]
+            await hub.close()
+
+        asyncio.run(run())
+
+    @pytest.mark.parametrize("token", ["not-a-jwt", "caregiver"])
+    def test_rejects_invalid_tokens(self, hub, paired_device, token):
+        if token == "caregiver":
+            from app.core.security import create_access_token
+            token = create_access_token(1, "care@example.com")
+
+        ws = FakeWebSocket()
+        asyncio.run(device_routes.device_event_channel(ws, token))
+
+        assert not ws.accepted
+        assert ws.close_code == status.WS_1008_POLICY_VIOLATION
+
+    def test_rejects_inactive_device(self, hub, database, paired_device):
+        elderly_id, device_id, call_id, token = paired_device
+        with database() as db:
+            db.get(ElderlyDevice, device_id).is_active = False
+            db.commit()
+
+        ws = FakeWebSocket()
+        asyncio.run(device_routes.device_event_channel(ws, token))
+
+        assert ws.close_code == status.WS_1008_POLICY_VIOLATION
+
+
+class TestPublishers:
+
+    def test_start_call_publishes_in_progress_call(self, client, auth_headers, loop_recorder):
+        elderly = client.post("/api/elderly", headers=auth_headers, json={"name": "김영희"}).json()["data"]
+
+        with patch.object(device_events, "publish", side_effect=loop_recorder) as publish:
+            response = client.post("/api/calls", headers=auth_headers,
+                             json={"elderly_id": elderly["id"], "call_type": "voice"})
+
+        call = response.json()["data"]
+        publish.assert_called_once_with([(elderly["id"], pending_call_event(call["id"], "in_progress"))])
+        # The Redis round trip ran in the threadpool, not on the event loop
+        assert loop_recorder.calls == ["threadpool"]
+
+    def test_disconnect_device_publishes_off_the_event_loop(self, client, auth_headers, loop_recorder):
+        from tests.conftest import TestingSessionLocal
+
+        elderly = client.post("/api/elderly", headers=auth_headers, json={"name": "김영희"}).json()["data"]
+        with TestingSessionLocal() as db:
+            device = ElderlyDevice(elderly_id=elderly["id"], fcm_token="fcm-token")
+            db.add(device)
+            db.commit()
+            device_id = device.id
+
+        with patch.object(device_events, "publish", side_effect=loop_recorder) as publish:
+            response = client.delete(f"/api/elderly/{elderly['id']}/devices/{device_id}", headers=auth_headers)
+
+        assert response.status_code == 200
+        publish.assert_called_once_with([(elderly["id"], {"type": "device_unpaired", "device_id": device_id})])
+        assert loop_recorder.calls == ["threadpool"]
+
+    def test_scheduled_calls_are_published_together(self):
+        due = datetime(2026, 1, 5, 0, 0)
+        with patch.object(device_events, "publish") as publish, \
+                patch("app.tasks.push.send_scheduled_pushes") as pushes, \
+                patch.object(schedule.check_missed_single, "apply_async"):
+            schedule.dispatch_call_follow_ups([(10, 1, due), (11, 2, due)])
+
+        publish.assert_called_once()
+        assert list(publish.call_args.args[0]) == [
+            (1, pending_call_event(10, "scheduled", due)),
+            (2, pending_call_event(11, "scheduled", due)),
+        ]
+        pushes.delay.assert_called_once_with([[10, 1], [11, 2]])
+
+    def test_scheduled_event_carries_scheduled_at(self, database, paired_device):
+        elderly_id = paired_device[0]
+        with database() as db:
+            db.get(Elderly, elderly_id).call_schedule = {"enabled": True, "times": ["09:00"]}
+            ElderlyService.rebuild_schedule_slots(db)
+            db.commit()
+            created = schedule.create_scheduled_calls(db, datetime(2026, 1, 5, 9, 0, tzinfo=schedule.KST))
+
+        with patch.object(device_events, "publish") as publish, \
+                patch("app.tasks.push.send_scheduled_pushes"), \
+                patch.object(schedule.check_missed_single, "apply_async"):
+            schedule.dispatch_call_follow_ups(created)
+
+        [(published_elderly, event)] = list(publish.call_args.args[0])
+        assert published_elderly == elderly_id
+        assert event["scheduled_at"] == "2026-01-05T00:00:00"
+
+    def test_pending_call_endpoint_uses_shared_query(self, client, capsys):
+        from tests.conftest import TestingSessionLocal
+
+        with TestingSessionLocal() as db:
+            caregiver = User(email="care@example.com", password_hash="x", full_name="보호자")
+            elderly = Elderly(caregiver=caregiver, name="김영희")
+            device = ElderlyDevice(elderly=elderly, fcm_token="fcm-token")
+            due = datetime.utcnow() + timedelta(minutes=10)
+            later = Call(elderly=elderly, status="scheduled", trigger_type="auto", started_at=due,
+                         scheduled_for=due + timedelta(minutes=30))
+            soon = Call(elderly=elderly, status="scheduled", trigger_type="auto", started_at=due, scheduled_for=due)
+            db.add_all([caregiver, elderly, device, later, soon])
+            db.commit()
+            headers = {"Authorization": f"Bearer {create_device_access_token(elderly.id, device.id)}"}
+            soon_id = soon.id
+
+        response = client.get("/api/device/pending-call", headers=headers)
+
+        assert response.json()["data"]["call_id"] == soon_id
+        assert "[DEBUG]" not in capsys.readouterr().out
@@ -0,0 +1,203 @@
+"""
+Tests for the pooled FCM HTTP v1 sender against a local stand-in FCM endpoint.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services import fcm_sender
+from app.services.fcm import FCMService
+from app.services.fcm_sender import FCMAuthError, FCMHttpSender, ServiceAccountToken
+
+
+class StandInFCM(ThreadingHTTPServer):
+    """
+    Minimal FCM v1 endpoint.
+
+    Token prefixes pick the behaviour: "dead" → UNREGISTERED, "flaky" → one
+    503 then success, "busy" → one 429 (Retry-After: 0) then success,
+    "down" → always 503. Anything else succeeds after `latency` seconds.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.seen = {}  # token -> attempts
+        self.connections = set()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.authorizations = []
+        self.reject_token = None  # bearer token answered with 401
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1  # one write per response (avoids Nagle / delayed-ACK stalls on keep-alive)
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        server = self.server
+        message = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["message"]
+        token = message["token"]
+        authorization = self.headers["Authorization"]
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.authorizations.append(authorization)
+            attempt = server.seen[token] = server.seen.get(token, 0) + 1
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+        try:
+            time.sleep(server.latency)
+            if authorization == f"Bearer {server.reject_token}":
+                self._reply(401, {"error": {"code": 401, "status": "UNAUTHENTICATED"}})
+            elif token.startswith("dead"):
+                self._reply(404, {"error": {
+                    "code": 404, "message": "Requested entity was not found.", "status": "NOT_FOUND",
+                    "details": [{"@type": "type.googleapis.com/google.firebase.fcm.v1.FcmError",
+                                 "errorCode": "UNREGISTERED"}],
+                }})
+            elif token.startswith("down") or (token.startswith("flaky") and attempt == 1):
+                self._reply(503, {"error": {"code": 503, "status": "UNAVAILABLE"}})
+            elif token.startswith("busy") and attempt == 1:
+                self._reply(429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}}, {"Retry-After": "0"})
+            else:
+                self._reply(200, {"name": f"projects/test/messages/{token}"})
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+@pytest.fixture
+def stand_in():
+    server = StandInFCM(latency=0.01)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def sender(stand_in):
+    sender = FCMHttpSender("test", lambda force_refresh=False: "token", base_url=stand_in.url,
+                           concurrency=8, max_retries=2, backoff=0)
+    yield sender
+    sender.close()
+
+
+def _message(token):
+    return {"token": token, "title": "소리가 전화드려요", "body": "안녕하세요", "data": {"call_id": "1"}}
+
+
+def test_sends_concurrently_over_reused_connections(stand_in, sender):
+    results = sender.send_many([_message(f"t{i}") for i in range(200)])
+
+    assert [r.token for r in results] == [f"t{i}" for i in range(200)]
+    assert all(r.success for r in results)
+    assert results[0].message_id == "projects/test/messages/t0"
+    assert 1 < stand_in.peak_in_flight <= 8
+    assert len(stand_in.connections) <= 8
+
+
+def test_retries_throttled_and_server_errors(stand_in, sender):
+    results = sender.send_many([_message("busy1"), _message("flaky1"), _message("down1")])
+
+    assert [r.success for r in results] == [True, True, False]
+    assert [r.attempts for r in results] == [2, 2, 3]
+    assert results[2].error_code == "UNAVAILABLE"
+    assert sender.stats.to_dict() == {
+        "requests": 7, "sent": 2, "failed": 1, "retries": 4, "throttled": 1, "server_errors": 4,
+    }
+
+
+def test_unregistered_token_is_not_retried(stand_in, sender):
+    result = sender.send(_message("dead1"))
+
+    assert result.invalid_token
+    assert result.error_code == "UNREGISTERED"
+    assert stand_in.seen["dead1"] == 1
+
+
+def test_refreshes_access_token_after_401(stand_in):
+    tokens = iter(["stale", "fresh"])
+    current = {"token": next(tokens)}
+
+    def provider(force_refresh=False):
+        if force_refresh:
+            current["token"] = next(tokens)
+        return current["token"]
+
+    stand_in.reject_token = "stale"
+    sender = FCMHttpSender("test", provider, base_url=stand_in.url, concurrency=1, backoff=0)
+    try:
+        assert sender.send(_message("t1")).success
+    finally:
+        sender.close()
+    assert stand_in.authorizations == ["Bearer stale", "Bearer fresh"]
+
+
+def test_token_refresh_failure_fails_messages_not_the_batch(stand_in):
+    def provider(force_refresh=False):
+        raise FCMAuthError("invalid_grant")
+
+    sender = FCMHttpSender("test", provider, base_url=stand_in.url, concurrency=2, backoff=0)
+    try:
+        results = sender.send_many([_message("t1"), _message("t2")])
+    finally:
+        sender.close()
+
+    assert [(r.success, r.error_code) for r in results] == [(False, "AUTH"), (False, "AUTH")]
+    assert stand_in.seen == {}
+    assert sender.stats.failed == 2
+
+
+def test_service_account_refresh_errors_become_auth_errors():
+    pytest.importorskip("google.auth")
+    from google.auth.exceptions import RefreshError
+
+    token = ServiceAccountToken.__new__(ServiceAccountToken)
+    token._lock = threading.Lock()
+    token._credentials = MagicMock(valid=False)
+    token._credentials.refresh.side_effect = RefreshError("invalid_grant")
+
+    with pytest.raises(FCMAuthError):
+        token()
+
+
+def test_fcm_service_routes_through_http_sender(stand_in, sender):
+    service = FCMService()
+    with patch("app.services.fcm.settings.FCM_SEND_MODE", "http"), \
+            patch.object(fcm_sender, "get_fcm_sender", lambda: sender), \
+            patch.object(service, "deactivate_tokens", return_value=1) as deactivate:
+        assert service.send_to_token("t1", "title", "body") == "projects/test/messages/t1"
+        batch = service.send_batch([_message("t2"), _message("dead2")])
+        multicast = service.send_to_tokens(["t3", "dead3"], "title", "body")
+
+    assert batch["success_count"] == 1
+    assert batch["invalid_tokens"] == ["dead2"]
+    assert multicast["failed_tokens"] == ["dead3"]
+    deactivate.assert_called_once_with(["dead3"])
@@ -0,0 +1,115 @@
+"""
+Tests for the shared keyword index.
+
+Tests multi-pattern matching, category tagging, memoization and
+registration changes.
+"""
+
+import pytest
+
+from app.core import keywords
+from app.core.keywords import (
+    KeywordIndex,
+    KeywordMatches,
+    get_keyword_index,
+    reset_keyword_index,
+)
+
+
+class TestKeywordIndex:
+    """Test KeywordIndex matching."""
+
+    @pytest.fixture
+    def index(self):
+        index = KeywordIndex()
+        index.register("health", ["아파", "가슴이 아", "숨"])
+        index.register("emergency", ["가슴이 아", "119"])
+        index.register("english", ["Help"])
+        return index
+
+    def test_single_pass_tags_all_categories(self, index):
+        matches = index.match("가슴이 아파요, 119 불러주세요")
+
+        assert isinstance(matches, KeywordMatches)
+        assert matches.get("health") == {"아파", "가슴이 아"}
+        assert matches.get("emergency") == {"가슴이 아", "119"}
+        assert not matches.has("english")
+        assert index.scans == 1
+
+    def test_overlapping_keywords(self, index):
+        """Keywords that are suffixes of other keywords are still found."""
+        index.register("overlap", ["abcd", "bc", "c"])
+
+        assert index.match("xabcdx").get("overlap") == {"abcd", "bc", "c"}
+
+    def test_case_insensitive(self, index):
+        assert index.match("please HELP me").has("english")
+
+    def test_count_and_any_of(self, index):
+        matches = index.match("숨이 차고 아파요")
+
+        assert matches.count("health") == 2
+        assert matches.count("emergency") == 0
+        assert matches.any_of("emergency", "health")
+
+    def test_empty_text(self, index):
+        assert index.match("").hits == {}
+        assert index.match(None).hits == {}
+
+    def test_repeated_text_is_memoized(self, index):
+        first = index.match("숨이 차요")
+        second = index.match("숨이 차요")
+
+        assert first is second
+        assert index.scans == 1
+        assert index.cache_hits == 1
+
+    def test_register_invalidates(self, index):
+        assert not index.match("어지러워요").has("health")
+
+        index.register("health", ["어지러"])
+
+        assert index.match("어지러워요").has("health")
+
+    def test_unregister(self, index):
+        index.unregister("english")
+
+        assert "english" not in index.categories
+        assert not index.match("help").has("english")
+
+
+class TestGlobalKeywordIndex:
+    """Test the global index and its registrations."""
+
+    @pytest.fixture(autouse=True)
+    def restore_global_index(self, monkeypatch):
+        """Keep registrations made by other tests' services intact."""
+        monkeypatch.setattr(keywords, "_keyword_index", keywords._keyword_index)
+
+    def test_singleton(self):
+        assert get_keyword_index() is get_keyword_index()
+
+    def test_reset(self):
+        first = get_keyword_index()
+        reset_keyword_index()
+
+        assert get_keyword_index() is not first
+
+    def test_workers_share_one_scan(self):
+        from app.services.agents.workers import (
+            HealthMonitorWorker,
+            EmotionSupportWorker,
+            ScheduleWorker,
+        )
+
+        reset_keyword_index()
+        workers = [HealthMonitorWorker(), EmotionSupportWorker(), ScheduleWorker()]
+        index = get_keyword_index()
+
+        text = "머리가 아파서 걱정돼요, 내일 병원 가요"
+        activated = [w.name for w in workers if w.should_activate(text)]
+        for worker in workers:
+            worker.get_priority(text)
+
+        assert activated == ["health_monitor", "emotion_support", "schedule_worker"]
+        assert index.scans == 1
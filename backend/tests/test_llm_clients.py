@@ -0,0 +1,164 @@
+"""
+Tests for the shared LLM client factory.
+
+Tests client reuse and the connection pool metrics, using a local HTTP
+server so real connections are opened.
+"""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from app.core import llm_clients
+from app.core.llm_clients import (
+    InstrumentedAsyncTransport,
+    InstrumentedSyncTransport,
+    LLMClientStats,
+    get_async_openai_client,
+    get_llm_client_stats,
+    get_openai_client,
+    reset_llm_clients,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        if self.path == "/sse":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for event in (b"data: {}\n\n", b"data: [DONE]\n\n"):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(event), event))
+            self.wfile.write(b"0\r\n\r\n")
+            return
+        if self.path == "/slow":
+            time.sleep(0.1)
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestInstrumentedTransport:
+    """Test pool and connection metrics."""
+
+    def test_keep_alive_reuses_connection(self, server_url):
+        stats = LLMClientStats(max_connections=10)
+        transport = InstrumentedSyncTransport(httpx.HTTPTransport(), stats)
+
+        with httpx.Client(transport=transport) as client:
+            assert client.get(f"{server_url}/").text == "ok"
+            assert client.get(f"{server_url}/").text == "ok"
+
+        data = stats.to_dict()
+        assert data["requests"] == 2
+        assert data["new_connections"] == 1
+        assert data["reused_connections"] == 1
+        assert data["in_flight"] == 0
+        assert data["avg_connect_ms"] > 0
+        assert data["avg_tls_ms"] == 0.0  # plain HTTP
+
+    @pytest.mark.asyncio
+    async def test_sse_stream_closed_at_done_keeps_connection(self, server_url):
+        """The SDK stops reading at [DONE]; the connection must still be reused."""
+        stats = LLMClientStats(max_connections=10)
+        transport = InstrumentedAsyncTransport(httpx.AsyncHTTPTransport(), stats)
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            for _ in range(2):
+                async with client.stream("GET", f"{server_url}/sse") as response:
+                    async for line in response.aiter_lines():
+                        if line == "data: [DONE]":
+                            break
+
+        assert stats.requests == 2
+        assert stats.new_connections == 1
+        assert stats.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_reports_pool_saturation(self, server_url):
+        stats = LLMClientStats(max_connections=1)
+        transport = InstrumentedAsyncTransport(
+            httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=1)), stats
+        )
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            responses = await asyncio.gather(*(client.get(f"{server_url}/slow") for _ in range(3)))
+
+        assert [r.text for r in responses] == ["ok"] * 3
+        assert stats.peak_in_flight == 3
+        assert stats.saturated_requests == 2
+        assert stats.in_flight == 0
+        assert stats.new_connections == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_request_is_not_left_in_flight(self):
+        stats = LLMClientStats(max_connections=1)
+        transport = InstrumentedAsyncTransport(httpx.AsyncHTTPTransport(), stats)
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            with pytest.raises(httpx.ConnectError):
+                await client.get("http://127.0.0.1:1/")
+
+        assert stats.requests == 1
+        assert stats.in_flight == 0
+
+
+class TestClientFactory:
+    """Test shared client creation."""
+
+    @pytest.fixture(autouse=True)
+    def reset(self):
+        reset_llm_clients()
+        yield
+        reset_llm_clients()
+
+    def test_sync_client_is_shared(self):
+        assert get_openai_client() is get_openai_client()
+
+    @pytest.mark.asyncio
+    async def test_async_client_is_shared_within_loop(self):
+        client = get_async_openai_client()
+
+        assert get_async_openai_client() is client
+        assert isinstance(client._client._transport, InstrumentedAsyncTransport)
+
+    def test_http2_falls_back_without_h2(self, monkeypatch):
+        import builtins
+
+        real_import = builtins.__import__
+
+        def fake_import(name, *args, **kwargs):
+            if name == "h2":
+                raise ImportError(name)
+            return real_import(name, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "__import__", fake_import)
+        assert llm_clients._http2_enabled() is False
+
+    def test_reset_clears_stats(self):
+        get_openai_client()
+        reset_llm_clients()
+
+        assert get_llm_client_stats()["sync"]["requests"] == 0
+        assert llm_clients._sync_client is None
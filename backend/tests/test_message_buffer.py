@@ -0,0 +1,318 @@
+"""
+Tests for the per-call write-behind message buffer.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.database import async_database_url
+from app.models.call import Call
+from app.models.elderly import Elderly
+from app.models.message import Message
+from app.models.user import User
+from app.services import message_buffer
+from app.services.message_buffer import MessageBuffer, open_message_buffer, recover_journals
+
+
+@pytest.fixture
+def database(async_database):
+    url, Session, _ = async_database
+    with Session() as db:
+        caregiver = User(email="care@example.com", password_hash="x", full_name="보호자")
+        elderly = Elderly(caregiver=caregiver, name="김영희")
+        call = Call(elderly=elderly, status="in_progress", started_at=datetime(2026, 1, 5))
+        db.add_all([caregiver, elderly, call])
+        db.commit()
+        call_id = call.id
+    return url, Session, call_id
+
+
+@pytest.fixture
+def sessions(async_database):
+    return async_database.sessions
+
+
+@pytest.fixture
+def journal_dir(tmp_path):
+    return str(tmp_path / "journal")
+
+
+@pytest.fixture(autouse=True)
+def pending_flags():
+    """call_id -> pending flag, in place of the Redis keys."""
+    flags = {}
+
+    def set_flag(call_id, pending):
+        flags[call_id] = pending
+        return True
+
+    with patch.object(message_buffer.pending_messages, "set", side_effect=set_flag):
+        yield flags
+
+
+def _stored(Session, call_id):
+    with Session() as db:
+        return [(m.role, m.content) for m in
+                db.query(Message).filter(Message.call_id == call_id).order_by(Message.id)]
+
+
+def test_buffered_turns_are_written_in_one_bulk_insert(database, sessions, journal_dir):
+    _, Session, call_id = database
+    stats_before = message_buffer.stats.to_dict()
+
+    async def scenario():
+        buffer = MessageBuffer(call_id, sessions, mode="journal", flush_interval=60, journal_dir=journal_dir)
+        for i in range(5):
+            await buffer.add("user" if i % 2 else "assistant", f"turn {i}")
+        assert _stored(Session, call_id) == []
+        assert buffer.pending == 5
+        assert len(open(buffer.journal_path).readlines()) == 5
+        assert await buffer.close() == 5
+        return buffer
+
+    buffer = asyncio.run(scenario())
+
+    assert [content for _, content in _stored(Session, call_id)] == [f"turn {i}" for i in range(5)]
+    stats = message_buffer.stats.to_dict()
+    assert stats["flushes"] - stats_before["flushes"] == 1
+    assert not os.path.exists(buffer.journal_path)
+
+
+def test_flushes_at_size_threshold_and_on_timer(database, sessions):
+    _, Session, call_id = database
+
+    async def scenario():
+        buffer = MessageBuffer(call_id, sessions, mode="buffered", flush_interval=0.05, flush_size=2)
+        await buffer.add("user", "하나")
+        await buffer.add("assistant", "둘")  # threshold: wakes the flusher now
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+            if not buffer.pending:
+                break
+        assert _stored(Session, call_id) == [("user", "하나"), ("assistant", "둘")]
+
+        await buffer.add("user", "셋")  # below threshold: written by the timer
+        await asyncio.sleep(0.2)
+        assert len(_stored(Session, call_id)) == 3
+        await buffer.close()
+
+    asyncio.run(scenario())
+
+
+def test_immediate_mode_commits_every_message(database, sessions):
+    _, Session, call_id = database
+
+    async def scenario():
+        buffer = MessageBuffer(call_id, sessions, mode="immediate")
+        await buffer.add("user", "안녕하세요")
+        assert _stored(Session, call_id) == [("user", "안녕하세요")]
+        await buffer.close()
+
+    asyncio.run(scenario())
+
+
+def test_failed_flush_keeps_messages_for_the_next_attempt(database, sessions):
+    _, Session, call_id = database
+    calls = {"n": 0}
+
+    def flaky_sessions():
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise ConnectionError("database is down")
+        return sessions()
+
+    async def scenario():
+        buffer = MessageBuffer(call_id, flaky_sessions, mode="buffered", flush_interval=60)
+        await buffer.add("user", "잘 지냈어요")
+        assert await buffer.flush() == 0
+        assert buffer.pending == 1
+        await buffer.add("assistant", "다행이에요")
+        assert await buffer.close() == 2
+
+    asyncio.run(scenario())
+    assert _stored(Session, call_id) == [("user", "잘 지냈어요"), ("assistant", "다행이에요")]
+
+
+@pytest.mark.parametrize("flushed", [False, True])
+def test_replace_overwrites_a_message(database, sessions, flushed):
+    _, Session, call_id = database
+
+    async def scenario():
+        buffer = MessageBuffer(call_id, sessions, mode="buffered", flush_interval=60)
+        await buffer.add("user", "안녕")
+        row = await buffer.add("assistant", "네")
+        if flushed:
+            await buffer.flush()
+        assert await buffer.replace(row, "네, 반가워요. 오늘 기분은 어떠세요?") is True
+        await buffer.add("user", "좋아요")
+        await buffer.close()
+
+    asyncio.run(scenario())
+    assert _stored(Session, call_id) == [
+        ("user", "안녕"), ("assistant", "네, 반가워요. 오늘 기분은 어떠세요?"), ("user", "좋아요"),
+    ]
+
+
+def test_replace_rewrites_the_journal(database, sessions, journal_dir):
+    _, _, call_id = database
+
+    async def scenario():
+        buffer = MessageBuffer(call_id, sessions, mode="journal", flush_interval=60, journal_dir=journal_dir)
+        row = await buffer.add("assistant", "네")
+        await buffer.replace(row, "정정된 답변")
+        lines = open(buffer.journal_path, encoding="utf-8").read()
+        await buffer.close()
+        return lines
+
+    lines = asyncio.run(scenario())
+    assert "정정된 답변" in lines and '"네"' not in lines
+
+
+def test_flush_call_messages_reaches_open_buffer(database, sessions):
+    _, Session, call_id = database
+
+    async def scenario():
+        buffer = open_message_buffer(call_id, sessions, mode="buffered", flush_interval=60)
+        await buffer.add("user", "끝낼게요")
+        assert await message_buffer.flush_call_messages(call_id) is True
+        assert buffer.pending == 0
+        await buffer.close()
+        assert message_buffer.get_message_buffer(call_id) is None
+        assert await message_buffer.flush_call_messages(call_id) is True
+
+    asyncio.run(scenario())
+    assert _stored(Session, call_id) == [("user", "끝낼게요")]
+
+
+def test_pending_flag_is_set_until_messages_are_written(database, sessions, pending_flags):
+    _, _, call_id = database
+
+    async def scenario():
+        buffer = MessageBuffer(call_id, sessions, mode="buffered", flush_interval=60)
+        await buffer.add("user", "안녕하세요")
+        await buffer.add("assistant", "반가워요")
+        await asyncio.sleep(0.05)
+        assert pending_flags == {call_id: True}
+
+        assert await buffer.drain() is True
+        assert pending_flags == {call_id: False}
+        await buffer.close()
+
+    asyncio.run(scenario())
+
+
+def test_immediate_mode_leaves_pending_flag_alone(database, sessions, pending_flags):
+    _, _, call_id = database
+
+    async def scenario():
+        buffer = MessageBuffer(call_id, sessions, mode="immediate")
+        await buffer.add("user", "안녕하세요")
+        await buffer.close()
+
+    asyncio.run(scenario())
+    assert pending_flags == {}
+
+
+def test_drain_retries_a_failed_flush(database, sessions, pending_flags):
+    _, Session, call_id = database
+    calls = {"n": 0}
+
+    def flaky_sessions():
+        calls["n"] += 1
+        if calls["n"] <= 2:
+            raise ConnectionError("database is down")
+        return sessions()
+
+    async def scenario():
+        buffer = MessageBuffer(call_id, flaky_sessions, mode="buffered", flush_interval=60)
+        await buffer.add("user", "이제 끊을게요")
+        with patch.object(message_buffer, "DRAIN_RETRY_DELAY", 0):
+            assert await buffer.drain() is True
+        await buffer.close()
+
+    asyncio.run(scenario())
+    assert _stored(Session, call_id) == [("user", "이제 끊을게요")]
+    assert pending_flags == {call_id: False}
+
+
+def test_drain_keeps_flag_when_messages_cannot_be_written(database, sessions, pending_flags):
+    _, _, call_id = database
+
+    def broken_sessions():
+        raise ConnectionError("database is down")
+
+    async def scenario():
+        buffer = MessageBuffer(call_id, broken_sessions, mode="buffered", flush_interval=60)
+        await buffer.add("user", "이제 끊을게요")
+        with patch.object(message_buffer, "DRAIN_RETRY_DELAY", 0):
+            assert await buffer.drain() is False
+        assert buffer.pending == 1
+
+    asyncio.run(scenario())
+    # analyze_call keeps waiting instead of analyzing a partial conversation
+    assert pending_flags == {call_id: True}
+
+
+def _crash_mid_call(url, call_id, journal_dir):
+    """Child process: buffer three turns, flush one, then die without closing."""
+    sessions = async_sessionmaker(create_async_engine(async_database_url(url), poolclass=NullPool))
+
+    async def scenario():
+        buffer = MessageBuffer(call_id, sessions, mode="journal", flush_interval=60, journal_dir=journal_dir)
+        await buffer.add("assistant", "안녕하세요")
+        await buffer.flush()
+        await buffer.add("user", "무릎이 아파요")
+        await buffer.add("assistant", "병원에 가보셨어요?")
+
+    asyncio.run(scenario())
+    os._exit(1)  # no finally, no close(): the process is gone
+
+
+def test_recovers_unflushed_messages_after_process_crash(database, sessions, journal_dir):
+    url, Session, call_id = database
+    child = multiprocessing.get_context("fork").Process(target=_crash_mid_call, args=(url, call_id, journal_dir))
+    child.start()
+    child.join(30)
+    assert child.exitcode == 1
+    assert _stored(Session, call_id) == [("assistant", "안녕하세요")]
+
+    assert asyncio.run(recover_journals(sessions, journal_dir)) == 2
+
+    assert _stored(Session, call_id) == [
+        ("assistant", "안녕하세요"), ("user", "무릎이 아파요"), ("assistant", "병원에 가보셨어요?"),
+    ]
+    assert os.listdir(journal_dir) == []
+    assert asyncio.run(recover_journals(sessions, journal_dir)) == 0
+
+
+def test_recovery_skips_live_journals_and_committed_rows(database, sessions, journal_dir):
+    _, Session, call_id = database
+
+    async def scenario():
+        live = MessageBuffer(call_id, sessions, mode="journal", flush_interval=60, journal_dir=journal_dir)
+        await live.add("user", "아직 통화 중")
+        assert await recover_journals(sessions, journal_dir) == 0  # locked by a live buffer
+        assert _stored(Session, call_id) == []
+
+        # Crash between COMMIT and journal rewrite: the journal still lists a stored row
+        journal = open(live.journal_path).read()
+        await live.close()
+        with open(os.path.join(journal_dir, f"call-{call_id}-{'0' * 32}.jsonl"), "w") as f:
+            f.write(journal + '{"torn": ')
+        return await recover_journals(sessions, journal_dir)
+
+    assert asyncio.run(scenario()) == 0
+    assert _stored(Session, call_id) == [("user", "아직 통화 중")]
+    assert os.listdir(journal_dir) == []
+
+
+def test_rejects_unknown_durability_mode():
+    with pytest.raises(ValueError):
+        MessageBuffer(1, None, mode="eventually")
@@ -127,6 +127,13 @@ class TestHealthMonitorWorker:
         # Emergency should trigger higher priority
         assert result.priority >= WorkerPriority.HIGH or len(result.urgent_flags) > 0
 
+    def test_uses_turn_keyword_matches(self, worker):
+        """Precomputed hits from the agent's turn analysis are used as-is."""
+        matches = worker.keyword_index.match("머리가 아파요")
+
+        assert worker.match_keywords("머리가 아파요", {"keyword_matches": matches}) is matches
+        assert worker.match_keywords("배가 아파요", {"keyword_matches": matches}) is not matches
+
 
 class TestEmotionSupportWorker:
     """Test EmotionSupportWorker."""
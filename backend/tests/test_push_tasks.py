@@ -0,0 +1,120 @@
+"""
+Tests for batched scheduled call pushes and invalid FCM token pruning.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.elderly import Elderly
+from app.models.elderly_device import ElderlyDevice
+from app.models.user import User
+from app.services import fcm
+from app.services.fcm import FCMTokenStats
+from app.tasks import push
+
+
+@pytest.fixture
+def task_db(task_db):
+    return task_db("app.tasks.push")
+
+
+@pytest.fixture
+def fake_fcm():
+    """send_each stand-in: tokens starting with "dead" are unregistered."""
+    batches = []
+
+    def send_each(messages):
+        batches.append(messages)
+        responses = [
+            SimpleNamespace(success=False, exception=Exception("Requested entity was not found."))
+            if m.token.startswith("dead") else SimpleNamespace(success=True, exception=None)
+            for m in messages
+        ]
+        ok = sum(r.success for r in responses)
+        return SimpleNamespace(responses=responses, success_count=ok, failure_count=len(messages) - ok)
+
+    def send_each_for_multicast(message):
+        return send_each([SimpleNamespace(token=token) for token in message.tokens])
+
+    with patch.object(push.fcm_service, "_app", object()), \
+            patch.object(push.fcm_service, "stats", FCMTokenStats()), \
+            patch("firebase_admin.messaging.send_each", send_each), \
+            patch("firebase_admin.messaging.send_each_for_multicast", send_each_for_multicast):
+        yield batches
+
+
+@pytest.fixture
+def elderly(db_session):
+    caregiver = User(email="care@example.com", password_hash="x", full_name="보호자", fcm_token="dead1")
+    db_session.add(caregiver)
+    db_session.commit()
+
+    people = {}
+    for name, tokens in [("two-devices", ["a1", "a2"]), ("stale", ["dead1"]), ("no-devices", [])]:
+        person = Elderly(caregiver_id=caregiver.id, name=name)
+        person.devices = [ElderlyDevice(fcm_token=token) for token in tokens]
+        db_session.add(person)
+        people[name] = person
+    people["two-devices"].devices.append(ElderlyDevice(fcm_token="inactive", is_active=False))
+    db_session.commit()
+    return {name: person.id for name, person in people.items()}
+
+
+def test_sends_one_message_per_device_in_chunks(task_db, elderly, fake_fcm):
+    calls = [[10, elderly["two-devices"]], [11, elderly["stale"]], [12, elderly["no-devices"]]]
+
+    with patch.object(fcm, "FCM_MAX_BATCH", 2):
+        result = push.send_scheduled_pushes(calls)
+
+    assert result["messages"] == 3
+    assert result["batches"] == 2
+    assert [len(batch) for batch in fake_fcm] == [2, 1]
+    sent = {m.token: m for batch in fake_fcm for m in batch}
+    assert set(sent) == {"a1", "a2", "dead1"}
+    assert sent["a1"].data["call_id"] == "10"
+    assert sent["a1"].notification.body == "two-devices님, 오늘 기분은 어떠세요?"
+
+
+def test_deactivates_invalid_tokens_in_bulk(task_db, elderly, fake_fcm):
+    result = push.send_scheduled_pushes([[10, elderly["two-devices"]], [11, elderly["stale"]]])
+
+    assert result["success_count"] == 2
+    assert result["deactivated"] == 2  # the device and the caregiver sharing the token
+    active = {d.fcm_token for d in task_db.query(ElderlyDevice).filter(ElderlyDevice.is_active == True)}
+    assert active == {"a1", "a2"}
+    assert task_db.query(User).one().fcm_token is None
+    assert push.fcm_service.stats.to_dict() == {
+        "invalid_tokens": 1, "device_tokens_pruned": 1, "user_tokens_pruned": 1, "prune_updates": 1,
+    }
+
+
+def test_empty_batch_skips_fcm(task_db, fake_fcm):
+    assert push.send_scheduled_pushes([]) == {"calls": 0, "messages": 0}
+    assert fake_fcm == []
+
+
+def test_multicast_prunes_invalid_tokens_in_one_update(db_session, elderly, fake_fcm):
+    db_session.add(ElderlyDevice(elderly_id=elderly["stale"], fcm_token="dead2"))
+    db_session.commit()
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db_session.get_bind(), "before_cursor_execute", record)
+    try:
+        with patch("app.database.SessionLocal", sessionmaker(bind=db_session.get_bind())):
+            result = push.fcm_service.send_to_tokens(["a1", "dead1", "dead2"], "title", "body")
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", record)
+
+    assert result["failed_tokens"] == ["dead1", "dead2"]
+    assert result["pruned"] == 3
+    assert len([s for s in statements if s.startswith("UPDATE elderly_devices")]) == 1
+    assert push.fcm_service.stats.device_tokens_pruned == 2
+    db_session.expire_all()
+    assert {d.fcm_token for d in db_session.query(ElderlyDevice).filter(ElderlyDevice.is_active == True)} == {"a1", "a2"}
@@ -0,0 +1,206 @@
+"""
+Tests for Batch API re-analysis.
+
+Uses the local batch backend so the full pipeline (JSONL input, submit,
+poll, bulk upsert) runs without network access.
+"""
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+from app.models.call import Call
+from app.models.call_analysis import CallAnalysis
+from app.models.elderly import Elderly
+from app.models.message import Message
+from app.models.user import User
+from app.services.ai_service import AIService
+from app.services.batch_api import BatchResult, BatchStatus, LocalBatchBackend, parse_output_line
+from app.tasks import reanalysis
+
+
+@pytest.fixture
+def elderly(db_session):
+    user = User(email="care@example.com", password_hash="x", full_name="보호자")
+    db_session.add(user)
+    db_session.commit()
+    person = Elderly(caregiver_id=user.id, name="김영희", age=80, risk_level="low")
+    db_session.add(person)
+    db_session.commit()
+    return person
+
+
+def _add_call(db, elderly_id, ended_at, messages=("안녕하세요",)):
+    call = Call(elderly_id=elderly_id, started_at=ended_at - timedelta(minutes=5),
+                ended_at=ended_at, status="completed")
+    db.add(call)
+    db.flush()
+    for content in messages:
+        db.add(Message(call_id=call.id, role="user", content=content))
+    db.commit()
+    return call.id
+
+
+def _responder(body):
+    """Risk score from the prompt text; fails requests mentioning '실패'."""
+    prompt = body["messages"][0]["content"]
+    if "실패" in prompt:
+        raise RuntimeError("model error")
+    score = 85 if "어지러워요" in prompt else 5
+    return json.dumps({"summary": "재분석", "risk_score": score, "concerns": "", "recommendations": ""})
+
+
+class TestBatchBackend:
+    """Test the local Batch API stand-in."""
+
+    def test_output_matches_openai_format(self, tmp_path):
+        backend = LocalBatchBackend(str(tmp_path / "batches"), responder=lambda body: "ok", polls_until_complete=1)
+        input_path = tmp_path / "in.jsonl"
+        input_path.write_text(json.dumps({"custom_id": "a", "method": "POST",
+                                          "url": "/v1/chat/completions", "body": {}}) + "\n")
+
+        batch_id = backend.submit(str(input_path))
+
+        assert backend.get_status(batch_id).status == BatchStatus.IN_PROGRESS
+        info = backend.get_status(batch_id)
+        assert info.status == BatchStatus.COMPLETED
+        assert info.request_counts == {"total": 1, "completed": 1, "failed": 0}
+        [result] = list(backend.iter_results(batch_id))
+        assert result.custom_id == "a"
+        assert result.content == "ok"
+
+    def test_parse_error_line(self):
+        result = parse_output_line({"custom_id": "a", "response": None,
+                                    "error": {"code": "x", "message": "boom"}})
+        assert result.error == "boom"
+        assert result.content is None
+
+
+class TestReanalysis:
+    """Test the build / apply pipeline."""
+
+    def test_build_splits_files_and_uses_analysis_prompt(self, db_session, elderly, tmp_path):
+        now = datetime(2026, 1, 1, 12, 0)
+        ids = [_add_call(db_session, elderly.id, now + timedelta(minutes=i)) for i in range(5)]
+        _add_call(db_session, elderly.id, now, messages=())  # nothing to analyze
+
+        paths = reanalysis.build_reanalysis_files(db_session, str(tmp_path), max_requests=2)
+
+        lines = [json.loads(l) for p in paths for l in open(p, encoding="utf-8")]
+        assert len(paths) == 3
+        assert [l["custom_id"] for l in lines] == [f"call-{i}" for i in ids]
+        body = lines[0]["body"]
+        assert body["model"] == AIService.ANALYSIS_MODEL
+        assert body["max_tokens"] == AIService.ANALYSIS_MAX_TOKENS
+        assert "어르신: 안녕하세요" in body["messages"][0]["content"]
+        assert "김영희, 80세" in body["messages"][0]["content"]
+
+    def test_run_upserts_analyses(self, db_session, elderly, tmp_path):
+        now = datetime(2026, 1, 1, 12, 0)
+        existing = _add_call(db_session, elderly.id, now, messages=("어지러워요",))
+        new = _add_call(db_session, elderly.id, now + timedelta(hours=1))
+        failing = _add_call(db_session, elderly.id, now + timedelta(hours=2), messages=("실패",))
+        db_session.add(CallAnalysis(call_id=existing, summary="이전", risk_score=10))
+        db_session.commit()
+
+        backend = LocalBatchBackend(str(tmp_path / "batches"), responder=_responder, polls_until_complete=2)
+        with patch("app.tasks.reanalysis.time.sleep"):
+            totals = reanalysis.run_reanalysis(db_session, backend, str(tmp_path / "input"),
+                                               poll_interval=0, timeout=10)
+
+        assert totals == {"batches": 1, "updated": 1, "inserted": 1, "failed": 1}
+        analyses = {a.call_id: a for a in db_session.query(CallAnalysis)}
+        assert analyses[existing].summary == "재분석"
+        assert analyses[existing].risk_score == 85
+        assert analyses[new].risk_score == 5
+        assert failing not in analyses
+        # Historical re-scoring leaves the current risk level alone
+        assert db_session.get(Elderly, elderly.id).risk_level == "low"
+
+    def test_unparseable_result_keeps_existing_analysis(self, db_session, elderly, tmp_path):
+        now = datetime(2026, 1, 1, 12, 0)
+        call_id = _add_call(db_session, elderly.id, now)
+        db_session.add(CallAnalysis(call_id=call_id, summary="이전", risk_score=60, concerns="어지러움"))
+        db_session.commit()
+
+        backend = LocalBatchBackend(str(tmp_path / "batches"), responder=lambda body: "죄송합니다, 분석할 수 없어요.",
+                                    polls_until_complete=1)
+        totals = reanalysis.run_reanalysis(db_session, backend, str(tmp_path / "input"),
+                                           poll_interval=0, timeout=10)
+
+        assert totals == {"batches": 1, "updated": 0, "inserted": 0, "failed": 1}
+        analysis = db_session.query(CallAnalysis).filter_by(call_id=call_id).one()
+        assert (analysis.summary, analysis.risk_score, analysis.concerns) == ("이전", 60, "어지러움")
+
+    def test_row_inserted_concurrently_is_updated(self, db_session, elderly):
+        """A CallAnalysis written by the real-time analysis mid-apply does not roll the chunk back."""
+        now = datetime(2026, 1, 1, 12, 0)
+        racing = _add_call(db_session, elderly.id, now)
+        other = _add_call(db_session, elderly.id, now + timedelta(hours=1))
+        bind = db_session.get_bind()
+
+        def analyze_call_wins(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT INTO call_analysis"):
+                cursor.execute("INSERT INTO call_analysis (call_id, summary, risk_score) VALUES (?, '실시간', 30)",
+                               (racing,))
+
+        event.listen(bind, "before_cursor_execute", analyze_call_wins)
+        try:
+            content = json.dumps({"summary": "재분석", "risk_score": 70, "concerns": "", "recommendations": ""})
+            body = {"choices": [{"message": {"content": content}}]}
+            stats = reanalysis.apply_reanalysis_results(
+                db_session, [BatchResult(f"call-{racing}", body), BatchResult(f"call-{other}", body)],
+            )
+        finally:
+            event.remove(bind, "before_cursor_execute", analyze_call_wins)
+
+        assert stats == {"updated": 1, "inserted": 1, "failed": 0}
+        analyses = {a.call_id: a for a in db_session.query(CallAnalysis)}
+        assert (analyses[racing].summary, analyses[racing].risk_score) == ("재분석", 70)
+        assert analyses[other].risk_score == 70
+
+    def test_filters_by_elderly_and_time(self, db_session, elderly, tmp_path):
+        other = Elderly(caregiver_id=elderly.caregiver_id, name="이철수")
+        db_session.add(other)
+        db_session.commit()
+        now = datetime(2026, 1, 1, 12, 0)
+        _add_call(db_session, elderly.id, now - timedelta(days=2))
+        recent = _add_call(db_session, elderly.id, now)
+        _add_call(db_session, other.id, now)
+
+        ids = reanalysis.select_call_ids(db_session, since=now - timedelta(days=1), elderly_id=elderly.id)
+
+        assert ids == [recent]
+
+
+class TestReanalysisTasks:
+    """Test the Celery submit / poll tasks."""
+
+    @pytest.fixture
+    def task_db(self, task_db):
+        return task_db("app.tasks.reanalysis")
+
+    def test_poll_reschedules_until_complete(self, task_db, elderly, tmp_path):
+        call_id = _add_call(task_db, elderly.id, datetime(2026, 1, 1, 12, 0))
+        backend = LocalBatchBackend(str(tmp_path / "batches"), responder=_responder, polls_until_complete=1)
+
+        with patch("app.tasks.reanalysis.get_batch_backend", return_value=backend), \
+                patch("app.tasks.reanalysis.settings.BATCH_API_DIR", str(tmp_path / "input")), \
+                patch.object(reanalysis.poll_reanalysis, "apply_async") as schedule:
+            submitted = reanalysis.submit_reanalysis()
+            [batch_id] = submitted["batch_ids"]
+            schedule.assert_called_once()
+
+            schedule.reset_mock()
+            assert reanalysis.poll_reanalysis(batch_id)["status"] == "in_progress"
+            schedule.assert_called_once()
+
+            schedule.reset_mock()
+            result = reanalysis.poll_reanalysis(batch_id)
+            schedule.assert_not_called()
+
+        assert result["inserted"] == 1
+        assert task_db.query(CallAnalysis).filter(CallAnalysis.call_id == call_id).count() == 1
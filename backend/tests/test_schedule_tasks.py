@@ -0,0 +1,263 @@
+"""
+Tests for schedule-based call creation.
+
+Tests the call_schedule_slots index kept by ElderlyService and the
+set-based check_schedules tick.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy import event
+
+from app.models.call import Call
+from app.models.call_schedule_slot import CallScheduleSlot
+from app.models.elderly import Elderly
+from app.models.user import User
+from app.schemas.elderly import CallSchedule, ElderlyCreateRequest, ElderlyUpdateRequest
+from app.services.elderly import ElderlyService, next_fire_time, schedule_slots
+from app.tasks import schedule
+from app.tasks.scheduler import CallScheduler
+
+KST = ZoneInfo("Asia/Seoul")
+MONDAY_9AM = datetime(2026, 1, 5, 9, 0, 30, tzinfo=KST)
+
+
+@pytest.fixture
+def caregiver(db_session):
+    user = User(email="care@example.com", password_hash="x", full_name="보호자")
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def task_db(task_db):
+    return task_db("app.tasks.schedule")
+
+
+def _slots(db, elderly_id):
+    return {
+        (s.weekday, s.slot_time)
+        for s in db.query(CallScheduleSlot).filter(CallScheduleSlot.elderly_id == elderly_id)
+    }
+
+
+class TestScheduleSlots:
+    """Test the normalized schedule index."""
+
+    def test_expands_days_and_times(self):
+        assert schedule_slots({"enabled": True, "times": ["9:00", "19:30"], "days": ["Monday", "sunday"]}) == {
+            (0, "09:00"), (0, "19:30"), (6, "09:00"), (6, "19:30"),
+        }
+        assert len(schedule_slots({"enabled": True, "times": ["09:00"]})) == 7
+        assert schedule_slots({"enabled": False, "times": ["09:00"]}) == set()
+        assert schedule_slots({"enabled": True, "times": ["bad"]}) == set()
+        assert schedule_slots(None) == set()
+
+    def test_synced_on_create_and_update(self, db_session, caregiver):
+        elderly = ElderlyService.create(db_session, ElderlyCreateRequest(
+            name="김영희", call_schedule=CallSchedule(times=["09:00"]),
+        ), caregiver.id)
+        assert _slots(db_session, elderly.id) == {(d, "09:00") for d in range(7)}
+
+        ElderlyService.update(db_session, elderly.id, caregiver.id, ElderlyUpdateRequest(
+            call_schedule=CallSchedule(enabled=True, times=["09:00", "20:00"]),
+        ))
+        assert _slots(db_session, elderly.id) == {(d, t) for d in range(7) for t in ("09:00", "20:00")}
+
+        ElderlyService.update(db_session, elderly.id, caregiver.id, ElderlyUpdateRequest(
+            call_schedule=CallSchedule(enabled=False, times=["09:00"]),
+        ))
+        assert _slots(db_session, elderly.id) == set()
+
+    def test_update_without_schedule_keeps_slots(self, db_session, caregiver):
+        elderly = ElderlyService.create(db_session, ElderlyCreateRequest(name="김영희"), caregiver.id)
+        before = _slots(db_session, elderly.id)
+
+        ElderlyService.update(db_session, elderly.id, caregiver.id, ElderlyUpdateRequest(name="이영희"))
+
+        assert _slots(db_session, elderly.id) == before
+        assert len(before) == 21  # default 09:00 / 14:00 / 19:00 every day
+
+    def test_next_fire_time_uses_kst(self):
+        call_schedule = {"enabled": True, "times": ["09:00", "19:00"], "days": ["monday"]}
+
+        # Monday 08:59 KST → 09:00 KST the same day (00:00 UTC)
+        assert next_fire_time(call_schedule, datetime(2026, 1, 4, 23, 59)) == datetime(2026, 1, 5, 0, 0)
+        # Exactly at a slot → the next one
+        assert next_fire_time(call_schedule, datetime(2026, 1, 5, 0, 0)) == datetime(2026, 1, 5, 10, 0)
+        # After the last Monday slot → next Monday
+        assert next_fire_time(call_schedule, datetime(2026, 1, 5, 10, 0)) == datetime(2026, 1, 12, 0, 0)
+        assert next_fire_time({"enabled": False, "times": ["09:00"]}, datetime(2026, 1, 5)) is None
+
+    def test_rebuild_backfills_existing_rows(self, db_session, caregiver):
+        db_session.add_all([
+            Elderly(caregiver_id=caregiver.id, name="a", call_schedule={"enabled": True, "times": ["09:00"]}),
+            Elderly(caregiver_id=caregiver.id, name="b", call_schedule={"enabled": False, "times": ["09:00"]}),
+        ])
+        db_session.commit()
+
+        assert ElderlyService.rebuild_schedule_slots(db_session) == 7
+        assert ElderlyService.rebuild_schedule_slots(db_session) == 7
+        fire_times = {e.name: e.next_fire_at for e in db_session.query(Elderly)}
+        assert fire_times["a"] is not None
+        assert fire_times["b"] is None
+
+
+class TestCheckSchedules:
+    """Test the minute tick."""
+
+    @pytest.fixture
+    def elderly(self, db_session, caregiver):
+        people = []
+        for name, call_schedule in [
+            ("every-day", {"enabled": True, "times": ["09:00"]}),
+            ("mondays", {"enabled": True, "times": ["09:00"], "days": ["monday"]}),
+            ("tuesdays", {"enabled": True, "times": ["09:00"], "days": ["tuesday"]}),
+            ("evening", {"enabled": True, "times": ["19:00"]}),
+            ("disabled", {"enabled": False, "times": ["09:00"]}),
+        ]:
+            people.append(ElderlyService.create(db_session, ElderlyCreateRequest(name=name), caregiver.id))
+            people[-1].call_schedule = call_schedule
+            ElderlyService.sync_schedule(people[-1])
+        db_session.commit()
+        return {e.name: e.id for e in people}
+
+    def test_creates_calls_in_one_statement(self, task_db, elderly):
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(task_db.get_bind(), "before_cursor_execute", listener)
+        try:
+            created = schedule.create_scheduled_calls(task_db, MONDAY_9AM)
+        finally:
+            event.remove(task_db.get_bind(), "before_cursor_execute", listener)
+
+        assert sorted(e for _, e, _ in created) == sorted([elderly["every-day"], elderly["mondays"]])
+        assert len(statements) == 1
+        call = task_db.get(Call, created[0][0])
+        assert call.status == "scheduled"
+        assert call.trigger_type == "auto"
+        assert call.scheduled_for == datetime(2026, 1, 5, 0, 0)  # UTC naive, minute precision
+
+    def test_repeated_tick_creates_nothing(self, task_db, elderly):
+        first = schedule.create_scheduled_calls(task_db, MONDAY_9AM)
+        second = schedule.create_scheduled_calls(task_db, MONDAY_9AM.replace(second=50))
+
+        assert len(first) == 2
+        assert second == []
+        assert task_db.query(Call).count() == 2
+
+    def test_manual_calls_do_not_conflict(self, task_db, elderly):
+        task_db.add(Call(elderly_id=elderly["every-day"], trigger_type="manual", status="completed",
+                         started_at=datetime(2026, 1, 5), scheduled_for=datetime(2026, 1, 5)))
+        task_db.commit()
+
+        created = schedule.create_scheduled_calls(task_db, MONDAY_9AM)
+
+        assert elderly["every-day"] in [e for _, e, _ in created]
+
+    def test_task_dispatches_follow_ups(self, task_db, elderly):
+        with patch("app.tasks.schedule.datetime") as fake_datetime, \
+                patch("app.tasks.push.send_scheduled_pushes") as push, \
+                patch.object(schedule.check_missed_single, "apply_async") as missed:
+            fake_datetime.now.return_value = MONDAY_9AM
+            fake_datetime.utcnow.return_value = datetime(2026, 1, 5, 0, 0, 30)
+            result = schedule.check_schedules()
+
+        assert result == {"created": 2, "time": "09:00"}
+        push.delay.assert_called_once()
+        assert sorted(e for _, e in push.delay.call_args.args[0]) == sorted([elderly["every-day"], elderly["mondays"]])
+        assert missed.call_count == 2
+
+
+class TestCallScheduler:
+    """Test the heap-backed next_fire_at scheduler."""
+
+    @pytest.fixture
+    def clock(self):
+        class Clock:
+            now = datetime(2026, 1, 4, 23, 58)  # Monday 08:58 KST
+
+            def __call__(self):
+                return self.now
+
+        return Clock()
+
+    @pytest.fixture
+    def elderly(self, db_session, caregiver, clock):
+        people = {}
+        for name, times in [("nine", ["09:00"]), ("nine-and-ten", ["09:00", "10:00"]), ("noon", ["12:00"])]:
+            person = Elderly(caregiver_id=caregiver.id, name=name,
+                             call_schedule={"enabled": True, "times": times})
+            db_session.add(person)
+            people[name] = person
+        db_session.commit()
+        with patch("app.services.elderly.datetime") as fake_datetime:
+            fake_datetime.utcnow.return_value = clock.now
+            fake_datetime.strptime = datetime.strptime
+            fake_datetime.combine = datetime.combine
+            ElderlyService.rebuild_schedule_slots(db_session)
+        return {name: person.id for name, person in people.items()}
+
+    def test_fires_on_time_and_advances(self, db_session, elderly, clock):
+        scheduler = CallScheduler(lookahead=timedelta(minutes=5), batch_size=100, clock=clock)
+
+        assert scheduler.refresh(db_session) == 2  # noon is outside the window
+        assert scheduler.next_due == datetime(2026, 1, 5, 0, 0)
+        assert scheduler.fire_due(db_session) == []
+
+        clock.now = datetime(2026, 1, 5, 0, 0)
+        created = scheduler.fire_due(db_session)
+
+        assert sorted(e for _, e, _ in created) == sorted([elderly["nine"], elderly["nine-and-ten"]])
+        assert db_session.query(Call).filter(Call.scheduled_for == clock.now).count() == 2
+        db_session.expire_all()
+        assert db_session.get(Elderly, elderly["nine"]).next_fire_at == datetime(2026, 1, 6, 0, 0)
+        assert db_session.get(Elderly, elderly["nine-and-ten"]).next_fire_at == datetime(2026, 1, 5, 1, 0)
+        assert len(scheduler) == 0  # advanced entries are past the window
+
+    def test_skips_entries_changed_after_refresh(self, db_session, elderly, clock):
+        scheduler = CallScheduler(lookahead=timedelta(minutes=5), batch_size=100, clock=clock)
+        scheduler.refresh(db_session)
+
+        person = db_session.get(Elderly, elderly["nine"])
+        person.call_schedule = {"enabled": True, "times": ["21:00"]}
+        ElderlyService.sync_schedule(person)
+        db_session.commit()
+
+        clock.now = datetime(2026, 1, 5, 0, 0)
+        created = scheduler.fire_due(db_session)
+
+        assert [e for _, e, _ in created] == [elderly["nine-and-ten"]]
+        assert scheduler.stats["stale"] == 1
+
+    def test_late_entries_advance_without_calls(self, db_session, elderly, clock):
+        scheduler = CallScheduler(lookahead=timedelta(minutes=5), batch_size=100,
+                                  max_lateness=timedelta(minutes=5), clock=clock)
+        scheduler.refresh(db_session)
+
+        clock.now = datetime(2026, 1, 5, 0, 30)
+        assert scheduler.fire_due(db_session) == []
+
+        assert scheduler.stats["skipped_late"] == 2
+        assert db_session.query(Call).count() == 0
+        db_session.expire_all()
+        assert db_session.get(Elderly, elderly["nine-and-ten"]).next_fire_at == datetime(2026, 1, 5, 1, 0)
+
+    def test_truncated_refresh_moves_deadline(self, db_session, elderly, clock):
+        scheduler = CallScheduler(lookahead=timedelta(hours=4), batch_size=2, clock=clock)
+        next_refresh = clock.now + timedelta(minutes=30)
+
+        scheduler.refresh(db_session)
+
+        assert len(scheduler) == 2
+        assert scheduler.refresh_deadline(next_refresh) == datetime(2026, 1, 5, 0, 0)
+
+        clock.now = datetime(2026, 1, 5, 0, 0)
+        scheduler.fire_due(db_session)
+        scheduler.refresh(db_session)
+        assert scheduler.next_due == datetime(2026, 1, 5, 1, 0)
+        assert scheduler.refresh_deadline(next_refresh) == next_refresh
@@ -450,6 +450,74 @@ class TestToolRegistry:
         assert len(claude_tools) == 1
         assert claude_tools[0]["name"] == "tool1"
 
+    def test_to_openai_format(self, registry):
+        for name in ("tool1", "tool2", "tool3"):
+            registry.register(Tool(
+                name=name,
+                description=name,
+                input_schema={"properties": {"x": {"type": "string"}}, "required": ["x"]},
+                execute_func=lambda **kwargs: None,
+            ))
+
+        openai_tools = registry.to_openai_format()
+
+        assert [t["function"]["name"] for t in openai_tools] == ["tool1", "tool2", "tool3"]
+        assert openai_tools[0] == registry.get("tool1").to_openai_format()
+
+        # Subsets keep registration order and ignore unknown names
+        subset = registry.to_openai_format(["tool3", "unknown", "tool1"])
+        assert [t["function"]["name"] for t in subset] == ["tool1", "tool3"]
+
+    def test_export_is_serialized_once(self, registry):
+        registry.register(Tool(
+            name="tool1",
+            description="Tool 1",
+            input_schema={},
+            execute_func=lambda **kwargs: None,
+        ))
+
+        first = registry.to_openai_format()
+        second = registry.to_openai_format(["tool1"])
+        registry.to_claude_format()
+
+        assert first[0] is second[0]
+        assert registry.export_builds == 1
+
+    def test_empty_subset_does_not_shadow_full_export(self, registry):
+        registry.register(Tool(
+            name="tool1",
+            description="Tool 1",
+            input_schema={},
+            execute_func=lambda **kwargs: None,
+        ))
+
+        assert registry.to_openai_format([]) == []
+        assert registry.to_openai_format(["unknown"]) == []
+        assert [t["function"]["name"] for t in registry.to_openai_format()] == ["tool1"]
+
+    def test_export_invalidated_on_register_and_unregister(self, registry):
+        registry.register(Tool(
+            name="tool1",
+            description="Tool 1",
+            input_schema={},
+            execute_func=lambda **kwargs: None,
+        ))
+        version = registry.version
+        assert len(registry.to_openai_format()) == 1
+
+        registry.register(Tool(
+            name="tool2",
+            description="Tool 2",
+            input_schema={},
+            execute_func=lambda **kwargs: None,
+        ))
+        assert registry.version > version
+        assert len(registry.to_openai_format()) == 2
+
+        registry.unregister("tool1")
+        assert [t["name"] for t in registry.to_claude_format()] == ["tool2"]
+        assert registry.export_builds == 3
+
     @pytest.mark.asyncio
     async def test_execute_tool(self, registry):
         async def async_tool(message: str) -> str:
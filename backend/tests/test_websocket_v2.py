@@ -7,6 +7,7 @@ Tests WebSocket connection handling, message processing, and agent integration.
 import pytest
 import json
 import asyncio
+import os
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timezone
 from collections import OrderedDict
@@ -14,6 +15,8 @@ from collections import OrderedDict
 from fastapi import status
 from fastapi.testclient import TestClient
 
+from app.core.config import settings
+
 from app.routes.websocket_v2 import (
     LRUSet,
     ConnectionState,
@@ -401,3 +404,263 @@ class TestMessageDeduplication:
         from app.routes.websocket_v2 import MESSAGE_DEDUP_SIZE
 
         assert MESSAGE_DEDUP_SIZE == 1000  # Verify constant
+
+
+class FakeAgent:
+    """Agent stand-in streaming fixed replies."""
+
+    def __init__(self):
+        self.config = MagicMock(reflection_mode=None)
+
+    async def generate_greeting(self, context):
+        yield "안녕하세요"
+
+    async def process_message(self, user_message, context):
+        for chunk in ["네, ", "좋아요"]:
+            yield chunk
+
+    def cancel_reflection(self, conversation_id):
+        pass
+
+    def clear_conversation(self, conversation_id):
+        pass
+
+    def schedule_summarization(self, conversation_id):
+        pass
+
+
+class CorrectingAgent(FakeAgent):
+    """Background reflection rejects the greeting and regenerates it."""
+
+    def __init__(self):
+        from app.services.agents import ReflectionMode
+
+        super().__init__()
+        self.config = MagicMock(reflection_mode=ReflectionMode.BACKGROUND)
+
+    async def await_reflection(self, conversation_id):
+        return MagicMock(should_retry=True, retry_reason="too short")
+
+    async def correct_response(self, user_input, context):
+        yield "안녕하세요, 어르신. 오늘 기분은 어떠세요?"
+
+
+class TestEndpointAsyncDatabase:
+    """End-to-end call over the async session (aiosqlite on a shared file)."""
+
+    @pytest.fixture
+    def database(self, async_database, tmp_path):
+        sessions = async_database.sessions
+        with patch("app.routes.websocket_v2.AsyncSessionLocal", sessions), \
+                patch("app.main.AsyncSessionLocal", sessions), \
+                patch.object(settings, "MESSAGE_JOURNAL_DIR", str(tmp_path / "journal")), \
+                patch("app.routes.websocket_v2.get_agent_service", return_value=FakeAgent()):
+            yield async_database.Session
+
+    @pytest.fixture
+    def call_and_token(self, database):
+        from app.core.security import create_device_access_token
+        from app.models.call import Call
+        from app.models.elderly import Elderly
+        from app.models.elderly_device import ElderlyDevice
+        from app.models.user import User
+
+        with database() as db:
+            caregiver = User(email="care@example.com", password_hash="x", full_name="보호자")
+            elderly = Elderly(caregiver=caregiver, name="김영희")
+            device = ElderlyDevice(elderly=elderly, fcm_token="token")
+            call = Call(elderly=elderly, status="scheduled", trigger_type="auto",
+                        started_at=datetime(2026, 1, 5), scheduled_for=datetime(2026, 1, 5))
+            db.add_all([caregiver, elderly, device, call])
+            db.commit()
+            return call.id, create_device_access_token(elderly.id, device.id)
+
+    def _receive_until(self, ws, frame_type):
+        frames = []
+        while not frames or frames[-1]["type"] != frame_type:
+            frames.append(ws.receive_json())
+        return frames
+
+    def test_conversation_is_persisted(self, database, call_and_token):
+        from app.main import app
+        from app.models.call import Call
+        from app.models.elderly_device import ElderlyDevice
+        from app.models.message import Message
+
+        call_id, token = call_and_token
+        with patch("app.tasks.analysis.analyze_call") as analyze_call, TestClient(app) as client:
+            with client.websocket_connect(f"/ws/v2/{call_id}?token={token}") as ws:
+                assert self._receive_until(ws, "stream_end")[-1]["content"] == "안녕하세요"
+
+                ws.send_json({"type": "message", "content": "잘 지냈어요", "message_id": "m1"})
+                frames = self._receive_until(ws, "stream_end")
+                assert [f["type"] for f in frames] == ["ack", "message", "stream_chunk", "stream_chunk", "stream_end"]
+                assert frames[-1]["content"] == "네, 좋아요"
+
+                ws.send_json({"type": "end_call"})
+                assert self._receive_until(ws, "ended")[-1]["status"] == "completed"
+
+        analyze_call.delay.assert_called_once_with(call_id)
+        with database() as db:
+            call = db.get(Call, call_id)
+            assert call.status == "completed"
+            assert call.is_successful is True
+            assert call.duration is not None
+            messages = db.query(Message).filter(Message.call_id == call_id).order_by(Message.id).all()
+            assert [(m.role, m.content) for m in messages] == [
+                ("assistant", "안녕하세요"), ("user", "잘 지냈어요"), ("assistant", "네, 좋아요"),
+            ]
+            assert db.query(ElderlyDevice).one().last_used_at is not None
+        assert os.listdir(settings.MESSAGE_JOURNAL_DIR) == []
+
+    def test_correction_replaces_the_rejected_answer(self, database, call_and_token):
+        from app.main import app
+        from app.models.message import Message
+
+        call_id, token = call_and_token
+        with patch("app.routes.websocket_v2.get_agent_service", return_value=CorrectingAgent()), \
+                patch("app.tasks.analysis.analyze_call"), TestClient(app) as client:
+            with client.websocket_connect(f"/ws/v2/{call_id}?token={token}") as ws:
+                greeting = self._receive_until(ws, "stream_end")[-1]
+                correction = self._receive_until(ws, "correction")[-1]
+                assert correction["replaces_response_id"] == greeting["response_id"]
+
+                ws.send_json({"type": "end_call"})
+                self._receive_until(ws, "ended")
+
+        with database() as db:
+            messages = db.query(Message).filter(Message.call_id == call_id).order_by(Message.id).all()
+            # One assistant turn holding the corrected text, not the rejected one plus the correction
+            assert [(m.role, m.content) for m in messages] == [
+                ("assistant", "안녕하세요, 어르신. 오늘 기분은 어떠세요?"),
+            ]
+
+    def test_disconnect_completes_call(self, database, call_and_token):
+        from app.main import app
+        from app.models.call import Call
+
+        call_id, token = call_and_token
+        with patch("app.tasks.analysis.analyze_call") as analyze_call, TestClient(app) as client:
+            with client.websocket_connect(f"/ws/v2/{call_id}?token={token}") as ws:
+                self._receive_until(ws, "stream_end")
+
+        with database() as db:
+            assert db.get(Call, call_id).status == "completed"
+        analyze_call.delay.assert_called_once_with(call_id)
+
+    def test_rejects_other_elderly(self, database, call_and_token):
+        from starlette.websockets import WebSocketDisconnect
+
+        from app.core.security import create_device_access_token
+        from app.main import app
+        from app.models.call import Call
+
+        call_id, _ = call_and_token
+        with TestClient(app) as client:
+            with pytest.raises(WebSocketDisconnect):
+                with client.websocket_connect(f"/ws/v2/{call_id}?token={create_device_access_token(999, 1)}") as ws:
+                    ws.receive_json()
+
+        with database() as db:
+            assert db.get(Call, call_id).status == "scheduled"
+
+
+class FakeWebSocket:
+    """In-process client: replays scripted frames and records what the server sends."""
+
+    def __init__(self, frames):
+        self.inbound = asyncio.Queue()
+        for frame in frames:
+            self.inbound.put_nowait(json.dumps(frame))
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+    async def receive_text(self):
+        return await self.inbound.get()
+
+    async def close(self, code=None):
+        self.sent.append({"type": "closed", "code": code})
+
+
+class StreamingAgent(FakeAgent):
+    """Holds every reply mid-stream until all calls are streaming at once."""
+
+    def __init__(self, calls: int, pool):
+        super().__init__()
+        self.calls = calls
+        self.pool = pool
+        self.streaming = 0
+        self.all_streaming = asyncio.Event()
+        self.checked_out_while_streaming = None
+
+    async def process_message(self, user_message, context):
+        yield "네, "
+        self.streaming += 1
+        if self.streaming == self.calls:
+            self.checked_out_while_streaming = self.pool.checkedout()
+            self.all_streaming.set()
+        await asyncio.wait_for(self.all_streaming.wait(), timeout=30)
+        yield "좋아요"
+
+
+class TestConnectionPoolCapacity:
+    """Load test: concurrent calls are not capped by the DB pool size."""
+
+    CALLS = 40
+    POOL_SIZE = 2
+
+    def test_calls_beyond_pool_size_stream_concurrently(self, async_database):
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+        from app.core.security import create_device_access_token
+        from app.database import async_database_url
+        from app.models.call import Call
+        from app.models.elderly import Elderly
+        from app.models.message import Message
+        from app.models.user import User
+        from app.routes.websocket_v2 import websocket_endpoint_v2
+
+        with async_database.Session() as db:
+            caregiver = User(email="care@example.com", password_hash="x", full_name="보호자")
+            elderly = [Elderly(caregiver=caregiver, name=f"어르신{i}") for i in range(self.CALLS)]
+            calls = [Call(elderly=e, status="scheduled", trigger_type="auto", started_at=datetime(2026, 1, 5))
+                     for e in elderly]
+            db.add_all([caregiver, *elderly, *calls])
+            db.commit()
+            sessions_for = [(c.id, create_device_access_token(c.elderly_id, 0)) for c in calls]
+
+        async def scenario():
+            # Old handler held one connection per call: the third call would time out here
+            async_engine = create_async_engine(async_database_url(async_database.url), poolclass=AsyncAdaptedQueuePool,
+                                               pool_size=self.POOL_SIZE, max_overflow=0, pool_timeout=5)
+            sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+            agent = StreamingAgent(self.CALLS, async_engine.pool)
+            clients = [FakeWebSocket([{"type": "message", "content": "잘 지냈어요"}, {"type": "end_call"}])
+                       for _ in sessions_for]
+            with patch("app.routes.websocket_v2.AsyncSessionLocal", sessions), \
+                    patch("app.routes.websocket_v2.get_agent_service", return_value=agent), \
+                    patch.object(settings, "MESSAGE_DURABILITY", "buffered"), \
+                    patch("app.tasks.analysis.analyze_call") as analyze_call:
+                await asyncio.gather(*(
+                    websocket_endpoint_v2(ws, call_id, token)
+                    for ws, (call_id, token) in zip(clients, sessions_for)
+                ))
+            await async_engine.dispose()
+            return agent, clients, analyze_call
+
+        agent, clients, analyze_call = asyncio.run(scenario())
+
+        assert agent.all_streaming.is_set()
+        assert agent.checked_out_while_streaming == 0
+        assert analyze_call.delay.call_count == self.CALLS
+        for ws in clients:
+            assert ws.sent[-1]["type"] == "ended"
+        with async_database.Session() as db:
+            assert db.query(Call).filter(Call.status == "completed").count() == self.CALLS
+            assert db.query(Message).count() == self.CALLS * 3
@@ -16,6 +16,7 @@ ALLOWED_TYPES = [
     "end_call",
     "ended",
     "history",
+    "correction",
 ]
 
 
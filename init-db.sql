@@ -21,6 +21,7 @@ CREATE TABLE IF NOT EXISTS elderly (
     age INTEGER,
     phone VARCHAR(20),
     call_schedule JSONB DEFAULT '{"enabled": true, "times": ["09:00", "14:00", "19:00"]}',
+    next_fire_at TIMESTAMP,  -- 다음 예약 통화 시각 (UTC, 비활성이면 NULL)
     health_condition TEXT,
     medications JSONB,
     emergency_contact VARCHAR(255),
@@ -55,6 +56,8 @@ CREATE TABLE IF NOT EXISTS calls (
     scheduled_for TIMESTAMP,
     status VARCHAR(50) DEFAULT 'in_progress',
     is_successful BOOLEAN DEFAULT TRUE,
+    analysis_failed_at TIMESTAMP,  -- 마지막 분석 실패 시각
+    analysis_attempts INTEGER NOT NULL DEFAULT 0,  -- 실패한 분석 횟수
     created_at TIMESTAMP DEFAULT NOW()
 );
 
@@ -90,6 +93,20 @@ CREATE TABLE IF NOT EXISTS elderly_pairing_codes (
     created_at TIMESTAMP DEFAULT NOW()
 );
 
+-- call_schedule_slots 테이블 (elderly.call_schedule 정규화 인덱스, KST 기준)
+CREATE TABLE IF NOT EXISTS call_schedule_slots (
+    weekday SMALLINT NOT NULL,          -- 0 = 월요일
+    slot_time VARCHAR(5) NOT NULL,      -- 'HH:MM'
+    elderly_id INTEGER NOT NULL REFERENCES elderly(id) ON DELETE CASCADE,
+    PRIMARY KEY (weekday, slot_time, elderly_id)
+);
+
+-- 기존 DB 업그레이드 (CREATE TABLE IF NOT EXISTS는 기존 테이블에 컬럼을 추가하지 않음)
+-- 백필(call_schedule_slots, next_fire_at)은 API 시작 시 app/db_upgrade.py가 수행
+ALTER TABLE elderly ADD COLUMN IF NOT EXISTS next_fire_at TIMESTAMP;
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS analysis_failed_at TIMESTAMP;
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS analysis_attempts INTEGER NOT NULL DEFAULT 0;
+
 -- 인덱스 생성
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_elderly_caregiver_id ON elderly(caregiver_id);
@@ -99,6 +116,9 @@ CREATE INDEX IF NOT EXISTS idx_calls_elderly_id ON calls(elderly_id);
 CREATE INDEX IF NOT EXISTS idx_calls_created_at ON calls(created_at);
 CREATE INDEX IF NOT EXISTS idx_calls_scheduled_for ON calls(scheduled_for);
 CREATE INDEX IF NOT EXISTS idx_calls_status ON calls(status);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_calls_elderly_scheduled ON calls(elderly_id, scheduled_for) WHERE trigger_type = 'auto';
+CREATE INDEX IF NOT EXISTS idx_call_schedule_slots_elderly_id ON call_schedule_slots(elderly_id);
+CREATE INDEX IF NOT EXISTS idx_elderly_next_fire_at ON elderly(next_fire_at);
 CREATE INDEX IF NOT EXISTS idx_messages_call_id ON messages(call_id);
 CREATE INDEX IF NOT EXISTS idx_call_analysis_call_id ON call_analysis(call_id);
 CREATE INDEX IF NOT EXISTS idx_pairing_codes_elderly_id ON elderly_pairing_codes(elderly_id);